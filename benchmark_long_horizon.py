@@ -0,0 +1,115 @@
+"""
+長期間シミュレーションモードのスケーリング計測スクリプト
+負荷試験シナリオ（1k〜100kタスク）で、タスクインデックスを使う長期間モードと
+全タスクを走査する通常モードの1判断あたりの時間を計測し、結果が一致することを確認する
+"""
+
+import copy
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.environment.task_index import TaskIndex
+from src.utils.packed_dataset import tasks_from_records
+from src.utils.rng import DecisionStream
+from src.utils.scenario_generator import ScenarioConfig, SCENARIO_START_TIME, generate_scenario_records
+from src.utils.scheduler_factory import create_baseline_schedulers, create_rl_scheduler
+from config import STRESS_SCENARIO_CONFIG, LONG_HORIZON_BENCHMARK_CONFIG
+
+def run_timed(simulation, scheduler, tasks, seed: int):
+    """
+    乱数を固定してシミュレーションを実行する
+
+    Returns:
+        (結果, エピソード全体の秒数, タスク選択の秒数, タスク選択の回数)
+    """
+    method_name = 'select_next_task_from_index' if simulation.long_horizon else 'select_next_task'
+    select = getattr(scheduler, method_name)
+    timing = {'seconds': 0.0, 'calls': 0}
+
+    # タスク選択（判断ごとにタスク数に依存するコストがかかる部分）だけを計測する
+    def timed_select(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return select(*args, **kwargs)
+        finally:
+            timing['seconds'] += time.perf_counter() - start
+            timing['calls'] += 1
+
+    setattr(scheduler, method_name, timed_select)
+    try:
+        scheduler.set_random_stream(DecisionStream(np.random.SeedSequence(seed)))
+        start = time.perf_counter()
+        result = simulation.run_simulation_with_tasks(scheduler, tasks)
+        elapsed = time.perf_counter() - start
+    finally:
+        delattr(scheduler, method_name)
+    return result, elapsed, timing['seconds'], timing['calls']
+
+def main():
+    config = LONG_HORIZON_BENCHMARK_CONFIG
+    scenarios = {s['name']: ScenarioConfig.from_dict(s) for s in STRESS_SCENARIO_CONFIG['scenarios']}
+
+    schedulers = create_baseline_schedulers()
+    if 'rl_scheduler' in config['schedulers']:
+        schedulers['rl_scheduler'] = create_rl_scheduler()
+    schedulers = {name: schedulers[name] for name in config['schedulers']}
+
+    print("長期間シミュレーションのスケーリング計測")
+    print(f"{'シナリオ':<18} {'スケジューラー':<20} {'判断数':>6} {'準備(秒)':>8} {'全体(秒)':>8} "
+          f"{'判断(μs)':>9} {'通常(μs)':>9} {'速度比':>7} {'一致':>4}")
+
+    rows = []
+    for name in config['scenarios']:
+        scenario = scenarios[name]
+        tasks = tasks_from_records(generate_scenario_records(scenario, config['seed'], 0), SCENARIO_START_TIME)
+
+        # 1エピソードに1回だけかかる準備（タスクのコピーとインデックスの構築）
+        start = time.perf_counter()
+        TaskIndex(copy.deepcopy(tasks))
+        setup_seconds = time.perf_counter() - start
+
+        for scheduler_name, scheduler in schedulers.items():
+            result, seconds, select_seconds, decisions = run_timed(
+                scenario.create_simulation(long_horizon=True), scheduler, tasks, config['seed'])
+            row = {
+                'scenario': name,
+                'num_tasks': scenario.num_tasks,
+                'simulation_days': scenario.simulation_days,
+                'scheduler': scheduler_name,
+                'decisions': decisions,
+                'total_score': result['total_score'],
+                'setup_seconds': setup_seconds,
+                'indexed_seconds': seconds,
+                'indexed_us_per_decision': select_seconds / decisions * 1e6,
+                'list_seconds': np.nan,
+                'list_us_per_decision': np.nan,
+                'results_match': None,
+            }
+
+            if scenario.num_tasks <= config['list_path_max_tasks']:
+                list_result, list_seconds, list_select_seconds, list_decisions = run_timed(
+                    scenario.create_simulation(), scheduler, tasks, config['seed'])
+                row['list_seconds'] = list_seconds
+                row['list_us_per_decision'] = list_select_seconds / list_decisions * 1e6
+                row['results_match'] = list_result['simulation_log'] == result['simulation_log']
+            rows.append(row)
+
+            speedup = row['list_us_per_decision'] / row['indexed_us_per_decision']
+            match = {True: 'OK', False: 'NG', None: '-'}[row['results_match']]
+            print(f"{name:<18} {scheduler_name:<20} {decisions:>6} {setup_seconds:>8.2f} {seconds:>8.2f} "
+                  f"{row['indexed_us_per_decision']:>9.1f} {row['list_us_per_decision']:>9.1f} "
+                  f"{speedup:>7.1f} {match:>4}")
+
+    df = pd.DataFrame(rows)
+    os.makedirs(os.path.dirname(config['output_path']), exist_ok=True)
+    df.to_csv(config['output_path'], index=False)
+    print(f"\n✅ 計測結果を保存: {config['output_path']}")
+
+    if (df['results_match'] == False).any():  # noqa: E712
+        print("⚠️ 長期間モードと通常モードの結果が一致しないケースがあります")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+テスト用タスクセットの代表コアセットを作成するスクリプト
+全テストセットでの高速なベースラインの予備実行と特徴量から、少数の重み付きタスクセットを選ぶ
+"""
+
+import sys
+import os
+import time
+
+# プロジェクトルートを追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.evaluation.coreset import run_pilot, select_coreset, save_coreset, CORESET_FEATURE_COLUMNS
+from src.utils.task_loader import create_task_loader
+from src.utils.task_set_features import load_feature_table
+from src.utils.scheduler_factory import create_baseline_schedulers
+from src.environment.simulation import TaskSchedulingSimulation
+from config import DEFAULT_SIMULATION_CONFIG, TEST_CORESET_CONFIG
+
+
+def main():
+    """予備実行とクラスタリングでコアセットを作り、誤差を報告する"""
+    print("=" * 60)
+    print("テスト用タスクセットの代表コアセット作成")
+    print("=" * 60)
+
+    config = TEST_CORESET_CONFIG
+    test_loader = create_task_loader('test')
+    num_sets = test_loader.get_num_datasets()
+
+    features = load_feature_table(test_loader, TaskSchedulingSimulation(**DEFAULT_SIMULATION_CONFIG).start_time)
+    feature_df = features.to_dataframe()[list(CORESET_FEATURE_COLUMNS)]
+
+    schedulers = {name: scheduler for name, scheduler in create_baseline_schedulers().items()
+                  if name in config['pilot_schedulers']}
+    print(f"\n予備実行: {list(schedulers)} × {num_sets}セット")
+    start = time.perf_counter()
+    pilot = run_pilot(test_loader, schedulers, DEFAULT_SIMULATION_CONFIG, seed=config['seed'])
+    pilot_seconds = time.perf_counter() - start
+
+    coreset = select_coreset(
+        feature_df, pilot,
+        clustering_columns=config['clustering_schedulers'],
+        initial_size=config['initial_size'],
+        max_size=config['max_size'],
+        tolerance=config['tolerance'],
+        pilot_weight=config['pilot_weight'],
+        seed=config['seed']
+    )
+    save_coreset(coreset, config['output_path'], dataset_info=test_loader.get_dataset_info())
+
+    print(f"\n予備実行時間: {pilot_seconds:.1f}秒")
+    print(f"コアセットの大きさ: {coreset['size']}/{num_sets}セット（{coreset['size'] / num_sets:.1%}）")
+    print(f"\n{'スケジューラー':<22}{'全体平均':>10}{'コアセット':>12}{'相対誤差':>10}")
+    for name in pilot.columns:
+        mark = "" if name in config['clustering_schedulers'] else "（確認用）"
+        print(f"{name:<22}{coreset['full_means'][name]:>10.1f}{coreset['coreset_means'][name]:>12.1f}"
+              f"{coreset['relative_errors'][name]:>10.2%} {mark}")
+    print(f"\n最大相対誤差: {coreset['max_relative_error']:.2%}（許容 {coreset['tolerance']:.2%}）")
+    print(f"順位の一致: {'はい' if coreset['ranking_preserved'] else 'いいえ'}")
+
+    if coreset['achieved']:
+        print(f"\n✅ コアセットを保存: {config['output_path']}")
+    else:
+        print(f"\n⚠️ 上限 {config['max_size']}セットでは許容誤差に収まりませんでした。保存: {config['output_path']}")
+    print(f"（EXPERIMENT_CONFIG['coreset_path'] に指定すると run_full_experiment.py で使用される）")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,8 +18,63 @@ QUICK_TEST_CONFIG = {
 
 # 実験設定
 EXPERIMENT_CONFIG = {
-    'num_experiments': 50,
-    'output_dir': 'results'
+    # 評価するテストセット数（Noneの場合はテスト分割の全セット）
+    'num_experiments': None,
+    'output_dir': 'results',
+    # 代表コアセット（build_test_coreset.py で作成）を使う場合はそのパス
+    # 指定するとnum_experimentsの代わりにコアセットのタスクセットを重み付きで評価する
+    'coreset_path': None,
+    # 並列実行するプロセス数（1の場合は直列、Noneの場合はCPU数）と1回に送る実験数（Noneの場合は自動）
+    'workers': None,
+    'chunk_size': None,
+    # タスクインデックスで選択するシミュレーション（長期間モード）で評価する（結果は同じで、60タスクでも約2倍速い）
+    'long_horizon': True,
+    # タスクセットを1回だけ読み込んで全スケジューラーを続けて実行する（並列実行では同じプロセスにまとめる）
+    'group_by_task_set': True,
+    # 実験ごとの乱数列（src/utils/rng.py）を導出するシード。結果が実行順・並列数・キャッシュの有無に依存しない
+    # （Noneの場合は実行のたびにOSのエントロピーから作る）
+    'seed': 0,
+    # 実験結果のキャッシュ（SQLite）のパス。スケジューラー・タスクセット・シミュレーション設定・コードが
+    # 変わっていない実験は再実行せずに保存済みの指標を使う（Noneの場合はキャッシュしない）
+    'result_cache_path': 'results/cache/results.sqlite',
+    # 共通乱数法: 確率的なスケジューラー（random・RLのε-greedy）の k 回目の判断に、全スケジューラーで同じ乱数を使う
+    'common_random_numbers': False,
+    # 対称変量法: 確率的なスケジューラーを乱数 u と 1 - u で2回実行して平均する（common_random_numbers が必要）
+    'antithetic': False,
+    # 進捗（エピソード/秒・判断/秒・残り時間）を表示する間隔（秒）
+    'progress_interval': 10.0,
+    # 評価コスト（実時間・CPU時間・最大メモリ使用量）を実行ごとに追記する履歴CSV（Noneの場合は保存しない）
+    'cost_history_path': 'results/evaluation_cost_history.csv',
+}
+
+# 分散削減の測定設定（measure_variance_reduction.py で使用）
+VARIANCE_REDUCTION_CONFIG = {
+    'num_experiments': 200,     # 測定に使うテストセット数（3通りの乱数の使い方でそれぞれ実行する）
+    'metric': 'total_score',
+    'seed': 0,
+    'output_path': 'results/variance_reduction.csv',
+}
+
+# 逐次評価の設定（SchedulerEvaluator.run_sequential）
+# タスクセットを batch_size ずつ実行し、基準のスケジューラーとの全ての比較が信頼系列で決まった時点で止める
+# （num_experiments は上限になる。コアセットとは併用できない）
+SEQUENTIAL_EVALUATION_CONFIG = {
+    'enabled': False,
+    'reference': 'rl_scheduler',
+    'metric': 'total_score',
+    'alpha': 0.05,              # 全ての比較を合わせた有意水準（全時点で同時に有効）
+    'batch_size': 50,
+    'tuning_sets': None,        # 信頼系列が最も狭くなるタスクセット数（Noneの場合はnum_experimentsの半分）
+    'equivalence_margin': None, # 差の信頼区間がこの範囲に収まったら「差なし」と決める（Noneの場合は決めない）
+    'min_sets': 30,             # 判定を始めるまでのタスクセット数
+}
+
+# ブートストラップ信頼区間・並べ替え検定の設定（src/evaluation/resampling.py）
+RESAMPLING_CONFIG = {
+    'n_resamples': 10000,
+    'confidence': 0.95,
+    'seed': 0,
+    'chunk_size': None,         # 1回にまとめて作る再標本数（Noneの場合はタスクセット数から自動）
 }
 
 # 集中力モデル設定
@@ -126,6 +181,17 @@ TASK_GENERATION_CONFIG = {
     'priority_medium_ratio': 0.25, # 25%がMEDIUM
     # 残り15%がHIGH
 
+    # 重要度別の所要時間の範囲（分、両端を含む）
+    'priority_duration_ranges': {
+        'LOW': (20, 40),       # 短時間タスク
+        'MEDIUM': (40, 80),    # 中時間タスク
+        'HIGH': (80, 160),     # 長時間タスク
+    },
+
+    # 締切: 開始から何日後の間で均等に分散するか（優先度に関係なく）
+    'deadline_min_days': 2.0,
+    'deadline_max_days': 7.0,
+
     # 依存関係設定
     'dependency_ratio': 0.3,  # 30%のタスクが依存関係を持つ
     'dependency_window_size': 20,  # 直近20個のタスクから依存先を選択
@@ -209,4 +275,135 @@ RL_LEARNING_MODE_CONFIG = {
     'enable_learning': True,
     'epsilon_decay_rate': 0.9995,  # 0.995 → 0.9995（減衰を緩やかに）
     'min_epsilon': 0.05,           # epsilonの下限
-}
\ No newline at end of file
+}
+
+# ハイパーパラメータ探索設定（tune_rl_model.py で使用）
+RL_HYPERPARAMETER_SEARCH_CONFIG = {
+    # 探索空間（各パラメータの候補値）
+    'search_space': {
+        'learning_rate': [0.01, 0.05, 0.1, 0.2],
+        'discount_factor': [0.9, 0.95, 0.99],
+        'epsilon_decay_rate': [0.999, 0.9995, 0.9998],
+        'min_epsilon': [0.01, 0.05, 0.1],
+    },
+    'num_configs': 27,          # 探索する設定数（全組み合わせより多い場合は全組み合わせ）
+
+    # Successive Halving
+    'min_episodes': 500,        # 最初の評価までの学習エピソード数
+    'max_episodes': 20000,      # 最終的な学習エピソード数の上限
+    'reduction_factor': 3,      # 各段階で上位 1/reduction_factor だけ残す
+
+    # 評価用に学習データの末尾から切り出すタスクセット数（学習には使わない）
+    'num_eval_sets': 100,
+
+    'num_workers': None,        # None の場合は os.cpu_count()
+    'seed': 0,
+}
+
+# 学習時のタスクセットサンプリング設定（train_rl_model.py で使用）
+RL_TRAINING_SAMPLER_CONFIG = {
+    'strategy': 'prioritized',      # 'round_robin'（従来の順番通り） or 'prioritized'
+
+    # 優先度付きサンプリング: P(i) ∝ priority_i ** alpha
+    'alpha': 0.6,                   # 0で一様、大きいほど難しいセットに偏る
+    'td_error_weight': 1.0,         # 直近のTD誤差の重み
+    'baseline_gap_weight': 1.0,     # ベースラインとのスコア差の重み（0ならベースラインを実行しない）
+    'ema_decay': 0.3,               # 統計の指数移動平均で新しい値に掛ける重み
+
+    # カリキュラム（タスク数と締切の厳しさで易→難の順に解禁）
+    'curriculum': False,
+    'curriculum_episodes': 10000,   # 全タスクセットが解禁されるまでのエピソード数
+    'curriculum_start_fraction': 0.2,  # 最初に使う易しいタスクセットの割合
+
+    'seed': 0,
+}
+
+# 複数ペルソナの同時学習設定（train_multi_persona_model.py で使用）
+MULTI_PERSONA_TRAINING_CONFIG = {
+    # プロファイル名 -> パーソナルデータファイル
+    'profiles': {
+        'default': PERSONAL_DATA_FILE,
+        'switch_short': 'personas/switch_short.json',
+        'same_long': 'personas/same_long.json',
+    },
+    'num_episodes': 20000,
+    'bundle_path': 'trained_models/rl_model_bundle_default.pkl',
+}
+
+# 方策蒸留設定（distill_rl_model.py で使用）
+RL_DISTILLATION_CONFIG = {
+    'max_depth': 8,             # 決定木の最大深さ（深いほど忠実だがルールが増える）
+    'min_samples_leaf': 1,      # 葉に含まれる最小状態数
+    'output_path': 'trained_models/rl_policy_distilled.pkl',
+}
+
+# タスクローダー設定（先読み・キャッシュ）
+TASK_LOADER_CONFIG = {
+    'cache_size': 512,          # キャッシュするデコード済みタスクセット数
+    'prefetch_depth': 16,       # 先読みしておくタスクセット数
+}
+
+# データセット生成設定（generate_task_dataset.py で使用）
+DATASET_GENERATION_CONFIG = {
+    'num_train': 8000,
+    'num_test': 2000,
+    'seed': 42,                 # 分割・シャードごとのシードの元
+    'shard_size': 1000,         # 1シャード（並列化・差分再生成の単位）のタスクセット数
+    'num_workers': None,        # Noneの場合はCPUコア数
+}
+
+# 実験・学習で使うタスクデータセット
+TASK_DATASET_CONFIG = {
+    'source': 'stored',         # 'stored'（dataset/ のファイル） or 'virtual'（シードから必要な時に生成）
+    'dataset_root': 'dataset',
+    # 仮想データセットの設定（ディスクを使わないため数百万セットでもよい）
+    'virtual_num_sets': {'train': 8000, 'test': 2000},
+    'seed': 42,
+}
+
+# テスト用タスクセットの代表コアセット設定（build_test_coreset.py で使用）
+TEST_CORESET_CONFIG = {
+    # 予備実行するスケジューラー（全テストセットで1回ずつ実行する）
+    'pilot_schedulers': ['deadline_scheduler', 'priority_scheduler', 'random_scheduler'],
+    # クラスタリングに使うスケジューラー（残りは誤差の確認だけに使う）
+    'clustering_schedulers': ['deadline_scheduler', 'priority_scheduler'],
+    'initial_size': 100,        # 最初のコアセットの大きさ（許容誤差に収まるまで倍にする）
+    'max_size': 400,
+    'tolerance': 0.01,          # 全体の平均に対する最大相対誤差
+    'pilot_weight': 2.0,        # 特徴量に対する予備実行スコアの重み
+    'seed': 0,
+    'output_path': 'results/test_coreset.json',
+}
+
+# 負荷試験シナリオ設定（generate_stress_scenarios.py で使用）
+# 各要素は ScenarioConfig の引数（省略した項目は既定値: 8時間/日、重要度 5:3:2、ジャンルはGENRE_CONFIG）
+STRESS_SCENARIO_CONFIG = {
+    'output_dir': 'scenarios',
+    'num_sets': 1,              # シナリオごとのタスクセット数
+    'seed': 0,
+    'scenarios': [
+        {'name': 'tasks_1k_30d', 'num_tasks': 1000, 'simulation_days': 30},
+        {'name': 'tasks_3k_90d', 'num_tasks': 3000, 'simulation_days': 90},
+        {'name': 'tasks_10k_180d', 'num_tasks': 10000, 'simulation_days': 180},
+        {'name': 'tasks_30k_365d', 'num_tasks': 30000, 'simulation_days': 365},
+        {'name': 'tasks_100k_365d', 'num_tasks': 100000, 'simulation_days': 365},
+        # 構成を変えた派生シナリオ
+        {'name': 'high_heavy_10k_180d', 'num_tasks': 10000, 'simulation_days': 180,
+         'priority_mix': [0.2, 0.3, 0.5]},
+        {'name': 'single_genre_10k_180d', 'num_tasks': 10000, 'simulation_days': 180,
+         'genre_mix': {'1': 0.85, '2': 0.05, '3': 0.05, '4': 0.05}},
+        {'name': 'dense_deadlines_10k_180d', 'num_tasks': 10000, 'simulation_days': 180,
+         'deadline_density': 4.0},
+    ],
+}
+
+# 長期間シミュレーションのベンチマーク設定（benchmark_long_horizon.py で使用）
+LONG_HORIZON_BENCHMARK_CONFIG = {
+    # STRESS_SCENARIO_CONFIG のシナリオ名（タスク数の小さい順）
+    'scenarios': ['tasks_1k_30d', 'tasks_3k_90d', 'tasks_10k_180d', 'tasks_30k_365d', 'tasks_100k_365d'],
+    'schedulers': ['deadline_scheduler', 'priority_scheduler', 'random_scheduler', 'rl_scheduler'],
+    # 全タスクを走査する通常モードも計測する最大タスク数（比較と結果一致の確認用、O(n²)のため）
+    'list_path_max_tasks': 10000,
+    'seed': 0,
+    'output_path': 'results/benchmarks/long_horizon_scaling.csv',
+}
@@ -0,0 +1,88 @@
+"""
+学習済みQ-tableの方策を浅い決定木に蒸留するスクリプト
+元の方策との一致度（忠実度）と推論レイテンシを報告する
+"""
+
+import sys
+import os
+import time
+import pickle
+
+# プロジェクトルートを追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from src.schedulers.distilled_policy import distill_q_table, q_table_to_dataset
+from src.schedulers.rl_policy_selector import PolicyBasedQLearningSelector
+from config import RL_DISTILLATION_CONFIG
+
+
+def main(model_path: str = "trained_models/rl_model_default.pkl"):
+    """Q-tableを読み込み、決定木に蒸留して保存"""
+    print("=" * 60)
+    print("強化学習モデルの方策蒸留")
+    print("=" * 60)
+
+    config = RL_DISTILLATION_CONFIG
+
+    selector = PolicyBasedQLearningSelector()
+    selector.load_q_table(model_path)
+    print(f"Q-tableを読み込み: {model_path} ({len(selector.q_table)} 状態)")
+
+    policy, report = distill_q_table(
+        selector.q_table,
+        max_depth=config['max_depth'],
+        min_samples_leaf=config['min_samples_leaf']
+    )
+
+    # 推論レイテンシ（1回の行動決定あたり）
+    states, _, _ = q_table_to_dataset(selector.q_table)
+    state_tuples = [tuple(int(v) for v in state) for state in states]
+    repeats = max(1, 100000 // max(1, len(state_tuples)))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for state in state_tuples:
+            policy.predict(state)
+    distilled_us = (time.perf_counter() - start) / (repeats * len(state_tuples)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for state in state_tuples:
+            np.argmax(selector.q_table[state])
+    q_table_us = (time.perf_counter() - start) / (repeats * len(state_tuples)) * 1e6
+
+    policy.save(config['output_path'])
+    model_size = os.path.getsize(config['output_path'])
+    q_table_size = len(pickle.dumps(selector.q_table))
+
+    report_lines = [
+        "# 方策蒸留レポート",
+        "",
+        f"- 元モデル: {model_path}",
+        f"- 蒸留に使った状態数: {report['num_states']}",
+        f"- 決定木の深さ: {report['depth']}（上限 {config['max_depth']}）",
+        f"- ルール数: {report['num_leaves']}",
+        f"- 忠実度（貪欲行動の一致率）: {report['fidelity']:.3f}",
+        f"- 平均Q値損失: {report['mean_q_regret']:.3f}",
+        f"- 推論レイテンシ: 蒸留 {distilled_us:.2f}µs / Q-table {q_table_us:.2f}µs",
+        f"- モデルサイズ: 蒸留 {model_size}バイト / Q-table {q_table_size}バイト",
+        "",
+        "## ルールリスト",
+    ]
+    report_lines += [f"- {rule}" for rule in policy.to_rules(PolicyBasedQLearningSelector.ACTIONS)]
+    report_text = "\n".join(report_lines)
+
+    report_path = os.path.splitext(config['output_path'])[0] + "_report.md"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(report_text)
+
+    print(report_text)
+    print(f"\n✅ 蒸留モデルを保存: {config['output_path']}")
+    print(f"レポートを保存: {report_path}")
+    print(f"（create_rl_scheduler(distilled_model_path='{config['output_path']}') で使用できる）")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -7,12 +7,17 @@ import sys
 import os
 from datetime import datetime
 
+import numpy as np
+
 # プロジェクトルートを追加
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.environment.simulation import TaskSchedulingSimulation
 from src.evaluation.log_analyzer import SimulationLogAnalyzer
 from src.utils.scheduler_factory import create_baseline_schedulers, create_rl_scheduler
+from src.utils.task_loader import create_task_loader
+from src.utils.packed_dataset import records_from_tasks
+from src.utils.task_set_features import TaskSetFeatureTable, load_feature_table
 from config import DEFAULT_SIMULATION_CONFIG
 
 
@@ -37,10 +42,24 @@ def main():
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # 共通タスクセットを事前生成
-    print("共通タスクセットを生成中...")
-    common_tasks = simulation.generate_tasks()
-    print(f"生成されたタスク数: {len(common_tasks)}")
+    # 共通タスクセット: テスト用データセットから総スコアが中央値に近いものを選ぶ
+    # （データセットがない場合は従来通りその場で生成する）
+    try:
+        test_loader = create_task_loader('test')
+        features = load_feature_table(test_loader, simulation.start_time)
+        total_scores = features['total_score']
+        task_index = int(np.argmin(np.abs(total_scores - np.median(total_scores))))
+        common_tasks = test_loader.load_tasks(task_index)
+        task_source = f"テスト用データセットの{task_index}番（総スコアが中央値に近いもの）"
+    except FileNotFoundError:
+        print("共通タスクセットを生成中...")
+        common_tasks = simulation.generate_tasks()
+        features = TaskSetFeatureTable.from_records(
+            records_from_tasks(common_tasks, simulation.start_time), [0, len(common_tasks)])
+        task_index = 0
+        task_source = "その場で生成"
+    set_features = features.row(task_index)
+    print(f"共通タスクセット: {task_source}、タスク数: {len(common_tasks)}")
     
     # 実行サマリーを記録
     summary_lines = []
@@ -53,16 +72,15 @@ def main():
     summary_lines.append(f"- **重要**: 全スケジューラーで同一のタスクセットを使用")
     summary_lines.append(f"\n## 共通タスクセット情報")
     
-    # タスクセットのサマリーを追加
-    low_tasks = sum(1 for t in common_tasks if t.priority.value == 1)
-    medium_tasks = sum(1 for t in common_tasks if t.priority.value == 2) 
-    high_tasks = sum(1 for t in common_tasks if t.priority.value == 3)
-    total_score = sum(t.get_score() for t in common_tasks)
-    
-    summary_lines.append(f"- 重要度LOW: {low_tasks}個")
-    summary_lines.append(f"- 重要度MEDIUM: {medium_tasks}個")
-    summary_lines.append(f"- 重要度HIGH: {high_tasks}個")
-    summary_lines.append(f"- 総スコア（全完了時）: {total_score}点")
+    # タスクセットのサマリーを追加（特徴量テーブルから取り出す）
+    summary_lines.append(f"- タスクセット: {task_source}")
+    summary_lines.append(f"- 重要度LOW: {set_features['low_count']}個")
+    summary_lines.append(f"- 重要度MEDIUM: {set_features['medium_count']}個")
+    summary_lines.append(f"- 重要度HIGH: {set_features['high_count']}個")
+    summary_lines.append(f"- 総スコア（全完了時）: {set_features['total_score']}点")
+    summary_lines.append(f"- 所要時間の中央値: {set_features['duration_median']:.0f}分")
+    summary_lines.append(f"- 締切の広がり: {set_features['deadline_spread'] / 60:.1f}時間")
+    summary_lines.append(f"- 締切の厳しさ: {set_features['deadline_tightness']:.4f}")
     summary_lines.append(f"\n## 各スケジューラーの結果")
     
     # 各スケジューラーでシミュレーション実行
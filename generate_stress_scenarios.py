@@ -0,0 +1,54 @@
+"""
+負荷試験用の大規模シナリオ（1k〜100kタスク、30〜365日）を生成するスクリプト
+"""
+
+import argparse
+import os
+import time
+from src.utils.scenario_generator import ScenarioConfig, write_scenario
+from config import STRESS_SCENARIO_CONFIG
+
+def generate_scenarios(names=None, num_sets: int = None, seed: int = None, output_dir: str = None):
+    """
+    STRESS_SCENARIO_CONFIG のシナリオを生成して保存
+
+    Args:
+        names: 生成するシナリオ名（Noneの場合は全て）
+        num_sets: シナリオごとのタスクセット数（Noneの場合は設定値）
+        seed: シード（Noneの場合は設定値）
+        output_dir: 出力ディレクトリ（Noneの場合は設定値）
+    """
+    config = STRESS_SCENARIO_CONFIG
+    num_sets = config['num_sets'] if num_sets is None else num_sets
+    seed = config['seed'] if seed is None else seed
+    output_dir = output_dir or config['output_dir']
+
+    scenarios = [ScenarioConfig.from_dict(s) for s in config['scenarios']]
+    if names:
+        unknown = set(names) - {s.name for s in scenarios}
+        if unknown:
+            raise ValueError(f"未定義のシナリオです: {sorted(unknown)}")
+        scenarios = [s for s in scenarios if s.name in names]
+
+    print(f"負荷試験シナリオ生成開始（{len(scenarios)}シナリオ、各{num_sets}セット、シード: {seed}）")
+    print(f"{'シナリオ':<28} {'タスク数':>8} {'日数':>5} {'負荷率':>7} {'サイズ(MB)':>10} {'時間(秒)':>8}")
+
+    for scenario in scenarios:
+        start = time.perf_counter()
+        pack_path = write_scenario(scenario, output_dir, num_sets=num_sets, seed=seed)
+        elapsed = time.perf_counter() - start
+        size_mb = os.path.getsize(pack_path) / 1024 ** 2
+        print(f"{scenario.name:<28} {scenario.num_tasks:>8} {scenario.simulation_days:>5} "
+              f"{scenario.load_factor():>7.2f} {size_mb:>10.2f} {elapsed:>8.2f}")
+
+    print(f"\n✅ シナリオ生成完了: {output_dir}/")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="負荷試験用の大規模シナリオの生成")
+    parser.add_argument('--only', nargs='+', default=None, help="生成するシナリオ名")
+    parser.add_argument('--num-sets', type=int, default=None, help="シナリオごとのタスクセット数")
+    parser.add_argument('--seed', type=int, default=None, help="シード")
+    parser.add_argument('--output-dir', default=None, help="出力ディレクトリ")
+    args = parser.parse_args()
+
+    generate_scenarios(args.only, num_sets=args.num_sets, seed=args.seed, output_dir=args.output_dir)
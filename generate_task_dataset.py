@@ -2,27 +2,42 @@
 学習用と検証用のタスクデータセットを事前生成するスクリプト
 """
 
+import argparse
 import json
 import os
-from datetime import datetime
 from src.environment.simulation import TaskSchedulingSimulation
-from config import DEFAULT_SIMULATION_CONFIG
+from src.utils.task_loader import task_to_dict
+from src.utils.packed_dataset import pack_json_dataset, export_packed_to_json, tasks_from_records
+from src.utils.batch_task_generator import generate_shard_records
+from src.utils.dataset_manifest import build_dataset_split, manifest_path
+from config import DEFAULT_SIMULATION_CONFIG, DATASET_GENERATION_CONFIG
 
-def generate_dataset(num_train: int = 8000, num_test: int = 2000):
+def generate_dataset(num_train: int = None, num_test: int = None, dataset_format: str = 'packed',
+                     seed: int = None, num_workers: int = None):
     """
     タスクデータセットを生成して保存
 
     Args:
-        num_train: 学習用タスクセット数（デフォルト: 8000）
-        num_test: テスト用タスクセット数（デフォルト: 2000）
+        num_train: 学習用タスクセット数（Noneの場合はDATASET_GENERATION_CONFIGの値）
+        num_test: テスト用タスクセット数（Noneの場合はDATASET_GENERATION_CONFIGの値）
+        dataset_format: 'packed'（dataset/{split}.pack）または 'json'（1セット1ファイル）
+        seed: シード（Noneの場合はDATASET_GENERATION_CONFIGの値）
+        num_workers: ワーカープロセス数（Noneの場合はDATASET_GENERATION_CONFIGの値）
     """
-    print(f"タスクデータセット生成開始")
+    if dataset_format not in ('packed', 'json'):
+        raise ValueError(f"dataset_format must be 'packed' or 'json', got {dataset_format}")
+
+    config = DATASET_GENERATION_CONFIG
+    num_train = config['num_train'] if num_train is None else num_train
+    num_test = config['num_test'] if num_test is None else num_test
+    seed = config['seed'] if seed is None else seed
+    num_workers = num_workers or config['num_workers']
+    shard_size = config['shard_size']
+
+    print(f"タスクデータセット生成開始（{dataset_format}形式）")
     print(f"  学習用: {num_train}セット")
     print(f"  テスト用: {num_test}セット")
-
-    # ディレクトリ作成
-    os.makedirs("dataset/train", exist_ok=True)
-    os.makedirs("dataset/test", exist_ok=True)
+    print(f"  シード: {seed}")
 
     # シミュレーション環境（config.pyの設定を使用）
     sim = TaskSchedulingSimulation(
@@ -31,47 +46,75 @@ def generate_dataset(num_train: int = 8000, num_test: int = 2000):
         num_tasks=DEFAULT_SIMULATION_CONFIG['num_tasks']
     )
 
-    # 学習用データ生成
-    print("\n学習用データ生成中...")
-    for i in range(num_train):
-        tasks = sim.generate_tasks()
-        task_data = [task_to_dict(t) for t in tasks]
+    for split, num_sets in (('train', num_train), ('test', num_test)):
+        label = "学習用" if split == 'train' else "テスト用"
+        print(f"\n{label}データ生成中...")
+
+        if dataset_format == 'packed':
+            # 生成設定が同じなら最新のシャードは再利用し、マニフェストと要約統計を更新する
+            build_dataset_split("dataset", split, num_sets, sim.num_tasks, sim.start_time,
+                                seed=seed, shard_size=shard_size, num_workers=num_workers)
+            continue
 
-        filename = f"dataset/train/tasks_{i:04d}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(task_data, f, indent=2, default=str)
+        # JSON形式: パック形式と同じシャード・シードで生成して1セット1ファイルで書き出す
+        os.makedirs(f"dataset/{split}", exist_ok=True)
+        for first_set in range(0, num_sets, shard_size):
+            shard_records = generate_shard_records(seed, split, first_set // shard_size, shard_size,
+                                                   min(shard_size, num_sets - first_set), sim.num_tasks)
+            for i, records in enumerate(shard_records, first_set):
+                task_data = [task_to_dict(t) for t in tasks_from_records(records, sim.start_time)]
 
-        if (i + 1) % 1000 == 0:
-            print(f"  {i + 1}/{num_train} 完了")
+                filename = f"dataset/{split}/tasks_{i:04d}.json"
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(task_data, f, indent=2, default=str)
+            print(f"  {first_set + len(shard_records)}/{num_sets} 完了")
 
-    # テスト用データ生成
-    print("\nテスト用データ生成中...")
-    for i in range(num_test):
-        tasks = sim.generate_tasks()
-        task_data = [task_to_dict(t) for t in tasks]
+    print(f"\n✅ データセット生成完了")
+    if dataset_format == 'packed':
+        print(f"  学習用: dataset/train.pack ({num_train}セット)")
+        print(f"  テスト用: dataset/test.pack ({num_test}セット)")
+        print(f"  マニフェスト: dataset/manifest.json")
+    else:
+        print(f"  学習用: dataset/train/ ({num_train}ファイル)")
+        print(f"  テスト用: dataset/test/ ({num_test}ファイル)")
 
-        filename = f"dataset/test/tasks_{i:04d}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(task_data, f, indent=2, default=str)
+def pack_existing_dataset():
+    """既存のJSON形式のデータセットをパック形式に変換"""
+    start_time = TaskSchedulingSimulation().start_time
 
-        if (i + 1) % 500 == 0:
-            print(f"  {i + 1}/{num_test} 完了")
+    # JSON形式のデータは生成設定が分からないため、古いマニフェストは残さない
+    if os.path.exists(manifest_path("dataset")):
+        os.remove(manifest_path("dataset"))
+        print("⚠️ dataset/manifest.json を削除しました（変換したデータセットには生成設定の記録がありません）")
 
-    print(f"\n✅ データセット生成完了")
-    print(f"  学習用: dataset/train/ ({num_train}ファイル)")
-    print(f"  テスト用: dataset/test/ ({num_test}ファイル)")
-
-def task_to_dict(task):
-    """TaskオブジェクトをJSON化可能な辞書に変換"""
-    return {
-        'id': task.id,
-        'name': task.name,
-        'base_duration_minutes': task.base_duration_minutes,
-        'priority': task.priority.name,
-        'deadline': task.deadline.isoformat(),
-        'genre': task.genre,
-        'is_completed': task.is_completed
-    }
+    for split in ('train', 'test'):
+        num_sets = pack_json_dataset(f"dataset/{split}", f"dataset/{split}.pack", start_time)
+        print(f"✅ dataset/{split}/ → dataset/{split}.pack ({num_sets}セット)")
+
+def export_json_dataset():
+    """パック形式のデータセットをJSON形式に書き出す"""
+    for split in ('train', 'test'):
+        num_sets = export_packed_to_json(f"dataset/{split}.pack", f"dataset/{split}")
+        print(f"✅ dataset/{split}.pack → dataset/{split}/ ({num_sets}ファイル)")
 
 if __name__ == "__main__":
-    generate_dataset()
+    parser = argparse.ArgumentParser(description="タスクデータセットの生成・形式変換")
+    parser.add_argument('--format', choices=['packed', 'json'], default='packed',
+                        help="生成するデータセットの形式（デフォルト: packed）")
+    parser.add_argument('--num-train', type=int, default=None, help="学習用タスクセット数")
+    parser.add_argument('--num-test', type=int, default=None, help="テスト用タスクセット数")
+    parser.add_argument('--seed', type=int, default=None, help="シード")
+    parser.add_argument('--workers', type=int, default=None, help="ワーカープロセス数")
+    parser.add_argument('--pack-json', action='store_true',
+                        help="既存のJSON形式のデータセットをパック形式に変換する")
+    parser.add_argument('--export-json', action='store_true',
+                        help="パック形式のデータセットをJSON形式に書き出す")
+    args = parser.parse_args()
+
+    if args.pack_json:
+        pack_existing_dataset()
+    elif args.export_json:
+        export_json_dataset()
+    else:
+        generate_dataset(args.num_train, args.num_test, dataset_format=args.format,
+                         seed=args.seed, num_workers=args.workers)
@@ -0,0 +1,51 @@
+"""
+共通乱数法・対称変量法による分散削減を測定するスクリプト
+テストセットの一部で、独立な乱数・共通乱数・共通乱数 + 対称変量の3通りで全スケジューラーを実行し、
+平均とスケジューラー間の差の分散、同じ信頼度に必要な実行数の削減率を報告する
+"""
+
+import sys
+import os
+
+# プロジェクトルートを追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.evaluation.variance_reduction import measure_variance_reduction
+from src.utils.scheduler_factory import default_scheduler_specs
+from src.utils.task_loader import create_task_loader
+from config import DEFAULT_SIMULATION_CONFIG, VARIANCE_REDUCTION_CONFIG
+
+
+def main():
+    """3通りの乱数の使い方で実験し、分散削減の効果を保存する"""
+    print("=" * 60)
+    print("共通乱数法・対称変量法による分散削減の測定")
+    print("=" * 60)
+
+    config = VARIANCE_REDUCTION_CONFIG
+    test_loader = create_task_loader('test')
+    num_experiments = min(config['num_experiments'], test_loader.get_num_datasets())
+
+    report = measure_variance_reduction(
+        default_scheduler_specs(),
+        metric=config['metric'],
+        num_experiments=num_experiments,
+        task_loader=test_loader,
+        seed=config['seed'],
+        **DEFAULT_SIMULATION_CONFIG
+    )
+    test_loader.close()
+
+    os.makedirs(os.path.dirname(config['output_path']) or '.', exist_ok=True)
+    report.to_csv(config['output_path'], index=False, encoding='utf-8')
+
+    print(f"\n{num_experiments}セット、指標: {config['metric']}")
+    print(f"{'対象':<44}{'方法':<24}{'分散':>12}{'実行数':>6}{'削減率':>9}")
+    for row in report.itertuples():
+        print(f"{row.target:<44}{row.mode:<24}{row.variance:>12.1f}{row.runs_per_set:>6}{row.run_reduction:>9.1%}")
+    print(f"\n削減率: 独立な乱数と同じ信頼度に必要な実行数の削減率（負の場合は実行数が増える）")
+    print(f"✅ 保存: {config['output_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,17 +6,26 @@
 import sys
 import os
 import copy
+import json
 from datetime import datetime
 
+import pandas as pd
+
 # プロジェクトルートを追加
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.evaluation.evaluator import SchedulerEvaluator
-from src.utils.task_loader import TaskDataLoader
+from src.evaluation.coreset import load_coreset
+from src.evaluation.progress import ThroughputMonitor, append_history, format_duration
+from src.evaluation.result_cache import ResultCache
+from src.evaluation.result_sink import CsvResultSink, JsonlLogStore
+from src.evaluation.sequential import ObservingResultSink
+from src.utils.task_loader import create_task_loader, PrefetchingTaskDataLoader
 from src.environment.simulation import TaskSchedulingSimulation
-from src.utils.scheduler_factory import create_baseline_schedulers, create_rl_scheduler
+from src.utils.scheduler_factory import create_baseline_schedulers, create_rl_scheduler, default_scheduler_specs
+from src.utils.task_set_features import load_feature_table
 from src.visualization.schedule_gantt import generate_schedule_comparison
-from config import DEFAULT_SIMULATION_CONFIG, EXPERIMENT_CONFIG
+from config import DEFAULT_SIMULATION_CONFIG, EXPERIMENT_CONFIG, SEQUENTIAL_EVALUATION_CONFIG, TASK_LOADER_CONFIG
 
 
 def main():
@@ -24,33 +33,108 @@ def main():
     print("強化学習を含む本格実験を開始...")
 
     # タスクローダーを作成（テスト用）
-    test_loader = TaskDataLoader(dataset_type='test')
+    # タスクセットごとに全スケジューラーを続けて実行するので、各セットは1回だけ読み込まれる（その順に先読みする）
+    base_loader = create_task_loader('test')
+
+    # 代表コアセットがあれば、そのタスクセットを重み付きで評価する（なければテスト分割の全セット）
+    num_experiments = EXPERIMENT_CONFIG.get('num_experiments') or base_loader.get_num_datasets()
+    task_indices, weights = None, None
+    if EXPERIMENT_CONFIG.get('coreset_path'):
+        coreset = load_coreset(EXPERIMENT_CONFIG['coreset_path'], base_loader.get_dataset_info())
+        task_indices, weights = coreset['indices'], coreset['weights']
+        print(f"代表コアセットを使用: {len(task_indices)}セット "
+              f"（予備実行での最大相対誤差 {coreset['max_relative_error']:.2%}）")
+        access_order = task_indices
+    else:
+        access_order = [i % base_loader.get_num_datasets() for i in range(num_experiments)]
+    test_loader = PrefetchingTaskDataLoader(base_loader, access_order=access_order, **TASK_LOADER_CONFIG)
 
-    # 実験設定
+    # 実験結果のキャッシュ（変わっていない実験は再実行しない）
+    cache_path = EXPERIMENT_CONFIG.get('result_cache_path')
+    result_cache = ResultCache(cache_path) if cache_path else None
+
+    # 実験設定（並列数を指定しない場合はCPU数）
+    workers = EXPERIMENT_CONFIG.get('workers') or os.cpu_count() or 1
+    long_horizon = EXPERIMENT_CONFIG.get('long_horizon', False)
     evaluator = SchedulerEvaluator(
-        num_experiments=EXPERIMENT_CONFIG['num_experiments'],
+        num_experiments=num_experiments,
         task_loader=test_loader,
+        task_indices=task_indices,
+        weights=weights,
+        seed=EXPERIMENT_CONFIG.get('seed'),
+        workers=workers,
+        chunk_size=EXPERIMENT_CONFIG.get('chunk_size'),
+        group_by_task_set=EXPERIMENT_CONFIG.get('group_by_task_set', True),
+        result_cache=result_cache,
+        common_random_numbers=EXPERIMENT_CONFIG.get('common_random_numbers', False),
+        antithetic=EXPERIMENT_CONFIG.get('antithetic', False),
+        long_horizon=long_horizon,
         **DEFAULT_SIMULATION_CONFIG
     )
 
-    print("実験実行中... (強化学習含むため時間がかかります)")
-    results_df = evaluator.run_experiments()
-
-    # 結果を保存
+    # 結果の保存先
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     run_dir = f"{EXPERIMENT_CONFIG['output_dir']}/{timestamp}"
     os.makedirs(run_dir, exist_ok=True)
 
-    # CSVファイルに詳細データを保存
+    # 指標はCSVに、スケジュールのログはJSONLに1件ずつ書き出す（結果をメモリに溜めない）
     csv_path = f"{run_dir}/full_experiment_results.csv"
-    results_df.to_csv(csv_path, index=False, encoding='utf-8')
+    log_path = f"{run_dir}/simulation_logs.jsonl"
+    num_schedulers = len(default_scheduler_specs())
+    print(f"実験実行中: {evaluator.num_experiments}セット × {num_schedulers}スケジューラー"
+          f"（{workers}プロセス、{'長期間モード' if long_horizon else '通常モード'}）")
+    sequential_config = dict(SEQUENTIAL_EVALUATION_CONFIG)
+    # 書き出された結果を数えて、スループットと残り時間を表示する
+    monitor = ThroughputMonitor(evaluator.num_experiments * num_schedulers,
+                                interval=EXPERIMENT_CONFIG.get('progress_interval', 10.0))
+    with CsvResultSink(csv_path) as sink, JsonlLogStore(log_path) as log_store:
+        observed_sink = ObservingResultSink(sink, monitor.observe)
+        if sequential_config.pop('enabled'):
+            # 逐次評価: 基準のスケジューラーとの比較が全て決まった時点で止める
+            sequential = evaluator.run_sequential(observed_sink, log_store, **sequential_config)
+            sequential_path = f"{run_dir}/sequential_evaluation.csv"
+            sequential['comparisons'].to_csv(sequential_path, index=False, encoding='utf-8')
+            print(f"逐次評価: {sequential['num_sets']}/{sequential['max_sets']}セットを実行"
+                  f"（{sequential['saved_runs']}回の実行を省略）: {sequential_path}")
+        else:
+            evaluator.run_to_sink(observed_sink, log_store)
+
+    # 評価コスト（並列実行のワーカーは終了済みなので、子プロセスのCPU時間・メモリも含まれる）
+    cost = {
+        'timestamp': timestamp,
+        'num_sets': evaluator.num_experiments,
+        'num_schedulers': num_schedulers,
+        'workers': workers,
+        'long_horizon': long_horizon,
+        **monitor.summary(),
+    }
+    if result_cache is not None:
+        result_cache.close()
+    cost_path = f"{run_dir}/evaluation_cost.json"
+    with open(cost_path, 'w', encoding='utf-8') as f:
+        json.dump(cost, f, indent=2, ensure_ascii=False)
+    if EXPERIMENT_CONFIG.get('cost_history_path'):
+        append_history(EXPERIMENT_CONFIG['cost_history_path'], cost)
+    peak_rss = max(value or 0 for value in (cost['peak_rss_mb'], cost['peak_worker_rss_mb']))
+    print(f"評価コスト: 実時間 {format_duration(cost['wall_seconds'])}、CPU時間 {format_duration(cost['cpu_seconds'])}、"
+          f"{cost['episodes_per_second']:.1f} エピソード/秒、{cost['decisions_per_second']:,.0f} 判断/秒、"
+          f"最大メモリ {peak_rss:.0f}MB（キャッシュ {cost['cached_runs']}件）: {cost_path}")
     print(f"詳細データを保存: {csv_path}")
+    print(f"スケジュールのログを保存: {log_path}")
+
+    # 使用したデータセットの情報（仮想データセットの場合は生成設定のフィンガープリントを含む）
+    dataset_info_path = f"{run_dir}/dataset_info.json"
+    with open(dataset_info_path, 'w', encoding='utf-8') as f:
+        json.dump(test_loader.get_dataset_info(), f, indent=2, ensure_ascii=False)
 
-    # レポートを生成・保存
+    # レポートを生成・保存（集計に使う列だけを読み込む）
     report_path = f"{run_dir}/full_experiment_report.md"
-    report = evaluator.generate_report(results_df, save_path=report_path)
+    report = evaluator.generate_report(sink, save_path=report_path)
     print(f"レポートを保存: {report_path}")
 
+    results_df = sink.read(['scheduler_name', 'experiment_id', 'task_index', 'total_score', 'completion_rate',
+                            'deadline_compliance_rate', 'efficiency', 'weight'])
+
     # 強化学習の詳細分析
     rl_analysis_path = f"{run_dir}/rl_analysis.txt"
     with open(rl_analysis_path, 'w', encoding='utf-8') as f:
@@ -73,6 +157,18 @@ def main():
             f.write(f"効率={row['efficiency']:.3f}\n")
     
     print(f"強化学習詳細分析を保存: {rl_analysis_path}")
+
+    # タスクセットの特徴量別の平均スコア（特徴量はデータセットの版ごとに1回だけ計算）
+    features = load_feature_table(test_loader, TaskSchedulingSimulation(**DEFAULT_SIMULATION_CONFIG).start_time)
+    merged = results_df.join(features.to_dataframe().add_prefix('set_'), on='task_index')
+    with open(rl_analysis_path, 'a', encoding='utf-8') as f:
+        f.write("\n## タスクセットの特徴量別の平均スコア\n")
+        for column, label in (('deadline_tightness', '締切の厳しさ'), ('high_count', '重要度HIGHのタスク数')):
+            strata = pd.qcut(merged[f'set_{column}'].rank(method='first'), 3, labels=['低', '中', '高'])
+            table = merged.groupby([strata, 'scheduler_name'], observed=True)['total_score'].mean().unstack()
+            f.write(f"\n### {label}（3分位）\n")
+            f.write(table.to_string(float_format=lambda v: f"{v:.1f}"))
+            f.write("\n")
     
     # コンソールにサマリーを表示
     print("\n" + "="*60)
@@ -110,8 +206,9 @@ def main():
     representative_idx = (rl_data['total_score'] - median_score).abs().idxmin()
     representative_exp_id = results_df.loc[representative_idx, 'experiment_id']
 
-    task_index = int(representative_exp_id) % test_loader.get_num_datasets()
+    task_index = evaluator.get_task_index(int(representative_exp_id))
     tasks = test_loader.load_tasks(task_index)
+    test_loader.close()
 
     schedulers = create_baseline_schedulers()
     schedulers["rl_scheduler"] = create_rl_scheduler()
@@ -162,6 +259,9 @@ def main():
 
     print(f"\n✅ 実験完了！結果は以下に保存されました:")
     print(f"  - 詳細データ: {csv_path}")
+    print(f"  - スケジュールのログ: {log_path}")
+    print(f"  - データセット情報: {dataset_info_path}")
+    print(f"  - 評価コスト: {cost_path}")
     print(f"  - レポート: {report_path}")
     print(f"  - 強化学習分析: {rl_analysis_path}")
     print(f"  - ガンツチャート: {gantt_path}")
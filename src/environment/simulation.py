@@ -1,13 +1,40 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from datetime import datetime, timedelta
-import random
+import numpy as np
 import copy
 from ..models.task import Task
 from ..models.concentration import ConcentrationModel
 from ..schedulers.scheduler import Scheduler
+from .task_index import TaskIndex
+from ..utils.batch_task_generator import generate_task_records
+from ..utils.packed_dataset import tasks_from_records
 from config import TASK_GENERATION_CONFIG
 
 
+class _ArrivalFeed:
+    """到着ストリーム（(到着時刻, Task) の時刻順の反復子）から、到着済みのタスクをインデックスに渡す"""
+
+    def __init__(self, arrivals: Iterable[Tuple[datetime, Task]]):
+        self._stream = iter(arrivals)
+        self._pending = next(self._stream, None)
+        self._last_time = None
+        self.num_arrived = 0
+
+    def next_time(self) -> Optional[datetime]:
+        """次に到着するタスクの到着時刻（ストリームが終わっていればNone）"""
+        return self._pending[0] if self._pending is not None else None
+
+    def receive(self, until: datetime, index: TaskIndex):
+        """until までに到着したタスクをインデックスに追加する"""
+        while self._pending is not None and self._pending[0] <= until:
+            arrival_time, task = self._pending
+            if self._last_time is not None and arrival_time < self._last_time:
+                raise ValueError(f"到着ストリームが時刻順ではありません: {arrival_time} < {self._last_time}")
+            self._last_time = arrival_time
+            index.add(task)
+            self.num_arrived += 1
+            self._pending = next(self._stream, None)
+
 
 
 class TaskSchedulingSimulation:
@@ -17,26 +44,36 @@ class TaskSchedulingSimulation:
                  simulation_days: int = 7,
                  work_hours_per_day: int = 8,
                  num_tasks: int = None,
-                 target_total_score: int = None):
-        
+                 target_total_score: int = None,
+                 long_horizon: bool = False,
+                 rng: np.random.Generator = None):
+        """
+        Args:
+            simulation_days: シミュレーション日数
+            work_hours_per_day: 1日の作業時間
+            num_tasks: タスク数（Noneの場合は50〜100のランダム）
+            target_total_score: タスクの合計スコアの目標値
+            long_horizon: 長期間モード。タスクインデックスを使い、判断あたりのコストを
+                          タスク数に対して O(log n) に抑える（結果は通常モードと同じ）
+            rng: タスク数とタスクセットのランダム生成に使う乱数生成器（Noneの場合はOSのエントロピーから作る）
+        """
         self.simulation_days = simulation_days
         self.work_hours_per_day = work_hours_per_day
         self.work_minutes_per_day = work_hours_per_day * 60
         self.total_work_minutes = simulation_days * self.work_minutes_per_day
         
-        self.num_tasks = num_tasks or random.randint(50, 100)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.num_tasks = num_tasks or int(self.rng.integers(50, 100, endpoint=True))
         self.target_total_score = target_total_score
+        self.long_horizon = long_horizon
         
         self.start_time = datetime(2024, 1, 1, 9, 0)  # 固定開始時刻
         
     def generate_tasks(self) -> List[Task]:
         """バランスの取れたタスクセットを生成する"""
-        tasks = []
-
-        # 基本的なタスクを生成
-        for i in range(self.num_tasks):
-            task = Task.generate_random_task(i, self.start_time)
-            tasks.append(task)
+        # 全タスクの重要度・所要時間・締切・ジャンルをまとめて生成する（Task.generate_random_task と同じ分布）
+        records = generate_task_records(self.rng, 1, self.num_tasks)[0]
+        tasks = tasks_from_records(records, self.start_time)
 
         # 合計スコアを調整（指定がある場合）
         if self.target_total_score:
@@ -98,6 +135,9 @@ class TaskSchedulingSimulation:
         if hasattr(scheduler, 'set_simulation_config'):
             scheduler.set_simulation_config(self.start_time, self.simulation_days)
 
+        # 長期間モード: 全タスクの走査の代わりにインデックスで選択する
+        index = TaskIndex(tasks_copy) if self.long_horizon else None
+
         current_time = self.start_time
         current_day = 0
         current_day_work_time = 0
@@ -121,7 +161,10 @@ class TaskSchedulingSimulation:
                 remaining_time = self.work_minutes_per_day - current_day_work_time
 
                 # 次のタスクを選択
-                selected_task = scheduler.select_next_task(tasks_copy, current_time)
+                if index is not None:
+                    selected_task = scheduler.select_next_task_from_index(index, current_time)
+                else:
+                    selected_task = scheduler.select_next_task(tasks_copy, current_time)
 
                 # タスクが選択された場合、残り時間に収まるかチェック
                 if selected_task is not None:
@@ -166,6 +209,8 @@ class TaskSchedulingSimulation:
 
                     if selected_task.is_completed:
                         completed_tasks.append(selected_task)
+                        if index is not None:
+                            index.mark_completed(selected_task)
 
                     simulation_log.append({
                         'time': current_time.isoformat(),
@@ -186,6 +231,161 @@ class TaskSchedulingSimulation:
         # 結果を計算
         return self._calculate_results(tasks_copy, completed_tasks, total_work_time, total_break_time, simulation_log)
     
+    def run_simulation_with_arrivals(self, scheduler: Scheduler,
+                                     arrivals: Iterable[Tuple[datetime, Task]],
+                                     record_log: bool = False) -> Dict[str, Any]:
+        """
+        到着ストリームのタスクでシミュレーションを実行する（ストリーミングモード）
+
+        タスクは到着時刻になった時点でタスクインデックスに追加され、完了したタスクは捨てられるため、
+        メモリ使用量は未完了タスク数に比例する（到着したタスクの総数には比例しない）。
+        未完了タスクがなく、その日の作業時間内に次のタスクが到着する場合はそこまで待つ
+
+        Args:
+            scheduler: 使用するスケジューラー
+            arrivals: (到着時刻, Task) の時刻順の反復子（ジェネレーター可、期間の終わり以降は読まない）。
+                      Taskはコピーせずにそのまま完了状態を更新する
+            record_log: simulation_log と完了タスクの一覧を記録するか（Falseの場合は集計値のみ）
+
+        Returns:
+            シミュレーション結果の辞書（run_simulation_with_tasks と同じキーに加え、到着数・待ち時間など）
+        """
+        scheduler.reset()
+        if hasattr(scheduler, 'set_simulation_config'):
+            scheduler.set_simulation_config(self.start_time, self.simulation_days)
+
+        from config import TIME_MARGIN_CONFIG
+        safety_factor = TIME_MARGIN_CONFIG['safety_factor']
+
+        end_time = self.start_time + timedelta(days=self.simulation_days)
+        index = TaskIndex()
+        feed = _ArrivalFeed(arrivals)
+
+        total_score = 0
+        completed_count = 0
+        on_time_count = 0
+        deadline_compliant_count = 0
+        max_backlog = 0
+        total_work_time = 0
+        total_break_time = 0
+        total_idle_time = 0
+        completed_log = []
+        simulation_log = []
+
+        for current_day in range(self.simulation_days):
+            day_start_time = self.start_time + timedelta(days=current_day)
+            day_end_time = day_start_time + timedelta(minutes=self.work_minutes_per_day)
+            current_time = day_start_time
+            current_day_work_time = 0
+
+            # 朝は集中力をリセット（新しい1日）
+            scheduler.concentration_model.reset()
+
+            while current_day_work_time < self.work_minutes_per_day:
+                feed.receive(current_time, index)
+                max_backlog = max(max_backlog, len(index))
+
+                remaining_time = self.work_minutes_per_day - current_day_work_time
+                selected_task = scheduler.select_next_task_from_index(index, current_time)
+
+                # 残り時間に収まるかチェック（run_simulation_with_tasks と同じ見積もり）
+                if selected_task is not None:
+                    efficiency = scheduler.concentration_model.get_efficiency_multiplier()
+                    estimated_duration = selected_task.base_duration_minutes / max(efficiency, 1.0)
+                    if estimated_duration > remaining_time * safety_factor:
+                        selected_task = None
+
+                if selected_task is None:
+                    if scheduler.should_take_break():
+                        break_duration = scheduler.take_break()
+                        total_break_time += break_duration
+                        current_time += timedelta(minutes=break_duration)
+                        current_day_work_time += break_duration
+
+                        if record_log:
+                            simulation_log.append({
+                                'time': current_time.isoformat(),
+                                'action': 'break',
+                                'duration': break_duration
+                            })
+                        continue
+
+                    # 未完了タスクがなく、今日の作業時間内に次のタスクが到着する場合は待つ
+                    next_arrival = feed.next_time()
+                    if len(index) == 0 and next_arrival is not None and next_arrival < day_end_time:
+                        idle_minutes = (next_arrival - current_time) / timedelta(minutes=1)
+                        total_idle_time += idle_minutes
+                        current_time = next_arrival
+                        current_day_work_time += idle_minutes
+
+                        if record_log:
+                            simulation_log.append({
+                                'time': current_time.isoformat(),
+                                'action': 'idle',
+                                'duration': idle_minutes
+                            })
+                        continue
+
+                    # 作業可能なタスクがない
+                    break
+
+                # タスクを実行
+                work_duration = scheduler.work_on_task(selected_task)
+                total_work_time += work_duration
+                current_time += timedelta(minutes=work_duration)
+                current_day_work_time += work_duration
+
+                if selected_task.is_completed:
+                    index.mark_completed(selected_task)
+                    completed_count += 1
+                    total_score += selected_task.get_score()
+                    on_time_count += current_time <= selected_task.deadline
+                    deadline_compliant_count += selected_task.deadline <= end_time
+                    if record_log:
+                        completed_log.append({'id': selected_task.id, 'score': selected_task.get_score(),
+                                              'priority': selected_task.priority.name})
+
+                if record_log:
+                    simulation_log.append({
+                        'time': current_time.isoformat(),
+                        'action': 'work',
+                        'task_id': selected_task.id,
+                        'duration': work_duration,
+                        'base_duration': selected_task.base_duration_minutes,
+                        'completed': selected_task.is_completed,
+                        'concentration': scheduler.concentration_model.current_level
+                    })
+
+        # 期間の終わりまでに到着したタスクを反映してから集計する
+        feed.receive(end_time, index)
+        incomplete_tasks = index.incomplete_tasks()
+        num_arrived = feed.num_arrived
+        busy_time = total_work_time + total_break_time
+
+        return {
+            'total_score': total_score,
+            'completed_tasks_count': completed_count,
+            'incomplete_tasks_count': len(incomplete_tasks),
+            'overdue_tasks_count': sum(1 for task in incomplete_tasks if task.is_overdue(end_time)),
+            'completion_rate': completed_count / num_arrived if num_arrived else 0,
+            'deadline_compliance_rate': deadline_compliant_count / num_arrived if num_arrived else 0,
+            'total_work_time': total_work_time,
+            'total_break_time': total_break_time,
+            'efficiency': total_work_time / busy_time if busy_time > 0 else 0,
+            'arrived_tasks_count': num_arrived,
+            'on_time_completed_count': on_time_count,
+            'total_idle_time': total_idle_time,
+            'max_backlog': max_backlog,
+            'tasks': {
+                'total': num_arrived,
+                'completed': completed_log,
+                'incomplete': [{'id': t.id, 'score': t.get_score(), 'priority': t.priority.name,
+                                'deadline': t.deadline.isoformat(), 'is_overdue': t.is_overdue(end_time)}
+                               for t in incomplete_tasks]
+            },
+            'simulation_log': simulation_log
+        }
+
     def run_replay(self, planned_log: List[Dict], tasks: List[Task]) -> Dict[str, Any]:
         """
         Planned のタスク順番を固定して、隠しパラメータ付きで再実行する。
@@ -318,6 +518,7 @@ class TaskSchedulingSimulation:
             'total_work_time': total_work_time,
             'total_break_time': total_break_time,
             'efficiency': total_work_time / (total_work_time + total_break_time) if (total_work_time + total_break_time) > 0 else 0,
+            'num_decisions': len(simulation_log),  # 作業・休憩の判断の回数
             'tasks': {
                 'total': len(all_tasks),
                 'completed': [{'id': t.id, 'score': t.get_score(), 'priority': t.priority.name} for t in completed_tasks],
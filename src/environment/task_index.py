@@ -0,0 +1,343 @@
+"""
+長期間シミュレーション用のタスクインデックス
+数千〜数万タスクを1年分スケジュールする場合、判断のたびに全タスクを走査すると
+1エピソードが O(n²) になる。タスクの属性は変わらず、時刻は進む一方（締切に間に合わなくなった
+タスクは戻らない）なので、重要度ごとのヒープ（遅延削除）とカウンタだけで判断あたり O(log n) にできる
+
+タスクは途中で追加でき（到着ストリーム）、完了したタスクはスロットの詰め直しで捨てるため、
+メモリ使用量は未完了タスクの数に比例する
+
+選択結果はタスクのリストを走査する場合（TaskSelector._get_ready_tasks + ソート / max / min）と
+同じになるよう、同順位はリスト内の位置（追加順）が小さいものを選ぶ
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from ..models.task import Task
+
+
+# 重要度の値（高い順）
+PRIORITY_VALUES = (3, 2, 1)
+
+# 使われていないスロットがこの数を超え、かつ未完了タスク数を超えたら詰め直す
+_COMPACT_MIN_FREE_SLOTS = 64
+
+
+class _Fenwick:
+    """メンバーのスロットの個数を数えるFenwick木（k番目のメンバーを O(log n) で求める）"""
+
+    def __init__(self, member: bytearray, capacity: int):
+        self.size = capacity
+        tree = [0] * (capacity + 1)
+        for i, flag in enumerate(member, 1):
+            tree[i] += flag
+            parent = i + (i & -i)
+            if parent <= capacity:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.top_bit = 1 << (capacity.bit_length() - 1) if capacity else 0
+
+    def add(self, pos: int, delta: int):
+        i = pos + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def kth(self, k: int) -> int:
+        """k番目（0始まり）のメンバーのスロット"""
+        pos = 0
+        bit = self.top_bit
+        while bit:
+            nxt = pos + bit
+            if nxt <= self.size and self.tree[nxt] <= k:
+                pos = nxt
+                k -= self.tree[nxt]
+            bit >>= 1
+        return pos
+
+
+class TaskSubset:
+    """
+    タスクの部分集合（未完了のタスク、または締切に間に合う未完了のタスク）
+    件数・重要度ごとの件数・所要時間の合計と、各順序での先頭のタスクを返す
+    """
+
+    def __init__(self, index: 'TaskIndex'):
+        self._index = index
+        self._member = bytearray()
+        self.count = 0
+        self.class_counts = {p: 0 for p in PRIORITY_VALUES}
+        self.duration_sum = 0
+
+        # 重要度ごとのヒープ: 締切順 / スコアの高い順 / 所要時間の短い順 / スロット順
+        self._by_deadline = {p: [] for p in PRIORITY_VALUES}
+        self._by_score = {p: [] for p in PRIORITY_VALUES}
+        self._by_duration = {p: [] for p in PRIORITY_VALUES}
+        self._by_position = {p: [] for p in PRIORITY_VALUES}
+
+        # 締切が間近（締切までの日数が閾値以下）かをまだ確認していないタスク（締切順）と、
+        # 間近になったタスクのスロットのヒープ（重要度ごと）
+        self._not_urgent = {p: [] for p in PRIORITY_VALUES}
+        self._urgent = {p: [] for p in PRIORITY_VALUES}
+
+        self._fenwick = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, task: Task) -> bool:
+        slot = self._index._slots.get(id(task))
+        return slot is not None and bool(self._member[slot])
+
+    @property
+    def high_count(self) -> int:
+        return self.class_counts[3]
+
+    def _entries(self, slot: int):
+        index = self._index
+        deadline = index.deadlines[slot]
+        return (
+            (self._by_deadline, (deadline, slot)),
+            (self._by_score, (-index.scores[slot], slot)),
+            (self._by_duration, (index.durations[slot], slot)),
+            (self._by_position, slot),
+            (self._not_urgent, (deadline, slot)),
+        )
+
+    def _add(self, slot: int):
+        """スロットをメンバーに加える（スロットは追加順に増える）"""
+        index = self._index
+        while len(self._member) <= slot:
+            self._member.append(0)
+        self._member[slot] = 1
+        priority = index.priorities[slot]
+        self.count += 1
+        self.class_counts[priority] += 1
+        self.duration_sum += index.durations[slot]
+        for heaps, entry in self._entries(slot):
+            heapq.heappush(heaps[priority], entry)
+
+        if self._fenwick is not None:
+            if slot >= self._fenwick.size:
+                self._fenwick = _Fenwick(self._member, max(2 * self._fenwick.size, slot + 1))
+            else:
+                self._fenwick.add(slot, 1)
+
+    def _remove(self, slot: int):
+        """スロットをメンバーから外す（ヒープからは先頭に来た時に遅延削除）"""
+        self._member[slot] = 0
+        self.count -= 1
+        self.class_counts[self._index.priorities[slot]] -= 1
+        self.duration_sum -= self._index.durations[slot]
+        if self._fenwick is not None:
+            self._fenwick.add(slot, -1)
+
+    def _rebuild(self, member: bytearray):
+        """スロットの詰め直し後に、メンバーからヒープを作り直す"""
+        index = self._index
+        self._member = member
+        for heaps in (self._by_deadline, self._by_score, self._by_duration, self._by_position,
+                      self._not_urgent, self._urgent):
+            for p in PRIORITY_VALUES:
+                heaps[p] = []
+        for slot, flag in enumerate(member):
+            if flag:
+                for heaps, entry in self._entries(slot):
+                    heaps[index.priorities[slot]].append(entry)
+        for heaps in (self._by_deadline, self._by_score, self._by_duration, self._by_position, self._not_urgent):
+            for p in PRIORITY_VALUES:
+                heapq.heapify(heaps[p])
+        self._fenwick = None
+
+    def _first(self, heap: list) -> int:
+        """ヒープの先頭のメンバーのスロット（いなければ-1）"""
+        member = self._member
+        while heap:
+            top = heap[0]
+            slot = top if isinstance(top, int) else top[-1]
+            if member[slot]:
+                return slot
+            heapq.heappop(heap)
+        return -1
+
+    def _task(self, slot: int) -> Optional[Task]:
+        return self._index.tasks[slot] if slot >= 0 else None
+
+    def _min_over_classes(self, heaps) -> Optional[Task]:
+        """重要度ごとの先頭のうち、ヒープのキーが最小のタスク"""
+        best = None
+        for p in PRIORITY_VALUES:
+            if self._first(heaps[p]) >= 0 and (best is None or heaps[p][0] < best):
+                best = heaps[p][0]
+        return self._task(best[-1] if best is not None else -1)
+
+    def earliest_deadline(self) -> Optional[Task]:
+        """締切が最も早いタスク"""
+        return self._min_over_classes(self._by_deadline)
+
+    def highest_priority(self) -> Optional[Task]:
+        """重要度が最も高く、その中で締切が最も早いタスク"""
+        for p in PRIORITY_VALUES:
+            slot = self._first(self._by_deadline[p])
+            if slot >= 0:
+                return self._index.tasks[slot]
+        return None
+
+    def shortest(self) -> Optional[Task]:
+        """所要時間が最も短いタスク"""
+        return self._min_over_classes(self._by_duration)
+
+    def highest_score(self) -> Optional[Task]:
+        """スコアが最も高いタスク"""
+        return self._min_over_classes(self._by_score)
+
+    def earliest_deadline_in_class(self, priority: int) -> Optional[Task]:
+        return self._task(self._first(self._by_deadline[priority]))
+
+    def highest_score_in_class(self, priority: int) -> Optional[Task]:
+        return self._task(self._first(self._by_score[priority]))
+
+    def first_in_class(self, priority: int) -> Optional[Task]:
+        """重要度が priority のタスクのうち、リスト内で最初のもの"""
+        return self._task(self._first(self._by_position[priority]))
+
+    def urgent_first_in_class(self, priority: int, current_time: datetime,
+                              seconds_per_day: float, max_days: float) -> Optional[Task]:
+        """
+        締切までの日数が max_days 以下のタスク（重要度が priority）のうち、リスト内で最初のもの
+        時刻は進む一方なので、対象になったタスクは対象のまま（完了・除外されたものは遅延削除）
+        """
+        not_urgent = self._not_urgent[priority]
+        urgent = self._urgent[priority]
+        while self._first(not_urgent) >= 0 and \
+                (not_urgent[0][0] - current_time).total_seconds() / seconds_per_day <= max_days:
+            heapq.heappush(urgent, heapq.heappop(not_urgent)[1])
+        return self._task(self._first(urgent))
+
+    def kth(self, k: int) -> Task:
+        """リスト内の順で k 番目（0始まり）のタスク"""
+        if not 0 <= k < self.count:
+            raise IndexError(f"インデックスが範囲外です: {k} (件数: {self.count})")
+        if self._fenwick is None:
+            self._fenwick = _Fenwick(self._member, len(self._member))
+        return self._index.tasks[self._fenwick.kth(k)]
+
+
+class TaskIndex:
+    """
+    タスクのリストに対するインデックス（1エピソード分）
+
+    タスクの所要時間・重要度・締切は変わらないこと、問い合わせの時刻が単調に増加することを前提とする。
+    タスクを完了させたら mark_completed を呼ぶ。到着したタスクは add で追加できる
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self.tasks: List[Optional[Task]] = []
+        self._slots = {}
+
+        self.priorities: List[int] = []
+        self.durations: List[int] = []
+        self.deadlines: List[datetime] = []
+        self.scores: List[int] = []
+        self._latest_starts: List[datetime] = []
+
+        self.incomplete = TaskSubset(self)
+        self.feasible = TaskSubset(self)
+
+        # 締切に間に合わなくなる時刻（最遅開始時刻）のヒープ
+        self._expiry = []
+        self._last_time = None
+
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        """未完了タスク数"""
+        return self.incomplete.count
+
+    def incomplete_tasks(self) -> List[Task]:
+        """未完了タスク（追加順）"""
+        return [self.tasks[slot] for slot, flag in enumerate(self.incomplete._member) if flag]
+
+    def position(self, task: Task) -> int:
+        """タスクのスロット（追加順。詰め直し後も順序は保たれる）"""
+        try:
+            return self._slots[id(task)]
+        except KeyError:
+            raise ValueError(f"インデックスにないタスクです: {task.name}") from None
+
+    def add(self, task: Task):
+        """タスクを追加する（完了済みのタスクは無視する）"""
+        if task.is_completed:
+            return
+        if id(task) in self._slots:
+            raise ValueError(f"既に追加されたタスクです: {task.name}")
+
+        slot = len(self.tasks)
+        self.tasks.append(task)
+        self._slots[id(task)] = slot
+        self.priorities.append(task.priority.value)
+        self.durations.append(task.base_duration_minutes)
+        self.deadlines.append(task.deadline)
+        self.scores.append(task.get_score())
+        latest_start = task.deadline - timedelta(minutes=task.base_duration_minutes)
+        self._latest_starts.append(latest_start)
+
+        self.incomplete._add(slot)
+        self.feasible._add(slot)
+        heapq.heappush(self._expiry, (latest_start, slot))
+
+    def mark_completed(self, task: Task):
+        """タスクの完了をインデックスに反映する"""
+        slot = self.position(task)
+        for subset in (self.incomplete, self.feasible):
+            if subset._member[slot]:
+                subset._remove(slot)
+
+        # 完了したタスクのスロットが溜まったら詰め直す（メモリを未完了タスク数に比例させる）
+        free_slots = len(self.tasks) - self.incomplete.count
+        if free_slots > _COMPACT_MIN_FREE_SLOTS and free_slots > self.incomplete.count:
+            self._compact()
+
+    def _compact(self):
+        """未完了タスクだけを追加順のまま詰め直し、ヒープを作り直す"""
+        live = [slot for slot, flag in enumerate(self.incomplete._member) if flag]
+        feasible_member = self.feasible._member
+
+        self.tasks = [self.tasks[slot] for slot in live]
+        self._slots = {id(task): slot for slot, task in enumerate(self.tasks)}
+        self.priorities = [self.priorities[slot] for slot in live]
+        self.durations = [self.durations[slot] for slot in live]
+        self.deadlines = [self.deadlines[slot] for slot in live]
+        self.scores = [self.scores[slot] for slot in live]
+        self._latest_starts = [self._latest_starts[slot] for slot in live]
+
+        new_feasible = bytearray(feasible_member[slot] for slot in live)
+        self.incomplete._rebuild(bytearray(b'\x01' * len(live)))
+        self.feasible._rebuild(new_feasible)
+        self._expiry = [(self._latest_starts[slot], slot) for slot, flag in enumerate(new_feasible) if flag]
+        heapq.heapify(self._expiry)
+
+    def advance(self, current_time: datetime):
+        """時刻を進め、締切に間に合わなくなったタスクを feasible から外す"""
+        if self._last_time is not None and current_time < self._last_time:
+            raise ValueError(f"時刻を戻すことはできません: {current_time} < {self._last_time}")
+        self._last_time = current_time
+
+        expiry = self._expiry
+        while expiry and expiry[0][0] < current_time:
+            _, slot = heapq.heappop(expiry)
+            if self.feasible._member[slot]:
+                self.feasible._remove(slot)
+
+    def get_ready(self, current_time: datetime) -> Optional[TaskSubset]:
+        """
+        TaskSelector._get_ready_tasks に相当する部分集合
+        締切に間に合う未完了タスクがあればそれ、なければ未完了タスク全体、未完了タスクがなければNone
+        """
+        self.advance(current_time)
+        if self.incomplete.count == 0:
+            return None
+        return self.feasible if self.feasible.count else self.incomplete
@@ -0,0 +1,215 @@
+"""
+テスト用タスクセットの代表コアセット
+タスクセットの特徴量と高速なベースラインの予備実行スコアでクラスタリングし、
+各クラスタの代表セットをクラスタの大きさで重み付けして、全体の平均とスケジューラーの順位を再現する
+"""
+
+import json
+import os
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..environment.simulation import TaskSchedulingSimulation
+from ..utils.rng import DecisionStream, experiment_seed_sequence
+
+
+# クラスタリングに使う特徴量の列（TaskSetFeatureTable）
+CORESET_FEATURE_COLUMNS = (
+    'total_score',
+    'high_count',
+    'deadline_tightness',
+    'deadline_min',
+    'duration_median',
+    'genre_entropy',
+)
+
+
+def run_pilot(task_loader, schedulers: Dict, simulation_config: Dict,
+              metric: str = 'total_score', seed: int = 0, verbose: bool = True) -> pd.DataFrame:
+    """
+    全タスクセットでスケジューラーを1回ずつ実行する（予備実行）
+    確率的なスケジューラーには (シード, タスクセット, スケジューラー) の乱数列を渡す（評価器と同じ導出）ため、
+    予備実行の結果と、それから作るコアセットは再現できる
+
+    Args:
+        seed: 判断ごとの乱数列のシード
+
+    Returns:
+        行 = タスクセットのインデックス、列 = スケジューラー名 の指標のDataFrame
+    """
+    simulation = TaskSchedulingSimulation(**simulation_config)
+    num_sets = task_loader.get_num_datasets()
+    scores = {name: np.zeros(num_sets) for name in schedulers}
+
+    for index in range(num_sets):
+        tasks = task_loader.load_tasks(index)
+        for name, scheduler in schedulers.items():
+            episode = scheduler.for_episode()
+            episode.set_random_stream(DecisionStream(experiment_seed_sequence(seed, index, name)))
+            scores[name][index] = simulation.run_simulation_with_tasks(episode, tasks)[metric]
+        if verbose and (index + 1) % 200 == 0:
+            print(f"  予備実行: {index + 1}/{num_sets}")
+
+    df = pd.DataFrame(scores)
+    df.index.name = 'task_index'
+    return df
+
+
+def _standardize(matrix: np.ndarray) -> np.ndarray:
+    std = matrix.std(axis=0)
+    std[std == 0] = 1.0
+    return (matrix - matrix.mean(axis=0)) / std
+
+
+def _kmeans(points: np.ndarray, k: int, rng: np.random.Generator, num_iterations: int = 50) -> np.ndarray:
+    """k-means++ 初期化のk-means（各点のクラスタ番号を返す）"""
+    n = len(points)
+    centers = [points[rng.integers(n)]]
+    distances = np.sum((points - centers[0]) ** 2, axis=1)
+    for _ in range(1, k):
+        probabilities = distances / distances.sum() if distances.sum() > 0 else np.full(n, 1.0 / n)
+        centers.append(points[rng.choice(n, p=probabilities)])
+        distances = np.minimum(distances, np.sum((points - centers[-1]) ** 2, axis=1))
+    centers = np.array(centers)
+
+    labels = np.zeros(n, dtype=np.int64)
+    for iteration in range(num_iterations):
+        # (点, 中心) の距離 = |p|^2 - 2 p・c + |c|^2
+        squared = (np.sum(points ** 2, axis=1)[:, None] - 2 * points @ centers.T
+                   + np.sum(centers ** 2, axis=1)[None, :])
+        new_labels = np.argmin(squared, axis=1)
+        if iteration > 0 and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for cluster in range(k):
+            members = points[labels == cluster]
+            if len(members):
+                centers[cluster] = members.mean(axis=0)
+    return labels
+
+
+def build_coreset(features: pd.DataFrame, pilot: pd.DataFrame, size: int,
+                  pilot_weight: float = 2.0, seed: int = 0) -> Dict:
+    """
+    特徴量と予備実行スコアから重み付きコアセットを作る
+
+    Args:
+        features: タスクセットの特徴量（行 = タスクセット）
+        pilot: 予備実行のスコア（行 = タスクセット、列 = スケジューラー）
+        size: コアセットの大きさ（クラスタ数）
+        pilot_weight: 標準化した予備実行スコアに掛ける重み（特徴量より重視する）
+        seed: 乱数シード
+
+    Returns:
+        'indices'（タスクセットのインデックス）と 'weights'（合計1）
+    """
+    num_sets = len(pilot)
+    if not 1 <= size <= num_sets:
+        raise ValueError(f"sizeは1以上{num_sets}以下である必要があります: {size}")
+
+    points = np.hstack([
+        _standardize(features.to_numpy(dtype=float)),
+        pilot_weight * _standardize(pilot.to_numpy(dtype=float)),
+    ])
+    labels = _kmeans(points, size, np.random.default_rng(seed))
+
+    # 各クラスタの重心に最も近いタスクセットを代表にし、クラスタの大きさで重み付けする
+    indices, weights = [], []
+    for cluster in np.unique(labels):
+        members = np.flatnonzero(labels == cluster)
+        centroid = points[members].mean(axis=0)
+        representative = members[np.argmin(np.sum((points[members] - centroid) ** 2, axis=1))]
+        indices.append(int(pilot.index[representative]))
+        weights.append(len(members) / num_sets)
+
+    order = np.argsort(indices)
+    return {
+        'indices': [indices[i] for i in order],
+        'weights': [weights[i] for i in order],
+    }
+
+
+def coreset_error(pilot: pd.DataFrame, indices: Sequence[int], weights: Sequence[float]) -> Dict:
+    """
+    予備実行のスコアで、コアセットの重み付き平均が全体の平均をどれだけ再現するかを評価する
+
+    Returns:
+        スケジューラーごとの平均と相対誤差、最大相対誤差、順位が一致するか
+    """
+    full_means = pilot.mean()
+    coreset_means = pd.Series(np.average(pilot.loc[list(indices)].to_numpy(dtype=float), axis=0,
+                                         weights=np.asarray(weights, dtype=float)),
+                              index=pilot.columns)
+    relative_errors = (coreset_means - full_means).abs() / full_means.abs().where(full_means != 0, 1.0)
+
+    return {
+        'full_means': full_means.to_dict(),
+        'coreset_means': coreset_means.to_dict(),
+        'relative_errors': relative_errors.to_dict(),
+        'max_relative_error': float(relative_errors.max()),
+        'ranking_preserved': list(full_means.sort_values(ascending=False).index)
+                             == list(coreset_means.sort_values(ascending=False).index),
+    }
+
+
+def select_coreset(features: pd.DataFrame, pilot: pd.DataFrame, clustering_columns: List[str],
+                   initial_size: int, max_size: int, tolerance: float,
+                   pilot_weight: float = 2.0, seed: int = 0) -> Dict:
+    """
+    誤差が許容範囲に収まり順位が保たれるまで、コアセットを大きくしながら作る
+
+    予備実行の列のうち clustering_columns に含まれないものはクラスタリングに使わず、
+    誤差の確認だけに使う（コアセットが学習に使っていないスケジューラーにも通用するかの確認）
+
+    Args:
+        features: タスクセットの特徴量
+        pilot: 予備実行のスコア
+        clustering_columns: クラスタリングに使う予備実行の列
+        initial_size: 最初のコアセットの大きさ
+        max_size: コアセットの大きさの上限
+        tolerance: 許容する最大相対誤差
+        pilot_weight: 予備実行スコアの重み
+        seed: 乱数シード
+
+    Returns:
+        'indices', 'weights', 'size', 'tolerance', 'achieved'（許容範囲に収まったか）と誤差レポート
+    """
+    size = min(initial_size, max_size, len(pilot))
+    while True:
+        coreset = build_coreset(features, pilot[clustering_columns], size, pilot_weight, seed)
+        report = coreset_error(pilot, coreset['indices'], coreset['weights'])
+        achieved = report['max_relative_error'] <= tolerance and report['ranking_preserved']
+        if achieved or size >= min(max_size, len(pilot)):
+            return dict(coreset, size=len(coreset['indices']), tolerance=tolerance, achieved=achieved, **report)
+        size = min(size * 2, max_size, len(pilot))
+
+
+def save_coreset(coreset: Dict, filepath: str, dataset_info: Dict = None):
+    """コアセットをJSONで保存"""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(dict(coreset, dataset_info=dataset_info), f, indent=2, ensure_ascii=False)
+
+
+def load_coreset(filepath: str, dataset_info: Dict = None) -> Dict:
+    """
+    コアセットを読み込む
+
+    Raises:
+        ValueError: dataset_info を渡し、コアセットを作ったデータセットと一致しない場合
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"コアセットファイルが見つかりません: {filepath}")
+    with open(filepath, 'r', encoding='utf-8') as f:
+        coreset = json.load(f)
+
+    saved_info = coreset.get('dataset_info')
+    if dataset_info is not None and saved_info is not None:
+        keys = ('split', 'num_sets', 'generator_fingerprint', 'seed')
+        if any(saved_info.get(key) != dataset_info.get(key) for key in keys):
+            raise ValueError(f"コアセットを作ったデータセットと現在のデータセットが異なります: {filepath}")
+    return coreset
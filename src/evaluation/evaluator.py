@@ -1,9 +1,16 @@
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
 import numpy as np
 import pandas as pd
 from ..environment.simulation import TaskSchedulingSimulation
-from ..utils.scheduler_factory import create_baseline_schedulers, create_rl_scheduler
+from ..utils.scheduler_factory import create_schedulers_from_specs, default_scheduler_specs
+from ..utils.task_loader import task_loader_spec
+from ..utils.rng import DecisionStream, experiment_generator, experiment_seed_sequence
 from ..schedulers.scheduler import Scheduler
+from .result_sink import JsonlLogStore, MemoryResultSink, ResultSink, split_result
+from .sequential import ObservingResultSink, SequentialComparison
+from .resampling import METRIC_COLUMNS, resampling_analysis
+from .result_cache import (DETERMINISTIC_SCHEDULERS, ResultCache, scheduler_fingerprint, simulation_fingerprint,
+                           task_set_hash)
 
 
 class SchedulerEvaluator:
@@ -14,118 +21,520 @@ class SchedulerEvaluator:
                  simulation_days: int = 7,
                  work_hours_per_day: int = 8,
                  num_tasks: int = None,
-                 task_loader = None):
+                 task_loader = None,
+                 task_indices: List[int] = None,
+                 weights: List[float] = None,
+                 seed: int = None,
+                 workers: int = 1,
+                 chunk_size: int = None,
+                 group_by_task_set: bool = True,
+                 result_cache: ResultCache = None,
+                 common_random_numbers: bool = False,
+                 antithetic: bool = False,
+                 long_horizon: bool = False):
+        """
+        Args:
+            num_experiments: 実験回数（task_indices を指定した場合はその長さ）
+            simulation_days: シミュレーション日数
+            work_hours_per_day: 1日の作業時間
+            num_tasks: タスク数（ランダム生成の場合）
+            task_loader: 事前生成されたタスクのローダー
+            task_indices: 評価に使うタスクセットのインデックス（コアセットなど）
+            weights: 各タスクセットの重み（指定すると平均・標準偏差を重み付きで計算する）
+            seed: 実験ごとの乱数列を導出するシード（src/utils/rng.py、Noneの場合はOSのエントロピーを使う）。
+                  指定すると結果は実行順・並列数・キャッシュの有無に依存しない
+            workers: 並列実行するプロセス数（1の場合は直列）
+            chunk_size: 並列実行で1回に送る作業単位の数（Noneの場合は自動）
+            group_by_task_set: タスクセットを1回だけ読み込み、全スケジューラーを続けて実行するか
+                               （並列実行では1つのタスクセットの実行を同じプロセスにまとめる）
+            result_cache: 実験結果のキャッシュ（スケジューラーを設定で渡し、タスクローダーを使う場合のみ有効）。
+                          同じ入力の実験はシミュレーションせずに保存済みの指標を使う
+            common_random_numbers: 確率的なスケジューラーに (シード, 実験回) で決まる判断ごとの乱数列を渡すか
+                                   （共通乱数法: 全スケジューラーの k 回目の判断に同じ乱数を使う）
+            antithetic: 確率的なスケジューラーを乱数 u と 1 - u で2回実行し、指標を平均するか
+                        （対称変量法、common_random_numbers が必要）
+            long_horizon: タスクインデックスで選択するシミュレーション（長期間モード）を使うか
+                          （結果は通常モードと同じで、60タスク程度でも速い）
+        """
+        if antithetic and not common_random_numbers:
+            raise ValueError("antitheticにはcommon_random_numbersが必要です")
+        if weights is not None and (task_indices is None or len(weights) != len(task_indices)):
+            raise ValueError("weightsはtask_indicesと同じ長さで指定してください")
 
-        self.num_experiments = num_experiments
+        self.num_experiments = len(task_indices) if task_indices is not None else num_experiments
         self.simulation_days = simulation_days
         self.work_hours_per_day = work_hours_per_day
         self.num_tasks = num_tasks
         self.task_loader = task_loader
+        self.task_indices = list(task_indices) if task_indices is not None else None
+        self.weights = list(weights) if weights is not None else None
+        self.seed = seed
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.group_by_task_set = group_by_task_set
+        self.result_cache = result_cache
+        self._cache_keys = None
+        self._pool = None
+        self.common_random_numbers = common_random_numbers
+        self.antithetic = antithetic
+        self.long_horizon = long_horizon
     
     
-    def run_experiments(self, schedulers: Dict[str, Scheduler] = None) -> pd.DataFrame:
+    def run_experiments(self, schedulers: Dict[str, Scheduler] = None,
+                        scheduler_specs: Dict[str, Dict] = None) -> pd.DataFrame:
         """
         複数のスケジューラーで実験を実行し、結果を比較する
 
         Args:
-            schedulers: 評価するスケジューラーの辞書。Noneの場合はベースラインを使用
+            schedulers: 評価するスケジューラーの辞書。Noneの場合は scheduler_specs から作成
+            scheduler_specs: スケジューラーの設定（create_schedulers_from_specs 形式）。
+                             Noneの場合はベースライン + 強化学習。並列実行ではこちらを使う
 
         Returns:
-            実験結果のDataFrame
+            実験結果の指標のDataFrame（スケジューラー順 → 実験回順。simulation_log などのログは含まない、
+            ログが必要な場合は run_to_sink に log_store を渡す）
         """
+        sink = MemoryResultSink()
+        scheduler_names = self.run_to_sink(sink, schedulers=schedulers, scheduler_specs=scheduler_specs)
+        return self._sort_results(sink.read(), scheduler_names)
+
+    def run_to_sink(self, sink: ResultSink, log_store: JsonlLogStore = None,
+                    schedulers: Dict[str, Scheduler] = None,
+                    scheduler_specs: Dict[str, Dict] = None,
+                    experiment_ids: Sequence[int] = None) -> List[str]:
+        """
+        実験を実行し、1件ずつ sink（指標）と log_store（ログ）に書き出す
+        結果をメモリに溜めないため、実験回数が多くてもメモリ使用量は一定
+
+        Args:
+            sink: 指標の書き出し先
+            log_store: ログの書き出し先（Noneの場合はログを捨てる）
+            schedulers: 評価するスケジューラーの辞書。Noneの場合は scheduler_specs から作成
+            scheduler_specs: スケジューラーの設定（並列実行ではこちらを使う）
+            experiment_ids: 実行する実験回（Noneの場合は全実験回）
+
+        Returns:
+            スケジューラー名のリスト
+        """
+        experiment_ids = range(self.num_experiments) if experiment_ids is None else experiment_ids
+        if self.workers > 1 and schedulers is not None and scheduler_specs is None:
+            raise ValueError("並列実行ではスケジューラーの代わりにscheduler_specsを指定してください")
         if schedulers is None:
-            # ベースラインスケジューラーを作成
-            schedulers = create_baseline_schedulers()
-            # 強化学習スケジューラーを追加
-            schedulers["rl_scheduler"] = create_rl_scheduler()
-        
-        results = []
-        
-        for scheduler_name, scheduler in schedulers.items():
-            print(f"実験中: {scheduler_name}")
-            scheduler_results = self._run_single_scheduler_experiments(scheduler_name, scheduler)
-            results.extend(scheduler_results)
-        
-        return pd.DataFrame(results)
-    
-    def _run_single_scheduler_experiments(self, scheduler_name: str, scheduler: Scheduler) -> List[Dict]:
-        """単一スケジューラーで複数回実験を実行"""
-        results = []
-
-        for experiment_id in range(self.num_experiments):
-            # シミュレーション環境を作成
-            simulation = TaskSchedulingSimulation(
-                simulation_days=self.simulation_days,
-                work_hours_per_day=self.work_hours_per_day,
-                num_tasks=self.num_tasks
-            )
-
-            # タスクを取得
-            if self.task_loader:
-                # 事前生成されたデータを使用
-                task_index = experiment_id % self.task_loader.get_num_datasets()
-                tasks = self.task_loader.load_tasks(task_index)
-                result = simulation.run_simulation_with_tasks(scheduler, tasks)
+            scheduler_specs = scheduler_specs or default_scheduler_specs()
+        names = list(scheduler_specs) if schedulers is None else list(schedulers)
+        self._setup_cache(scheduler_specs if schedulers is None else None)
+
+        try:
+            if self.workers > 1:
+                if self.group_by_task_set:
+                    units = [(tuple(pending), experiment_id) for experiment_id in experiment_ids
+                             for pending in [self._write_cached(names, experiment_id, sink)] if pending]
+                else:
+                    units = [((name,), experiment_id) for name in names for experiment_id in experiment_ids
+                             if self._write_cached([name], experiment_id, sink)]
+                for result in self._iter_parallel(scheduler_specs, units, keep_logs=log_store is not None):
+                    self._write_result(result, sink, log_store)
+                return names
+
+            if schedulers is None:
+                schedulers = create_schedulers_from_specs(scheduler_specs)
+
+            if self.group_by_task_set:
+                # タスクセットごとに1回だけ読み込み、全スケジューラーで続けて実行する
+                print(f"実験中: {len(schedulers)}スケジューラー × {len(experiment_ids)}セット")
+                for done, experiment_id in enumerate(experiment_ids, 1):
+                    pending = self._write_cached(names, experiment_id, sink)
+                    if pending:
+                        for result in self.run_task_set({name: schedulers[name] for name in pending}, experiment_id):
+                            self._write_result(result, sink, log_store)
+                    if done % max(1, len(experiment_ids) // 10) == 0:
+                        print(f"  進捗: {done}/{len(experiment_ids)}セット")
+                return names
+
+            for scheduler_name, scheduler in schedulers.items():
+                print(f"実験中: {scheduler_name}")
+                for experiment_id in experiment_ids:
+                    if self._write_cached([scheduler_name], experiment_id, sink):
+                        self._write_result(self.run_single_experiment(scheduler_name, scheduler, experiment_id),
+                                           sink, log_store)
+            return names
+        finally:
+            if self._cache_keys is not None:
+                self.result_cache.commit()
+                hits, misses = self._cache_keys['counts']
+                print(f"キャッシュ: {self.result_cache.hits - hits}件を再利用、"
+                      f"{self.result_cache.misses - misses}件を実行")
+                if log_store is not None and self.result_cache.hits > hits:
+                    print(f"⚠️ キャッシュから読んだ{self.result_cache.hits - hits}件の実験はログに残りません"
+                          f"（結果の from_cache 列が True の行）")
+                self._cache_keys = None
+
+    def run_sequential(self, sink: ResultSink, log_store: JsonlLogStore = None,
+                       schedulers: Dict[str, Scheduler] = None,
+                       scheduler_specs: Dict[str, Dict] = None,
+                       reference: str = 'rl_scheduler',
+                       metric: str = 'total_score',
+                       alpha: float = 0.05,
+                       batch_size: int = 50,
+                       tuning_sets: int = None,
+                       equivalence_margin: float = None,
+                       min_sets: int = 30) -> Dict[str, Any]:
+        """
+        逐次評価: タスクセットを batch_size ずつ実行し、基準のスケジューラーとの全ての比較が
+        決まった時点（SequentialComparison）または num_experiments に達した時点で止める
+
+        Args:
+            sink / log_store / schedulers / scheduler_specs: run_to_sink と同じ
+            reference: 基準のスケジューラー
+            metric: 比較する指標
+            alpha: 全ての比較を合わせた有意水準
+            batch_size: 判定の間に実行するタスクセット数
+            tuning_sets: 信頼系列の半幅を最小にしたいタスクセット数（Noneの場合は num_experiments の半分）
+            equivalence_margin: 差がこの範囲に収まったら「差なし」と決める（Noneの場合は決めない）
+            min_sets: 判定を始めるまでのタスクセット数
+
+        Returns:
+            {'num_sets': 実行したタスクセット数, 'max_sets': num_experiments, 'saved_sets': 省略したタスクセット数,
+             'saved_runs': 省略した実行数, 'stopped_early': 上限の前に止まったか, 'comparisons': 比較ごとの表}
+        """
+        if self.weights is not None:
+            raise ValueError("逐次評価では重み付きのタスクセット（コアセット）は使えません")
+        names = list(schedulers or scheduler_specs or default_scheduler_specs())
+        comparison = SequentialComparison(names, reference=reference, metric=metric, alpha=alpha,
+                                          tuning_sets=tuning_sets or max(self.num_experiments // 2, 1),
+                                          equivalence_margin=equivalence_margin, min_sets=min_sets)
+        observed_sink = ObservingResultSink(sink, comparison.observe)
+
+        if self.workers > 1 and schedulers is None:
+            # ワーカー（タスクローダーとRLモデルの読み込み）はバッチごとに作り直さず、全バッチで使い回す
+            from .parallel_runner import WorkerPool
+
+            scheduler_specs = scheduler_specs or default_scheduler_specs()
+            print(f"並列実験中: 最大{len(scheduler_specs)}スケジューラー（{self.workers}プロセス）")
+            self._pool = WorkerPool(*self._worker_config(), scheduler_specs, workers=self.workers)
+
+        num_sets = 0
+        try:
+            while num_sets < self.num_experiments and not comparison.all_decided:
+                batch = range(num_sets, min(num_sets + batch_size, self.num_experiments))
+                self.run_to_sink(observed_sink, log_store, schedulers, scheduler_specs, experiment_ids=batch)
+                num_sets = batch.stop
+                comparison.update()
+                decided = sum(decision is not None for decision in comparison.decisions)
+                print(f"  逐次評価: {num_sets}/{self.num_experiments}セット、"
+                      f"{decided}/{len(comparison.others)}件の比較が決定")
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+        saved_sets = self.num_experiments - num_sets
+        if comparison.all_decided:
+            print(f"✅ 全ての比較が決定: {num_sets}セットで終了（{saved_sets}セット・{saved_sets * len(names)}回の実行を省略）")
+        else:
+            print(f"⚠️ 上限の{self.num_experiments}セットに達しました（未決定の比較があります）")
+        return {
+            'num_sets': num_sets,
+            'max_sets': self.num_experiments,
+            'saved_sets': saved_sets,
+            'saved_runs': saved_sets * len(names),
+            'stopped_early': saved_sets > 0,
+            'comparisons': comparison.summary(),
+        }
+
+    def _setup_cache(self, scheduler_specs: Optional[Dict[str, Dict]]):
+        """キャッシュのキーの材料（スケジューラーのフィンガープリントとシミュレーション設定のハッシュ）を用意する"""
+        self._cache_keys = None
+        if self.result_cache is None:
+            return
+        if scheduler_specs is None or not self.task_loader:
+            print("⚠️ スケジューラーのインスタンスやランダム生成のタスクではキャッシュを使えません")
+            return
+
+        start_time = TaskSchedulingSimulation(simulation_days=self.simulation_days,
+                                              work_hours_per_day=self.work_hours_per_day,
+                                              num_tasks=self.num_tasks).start_time
+        self._cache_keys = {
+            'schedulers': {name: scheduler_fingerprint(name, spec) for name, spec in scheduler_specs.items()},
+            # シードも共通乱数も使わない実験では、乱数を使わないスケジューラーだけをキャッシュする
+            'cacheable': {name for name, spec in scheduler_specs.items()
+                          if self.seed is not None or self.common_random_numbers
+                          or (spec['type'] == 'baseline' and name in DETERMINISTIC_SCHEDULERS)},
+            'simulation': simulation_fingerprint(self.simulation_days, self.work_hours_per_day,
+                                                 self.num_tasks, start_time),
+            'start_time': start_time,
+            'task_sets': {},
+            'counts': (self.result_cache.hits, self.result_cache.misses),
+        }
+
+    def _cache_key(self, scheduler_name: str, experiment_id: int) -> Optional[tuple]:
+        """実験のキャッシュのキー（キャッシュしない実験はNone）"""
+        keys = self._cache_keys
+        if keys is None or scheduler_name not in keys['cacheable']:
+            return None
+        task_index = self.get_task_index(experiment_id)
+        if task_index not in keys['task_sets']:
+            keys['task_sets'][task_index] = task_set_hash(self.task_loader, task_index, keys['start_time'])
+        run_seed = f"{self.seed}:{experiment_id}" if self.seed is not None else 'none'
+        if self.common_random_numbers:
+            run_seed += f":crn{self._stream_seed}" + (":antithetic" if self.antithetic else "")
+        return keys['schedulers'][scheduler_name], keys['task_sets'][task_index], keys['simulation'], run_seed
+
+    def _write_cached(self, scheduler_names: List[str], experiment_id: int, sink: ResultSink) -> List[str]:
+        """
+        キャッシュにある実験の指標を sink に書き出す（from_cache=True。キャッシュにはログがないので log_store には書かない）
+
+        Returns:
+            キャッシュになく、実行が必要なスケジューラー名
+        """
+        pending = []
+        for name in scheduler_names:
+            key = self._cache_key(name, experiment_id)
+            metrics = self.result_cache.get(key) if key is not None else None
+            if metrics is None:
+                pending.append(name)
             else:
-                # ランダム生成（後方互換性のため残す）
-                result = simulation.run_simulation(scheduler)
+                sink.write(dict(self._add_metadata(metrics, name, experiment_id), from_cache=True))
+        return pending
 
-            # 結果にメタデータを追加
-            result['scheduler_name'] = scheduler_name
-            result['experiment_id'] = experiment_id
+    def _write_result(self, result: Dict, sink: ResultSink, log_store: Optional[JsonlLogStore]):
+        metrics, logs = split_result(result)
+        if self._cache_keys is not None:
+            # キャッシュを使う実験では、ログのない（キャッシュから読んだ）行を区別できるようにする
+            metrics['from_cache'] = False
+        sink.write(metrics)
+        if log_store is not None:
+            log_store.append(result['scheduler_name'], result['experiment_id'], logs)
 
-            results.append(result)
+        key = self._cache_key(result['scheduler_name'], result['experiment_id'])
+        if key is not None:
+            # 実験回ごとのメタデータを除いた指標を保存する
+            self.result_cache.put(key, {k: v for k, v in metrics.items()
+                                        if k not in ('scheduler_name', 'experiment_id', 'task_index', 'weight',
+                                                     'from_cache')})
 
-        return results
+    @staticmethod
+    def _sort_results(results_df: pd.DataFrame, scheduler_names: List[str]) -> pd.DataFrame:
+        """結果をスケジューラー順 → 実験回順に並べる（実行順に関係なく同じ並びのDataFrameにする）"""
+        results_df['scheduler_name'] = results_df['scheduler_name'].cat.set_categories(scheduler_names)
+        return results_df.sort_values(['scheduler_name', 'experiment_id'], kind='stable').reset_index(drop=True)
+
+    def _iter_parallel(self, scheduler_specs: Dict[str, Dict], units: List[tuple], keep_logs: bool) -> Iterator[Dict]:
+        """
+        作業単位をプロセスプールで実行し、終わった順に結果を返す
+        （run_sequential の実行中はそのプールを使い、それ以外は呼び出しごとにプールを作る）
+
+        Args:
+            scheduler_specs: スケジューラーの設定
+            units: (スケジューラー名のタプル, 実験回) のリスト。タスクセット単位でまとめる場合は
+                   1つのタスクセットの全スケジューラーを1つの作業単位にする
+            keep_logs: ログも返すか
+        """
+        from .parallel_runner import iter_units_in_pool
+
+        if not units:
+            return iter(())
+        if self._pool is not None:
+            return self._pool.iter_units(units, chunk_size=self.chunk_size, keep_logs=keep_logs, verbose=False)
+
+        evaluator_config, loader_spec = self._worker_config()
+        print(f"並列実験中: {len(units)}作業単位 × 最大{len(scheduler_specs)}スケジューラー（{self.workers}プロセス）")
+        return iter_units_in_pool(evaluator_config, loader_spec, scheduler_specs, units,
+                                  workers=self.workers, chunk_size=self.chunk_size, keep_logs=keep_logs)
+
+    def _worker_config(self) -> Tuple[Dict, Optional[Dict]]:
+        """ワーカーで評価器を作り直すための (SchedulerEvaluator の引数, task_loader_spec の設定)"""
+        evaluator_config = {
+            'num_experiments': self.num_experiments,
+            'simulation_days': self.simulation_days,
+            'work_hours_per_day': self.work_hours_per_day,
+            'num_tasks': self.num_tasks,
+            'task_indices': self.task_indices,
+            'weights': self.weights,
+            'seed': self.seed,
+            'common_random_numbers': self.common_random_numbers,
+            'antithetic': self.antithetic,
+            'long_horizon': self.long_horizon,
+        }
+        loader_spec = task_loader_spec(self.task_loader) if self.task_loader else None
+        return evaluator_config, loader_spec
+
+    def run_task_set(self, schedulers: Dict[str, Scheduler], experiment_id: int) -> List[Dict]:
+        """
+        実験回のタスクセットを1回だけ読み込み、全スケジューラーで実行する
+        （シミュレーションはタスクをコピーして使うので、読み込んだリストは共有してよい）
+        """
+        tasks = self.task_loader.load_tasks(self.get_task_index(experiment_id)) if self.task_loader else None
+        return [self.run_single_experiment(name, scheduler, experiment_id, tasks)
+                for name, scheduler in schedulers.items()]
+
+    def run_single_experiment(self, scheduler_name: str, scheduler: Scheduler, experiment_id: int,
+                              tasks: List = None) -> Dict:
+        """1つのスケジューラーで1回実験を実行（直列・並列で共通、tasks: 読み込み済みのタスクセット）"""
+        # タスクを取得
+        if self.task_loader and tasks is None:
+            tasks = self.task_loader.load_tasks(self.get_task_index(experiment_id))
+
+        # 共有のスケジューラーは変更せず、エピソードごとの状態を持つコピーで実行する
+        stream = self._decision_stream(scheduler_name, experiment_id) if scheduler.uses_random_stream else None
+        episode = scheduler.for_episode()
+        episode.set_random_stream(stream)
+        result = self._simulate(experiment_id, episode, tasks)
+        if stream is not None and self.antithetic:
+            # 対称変量法: 1 - u の乱数列でもう1回実行し、スカラーの指標を平均する（ログは1回目のもの）
+            episode = scheduler.for_episode()
+            episode.set_random_stream(stream.pair())
+            result = self._average_antithetic(result, self._simulate(experiment_id, episode, tasks))
+        return self._add_metadata(result, scheduler_name, experiment_id)
+
+    @property
+    def _stream_seed(self) -> int:
+        """共通乱数法の乱数列のシード（シードを指定しない場合は0）"""
+        return self.seed if self.seed is not None else 0
+
+    def _decision_stream(self, scheduler_name: str, experiment_id: int) -> Optional[DecisionStream]:
+        """
+        スケジューラーの判断に使う乱数列（シードも共通乱数も使わない場合はNone）
+        共通乱数法では全スケジューラーで同じ (シード, 実験回) の乱数列、それ以外は (シード, 実験回, スケジューラー) の乱数列
+        """
+        if self.common_random_numbers:
+            return DecisionStream(experiment_seed_sequence(self._stream_seed, experiment_id, purpose='decisions'))
+        if self.seed is not None:
+            return DecisionStream(experiment_seed_sequence(self.seed, experiment_id, scheduler_name, 'decisions'))
+        return None
+
+    def _simulate(self, experiment_id: int, scheduler: Scheduler, tasks: Optional[List]) -> Dict:
+        # シミュレーション環境を作成（ランダム生成のタスクは (シード, 実験回) の乱数で全スケジューラー共通）
+        simulation = TaskSchedulingSimulation(
+            simulation_days=self.simulation_days,
+            work_hours_per_day=self.work_hours_per_day,
+            num_tasks=self.num_tasks,
+            long_horizon=self.long_horizon,
+            rng=experiment_generator(self.seed, experiment_id, purpose='tasks') if self.seed is not None else None
+        )
+
+        if tasks is not None:
+            # 事前生成されたデータを使用
+            return simulation.run_simulation_with_tasks(scheduler, tasks)
+        # ランダム生成（後方互換性のため残す）
+        return simulation.run_simulation(scheduler)
+
+    @staticmethod
+    def _average_antithetic(result: Dict, paired: Dict) -> Dict:
+        """対称変量法のペアのスカラーの指標を平均する（整数の指標も平均値にする）"""
+        averaged = dict(result)
+        for key, value in result.items():
+            if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                averaged[key] = (value + paired[key]) / 2
+        return averaged
+
+    def _add_metadata(self, result: Dict, scheduler_name: str, experiment_id: int) -> Dict:
+        """結果に実験回ごとのメタデータを追加"""
+        result['scheduler_name'] = scheduler_name
+        result['experiment_id'] = experiment_id
+        if self.task_loader:
+            result['task_index'] = self.get_task_index(experiment_id)
+        if self.weights is not None:
+            result['weight'] = self.weights[experiment_id]
+        return result
+
+    def get_task_index(self, experiment_id: int) -> int:
+        """実験回に対応するタスクセットのインデックス"""
+        if self.task_indices is not None:
+            return self.task_indices[experiment_id]
+        return experiment_id % self.task_loader.get_num_datasets()
+
+    @staticmethod
+    def _weighted_stats(data: pd.DataFrame, column: str):
+        """
+        列の平均・標準偏差・有効サンプル数（weight列があれば重み付き）
+        標準偏差は信頼性重みの不偏推定（重みが全て等しい場合は ddof=1 の標準偏差と同じ）、
+        有効サンプル数は (Σw)² / Σw²（重みが全て等しい場合は件数）
+
+        Returns:
+            (平均, 標準偏差, 有効サンプル数)
+        """
+        values = data[column].to_numpy(dtype=float)
+        weights = data['weight'].to_numpy(dtype=float) if 'weight' in data.columns else np.ones(len(values))
+        total, total_sq = weights.sum(), (weights ** 2).sum()
+        mean = float(np.average(values, weights=weights))
+        denominator = total - total_sq / total
+        variance = float(np.sum(weights * (values - mean) ** 2) / denominator) if denominator > 0 else np.nan
+        return mean, float(np.sqrt(variance)), total ** 2 / total_sq
+
+    @classmethod
+    def _mean_std(cls, data: pd.DataFrame, column: str):
+        """列の平均と標準偏差（weight列があれば重み付き、どちらも不偏推定の標準偏差）"""
+        mean, std, _ = cls._weighted_stats(data, column)
+        return mean, std
     
-    def analyze_results(self, results_df: pd.DataFrame) -> Dict[str, Any]:
+    @staticmethod
+    def _read_columns(results, columns: List[str]) -> pd.DataFrame:
+        """結果のDataFrameまたは書き出し先から、必要な列だけを取り出す（weight列は常に含める）"""
+        columns = list(columns) + ['weight']
+        if isinstance(results, ResultSink):
+            return results.read(columns)
+        return results[[column for column in columns if column in results.columns]]
+
+    def analyze_results(self, results_df) -> Dict[str, Any]:
         """
         実験結果を分析し、統計サマリーを作成する
         
         Args:
-            results_df: run_experiments()で得られた結果のDataFrame
+            results_df: run_experiments()で得られた結果のDataFrame、または結果を書き出した ResultSink
             
         Returns:
             分析結果の辞書
         """
+        results_df = self._read_columns(results_df, ['scheduler_name', 'total_score', 'completion_rate',
+                                                     'deadline_compliance_rate', 'efficiency'])
         analysis = {}
         
         # 各スケジューラーごとの統計
         for scheduler_name in results_df['scheduler_name'].unique():
             scheduler_data = results_df[results_df['scheduler_name'] == scheduler_name]
             
+            mean_score, std_score = self._mean_std(scheduler_data, 'total_score')
+            mean_completion, std_completion = self._mean_std(scheduler_data, 'completion_rate')
+            mean_deadline, std_deadline = self._mean_std(scheduler_data, 'deadline_compliance_rate')
+            mean_efficiency, std_efficiency = self._mean_std(scheduler_data, 'efficiency')
+
             analysis[scheduler_name] = {
-                'mean_score': scheduler_data['total_score'].mean(),
-                'std_score': scheduler_data['total_score'].std(),
-                'mean_completion_rate': scheduler_data['completion_rate'].mean(),
-                'std_completion_rate': scheduler_data['completion_rate'].std(),
-                'mean_deadline_compliance': scheduler_data['deadline_compliance_rate'].mean(),
-                'std_deadline_compliance': scheduler_data['deadline_compliance_rate'].std(),
-                'mean_efficiency': scheduler_data['efficiency'].mean(),
-                'std_efficiency': scheduler_data['efficiency'].std()
+                'mean_score': mean_score,
+                'std_score': std_score,
+                'mean_completion_rate': mean_completion,
+                'std_completion_rate': std_completion,
+                'mean_deadline_compliance': mean_deadline,
+                'std_deadline_compliance': std_deadline,
+                'mean_efficiency': mean_efficiency,
+                'std_efficiency': std_efficiency
             }
         
         # 全体比較
+        schedulers = list(analysis)
         analysis['summary'] = {
-            'best_scheduler_by_score': results_df.groupby('scheduler_name')['total_score'].mean().idxmax(),
-            'best_scheduler_by_completion': results_df.groupby('scheduler_name')['completion_rate'].mean().idxmax(),
-            'best_scheduler_by_deadline': results_df.groupby('scheduler_name')['deadline_compliance_rate'].mean().idxmax(),
+            'best_scheduler_by_score': max(schedulers, key=lambda name: analysis[name]['mean_score']),
+            'best_scheduler_by_completion': max(schedulers, key=lambda name: analysis[name]['mean_completion_rate']),
+            'best_scheduler_by_deadline': max(schedulers, key=lambda name: analysis[name]['mean_deadline_compliance']),
         }
         
         return analysis
     
-    def statistical_significance_test(self, results_df: pd.DataFrame, metric: str = 'total_score') -> Dict[str, Any]:
+    def statistical_significance_test(self, results_df, metric: str = 'total_score') -> Dict[str, Any]:
         """
-        スケジューラー間の統計的有意差を検定する
+        スケジューラー間の統計的有意差を検定する（Welchのt検定）
+        weight列がある場合（コアセット）は、重み付きの平均・標準偏差と有効サンプル数で検定する
         
         Args:
-            results_df: 実験結果のDataFrame
+            results_df: 実験結果のDataFrame、または結果を書き出した ResultSink
             metric: 比較する指標名
             
         Returns:
             統計検定の結果
         """
         from scipy import stats
+
+        results_df = self._read_columns(results_df, ['scheduler_name', metric])
         
         schedulers = results_df['scheduler_name'].unique()
         test_results = {}
@@ -134,27 +543,42 @@ class SchedulerEvaluator:
         for i, scheduler1 in enumerate(schedulers):
             for j, scheduler2 in enumerate(schedulers):
                 if i < j:  # 重複を避ける
-                    data1 = results_df[results_df['scheduler_name'] == scheduler1][metric]
-                    data2 = results_df[results_df['scheduler_name'] == scheduler2][metric]
-                    
+                    mean1, std1, n1 = self._weighted_stats(results_df[results_df['scheduler_name'] == scheduler1], metric)
+                    mean2, std2, n2 = self._weighted_stats(results_df[results_df['scheduler_name'] == scheduler2], metric)
+
                     # Welchのt検定（等分散を仮定しない）
-                    t_stat, p_value = stats.ttest_ind(data1, data2, equal_var=False)
+                    t_stat, p_value = stats.ttest_ind_from_stats(mean1, std1, n1, mean2, std2, n2, equal_var=False)
                     
                     test_results[f"{scheduler1}_vs_{scheduler2}"] = {
                         't_statistic': t_stat,
                         'p_value': p_value,
                         'significant': p_value < 0.05,
-                        'mean_diff': data1.mean() - data2.mean()
+                        'mean_diff': mean1 - mean2
                     }
         
         return test_results
     
-    def generate_report(self, results_df: pd.DataFrame, save_path: str = None) -> str:
+    def resampling_test(self, results_df, metrics: List[str] = METRIC_COLUMNS, **kwargs) -> Dict[str, Any]:
+        """
+        全指標・全ペアのブートストラップ信頼区間と対応のある並べ替え検定（resampling_analysis）
+
+        Args:
+            results_df: 実験結果のDataFrame、または結果を書き出した ResultSink
+            metrics: 対象の指標
+            **kwargs: resampling_analysis の引数（n_resamples, confidence, seed, chunk_size）
+
+        Returns:
+            {'confidence_intervals': スケジューラー別の表, 'comparisons': ペア別の表, 'num_sets': タスクセット数}
+        """
+        results_df = self._read_columns(results_df, ['scheduler_name', 'experiment_id'] + list(metrics))
+        return resampling_analysis(results_df, metrics, **kwargs)
+
+    def generate_report(self, results_df, save_path: str = None) -> str:
         """
         実験結果のレポートを生成する
         
         Args:
-            results_df: 実験結果のDataFrame
+            results_df: 実験結果のDataFrame、または結果を書き出した ResultSink
             save_path: レポートを保存するパス（Noneの場合は保存しない）
             
         Returns:
@@ -162,6 +586,7 @@ class SchedulerEvaluator:
         """
         analysis = self.analyze_results(results_df)
         significance = self.statistical_significance_test(results_df)
+        resampling = self.resampling_test(results_df)
         
         report = []
         report.append("# タスクスケジューリング実験結果レポート")
@@ -189,9 +614,21 @@ class SchedulerEvaluator:
         report.append(f"- 締切遵守率が最も高い: {summary['best_scheduler_by_deadline']}")
         
         report.append(f"\n## 統計的有意差検定結果")
+        if self.weights is not None:
+            report.append("（コアセットの重み付き平均・標準偏差と有効サンプル数によるWelchのt検定）")
         for comparison, test_result in significance.items():
             significance_mark = "**" if test_result['significant'] else ""
             report.append(f"- {comparison}: p={test_result['p_value']:.4f} {significance_mark}")
+
+        report.append(f"\n## ブートストラップ信頼区間と並べ替え検定（対応あり、{resampling['num_sets']}セット）")
+        for metric, intervals in resampling['confidence_intervals'].groupby('metric', sort=False):
+            report.append(f"\n### {metric}")
+            for row in intervals.itertuples():
+                report.append(f"- {row.scheduler_name}: {row.mean:.3f} [{row.ci_low:.3f}, {row.ci_high:.3f}]")
+            for row in resampling['comparisons'][resampling['comparisons']['metric'] == metric].itertuples():
+                significance_mark = "**" if row.significant else ""
+                report.append(f"- {row.comparison}: 差={row.mean_diff:.3f} [{row.ci_low:.3f}, {row.ci_high:.3f}], "
+                              f"p={row.p_value:.4f} {significance_mark}")
         
         report_text = "\n".join(report)
         
@@ -0,0 +1,136 @@
+"""
+実験のプロセス並列実行
+(スケジューラー名のタプル, 実験回) の作業単位をプロセスプールに分配する。各プロセスには
+タスクローダーとスケジューラーの設定だけを最初に1回渡して作り直させ、作業単位としては
+スケジューラー名と実験回の番号だけを送る（Taskのリストは送らない）。
+1つの作業単位のスケジューラーは、同じプロセスで1回読み込んだタスクセットを続けて使う。
+何回かに分けて実行する場合（逐次評価）は WorkerPool を使い回し、ワーカーを作り直さない
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from ..utils.scheduler_factory import create_schedulers_from_specs
+from ..utils.task_loader import task_loader_from_spec
+from .result_sink import split_result
+
+
+# ワーカープロセス内の評価器とスケジューラー（initializer で作る）
+_worker_state = {}
+
+
+def _init_worker(evaluator_config: Dict, loader_spec: Dict, scheduler_specs: Dict[str, Dict]):
+    from .evaluator import SchedulerEvaluator
+
+    loader = task_loader_from_spec(loader_spec) if loader_spec is not None else None
+    _worker_state['evaluator'] = SchedulerEvaluator(task_loader=loader, **evaluator_config)
+    _worker_state['schedulers'] = create_schedulers_from_specs(scheduler_specs)
+
+
+def _run_chunk(units: Sequence[Tuple[Tuple[str, ...], int]], keep_logs: bool) -> List[Dict]:
+    evaluator = _worker_state['evaluator']
+    schedulers = _worker_state['schedulers']
+    results = []
+    for names, experiment_id in units:
+        results.extend(evaluator.run_task_set({name: schedulers[name] for name in names}, experiment_id))
+    if not keep_logs:
+        # 使わないログはプロセス間で送らない
+        results = [split_result(result)[0] for result in results]
+    return results
+
+
+def default_chunk_size(num_units: int, workers: int) -> int:
+    """
+    1回に送る作業単位の数
+    エピソードの長さがばらつくので、1プロセスあたり8チャンク程度に分け、
+    早く終わったプロセスが残りのチャンクを取りに行けるようにする
+    """
+    return max(1, math.ceil(num_units / (workers * 8)))
+
+
+class WorkerPool:
+    """
+    ワーカープロセスのプール
+    ワーカーはタスクローダーとスケジューラー（RLモデルを含む）を最初に1回だけ作るので、
+    逐次評価のように作業単位を何回かに分けて実行する場合は、同じプールを使い回して作り直しを避ける
+    """
+
+    def __init__(self, evaluator_config: Dict, loader_spec: Dict, scheduler_specs: Dict[str, Dict],
+                 workers: int = None):
+        """
+        Args:
+            evaluator_config: ワーカーで SchedulerEvaluator を作る引数（task_loader以外）
+            loader_spec: task_loader_spec の設定（Noneの場合はランダム生成）
+            scheduler_specs: スケジューラー名 -> 設定
+            workers: プロセス数（Noneの場合はCPU数）
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(evaluator_config, loader_spec, scheduler_specs))
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ワーカープロセスを終了する"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_units(self, units: Sequence[Tuple[Tuple[str, ...], int]], chunk_size: int = None,
+                   keep_logs: bool = True, verbose: bool = True) -> Iterator[Dict]:
+        """
+        作業単位をワーカーで実行し、チャンクが終わった順に結果を返す
+
+        チャンクは全てプールのキューに入れ、空いたプロセスが順に取り出す（処理の速いプロセスが
+        遅いプロセスの残りを引き受ける）。受け取った結果はすぐに返して手放すため、
+        呼び出し側が書き出していけばメモリ使用量は実行中のチャンク分で済む
+
+        Args:
+            units: (スケジューラー名のタプル, 実験回) のリスト
+            chunk_size: 1チャンクの作業単位数（Noneの場合は default_chunk_size）
+            keep_logs: simulation_log などのログも返すか（Falseの場合は指標のみ）
+            verbose: 進捗を表示するか
+
+        Yields:
+            実験結果（チャンクの中は units の順、チャンク同士は終わった順）
+        """
+        if not units:
+            return
+        chunk_size = chunk_size or default_chunk_size(len(units), self.workers)
+        chunks = [list(units[i:i + chunk_size]) for i in range(0, len(units), chunk_size)]
+
+        done = 0
+        next_report = 0.1
+        futures = {self._executor.submit(_run_chunk, chunk, keep_logs): len(chunk) for chunk in chunks}
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+                done += futures[future]
+                if verbose and (done / len(units) >= next_report or done == len(units)):
+                    print(f"  進捗: {done}/{len(units)} ({done / len(units):.0%})")
+                    next_report = math.floor(done / len(units) * 10 + 1) / 10
+        finally:
+            # 途中で止めた場合に、まだ始まっていないチャンクをプールに残さない
+            for future in futures:
+                future.cancel()
+
+
+def iter_units_in_pool(evaluator_config: Dict, loader_spec: Dict, scheduler_specs: Dict[str, Dict],
+                       units: Sequence[Tuple[Tuple[str, ...], int]], workers: int = None, chunk_size: int = None,
+                       keep_logs: bool = True, verbose: bool = True) -> Iterator[Dict]:
+    """
+    作業単位を一時的なプロセスプール（WorkerPool）で実行し、チャンクが終わった順に結果を返す
+
+    Args:
+        evaluator_config / loader_spec / scheduler_specs / workers: WorkerPool と同じ
+        units / chunk_size / keep_logs / verbose: WorkerPool.iter_units と同じ
+
+    Yields:
+        実験結果（チャンクの中は units の順、チャンク同士は終わった順）
+    """
+    with WorkerPool(evaluator_config, loader_spec, scheduler_specs, workers=workers) as pool:
+        yield from pool.iter_units(units, chunk_size=chunk_size, keep_logs=keep_logs, verbose=verbose)
@@ -0,0 +1,139 @@
+"""
+評価の進捗とコストの計測
+書き出された結果を数えてスループット（エピソード/秒・判断/秒）と残り時間を表示し、
+評価全体の実時間・CPU時間・最大メモリ使用量をまとめて履歴CSVに追記する（評価コストの推移を追うため）
+"""
+
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def resource_usage() -> Dict[str, Optional[float]]:
+    """
+    このプロセスと終了済みの子プロセス（並列実行のワーカー）のCPU時間と最大メモリ使用量
+
+    Returns:
+        {'cpu_seconds': CPU時間（ユーザー + システム、子プロセスを含む）,
+         'peak_rss_mb': このプロセスの最大RSS, 'peak_worker_rss_mb': 子プロセスの最大RSSの最大値}
+        （resource モジュールがない環境では最大RSSはNone）
+    """
+    times = os.times()
+    usage = {'cpu_seconds': times.user + times.system + times.children_user + times.children_system,
+             'peak_rss_mb': None, 'peak_worker_rss_mb': None}
+    if resource is not None:
+        # ru_maxrss の単位は Linux では KB、macOS ではバイト
+        unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        usage['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+        usage['peak_worker_rss_mb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit
+    return usage
+
+
+def format_duration(seconds: float) -> str:
+    """秒数を「1時間2分」「3分4秒」の形式にする"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}時間{minutes}分"
+    if minutes:
+        return f"{minutes}分{seconds}秒"
+    return f"{seconds}秒"
+
+
+class ThroughputMonitor:
+    """
+    実験結果を1件ずつ受け取り、スループットと残り時間を一定間隔で表示する
+    （ObservingResultSink の observer に渡す。キャッシュから読んだ結果（from_cache が True）は
+    進捗には数えるが、シミュレーションしていないのでスループットと残り時間の計算には含めない）
+    """
+
+    def __init__(self, total_runs: int, interval: float = 10.0, clock=time.perf_counter):
+        """
+        Args:
+            total_runs: 全体の実行数（タスクセット数 × スケジューラー数）
+            interval: 表示の間隔（秒）
+            clock: 時刻の関数（テスト用）
+        """
+        self.total_runs = total_runs
+        self.interval = interval
+        self.clock = clock
+        self.episodes = 0
+        self.decisions = 0
+        self.cached = 0
+        self._start = clock()
+        self._cpu_start = resource_usage()['cpu_seconds']
+        self._last_report = self._start
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self._start
+
+    def observe(self, metrics: Dict):
+        """実験結果を1件加える（interval 秒ごとに進捗を表示する）"""
+        if metrics.get('from_cache'):
+            self.cached += 1
+        else:
+            self.episodes += 1
+            self.decisions += metrics.get('num_decisions') or 0
+        now = self.clock()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            print(f"  {self.status()}")
+
+    def status(self) -> str:
+        """進捗の1行表示"""
+        elapsed = max(self.elapsed, 1e-9)
+        done = self.episodes + self.cached
+        line = (f"進捗: {done}/{self.total_runs}件 ({done / max(self.total_runs, 1):.1%}) "
+                f"{self.episodes / elapsed:.1f} エピソード/秒, {self.decisions / elapsed:,.0f} 判断/秒")
+        if self.cached:
+            line += f"（キャッシュ {self.cached}件）"
+        if self.episodes > 0 and done < self.total_runs:
+            line += f", 残り約{format_duration((self.total_runs - done) * elapsed / self.episodes)}"
+        return line
+
+    def summary(self) -> Dict:
+        """
+        評価全体のコスト（評価の終了後、並列実行のワーカーが終了してから呼ぶ）
+
+        Returns:
+            episodes, decisions, cached_runs, wall_seconds, cpu_seconds, episodes_per_second,
+            decisions_per_second, peak_rss_mb, peak_worker_rss_mb の辞書
+            （episodes・decisions とスループットはシミュレーションした実行だけ。cached_runs はキャッシュから読んだ件数）
+        """
+        wall_seconds = self.elapsed
+        usage = resource_usage()
+        return {
+            'episodes': self.episodes,
+            'decisions': int(self.decisions),
+            'cached_runs': self.cached,
+            'wall_seconds': wall_seconds,
+            'cpu_seconds': usage['cpu_seconds'] - self._cpu_start,
+            'episodes_per_second': self.episodes / wall_seconds if wall_seconds > 0 else 0.0,
+            'decisions_per_second': self.decisions / wall_seconds if wall_seconds > 0 else 0.0,
+            'peak_rss_mb': usage['peak_rss_mb'],
+            'peak_worker_rss_mb': usage['peak_worker_rss_mb'],
+        }
+
+
+def append_history(filepath: str, row: Dict):
+    """履歴CSVに1行追記する（ファイルがなければヘッダー付きで作成。列が増えた場合は全体を書き直す）"""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    new_row = pd.DataFrame([row])
+    if os.path.exists(filepath):
+        history = pd.read_csv(filepath)
+        if list(history.columns) != list(new_row.columns):
+            pd.concat([history, new_row], ignore_index=True).to_csv(filepath, index=False, encoding='utf-8')
+            return
+    new_row.to_csv(filepath, mode='a', header=not os.path.exists(filepath), index=False, encoding='utf-8')
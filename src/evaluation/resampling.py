@@ -0,0 +1,173 @@
+"""
+ブートストラップ信頼区間と対応のある並べ替え検定（ベクトル化版）
+全スケジューラーが同じタスクセットで実行されることを利用し、(タスクセット × スケジューラー × 指標) の
+行列に対して再標本化する。再標本は「各タスクセットを何回選んだか」の回数行列（ブートストラップ）や
+符号行列（並べ替え検定）としてまとめて作り、行列積で全スケジューラー・全ペア・全指標の統計量を一度に求める。
+再標本はチャンクに分けて作るため、メモリ使用量は chunk_size × タスクセット数 で済む
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import RESAMPLING_CONFIG
+
+
+# 検定・信頼区間を求める指標
+METRIC_COLUMNS = ('total_score', 'completion_rate', 'deadline_compliance_rate', 'efficiency')
+
+
+def paired_values(results_df: pd.DataFrame, metrics: Sequence[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    結果を (タスクセット, スケジューラー, 指標) の配列に並べる
+    全スケジューラーの結果がそろっている実験回だけを使う
+
+    Returns:
+        (スケジューラー名のリスト, 値の配列 shape=(実験回数, スケジューラー数, 指標数), 重み shape=(実験回数,))
+    """
+    names = [str(name) for name in pd.unique(results_df['scheduler_name'])]
+    table = results_df.pivot_table(index='experiment_id', columns='scheduler_name', values=list(metrics),
+                                   aggfunc='first', observed=True).dropna()
+    values = np.stack([table[metric][names].to_numpy(dtype=float) for metric in metrics], axis=-1)
+
+    if 'weight' in results_df.columns:
+        weights = results_df.groupby('experiment_id')['weight'].first().reindex(table.index).to_numpy(dtype=float)
+    else:
+        weights = np.ones(len(table))
+    return names, values, weights
+
+
+def _default_chunk_size(num_sets: int) -> int:
+    """1チャンクの再標本数（回数行列・符号行列が約400万要素に収まる数）"""
+    return max(1, (1 << 22) // max(num_sets, 1))
+
+
+def _chunks(n_resamples: int, chunk_size: int):
+    for start in range(0, n_resamples, chunk_size):
+        yield min(chunk_size, n_resamples - start)
+
+
+def _random_signs(rng: np.random.Generator, size: int, n: int) -> np.ndarray:
+    """
+    shape=(size, n) の ±1 の行列
+    64ビットの乱数を1ビットずつ使う（1行あたりの乱数の消費量が一定なので、チャンクの分け方によらず同じ行列になる）
+    """
+    words = rng.integers(0, np.iinfo(np.uint64).max, size=(size, (n + 63) // 64), dtype=np.uint64, endpoint=True)
+    bits = np.unpackbits(words.view(np.uint8), axis=1, count=n)
+    return bits.astype(float) * 2 - 1
+
+
+def bootstrap_means(values: np.ndarray, weights: np.ndarray, n_resamples: int, rng: np.random.Generator,
+                    chunk_size: int = None) -> np.ndarray:
+    """
+    タスクセットを復元抽出した再標本ごとの（重み付き）平均
+
+    Args:
+        values: shape=(タスクセット数, ...) の値
+        weights: shape=(タスクセット数,) の重み
+        n_resamples: 再標本数
+        rng: 乱数生成器
+        chunk_size: 1回にまとめて作る再標本数（Noneの場合は自動）
+
+    Returns:
+        shape=(n_resamples, ...) の平均
+    """
+    n = len(values)
+    flat = values.reshape(n, -1)
+    chunk_size = chunk_size or _default_chunk_size(n)
+
+    means = np.empty((n_resamples, flat.shape[1]))
+    row = 0
+    for size in _chunks(n_resamples, chunk_size):
+        # 各再標本で各タスクセットが選ばれた回数（size × n の回数行列）
+        picks = rng.integers(0, n, size=(size, n))
+        picks += (np.arange(size) * n)[:, None]
+        counts = np.bincount(picks.ravel(), minlength=size * n).reshape(size, n) * weights
+        means[row:row + size] = (counts @ flat) / counts.sum(axis=1, keepdims=True)
+        row += size
+    return means.reshape((n_resamples,) + values.shape[1:])
+
+
+def sign_flip_statistics(differences: np.ndarray, weights: np.ndarray, n_resamples: int, rng: np.random.Generator,
+                         chunk_size: int = None) -> np.ndarray:
+    """
+    対応のある並べ替え検定の帰無分布（タスクセットごとの差の符号を入れ替えた（重み付き）平均）
+
+    Args:
+        differences: shape=(タスクセット数, ...) のタスクセットごとの差
+        weights: shape=(タスクセット数,) の重み
+
+    Returns:
+        shape=(n_resamples, ...) の統計量
+    """
+    n = len(differences)
+    flat = differences.reshape(n, -1) * (weights / weights.sum())[:, None]
+    chunk_size = chunk_size or _default_chunk_size(n)
+
+    statistics = np.empty((n_resamples, flat.shape[1]))
+    row = 0
+    for size in _chunks(n_resamples, chunk_size):
+        statistics[row:row + size] = _random_signs(rng, size, n) @ flat
+        row += size
+    return statistics.reshape((n_resamples,) + differences.shape[1:])
+
+
+def resampling_analysis(results_df: pd.DataFrame, metrics: Sequence[str] = METRIC_COLUMNS,
+                        n_resamples: int = None, confidence: float = None, seed: int = None,
+                        chunk_size: int = None) -> Dict[str, Any]:
+    """
+    全スケジューラーの平均のブートストラップ信頼区間と、全ペアの差の信頼区間・並べ替え検定
+
+    ペアの比較は同じタスクセットでの差（対応あり）で行う。信頼区間はパーセンタイル法、
+    p値は両側（|並べ替えた統計量| >= |観測値| の割合、観測値自身を含める）
+
+    Args:
+        results_df: 実験結果のDataFrame（scheduler_name, experiment_id, 指標の列）
+        metrics: 対象の指標
+        n_resamples / confidence / seed / chunk_size: Noneの場合は RESAMPLING_CONFIG の値
+
+    Returns:
+        {'confidence_intervals': スケジューラー別の表, 'comparisons': ペア別の表, 'num_sets': 使ったタスクセット数}
+    """
+    n_resamples = n_resamples or RESAMPLING_CONFIG['n_resamples']
+    confidence = confidence or RESAMPLING_CONFIG['confidence']
+    seed = RESAMPLING_CONFIG['seed'] if seed is None else seed
+    chunk_size = chunk_size or RESAMPLING_CONFIG.get('chunk_size')
+    metrics = [metric for metric in metrics if metric in results_df.columns]
+
+    names, values, weights = paired_values(results_df, metrics)
+    pairs = [(i, j) for i in range(len(names)) for j in range(i + 1, len(names))]
+    first, second = [i for i, _ in pairs], [j for _, j in pairs]
+    # shape=(タスクセット数, ペア数, 指標数)
+    differences = values[:, first] - values[:, second]
+
+    ss = np.random.SeedSequence(seed)
+    bootstrap_rng, permutation_rng = (np.random.default_rng(child) for child in ss.spawn(2))
+    tail = (1 - confidence) / 2
+
+    # 平均は線形なので、同じ再標本での平均の差が差の平均になる（対応のあるブートストラップ）
+    boot = bootstrap_means(values, weights, n_resamples, bootstrap_rng, chunk_size)
+    boot_means_low, boot_means_high = np.quantile(boot, [tail, 1 - tail], axis=0)
+    boot_diff = boot[:, first] - boot[:, second]
+    boot_diff_low, boot_diff_high = np.quantile(boot_diff, [tail, 1 - tail], axis=0)
+
+    observed_means = np.average(values, axis=0, weights=weights)
+    observed_diff = observed_means[first] - observed_means[second]
+    null = sign_flip_statistics(differences, weights, n_resamples, permutation_rng, chunk_size)
+    # 浮動小数点の誤差で観測値と同じ統計量を取りこぼさないよう、わずかに緩める
+    extreme = (np.abs(null) >= np.abs(observed_diff) * (1 - 1e-12)).sum(axis=0)
+    p_values = (extreme + 1) / (n_resamples + 1)
+
+    intervals = pd.DataFrame([
+        {'metric': metric, 'scheduler_name': name, 'mean': observed_means[s, m],
+         'ci_low': boot_means_low[s, m], 'ci_high': boot_means_high[s, m]}
+        for m, metric in enumerate(metrics) for s, name in enumerate(names)
+    ])
+    comparisons = pd.DataFrame([
+        {'metric': metric, 'comparison': f"{names[i]}_vs_{names[j]}", 'scheduler1': names[i], 'scheduler2': names[j],
+         'mean_diff': observed_diff[p, m], 'ci_low': boot_diff_low[p, m], 'ci_high': boot_diff_high[p, m],
+         'p_value': p_values[p, m], 'significant': p_values[p, m] < 1 - confidence}
+        for m, metric in enumerate(metrics) for p, (i, j) in enumerate(pairs)
+    ])
+    return {'confidence_intervals': intervals, 'comparisons': comparisons, 'num_sets': len(values)}
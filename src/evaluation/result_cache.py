@@ -0,0 +1,242 @@
+"""
+実験結果のキャッシュ（内容で決まるキーのSQLite）
+(スケジューラーのフィンガープリント, タスクセットのハッシュ, シミュレーション設定のハッシュ, 実験のシード)
+をキーに指標を保存し、同じ入力の実験はシミュレーションせずに保存済みの指標を返す。
+スケジューラーの設定・学習済みモデル・パーソナルデータ・タスクセット・シミュレーション設定・
+シミュレーションのコードのどれかが変わるとキーが変わるため、古い結果は自動的に使われなくなる
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+import config
+from ..utils.packed_dataset import records_from_tasks
+from ..schedulers.rl_policy_selector import read_model_data
+from ..utils.scheduler_factory import DEFAULT_RL_MODEL_PATH, resolve_personal_data_file
+
+
+CACHE_VERSION = 1
+
+# この件数を保存するごとにコミットする（途中で止まっても保存済みの結果は残る）
+_COMMIT_INTERVAL = 200
+
+# スケジューラーの動作に関わる設定（config.py の名前）
+SCHEDULER_CONFIG_NAMES = (
+    'CONCENTRATION_CONFIG',
+    'CONCENTRATION_SUSTAINABILITY_CONFIG',
+    'CONCENTRATION_LIMITS',
+    'PRIORITY_FATIGUE_CONFIG',
+    'PRIORITY_CONSECUTIVE_PENALTY',
+    'BREAK_STRATEGY_CONFIG',
+    'TASK_PRIORITY_THRESHOLDS',
+    'SCHEDULING_CONFIG',
+    'RL_CONFIG',
+    'RL_STATE_SPACE_CONFIG',
+    'RL_REWARD_CONFIG',
+    'RL_LEARNING_MODE_CONFIG',
+)
+
+# シミュレーションの動作に関わる設定
+SIMULATION_CONFIG_NAMES = (
+    'TIME_MARGIN_CONFIG',
+)
+
+# シミュレーション結果に影響するコード（src/ 以下のディレクトリとファイル）
+# scheduler_factory.py は設定からスケジューラーを作り、packed_dataset.py はレコードからタスクを組み立て、
+# evaluator.py はシミュレーションの方式を選んで対称変量法の組を平均する（キャッシュする指標を作る）
+_CODE_DIRECTORIES = ('models', 'schedulers', 'environment')
+_CODE_FILES = ('utils/rng.py', 'utils/scheduler_factory.py', 'utils/packed_dataset.py', 'evaluation/evaluator.py')
+
+# 乱数を使わないスケジューラー（シードを指定しない実験でもキャッシュできる）
+DETERMINISTIC_SCHEDULERS = ('deadline_scheduler', 'priority_scheduler')
+
+
+def _digest(payload) -> str:
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+def file_hash(filepath: str) -> Optional[str]:
+    """ファイルのSHA-256（ファイルがなければNone）"""
+    if not filepath or not os.path.exists(filepath):
+        return None
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+_code_hash = None
+
+
+def code_fingerprint() -> str:
+    """シミュレーション結果に影響するソースコードのハッシュ（プロセス内で1回だけ計算）"""
+    global _code_hash
+    if _code_hash is None:
+        src_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        sha = hashlib.sha256()
+        for directory in _CODE_DIRECTORIES:
+            for root, _, files in sorted(os.walk(os.path.join(src_root, directory))):
+                for name in sorted(files):
+                    if name.endswith('.py'):
+                        path = os.path.join(root, name)
+                        sha.update(os.path.relpath(path, src_root).encode('utf-8'))
+                        sha.update(file_hash(path).encode('ascii'))
+        for name in _CODE_FILES:
+            sha.update(name.encode('utf-8'))
+            sha.update(file_hash(os.path.join(src_root, name)).encode('ascii'))
+        _code_hash = sha.hexdigest()[:32]
+    return _code_hash
+
+
+# (モデルファイルのハッシュ, プロファイル) -> バンドルに記録されたパーソナルデータファイル
+_bundle_files = {}
+
+
+def _bundle_personal_data_file(model_path: str, model_hash: Optional[str], profile: Optional[str]) -> Optional[str]:
+    """バンドルのプロファイルのパーソナルデータファイル（同じ内容のモデルファイルは1回だけ読み込む）"""
+    if model_hash is None or profile is None:
+        return None
+    key = (model_hash, profile)
+    if key not in _bundle_files:
+        _bundle_files[key] = read_model_data(model_path, profile).get('personal_data_file')
+    return _bundle_files[key]
+
+
+def scheduler_fingerprint(name: str, spec: Dict) -> str:
+    """
+    スケジューラーのフィンガープリント（名前・設定・関連するconfig・学習済みモデルとパーソナルデータのハッシュ）
+
+    Args:
+        name: スケジューラー名
+        spec: create_schedulers_from_specs 形式の設定
+    """
+    personal_data_file = spec.get('personal_data_file')
+    files = {}
+    if spec['type'] == 'rl':
+        if spec.get('distilled_model_path'):
+            files['distilled_model_path'] = file_hash(spec['distilled_model_path'])
+        else:
+            model_path = spec.get('model_path') or DEFAULT_RL_MODEL_PATH
+            files['model_path'] = file_hash(model_path)
+            # バンドルのプロファイルは、バンドルに記録されたパーソナルデータを使う（create_rl_scheduler と同じ）
+            bundle_file = _bundle_personal_data_file(model_path, files['model_path'], spec.get('profile'))
+            personal_data_file = resolve_personal_data_file(bundle_file, personal_data_file, spec.get('profile'))
+    files['personal_data_file'] = file_hash(personal_data_file or config.PERSONAL_DATA_FILE)
+
+    return _digest({
+        'version': CACHE_VERSION,
+        'name': name,
+        'spec': spec,
+        'config': {key: getattr(config, key, None) for key in SCHEDULER_CONFIG_NAMES},
+        'files': files,
+    })
+
+
+def simulation_fingerprint(simulation_days: int, work_hours_per_day: int, num_tasks: Optional[int],
+                           start_time: datetime) -> str:
+    """シミュレーション設定（期間・作業時間・開始時刻・関連するconfig・コード）のハッシュ"""
+    return _digest({
+        'version': CACHE_VERSION,
+        'simulation_days': simulation_days,
+        'work_hours_per_day': work_hours_per_day,
+        'num_tasks': num_tasks,
+        'start_time': start_time.isoformat(),
+        'config': {key: getattr(config, key, None) for key in SIMULATION_CONFIG_NAMES},
+        'code': code_fingerprint(),
+    })
+
+
+def task_set_hash(loader, index: int, start_time: datetime) -> str:
+    """
+    タスクセットの内容のハッシュ（固定長レコードと、締切の基準時刻）
+    パック形式・仮想データセットではタスクを組み立てずにレコードから計算する
+    """
+    loader = getattr(loader, 'loader', loader)  # 先読みローダーは元のローダーを使う
+    if hasattr(loader, 'load_task_records'):
+        records = loader.load_task_records(index, start_time)
+    else:
+        records = records_from_tasks(loader.load_tasks(index), start_time)
+
+    # レコードの締切は基準時刻からの分数（パック形式はファイルの基準時刻、仮想データセットはローダーの基準時刻）
+    packed = getattr(loader, 'packed', None)
+    base_time = packed.start_time if packed is not None else getattr(loader, 'start_time', start_time)
+
+    sha = hashlib.sha256(base_time.isoformat().encode('ascii'))
+    sha.update(np.ascontiguousarray(records).tobytes())
+    return sha.hexdigest()[:32]
+
+
+class ResultCache:
+    """
+    実験結果の指標のキャッシュ（SQLite）
+
+    キーは (スケジューラーのフィンガープリント, タスクセットのハッシュ, シミュレーション設定のハッシュ, 実験のシード)。
+    実験のシードは乱数を初期化しない実験では 'none'（乱数を使わないスケジューラーだけをキャッシュする）
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(filepath)
+        self._connection.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                scheduler_fingerprint TEXT NOT NULL,
+                task_set_hash TEXT NOT NULL,
+                simulation_hash TEXT NOT NULL,
+                run_seed TEXT NOT NULL,
+                metrics TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (scheduler_fingerprint, task_set_hash, simulation_hash, run_seed)
+            )
+        ''')
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+        self._uncommitted = 0
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[Dict]:
+        """保存済みの指標（なければNone）"""
+        row = self._connection.execute(
+            'SELECT metrics FROM results WHERE scheduler_fingerprint = ? AND task_set_hash = ? '
+            'AND simulation_hash = ? AND run_seed = ?', key).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: Tuple[str, str, str, str], metrics: Dict):
+        """指標を保存する（同じキーは上書き）"""
+        self._connection.execute(
+            'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+            (*key, json.dumps(metrics, ensure_ascii=False), datetime.now().isoformat()))
+        self._uncommitted += 1
+        if self._uncommitted >= _COMMIT_INTERVAL:
+            self.commit()
+
+    def commit(self):
+        self._connection.commit()
+        self._uncommitted = 0
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,190 @@
+"""
+実験結果の書き出し先
+シミュレーション結果のうち、スカラーの指標（スコア・完了率など）は型付きの列形式のテーブルに、
+simulation_log・tasks などの入れ子のログは (スケジューラー, 実験回) をキーにした追記専用のJSONLに分けて書く。
+大規模な実験でも結果の辞書をメモリに溜めずに済み、集計では必要な列だけを読み込める
+"""
+
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from numbers import Number
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# 結果を識別する列
+KEY_COLUMNS = ('scheduler_name', 'experiment_id')
+
+
+def split_result(result: Dict) -> Tuple[Dict, Dict]:
+    """
+    シミュレーション結果をスカラーの指標と入れ子のログに分ける
+
+    Returns:
+        (指標, ログ)
+    """
+    metrics, logs = {}, {}
+    for key, value in result.items():
+        if value is None or isinstance(value, (str, bool, Number)):
+            metrics[key] = value.item() if isinstance(value, np.generic) else value
+        else:
+            logs[key] = value
+    return metrics, logs
+
+
+def _typed_frame(columns: Dict[str, list]) -> pd.DataFrame:
+    """列のリストからDataFrameを作る（scheduler_name はカテゴリ型）"""
+    df = pd.DataFrame(columns)
+    if 'scheduler_name' in df.columns:
+        df['scheduler_name'] = df['scheduler_name'].astype('category')
+    return df
+
+
+class ResultSink(ABC):
+    """実験結果の指標の書き出し先（write で1件ずつ追加し、read で列を指定して読む）"""
+
+    @abstractmethod
+    def write(self, metrics: Dict):
+        """指標を1件書き出す"""
+        pass
+
+    @abstractmethod
+    def read(self, columns: Sequence[str] = None) -> pd.DataFrame:
+        """書き出した指標を読む（columns を指定した場合はその列だけ）"""
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class MemoryResultSink(ResultSink):
+    """指標を列ごとのリストとしてメモリに持つ書き出し先"""
+
+    def __init__(self):
+        self.columns: Dict[str, list] = {}
+        self.num_rows = 0
+
+    def write(self, metrics: Dict):
+        for key in metrics.keys() - self.columns.keys():
+            self.columns[key] = [None] * self.num_rows
+        for key, values in self.columns.items():
+            values.append(metrics.get(key))
+        self.num_rows += 1
+
+    def read(self, columns: Sequence[str] = None) -> pd.DataFrame:
+        names = list(self.columns) if columns is None else [c for c in columns if c in self.columns]
+        return _typed_frame({name: self.columns[name] for name in names})
+
+
+class CsvResultSink(ResultSink):
+    """
+    指標をCSVに1行ずつ追記する書き出し先
+    列は最初の1件で決まり、以降の結果に新しい列があるとエラーにする（欠けている列は空欄）
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._writer = None
+        self.fieldnames: Optional[List[str]] = None
+
+    def write(self, metrics: Dict):
+        if self._writer is None:
+            self.fieldnames = list(metrics)
+            self._file = open(self.filepath, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, restval='')
+            self._writer.writeheader()
+        unknown = metrics.keys() - set(self.fieldnames)
+        if unknown:
+            raise ValueError(f"最初の結果にない列があります: {sorted(unknown)}")
+        self._writer.writerow(metrics)
+
+    def read(self, columns: Sequence[str] = None) -> pd.DataFrame:
+        """CSVから指定した列だけを読み込む"""
+        if self._file is not None:
+            self._file.flush()
+        return read_result_columns(self.filepath, columns)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+def read_result_columns(filepath: str, columns: Sequence[str] = None) -> pd.DataFrame:
+    """結果のCSVから指定した列だけを読み込む（存在しない列は無視する）"""
+    usecols = None if columns is None else (lambda name: name in set(columns))
+    df = pd.read_csv(filepath, usecols=usecols, encoding='utf-8')
+    if 'scheduler_name' in df.columns:
+        df['scheduler_name'] = df['scheduler_name'].astype('category')
+    return df
+
+
+class JsonlLogStore:
+    """
+    (スケジューラー, 実験回) ごとのログ（simulation_log・tasks）を1行ずつ追記するJSONL
+    読み込み用に各行の位置を覚えておき、1件だけを読み込める
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._offsets: Dict[Tuple[str, int], int] = {}
+        if os.path.exists(filepath):
+            with open(filepath, 'rb') as f:
+                offset = 0
+                for line in f:
+                    record = json.loads(line)
+                    self._offsets[(record['scheduler_name'], record['experiment_id'])] = offset
+                    offset += len(line)
+        self._file = open(filepath, 'ab')
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def append(self, scheduler_name: str, experiment_id: int, logs: Dict):
+        record = dict(logs, scheduler_name=scheduler_name, experiment_id=int(experiment_id))
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        self._offsets[(scheduler_name, int(experiment_id))] = self._file.tell()
+        self._file.write(line)
+
+    def load(self, scheduler_name: str, experiment_id: int) -> Dict:
+        """1件のログを読み込む"""
+        key = (scheduler_name, int(experiment_id))
+        if key not in self._offsets:
+            raise KeyError(f"ログがありません: {key}")
+        self._file.flush()
+        with open(self.filepath, 'rb') as f:
+            f.seek(self._offsets[key])
+            return json.loads(f.readline())
+
+    def __iter__(self) -> Iterator[Dict]:
+        self._file.flush()
+        with open(self.filepath, 'rb') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
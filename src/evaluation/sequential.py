@@ -0,0 +1,149 @@
+"""
+逐次評価（順位が統計的に決まった時点で実験を打ち切る）
+基準のスケジューラー（rl_scheduler）と他のスケジューラーの、同じタスクセットでの指標の差について
+常に有効な信頼系列（always-valid confidence sequence）を更新していく。信頼系列は何回途中で確認しても
+全時点で同時に有効なので、バッチごとに確認して全ての比較が決まった時点で止めてよい
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .result_sink import ResultSink
+
+
+def confidence_sequence_radius(num_sets: int, std: float, alpha: float, tuning_sets: int) -> float:
+    """
+    漸近的な信頼系列の半幅（Waudby-Smith et al., "Time-uniform central limit theory"）
+
+        σ̂ · sqrt( 2(tρ²+1) / (t²ρ²) · log( sqrt(tρ²+1) / α ) )
+
+    ρ は tuning_sets 回目で半幅が最も狭くなるように決める
+
+    Args:
+        num_sets: これまでのタスクセット数 t
+        std: 差の標準偏差の推定値 σ̂
+        alpha: 有意水準（全時点で同時に 1 - alpha の被覆率）
+        tuning_sets: 半幅を最小にしたいタスクセット数
+    """
+    rho2 = (-2 * math.log(alpha) + math.log(-2 * math.log(alpha) + 1)) / tuning_sets
+    t_rho2 = num_sets * rho2
+    return std * math.sqrt(2 * (t_rho2 + 1) / (num_sets * t_rho2) * math.log(math.sqrt(t_rho2 + 1) / alpha))
+
+
+class SequentialComparison:
+    """
+    基準のスケジューラーとの対応のある差の信頼系列
+
+    全スケジューラーの結果がそろったタスクセットごとに差を加え、平均と分散を逐次更新する。
+    比較は信頼系列が0を含まなくなった時点（または equivalence_margin の範囲に収まった時点）で決まり、
+    以降は変えない。信頼区間は各時点の区間の共通部分（信頼系列なので共通部分も有効）
+    """
+
+    def __init__(self, scheduler_names: Sequence[str], reference: str = 'rl_scheduler',
+                 metric: str = 'total_score', alpha: float = 0.05, tuning_sets: int = 500,
+                 equivalence_margin: float = None, min_sets: int = 30):
+        """
+        Args:
+            scheduler_names: 評価するスケジューラー名
+            reference: 基準のスケジューラー
+            metric: 比較する指標
+            alpha: 全ての比較を合わせた有意水準（比較の数で割る）
+            tuning_sets: 信頼系列の半幅を最小にしたいタスクセット数
+            equivalence_margin: 差の信頼区間がこの範囲に収まったら「差なし」と決める（Noneの場合は決めない）
+            min_sets: 判定を始めるまでのタスクセット数（漸近近似のため）
+        """
+        if reference not in scheduler_names:
+            raise ValueError(f"基準のスケジューラーがありません: {reference}")
+        self.reference = reference
+        self.others = [name for name in scheduler_names if name != reference]
+        self.metric = metric
+        self.alpha = alpha / max(len(self.others), 1)
+        self.tuning_sets = tuning_sets
+        self.equivalence_margin = equivalence_margin
+        self.min_sets = min_sets
+
+        self._pending: Dict[int, Dict[str, float]] = {}
+        self.num_sets = 0
+        k = len(self.others)
+        self._mean = np.zeros(k)
+        self._m2 = np.zeros(k)
+        self.ci_low = np.full(k, -np.inf)
+        self.ci_high = np.full(k, np.inf)
+        self.decisions: List[Optional[str]] = [None] * k
+        self.decided_at: List[Optional[int]] = [None] * k
+
+    @property
+    def all_decided(self) -> bool:
+        return all(decision is not None for decision in self.decisions)
+
+    def observe(self, metrics: Dict):
+        """実験結果の指標を1件加える（そのタスクセットの全スケジューラーがそろったら差を加える）"""
+        name = str(metrics['scheduler_name'])
+        if name != self.reference and name not in self.others:
+            return
+        row = self._pending.setdefault(int(metrics['experiment_id']), {})
+        row[name] = float(metrics[self.metric])
+        if len(row) == len(self.others) + 1:
+            del self._pending[int(metrics['experiment_id'])]
+            self._add(np.array([row[self.reference] - row[other] for other in self.others]))
+
+    def _add(self, differences: np.ndarray):
+        # Welford法で平均と分散を更新する
+        self.num_sets += 1
+        delta = differences - self._mean
+        self._mean += delta / self.num_sets
+        self._m2 += delta * (differences - self._mean)
+
+    def update(self):
+        """現時点の信頼系列で区間を狭め、決まっていない比較を判定する（バッチごとに呼ぶ）"""
+        if self.num_sets < max(self.min_sets, 2):
+            return
+        std = np.sqrt(self._m2 / (self.num_sets - 1))
+        for k in range(len(self.others)):
+            radius = confidence_sequence_radius(self.num_sets, std[k], self.alpha, self.tuning_sets)
+            self.ci_low[k] = max(self.ci_low[k], self._mean[k] - radius)
+            self.ci_high[k] = min(self.ci_high[k], self._mean[k] + radius)
+            if self.decisions[k] is not None:
+                continue
+            if self.ci_low[k] > 0:
+                self.decisions[k] = 'better'
+            elif self.ci_high[k] < 0:
+                self.decisions[k] = 'worse'
+            elif self.equivalence_margin is not None and \
+                    -self.equivalence_margin <= self.ci_low[k] and self.ci_high[k] <= self.equivalence_margin:
+                self.decisions[k] = 'equivalent'
+            if self.decisions[k] is not None:
+                self.decided_at[k] = self.num_sets
+
+    def summary(self) -> pd.DataFrame:
+        """
+        比較ごとの結果
+
+        Returns:
+            comparison, mean_diff（基準 - 相手）, ci_low, ci_high, decision（better: 基準が良い /
+            worse: 基準が悪い / equivalent: 差なし / undecided: 未決定）, decided_at（決まった時点のタスクセット数）の表
+        """
+        return pd.DataFrame([
+            {'comparison': f"{self.reference}_vs_{other}", 'mean_diff': self._mean[k],
+             'ci_low': self.ci_low[k], 'ci_high': self.ci_high[k],
+             'decision': self.decisions[k] or 'undecided', 'decided_at': self.decided_at[k]}
+            for k, other in enumerate(self.others)
+        ])
+
+
+class ObservingResultSink(ResultSink):
+    """書き出した指標を observer にも渡す書き出し先（逐次評価で結果を書きながら集計する）"""
+
+    def __init__(self, sink: ResultSink, observer: Callable[[Dict], None]):
+        self.sink = sink
+        self.observer = observer
+
+    def write(self, metrics: Dict):
+        self.sink.write(metrics)
+        self.observer(metrics)
+
+    def read(self, columns: Sequence[str] = None) -> pd.DataFrame:
+        return self.sink.read(columns)
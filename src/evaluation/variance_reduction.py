@@ -0,0 +1,71 @@
+"""
+共通乱数法・対称変量法による分散削減の測定
+同じタスクセットで、独立な乱数（実験ごとのシード）・共通乱数・共通乱数 + 対称変量の3通りで実験し、
+スケジューラーの平均とスケジューラー間の差の推定量の分散を比べる。
+対称変量法は確率的なスケジューラーを2回実行するため、1セットあたりの実行数で割り引いた効率で比較する
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .evaluator import SchedulerEvaluator
+from ..utils.scheduler_factory import create_schedulers_from_specs
+
+
+# (名前, SchedulerEvaluator の引数)
+VARIANCE_REDUCTION_MODES = (
+    ('independent', {'common_random_numbers': False, 'antithetic': False}),
+    ('common_random_numbers', {'common_random_numbers': True, 'antithetic': False}),
+    ('antithetic', {'common_random_numbers': True, 'antithetic': True}),
+)
+
+
+def _targets(results_df: pd.DataFrame, names: List[str], metric: str) -> Dict[str, Tuple[List[str], np.ndarray]]:
+    """スケジューラーごとの指標と全ペアの差（実験回ごと）: 対象 -> (関係するスケジューラー, 値)"""
+    table = results_df.pivot(index='experiment_id', columns='scheduler_name', values=metric)
+    targets = {name: ([name], table[name].to_numpy(dtype=float)) for name in names}
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            targets[f"{first}_vs_{second}"] = ([first, second], targets[first][1] - targets[second][1])
+    return targets
+
+
+def measure_variance_reduction(scheduler_specs: Dict[str, Dict], metric: str = 'total_score',
+                               **evaluator_kwargs) -> pd.DataFrame:
+    """
+    分散削減の効果を測る
+
+    Args:
+        scheduler_specs: スケジューラーの設定（create_schedulers_from_specs 形式）
+        metric: 比較する指標
+        **evaluator_kwargs: SchedulerEvaluator の引数（seed を指定しない場合は0）
+
+    Returns:
+        target（スケジューラー名またはペア）, mode, variance（実験回ごとの値の分散）,
+        runs_per_set（1セットあたりの実行数）, efficiency（独立な乱数に対する、同じ実行数での分散の比）,
+        run_reduction（同じ信頼度に必要な実行数の削減率 = 1 - 1 / efficiency）の表
+    """
+    evaluator_kwargs.setdefault('seed', 0)
+    names = list(scheduler_specs)
+    stochastic = {name for name, scheduler in create_schedulers_from_specs(scheduler_specs).items()
+                  if scheduler.uses_random_stream}
+
+    rows = []
+    for mode, flags in VARIANCE_REDUCTION_MODES:
+        print(f"分散削減の測定: {mode}")
+        evaluator = SchedulerEvaluator(**evaluator_kwargs, **flags)
+        results_df = evaluator.run_experiments(scheduler_specs=scheduler_specs)
+        runs = {name: 2 if flags['antithetic'] and name in stochastic else 1 for name in names}
+        for target, (members, values) in _targets(results_df, names, metric).items():
+            rows.append({'target': target, 'mode': mode, 'variance': float(np.var(values, ddof=1)),
+                         'runs_per_set': sum(runs[name] for name in members)})
+
+    report = pd.DataFrame(rows)
+    baseline = report[report['mode'] == 'independent'].set_index('target')
+    cost = baseline.loc[report['target'], 'variance'].to_numpy() * baseline.loc[report['target'], 'runs_per_set'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        report['efficiency'] = cost / (report['variance'] * report['runs_per_set']).to_numpy()
+        report['run_reduction'] = 1 - 1 / report['efficiency']
+    return report
@@ -1,52 +1,82 @@
+import copy
+from dataclasses import dataclass
+from typing import Optional
+
 import numpy as np
+from .personal_profile import PersonalProfile, load_personal_profile
 from config import CONCENTRATION_LIMITS
 
 
+@dataclass
+class ConcentrationState:
+    """1エピソード分の集中力の状態（ConcentrationModel のパラメータ以外の、作業・休憩で変わる値）"""
+    current_level: float = 1.0
+    continuous_work_time: float = 0       # 連続作業時間
+    last_genre: Optional[str] = None      # 前回のジャンル
+    last_priority: Optional[int] = None   # 前回の重要度
+
+
+def _state_property(name: str) -> property:
+    """state の属性を読み書きするプロパティ"""
+    return property(lambda self: getattr(self.state, name),
+                    lambda self, value: setattr(self.state, name, value))
+
+
 class ConcentrationModel:
+    """
+    集中力モデル
+    パラメータ（時間・パーソナルデータ）は読み取り専用で、作業・休憩で変わる値は state（ConcentrationState）に持つ。
+    for_episode() でパラメータを共有し、状態だけ別のモデルを作れる
+    """
+
     def __init__(self,
                  max_work_time_minutes: int = 120,  # 連続作業可能時間
                  rest_recovery_minutes: int = 15,   # 休憩による回復時間
                  initial_level: float = 1.0,        # 初期集中レベル
-                 personal_data_file: str = None):   # パーソナルデータファイル
+                 personal_data_file: str = None,    # パーソナルデータファイル
+                 personal_profile: PersonalProfile = None):  # 読み込み済みのプロファイル
 
         self.max_work_time = max_work_time_minutes
         self.rest_recovery = rest_recovery_minutes
         self.initial_level = initial_level
 
-        self.current_level = initial_level
-        self.continuous_work_time = 0  # 連続作業時間
+        self.state = ConcentrationState(current_level=initial_level)
 
-        # パーソナルデータの読み込み
-        if personal_data_file is None:
-            from config import PERSONAL_DATA_FILE
-            personal_data_file = PERSONAL_DATA_FILE
+        # パーソナルデータ（ファイルはプロセス内で1回だけ読み込まれ、共有される）
+        if personal_profile is None:
+            personal_profile = load_personal_profile(personal_data_file)
+        self.personal_profile = personal_profile
 
-        import json
-        with open(personal_data_file, 'r') as f:
-            personal_config = json.load(f)
+        self.genre_preference_type = personal_profile.genre_preference_type
+        self.genre_params = personal_profile.genre_params
 
-        self.genre_preference_type = personal_config['genre_preference_type']
+        # 集中力の持続力（減衰係数）
+        self.decay_factor = personal_profile.decay_factor
 
-        if self.genre_preference_type == 'same':
-            self.genre_params = personal_config['same_genre_preference']
-        else:
-            self.genre_params = personal_config['switch_genre_preference']
+    # 状態の値は state に委譲する（従来どおり model.current_level などで読み書きできる）
+    current_level = _state_property('current_level')
+    continuous_work_time = _state_property('continuous_work_time')
+    last_genre = _state_property('last_genre')
+    last_priority = _state_property('last_priority')
+
+    def new_state(self) -> ConcentrationState:
+        """初期状態（朝の状態）"""
+        return ConcentrationState(current_level=self.initial_level)
 
-        # 集中力の持続力設定を読み込み
-        from config import CONCENTRATION_SUSTAINABILITY_CONFIG
-        sustainability_type = personal_config.get('concentration_sustainability', 'medium')
-        self.decay_factor = CONCENTRATION_SUSTAINABILITY_CONFIG[sustainability_type]['decay_factor']
+    def for_episode(self, state: ConcentrationState = None) -> 'ConcentrationModel':
+        """
+        パラメータとパーソナルデータを共有し、状態だけ別の集中力モデルを作る（複数のエピソードの同時実行用）
 
-        # 前回のジャンルと重要度を記憶
-        self.last_genre = None
-        self.last_priority = None
+        Args:
+            state: 使う状態（Noneの場合は初期状態）
+        """
+        model = copy.copy(self)
+        model.state = state if state is not None else self.new_state()
+        return model
 
     def reset(self):
         """毎朝のリセット時にジャンル履歴と重要度履歴もクリア"""
-        self.current_level = self.initial_level
-        self.continuous_work_time = 0
-        self.last_genre = None
-        self.last_priority = None
+        self.state = self.new_state()
         
     def work(self, duration_minutes: int, task_priority: int = 1) -> float:
         """
@@ -0,0 +1,84 @@
+"""
+パーソナルデータ（ペルソナ）のプロファイル
+各ファイルは1プロセスにつき1回だけ読み込み、変更不可のオブジェクトとして共有する
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+
+@dataclass(frozen=True)
+class PersonalProfile:
+    """パーソナルデータファイルを解釈した結果（変更不可）"""
+    source_file: str
+    genre_preference_type: str               # 'same' or 'switch'
+    genre_param_items: Tuple[Tuple[str, float], ...]
+    concentration_sustainability: str        # 'short' / 'medium' / 'long'
+    decay_factor: float
+
+    @property
+    def genre_params(self) -> Dict[str, float]:
+        """好向性タイプに対応するジャンル切り替えパラメータ（コピーを返す）"""
+        return dict(self.genre_param_items)
+
+    @staticmethod
+    def from_dict(personal_config: dict, source_file: str = '<dict>') -> 'PersonalProfile':
+        """パーソナルデータの辞書からプロファイルを作る"""
+        from config import CONCENTRATION_SUSTAINABILITY_CONFIG
+
+        genre_preference_type = personal_config['genre_preference_type']
+        if genre_preference_type == 'same':
+            genre_params = personal_config['same_genre_preference']
+        else:
+            genre_params = personal_config['switch_genre_preference']
+
+        sustainability_type = personal_config.get('concentration_sustainability', 'medium')
+
+        return PersonalProfile(
+            source_file=source_file,
+            genre_preference_type=genre_preference_type,
+            genre_param_items=tuple(sorted(genre_params.items())),
+            concentration_sustainability=sustainability_type,
+            decay_factor=CONCENTRATION_SUSTAINABILITY_CONFIG[sustainability_type]['decay_factor']
+        )
+
+
+# 絶対パス -> プロファイル
+_PROFILE_REGISTRY: Dict[str, PersonalProfile] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def load_personal_profile(personal_data_file: str = None) -> PersonalProfile:
+    """
+    パーソナルデータファイルのプロファイルを取得する（2回目以降はキャッシュを返す）
+
+    Args:
+        personal_data_file: パーソナルデータファイル。Noneの場合はconfigの設定を使用
+
+    Returns:
+        PersonalProfile
+    """
+    if personal_data_file is None:
+        from config import PERSONAL_DATA_FILE
+        personal_data_file = PERSONAL_DATA_FILE
+
+    key = os.path.abspath(personal_data_file)
+    profile = _PROFILE_REGISTRY.get(key)
+    if profile is not None:
+        return profile
+
+    with _REGISTRY_LOCK:
+        if key not in _PROFILE_REGISTRY:
+            with open(personal_data_file, 'r') as f:
+                personal_config = json.load(f)
+            _PROFILE_REGISTRY[key] = PersonalProfile.from_dict(personal_config, personal_data_file)
+        return _PROFILE_REGISTRY[key]
+
+
+def clear_profile_registry():
+    """キャッシュしたプロファイルを破棄する（ファイルを書き換えた後に再読み込みさせる場合）"""
+    with _REGISTRY_LOCK:
+        _PROFILE_REGISTRY.clear()
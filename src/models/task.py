@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-import random
-from config import TASK_GENERATION_CONFIG
+import numpy as np
+from config import TASK_GENERATION_CONFIG, GENRE_CONFIG
 
 
 class Priority(Enum):
@@ -28,13 +28,22 @@ class Task:
         return current_time > self.deadline and not self.is_completed
     
     @staticmethod
-    def generate_random_task(task_id: int, current_time: datetime) -> 'Task':
+    def generate_random_task(task_id: int, current_time: datetime, rng: np.random.Generator = None) -> 'Task':
+        """
+        ランダムなタスクを1つ生成する
+
+        Args:
+            task_id: タスクID
+            current_time: 締切の基準時刻
+            rng: 乱数生成器（Noneの場合はOSのエントロピーから作る）
+        """
+        rng = rng if rng is not None else np.random.default_rng()
         name = f"Task_{task_id}"
 
         config = TASK_GENERATION_CONFIG
 
         # 先に重要度を決定
-        rand = random.random()
+        rand = rng.random()
         if rand < config['priority_low_ratio']:
             priority = Priority.LOW
         elif rand < config['priority_low_ratio'] + config['priority_medium_ratio']:
@@ -42,29 +51,20 @@ class Task:
         else:
             priority = Priority.HIGH
 
-        # 重要度に応じて時間範囲を決定
-        if priority == Priority.LOW:
-            # LOW: 短時間タスク（20-40分）
-            base_duration = random.randint(20, 40)
-        elif priority == Priority.MEDIUM:
-            # MEDIUM: 中時間タスク（40-80分）
-            base_duration = random.randint(40, 80)
-        else:  # Priority.HIGH
-            # HIGH: 長時間タスク（80-160分）
-            base_duration = random.randint(80, 160)
+        # 重要度に応じて時間範囲を決定（LOW: 短時間、MEDIUM: 中時間、HIGH: 長時間）
+        min_duration, max_duration = config['priority_duration_ranges'][priority.name]
+        base_duration = int(rng.integers(min_duration, max_duration, endpoint=True))
 
-        # 締切: Day 2-7の間で均等に分散（優先度に関係なく）
-        base_days = random.uniform(2.0, 7.0)
+        # 締切: 指定範囲の日数で均等に分散（優先度に関係なく）
+        base_days = rng.uniform(config['deadline_min_days'], config['deadline_max_days'])
         deadline = current_time + timedelta(days=base_days)
 
         # ジャンルをランダムに割り当て
-        from config import GENRE_CONFIG
-        genre_config = GENRE_CONFIG
-        genres = genre_config['genres']
-        distribution = genre_config['genre_distribution']
+        genres = GENRE_CONFIG['genres']
+        distribution = GENRE_CONFIG['genre_distribution']
 
         # 確率分布に従ってジャンルを選択
-        rand = random.random()
+        rand = rng.random()
         cumulative = 0
         selected_genre = genres[0]
         for genre in genres:
@@ -80,4 +80,4 @@ class Task:
             priority=priority,
             deadline=deadline,
             genre=selected_genre
-        )
\ No newline at end of file
+        )
@@ -1,3 +1,4 @@
+import copy
 from abc import ABC, abstractmethod
 from ..models.concentration import ConcentrationModel
 
@@ -7,6 +8,13 @@ class BreakStrategy(ABC):
     
     def __init__(self, concentration_model: ConcentrationModel):
         self.concentration_model = concentration_model
+
+    def for_episode(self, concentration_model: ConcentrationModel) -> 'BreakStrategy':
+        """同じ設定で、エピソードごとの集中力モデルを参照する休憩戦略を作る"""
+        strategy = copy.copy(self)
+        strategy.concentration_model = concentration_model
+        strategy.reset()
+        return strategy
     
     @abstractmethod
     def should_take_break(self) -> bool:
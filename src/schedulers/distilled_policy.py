@@ -0,0 +1,272 @@
+"""
+Q-tableの貪欲方策を浅い決定木に蒸留する
+推論時はQ-tableを読み込まず、8つの状態特徴量に対する数回の比較だけで行動を決める
+"""
+
+import os
+import pickle
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+# 状態タプルの各要素（PolicyBasedQLearningSelector._get_state の並び順）
+STATE_FEATURES = (
+    'num_tasks_bin',
+    'high_priority_bin',
+    'deadline_bin',
+    'duration_bin',
+    'concentration_bin',
+    'fatigue_bin',
+    'last_priority',
+    'last_genre',
+)
+
+
+class DistilledPolicy:
+    """
+    状態 -> 行動 の浅い決定木（CART、Gini不純度）
+
+    ノードはPythonのリストで平坦に保持し、predict は numpy を使わずに辿る（1回数マイクロ秒）。
+    """
+
+    LEAF = -1
+
+    def __init__(self, max_depth: int = 6, min_samples_leaf: int = 1, num_actions: int = 7):
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.num_actions = num_actions
+
+        # 平坦化したノード: feature == LEAF なら葉で value が行動
+        self.features: List[int] = []
+        self.thresholds: List[float] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.values: List[int] = []
+
+    def fit(self, states: np.ndarray, actions: np.ndarray, sample_weight: np.ndarray = None) -> 'DistilledPolicy':
+        """
+        状態と行動のペアから決定木を学習する
+
+        Args:
+            states: (状態数, 特徴量数) の整数配列
+            actions: 各状態の行動
+            sample_weight: 各状態の重み（Noneの場合は均等）
+        """
+        states = np.asarray(states)
+        actions = np.asarray(actions, dtype=np.int64)
+        if len(states) == 0:
+            raise ValueError("蒸留する状態が1つもありません")
+        if sample_weight is None:
+            sample_weight = np.ones(len(states))
+
+        self.features, self.thresholds, self.left, self.right, self.values = [], [], [], [], []
+        self._build(states, actions, np.asarray(sample_weight, dtype=float), depth=0)
+        return self
+
+    def _new_node(self) -> int:
+        self.features.append(self.LEAF)
+        self.thresholds.append(0.0)
+        self.left.append(self.LEAF)
+        self.right.append(self.LEAF)
+        self.values.append(0)
+        return len(self.features) - 1
+
+    def _build(self, X: np.ndarray, y: np.ndarray, w: np.ndarray, depth: int) -> int:
+        node = self._new_node()
+
+        # 葉の値は重み付き多数決（同数の場合は小さい行動番号 = np.argmaxと同じ）
+        class_weights = np.bincount(y, weights=w, minlength=self.num_actions)
+        self.values[node] = int(np.argmax(class_weights))
+
+        if depth >= self.max_depth or np.count_nonzero(class_weights) <= 1:
+            return node
+
+        split = self._best_split(X, y, w)
+        if split is None:
+            return node
+
+        feature, threshold = split
+        mask = X[:, feature] <= threshold
+        self.features[node] = feature
+        self.thresholds[node] = threshold
+        self.left[node] = self._build(X[mask], y[mask], w[mask], depth + 1)
+        self.right[node] = self._build(X[~mask], y[~mask], w[~mask], depth + 1)
+        return node
+
+    def _best_split(self, X: np.ndarray, y: np.ndarray, w: np.ndarray):
+        """Gini不純度を最も下げる (特徴量, 閾値) を返す（改善しない場合はNone）"""
+        total = np.bincount(y, weights=w, minlength=self.num_actions)
+        total_weight = total.sum()
+        best_impurity = 1.0 - np.sum((total / total_weight) ** 2)
+        best = None
+
+        for feature in range(X.shape[1]):
+            values, inverse = np.unique(X[:, feature], return_inverse=True)
+            if len(values) < 2:
+                continue
+
+            # 値ごとのクラス重みを累積し、全ての閾値を一度に評価する
+            counts = np.zeros((len(values), self.num_actions))
+            np.add.at(counts, (inverse, y), w)
+            left = np.cumsum(counts, axis=0)[:-1]
+            right = total - left
+            left_weight = left.sum(axis=1)
+            right_weight = right.sum(axis=1)
+
+            left_samples = np.cumsum(np.bincount(inverse, minlength=len(values)))[:-1]
+            right_samples = len(y) - left_samples
+            valid = ((left_samples >= self.min_samples_leaf) & (right_samples >= self.min_samples_leaf)
+                     & (left_weight > 0) & (right_weight > 0))
+            if not valid.any():
+                continue
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                left_gini = 1.0 - np.sum((left / left_weight[:, None]) ** 2, axis=1)
+                right_gini = 1.0 - np.sum((right / right_weight[:, None]) ** 2, axis=1)
+                impurity = (left_weight * left_gini + right_weight * right_gini) / total_weight
+            impurity[~valid] = np.inf
+
+            i = int(np.argmin(impurity))
+            if impurity[i] < best_impurity - 1e-12:
+                best_impurity = impurity[i]
+                best = (feature, float(values[i]))
+
+        return best
+
+    def predict(self, state: Sequence[int]) -> int:
+        """状態に対する行動を返す"""
+        features, thresholds, left, right = self.features, self.thresholds, self.left, self.right
+        node = 0
+        while features[node] != self.LEAF:
+            if state[features[node]] <= thresholds[node]:
+                node = left[node]
+            else:
+                node = right[node]
+        return self.values[node]
+
+    def get_depth(self) -> int:
+        """木の深さ"""
+        def depth(node: int) -> int:
+            if self.features[node] == self.LEAF:
+                return 0
+            return 1 + max(depth(self.left[node]), depth(self.right[node]))
+        return depth(0) if self.features else 0
+
+    def get_num_leaves(self) -> int:
+        """葉（ルール）の数"""
+        return sum(1 for f in self.features if f == self.LEAF)
+
+    def to_rules(self, action_names: Dict[int, str] = None) -> List[str]:
+        """決定木を上から順に評価するルールリストとして返す"""
+        rules = []
+
+        def walk(node: int, conditions: List[str]):
+            if self.features[node] == self.LEAF:
+                action = self.values[node]
+                name = action_names.get(action, str(action)) if action_names else str(action)
+                condition = " AND ".join(conditions) if conditions else "常に"
+                rules.append(f"IF {condition} THEN {name}")
+                return
+            feature_name = STATE_FEATURES[self.features[node]] \
+                if self.features[node] < len(STATE_FEATURES) else f"x{self.features[node]}"
+            threshold = self.thresholds[node]
+            walk(self.left[node], conditions + [f"{feature_name} <= {threshold:g}"])
+            walk(self.right[node], conditions + [f"{feature_name} > {threshold:g}"])
+
+        if self.features:
+            walk(0, [])
+        return rules
+
+    def save(self, filepath: str):
+        """蒸留モデルを保存"""
+        try:
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(filepath, 'wb') as f:
+                pickle.dump({
+                    'max_depth': self.max_depth,
+                    'min_samples_leaf': self.min_samples_leaf,
+                    'num_actions': self.num_actions,
+                    'features': self.features,
+                    'thresholds': self.thresholds,
+                    'left': self.left,
+                    'right': self.right,
+                    'values': self.values,
+                }, f)
+        except (IOError, OSError) as e:
+            raise IOError(f"蒸留モデルの保存に失敗しました: {filepath}") from e
+
+    @staticmethod
+    def load(filepath: str) -> 'DistilledPolicy':
+        """蒸留モデルを読み込み"""
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"蒸留モデルファイルが見つかりません: {filepath}")
+
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+
+        required_keys = ['features', 'thresholds', 'left', 'right', 'values']
+        if not isinstance(data, dict) or not all(key in data for key in required_keys):
+            raise ValueError(f"蒸留モデルファイルの形式が不正です: {filepath}")
+
+        policy = DistilledPolicy(data.get('max_depth', 6), data.get('min_samples_leaf', 1),
+                                 data.get('num_actions', 7))
+        for key in required_keys:
+            setattr(policy, key, list(data[key]))
+        return policy
+
+
+def q_table_to_dataset(q_table: Dict[Tuple, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Q-tableから蒸留用の (状態, 貪欲行動, Q値) を取り出す
+    Q値が全て0の状態（初期化されただけで学習されていない状態）は除く
+    """
+    items = [(state, q_values) for state, q_values in q_table.items() if np.any(q_values)]
+    if not items:
+        return np.zeros((0, len(STATE_FEATURES))), np.zeros(0, dtype=np.int64), np.zeros((0, 0))
+
+    states = np.array([state for state, _ in items])
+    q_values = np.array([q for _, q in items])
+    return states, np.argmax(q_values, axis=1), q_values
+
+
+def distill_q_table(q_table: Dict[Tuple, np.ndarray],
+                    max_depth: int = 6,
+                    min_samples_leaf: int = 1) -> Tuple[DistilledPolicy, Dict]:
+    """
+    Q-tableの貪欲方策を決定木に蒸留し、元の方策との一致度を報告する
+
+    Returns:
+        (蒸留した方策, 忠実度レポート)
+    """
+    states, actions, q_values = q_table_to_dataset(q_table)
+    policy = DistilledPolicy(max_depth=max_depth, min_samples_leaf=min_samples_leaf,
+                             num_actions=q_values.shape[1] if len(q_values) else 7)
+    policy.fit(states, actions)
+    return policy, evaluate_fidelity(policy, q_table)
+
+
+def evaluate_fidelity(policy: DistilledPolicy, q_table: Dict[Tuple, np.ndarray]) -> Dict:
+    """
+    蒸留した方策と元のQ-tableの貪欲方策を比較する
+
+    Returns:
+        'fidelity'（行動の一致率）, 'mean_q_regret'（Q値の損失の平均）, 状態数・木の大きさ
+    """
+    states, actions, q_values = q_table_to_dataset(q_table)
+    if len(states) == 0:
+        return {'num_states': 0, 'fidelity': 0.0, 'mean_q_regret': 0.0,
+                'depth': policy.get_depth(), 'num_leaves': policy.get_num_leaves()}
+
+    predicted = np.array([policy.predict(tuple(state)) for state in states])
+    regret = q_values.max(axis=1) - q_values[np.arange(len(states)), predicted]
+
+    return {
+        'num_states': int(len(states)),
+        'fidelity': float(np.mean(predicted == actions)),
+        'mean_q_regret': float(np.mean(regret)),
+        'depth': policy.get_depth(),
+        'num_leaves': policy.get_num_leaves(),
+    }
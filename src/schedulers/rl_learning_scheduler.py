@@ -1,10 +1,11 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from .scheduler import Scheduler
 from .rl_policy_selector import PolicyBasedQLearningSelector
 from .break_strategies import ConcentrationBreakStrategy
 from ..models.task import Task
 from ..models.concentration import ConcentrationModel
+from ..environment.task_index import TaskIndex
 
 
 class RLLearningScheduler(Scheduler):
@@ -15,16 +16,24 @@ class RLLearningScheduler(Scheduler):
                  learning_rate: float = 0.1,
                  discount_factor: float = 0.9,
                  epsilon: float = 0.1,
-                 learning_mode: bool = True):
+                 learning_mode: bool = True,
+                 personal_data_file: str = None):
 
         self.learning_mode = learning_mode
 
+        # 報酬関数は、特に指定がなければ集中力モデルと同じプロファイルを参照する
+        personal_profile = None
+        if personal_data_file is None:
+            personal_profile = concentration_model.personal_profile
+
         # ポリシーベースQ-learningタスク選択戦略を作成
         ql_task_selector = PolicyBasedQLearningSelector(
             learning_rate=learning_rate,
             discount_factor=discount_factor,
             epsilon=epsilon,
-            learning_mode=learning_mode
+            learning_mode=learning_mode,
+            personal_data_file=personal_data_file,
+            personal_profile=personal_profile
         )
 
         # 集中力ベース休憩戦略を作成
@@ -62,6 +71,18 @@ class RLLearningScheduler(Scheduler):
             fatigue_accumulation=fatigue_accumulation
         )
 
+    def select_next_task_from_index(self, index: TaskIndex, current_time: datetime) -> Optional[Task]:
+        """タスクインデックスから次に実行するタスクを選択する（長期間シミュレーション用）"""
+        if self.break_strategy.should_take_break():
+            return None
+
+        return self.task_selector.select_task_from_index(
+            index,
+            current_time,
+            concentration_level=self.concentration_model.current_level,
+            fatigue_accumulation=self.concentration_model.get_fatigue_accumulation()
+        )
+
     def work_on_task(self, task: Task) -> float:
         """
         タスクを実行し、Q値を更新する
@@ -110,6 +131,13 @@ class RLLearningScheduler(Scheduler):
         
         return break_duration
     
+    def for_episode(self) -> 'RLLearningScheduler':
+        """Q-tableを共有し、エピソードごとの状態だけ別のスケジューラーを作る"""
+        episode = super().for_episode()
+        episode.last_task = None
+        episode.last_action_time = None
+        return episode
+
     def reset(self):
         """スケジューラーをリセット"""
         super().reset()
@@ -140,9 +168,14 @@ class RLLearningScheduler(Scheduler):
         """学習済みモデルを保存"""
         self.task_selector.save_q_table(filepath)
 
-    def load_model(self, filepath: str):
-        """学習済みモデルを読み込み"""
-        self.task_selector.load_q_table(filepath)
+    def load_model(self, filepath: str, profile: str = None, save_data: Dict = None):
+        """学習済みモデルを読み込み（モデルバンドルの場合はprofileを指定。save_data は読み込み済みの保存データ）"""
+        self.task_selector.load_q_table(filepath, profile=profile, save_data=save_data)
+
+    def load_distilled_model(self, filepath: str):
+        """蒸留モデルを読み込み、Q-tableなしの推論専用モードにする"""
+        self.task_selector.load_distilled_policy(filepath)
+        self.learning_mode = False
 
     def train_episodes(self, 
                       simulation_environment,
@@ -5,15 +5,53 @@
 import numpy as np
 import pickle
 import os
+from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 from .task_selectors import TaskSelector
+from ..utils.rng import uniform_index
+from ..environment.task_index import TaskIndex, TaskSubset, PRIORITY_VALUES
 from ..models.task import Task, Priority
+from ..models.personal_profile import PersonalProfile, load_personal_profile
 from config import SCHEDULING_CONFIG, RL_REWARD_CONFIG
 
 
+@dataclass
+class QLearningEpisodeState:
+    """
+    1エピソード分の Q-learning の状態（ポリシー（Q-table・蒸留モデル・ハイパーパラメータ）以外の、判断ごとに変わる値）
+    reward_history は学習の記録としてエピソードをまたいで残す（reset_episode ではクリアしない）
+    """
+    # 学習用の履歴
+    state_history: List[Tuple] = field(default_factory=list)
+    action_history: List[int] = field(default_factory=list)
+    reward_history: List[float] = field(default_factory=list)
+
+    # エピソード内のTD誤差（学習サンプラーがタスクセットの情報量の目安に使う）
+    episode_td_error_sum: float = 0.0
+    episode_td_error_count: int = 0
+
+    # 直前のタスク情報
+    last_task_priority: Optional[int] = None  # Priority.value (1-3)
+    last_task_genre: Optional[str] = None     # ジャンル ('1'-'4')
+    consecutive_high_priority_count: int = 0  # 連続高優先度タスク数
+
+
+def _episode_property(name: str) -> property:
+    """episode の属性を読み書きするプロパティ"""
+    return property(lambda self: getattr(self.episode, name),
+                    lambda self, value: setattr(self.episode, name, value))
+
+
 class PolicyBasedQLearningSelector(TaskSelector):
-    """ポリシーベースQ-learningタスク選択戦略"""
+    """
+    ポリシーベースQ-learningタスク選択戦略
+    ポリシー（Q-table・蒸留モデル・ハイパーパラメータ）と、エピソードごとの状態（episode: QLearningEpisodeState）を分けて持つ。
+    for_episode() はポリシーを共有し、状態だけ別の選択戦略を作る。学習モードでない場合、判断は Q-table を変更しないので、
+    1つのポリシーで複数のエピソードを同時に実行できる（学習モードでは共有の Q-table を更新する）
+    """
+
+    uses_random_stream = True
 
     # アクション定義: どの基準でタスクを選ぶか
     ACTIONS = {
@@ -30,25 +68,50 @@ class PolicyBasedQLearningSelector(TaskSelector):
                  learning_rate: float = 0.1,
                  discount_factor: float = 0.9,
                  epsilon: float = 0.1,
-                 learning_mode: bool = True):
+                 learning_mode: bool = True,
+                 personal_data_file: str = None,
+                 personal_profile: PersonalProfile = None):
 
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.epsilon = epsilon
         self.learning_mode = learning_mode
 
+        # 報酬計算に使うパーソナルデータ（毎ステップ読み込まず、プロファイルを保持する）
+        if personal_profile is None:
+            personal_profile = load_personal_profile(personal_data_file)
+        self.personal_profile = personal_profile
+        self.personal_data_file = personal_profile.source_file
+
         # Q-table: state -> action -> Q値
         self.q_table = {}
 
-        # 学習用の履歴
-        self.state_history = []
-        self.action_history = []
-        self.reward_history = []
-
-        # 直前のタスク情報を記憶
-        self.last_task_priority = None  # Priority.value (1-3)
-        self.last_task_genre = None     # ジャンル ('1'-'4')
-        self.consecutive_high_priority_count = 0  # 連続高優先度タスク数
+        # 蒸留モード: 設定されている場合はQ-tableの代わりに決定木で行動を決める
+        self.distilled_policy = None
+
+        # エピソードごとの状態（履歴・直前のタスク情報）
+        self.episode = QLearningEpisodeState()
+
+    # エピソードの状態は episode に委譲する（従来どおり selector.state_history などで読み書きできる）
+    state_history = _episode_property('state_history')
+    action_history = _episode_property('action_history')
+    reward_history = _episode_property('reward_history')
+    episode_td_error_sum = _episode_property('episode_td_error_sum')
+    episode_td_error_count = _episode_property('episode_td_error_count')
+    last_task_priority = _episode_property('last_task_priority')
+    last_task_genre = _episode_property('last_task_genre')
+    consecutive_high_priority_count = _episode_property('consecutive_high_priority_count')
+
+    def for_episode(self, episode: QLearningEpisodeState = None) -> 'PolicyBasedQLearningSelector':
+        """
+        ポリシーを共有し、エピソードの状態だけ別の選択戦略を作る
+
+        Args:
+            episode: 使う状態（Noneの場合は新しい状態）
+        """
+        selector = super().for_episode()
+        selector.episode = episode if episode is not None else QLearningEpisodeState()
+        return selector
 
     def select_task(self, tasks: List[Task], current_time: datetime,
                     concentration_level: float = 1.0,
@@ -82,18 +145,39 @@ class PolicyBasedQLearningSelector(TaskSelector):
         # 状態を取得（集中力レベルと疲労蓄積度を含む）
         state = self._get_state(ready_tasks, current_time, concentration_level, fatigue_accumulation)
 
-        # ε-greedy探索
-        if np.random.random() < self.epsilon:
+        return self._act(state, lambda action: self._select_task_by_policy(
+            ready_tasks, action, current_time, concentration_level
+        ))
+
+    def select_task_from_index(self, index: TaskIndex, current_time: datetime,
+                               concentration_level: float = 1.0,
+                               fatigue_accumulation: float = 0.0) -> Optional[Task]:
+        """タスクインデックスを使って select_task と同じ選択をする（長期間シミュレーション用）"""
+        ready = index.get_ready(current_time)
+        if ready is None:
+            return None
+
+        state = self._state_from_summary(len(ready), ready.high_count, ready.earliest_deadline().deadline,
+                                         ready.duration_sum, current_time,
+                                         concentration_level, fatigue_accumulation)
+
+        return self._act(state, lambda action: self._select_task_by_policy_from_index(
+            ready, action, current_time, concentration_level
+        ))
+
+    def _act(self, state: Tuple, select_by_policy) -> Optional[Task]:
+        """ε-greedyで行動を決め、その基準でタスクを選んで履歴に記録する"""
+        # ε-greedy探索（判断ごとの乱数列から、探索するかとランダムな行動を決める）
+        u_explore, u_action = self._next_uniforms()
+        if u_explore < self.epsilon:
             # ランダム探索
-            action = np.random.randint(0, len(self.ACTIONS))
+            action = uniform_index(u_action, len(self.ACTIONS))
         else:
             # Q値最大の行動を選択
             action = self._get_best_action(state)
 
         # アクションに基づいてタスクを選択（依存関係を満たすタスクから）
-        selected_task = self._select_task_by_policy(
-            ready_tasks, action, current_time, concentration_level
-        )
+        selected_task = select_by_policy(action)
 
         # 履歴に記録
         self.state_history.append(state)
@@ -113,32 +197,42 @@ class PolicyBasedQLearningSelector(TaskSelector):
         if not tasks:
             return (0, 0, 0, 0, 0, 0, 0, 0)
 
+        return self._state_from_summary(
+            len(tasks),
+            sum(1 for t in tasks if t.priority == Priority.HIGH),
+            min(task.deadline for task in tasks),
+            sum(t.base_duration_minutes for t in tasks),
+            current_time, concentration_level, fatigue_accumulation
+        )
+
+    def _state_from_summary(self, num_tasks: int, high_count: int, min_deadline: datetime,
+                            duration_sum: int, current_time: datetime,
+                            concentration_level: float, fatigue_accumulation: float) -> Tuple:
+        """候補タスクの集計値（件数・HIGHの件数・最も早い締切・所要時間の合計）から状態を作る"""
+
         # 設定値を読み込み
         from config import RL_STATE_SPACE_CONFIG
         config = RL_STATE_SPACE_CONFIG
 
         # タスク数の区間
         num_tasks_bin = min(
-            len(tasks) // config['num_tasks_bin_divisor'],
+            num_tasks // config['num_tasks_bin_divisor'],
             config['num_tasks_bin_max']
         )
 
         # 重要度分布
-        high_ratio = sum(1 for t in tasks if t.priority == Priority.HIGH) / len(tasks)
+        high_ratio = high_count / num_tasks
         high_bin = int(high_ratio * config['high_priority_ratio_bins'])
 
         # 締切の緊急度
-        min_deadline_hours = min(
-            max(0, (task.deadline - current_time).total_seconds() / 3600)
-            for task in tasks
-        )
+        min_deadline_hours = max(0, (min_deadline - current_time).total_seconds() / 3600)
         deadline_bin = min(
             int(min_deadline_hours / config['deadline_bin_hours']),
             config['deadline_bin_max']
         )
 
         # タスクの平均時間
-        avg_duration = np.mean([t.base_duration_minutes for t in tasks])
+        avg_duration = duration_sum / num_tasks
         duration_bin = min(
             int(avg_duration / config['avg_duration_bin_minutes']),
             config['avg_duration_bin_max']
@@ -227,6 +321,75 @@ class PolicyBasedQLearningSelector(TaskSelector):
         # デフォルト: 最初のタスク
         return candidate_tasks[0] if candidate_tasks else tasks[0]
 
+    def _select_task_by_policy_from_index(self, ready: TaskSubset, action: int, current_time: datetime,
+                                          concentration_level: float = 1.0) -> Task:
+        """
+        _select_task_by_policy と同じ基準で、タスクインデックスの部分集合から選ぶ
+        重要度ごとの先頭だけを比べ、同じ値の場合は（max / min と同じく）リスト内で先のタスクを選ぶ
+        """
+        from config import TASK_PRIORITY_THRESHOLDS
+
+        policy = self.ACTIONS[action]
+        config = SCHEDULING_CONFIG
+        position = ready._index.position
+
+        def best_of(candidates, value):
+            """value が最大の候補（同じ値ならリスト内で先のもの）"""
+            candidates = [t for t in candidates if t is not None]
+            return max(candidates, key=lambda t: (value(t), -position(t)))
+
+        if policy == "highest_priority":
+            return ready.highest_priority()
+
+        elif policy == "nearest_deadline":
+            return ready.earliest_deadline()
+
+        elif policy == "shortest_task":
+            return ready.shortest()
+
+        elif policy == "highest_score":
+            return ready.highest_score()
+
+        elif policy == "priority_deadline_mix":
+            seconds_per_day = config['seconds_per_day']
+
+            def urgency_score(t):
+                days_until_deadline = (t.deadline - current_time).total_seconds() / seconds_per_day
+                urgency = 1.0 / max(days_until_deadline, 0.1)
+                return t.priority.value * 2 + urgency
+
+            # 重要度ごとの最良: 締切まで0.1日以下（緊急度が上限で同値）のタスクがあればその中で先のもの、
+            # なければ締切が最も早いもの
+            candidates = []
+            for p in ready.class_counts:
+                if ready.class_counts[p]:
+                    urgent = ready.urgent_first_in_class(p, current_time, seconds_per_day, 0.1)
+                    candidates.append(urgent if urgent is not None else ready.earliest_deadline_in_class(p))
+            return best_of(candidates, urgency_score)
+
+        elif policy == "concentration_matched":
+            # 重要度ごとに倍率が同じなので、各重要度でスコア最大のタスクだけを比べればよい
+            def concentration_match_score(t):
+                required = TASK_PRIORITY_THRESHOLDS.get(t.priority.value, 0.5)
+                if concentration_level >= required:
+                    return t.get_score() * (1.0 + (concentration_level - required))
+                else:
+                    return t.get_score() * (concentration_level / required)
+
+            return best_of([ready.highest_score_in_class(p) for p in ready.class_counts],
+                           concentration_match_score)
+
+        elif policy == "safe_high_priority":
+            for p in PRIORITY_VALUES:
+                if ready.class_counts[p] and concentration_level >= TASK_PRIORITY_THRESHOLDS.get(p, 0.5):
+                    return ready.highest_score_in_class(p)
+            # 適切なタスクがない場合は最も優先度が低いタスクを選ぶ
+            for p in reversed(PRIORITY_VALUES):
+                if ready.class_counts[p]:
+                    return ready.first_in_class(p)
+
+        return ready.kth(0)
+
     def _update_task_history(self, task: Task):
         """選択したタスクの情報を記憶"""
         # 連続高優先度カウントを更新
@@ -245,10 +408,15 @@ class PolicyBasedQLearningSelector(TaskSelector):
     def _get_best_action(self, state: Tuple) -> int:
         """状態に対して最適な行動を取得"""
 
-        if state not in self.q_table:
-            self.q_table[state] = np.zeros(len(self.ACTIONS))
+        if self.distilled_policy is not None:
+            return self.distilled_policy.predict(state)
 
-        return np.argmax(self.q_table[state])
+        # 未知の状態は全行動のQ値が0（Q-tableには追加しない。Q値の更新時に追加される）
+        q_values = self.q_table.get(state)
+        if q_values is None:
+            return 0
+
+        return np.argmax(q_values)
 
     def update_q_value(self, reward: float, next_state: Tuple = None, done: bool = False):
         """Q値を更新（学習モードの時のみ）"""
@@ -282,9 +450,12 @@ class PolicyBasedQLearningSelector(TaskSelector):
             target_q = reward + self.discount_factor * next_max_q
 
         # Q値更新
+        td_error = target_q - current_q
         self.q_table[current_state][current_action] = (
-            current_q + self.learning_rate * (target_q - current_q)
+            current_q + self.learning_rate * td_error
         )
+        self.episode_td_error_sum += abs(td_error)
+        self.episode_td_error_count += 1
 
         # 報酬履歴に記録
         self.reward_history.append(reward)
@@ -324,13 +495,8 @@ class PolicyBasedQLearningSelector(TaskSelector):
 
         # 4. ジャンル継続/切り替えの報酬（personal_dataに基づく）
         if self.last_task_genre is not None:
-            import json
-            from config import PERSONAL_DATA_FILE
-            with open(PERSONAL_DATA_FILE, 'r') as f:
-                personal_data = json.load(f)
-
             is_same_genre = (self.last_task_genre == task.genre)
-            genre_pref_type = personal_data['genre_preference_type']
+            genre_pref_type = self.personal_profile.genre_preference_type
 
             if genre_pref_type == 'same':
                 # 同じジャンルを好む場合
@@ -363,13 +529,14 @@ class PolicyBasedQLearningSelector(TaskSelector):
         self.learning_mode = enabled
 
     def reset_episode(self):
-        """エピソード終了時のリセット"""
-        self.state_history = []
-        self.action_history = []
-        # タスク履歴もリセット
-        self.last_task_priority = None
-        self.last_task_genre = None
-        self.consecutive_high_priority_count = 0
+        """エピソード終了時のリセット（報酬履歴は残す）"""
+        self.episode = QLearningEpisodeState(reward_history=self.episode.reward_history)
+
+    def get_episode_td_error(self) -> float:
+        """現在のエピソードの平均TD誤差（絶対値）を取得"""
+        if self.episode_td_error_count == 0:
+            return 0.0
+        return self.episode_td_error_sum / self.episode_td_error_count
 
     def get_learning_stats(self) -> Dict:
         """学習統計を取得"""
@@ -397,25 +564,68 @@ class PolicyBasedQLearningSelector(TaskSelector):
         except (IOError, OSError) as e:
             raise IOError(f"Q-tableの保存に失敗しました: {filepath}") from e
 
-    def load_q_table(self, filepath: str):
-        """Q-tableを読み込み"""
-        try:
-            if not os.path.exists(filepath):
-                raise FileNotFoundError(f"Q-tableファイルが見つかりません: {filepath}")
-
-            with open(filepath, 'rb') as f:
-                save_data = pickle.load(f)
-
-            # データの妥当性チェック
-            required_keys = ['q_table', 'learning_rate', 'discount_factor', 'epsilon']
-            if not all(key in save_data for key in required_keys):
-                raise ValueError(f"Q-tableファイルの形式が不正です: {filepath}")
-
-            self.q_table = save_data['q_table']
-            self.learning_rate = save_data['learning_rate']
-            self.discount_factor = save_data['discount_factor']
-            self.epsilon = save_data['epsilon']
-        except (IOError, OSError) as e:
-            raise IOError(f"Q-tableの読み込みに失敗しました: {filepath}") from e
-        except pickle.UnpicklingError as e:
-            raise ValueError(f"Q-tableファイルの形式が不正です: {filepath}") from e
+    def load_q_table(self, filepath: str, profile: str = None, save_data: Dict = None):
+        """
+        Q-tableを読み込み
+
+        Args:
+            filepath: モデルファイルのパス
+            profile: 複数ペルソナのモデルバンドルの場合に読み込むプロファイル名
+            save_data: read_model_data で読み込み済みの保存データ（指定した場合はファイルを読まない）
+        """
+        if save_data is None:
+            save_data = read_model_data(filepath, profile)
+
+        # データの妥当性チェック
+        required_keys = ['q_table', 'learning_rate', 'discount_factor', 'epsilon']
+        if not all(key in save_data for key in required_keys):
+            raise ValueError(f"Q-tableファイルの形式が不正です: {filepath}")
+
+        self.q_table = save_data['q_table']
+        self.learning_rate = save_data['learning_rate']
+        self.discount_factor = save_data['discount_factor']
+        self.epsilon = save_data['epsilon']
+
+    def load_distilled_policy(self, filepath: str):
+        """
+        蒸留モデルを読み込み、蒸留モードに切り替える
+        （推論専用: Q-tableは破棄し、Q値の更新も行わない）
+        """
+        from .distilled_policy import DistilledPolicy
+
+        self.distilled_policy = DistilledPolicy.load(filepath)
+        self.q_table = {}
+        self.learning_mode = False
+
+
+def read_model_data(filepath: str, profile: str = None) -> Dict:
+    """
+    学習済みモデルファイルの保存データを読み込む
+
+    Args:
+        filepath: モデルファイルのパス
+        profile: 複数ペルソナのモデルバンドルの場合に読み込むプロファイル名
+
+    Returns:
+        保存データ（バンドルの場合はプロファイルの保存データ。personal_data_file も含む）
+    """
+    try:
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Q-tableファイルが見つかりません: {filepath}")
+
+        with open(filepath, 'rb') as f:
+            save_data = pickle.load(f)
+    except (IOError, OSError) as e:
+        raise IOError(f"Q-tableの読み込みに失敗しました: {filepath}") from e
+    except pickle.UnpicklingError as e:
+        raise ValueError(f"Q-tableファイルの形式が不正です: {filepath}") from e
+
+    # 複数ペルソナのモデルバンドル（プロファイル名 -> 保存データ）
+    if 'profiles' in save_data:
+        if profile not in save_data['profiles']:
+            raise ValueError(
+                f"モデルバンドルにプロファイル '{profile}' がありません: {filepath} "
+                f"(利用可能: {sorted(save_data['profiles'])})"
+            )
+        save_data = save_data['profiles'][profile]
+    return save_data
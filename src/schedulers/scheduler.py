@@ -1,14 +1,21 @@
+import copy
 from typing import List, Optional
 from datetime import datetime
-import random
 from .task_selectors import TaskSelector
 from .break_strategies import BreakStrategy
 from ..models.task import Task
 from ..models.concentration import ConcentrationModel
+from ..environment.task_index import TaskIndex
+from ..utils.rng import DecisionStream
 
 
 class Scheduler:
-    """戦略パターンを使ったスケジューラー"""
+    """
+    戦略パターンを使ったスケジューラー
+    for_episode() で、ポリシー（タスク選択戦略の設定・学習済みの値、集中力モデルのパラメータ）を共有し、
+    エピソードごとの状態（集中力・選択の履歴・乱数列）だけ別のスケジューラーを作れる。
+    元のスケジューラーは変更されないため、1つのスケジューラーから複数のエピソードを同時に実行できる
+    """
     
     def __init__(self, task_selector: TaskSelector, break_strategy: BreakStrategy):
         self.task_selector = task_selector
@@ -24,6 +31,16 @@ class Scheduler:
             return None
             
         return self.task_selector.select_task(tasks, current_time)
+
+    def select_next_task_from_index(self, index: TaskIndex, current_time: datetime) -> Optional[Task]:
+        """
+        タスクインデックスから次に実行するタスクを選択する（長期間シミュレーション用）
+        休憩時間中の場合はNoneを返す
+        """
+        if self.break_strategy.should_take_break():
+            return None
+
+        return self.task_selector.select_task_from_index(index, current_time)
     
     def work_on_task(self, task: Task) -> float:
         """
@@ -66,6 +83,24 @@ class Scheduler:
         self.concentration_model.rest(break_duration)
         return break_duration
     
+    @property
+    def uses_random_stream(self) -> bool:
+        """判断に乱数を使うスケジューラーか（共通乱数法・対称変量法の対象）"""
+        return self.task_selector.uses_random_stream
+
+    def set_random_stream(self, stream: Optional[DecisionStream]):
+        """判断ごとの乱数列を設定する（Noneの場合は最初の判断でOSのエントロピーから乱数列を作る）"""
+        if self.task_selector.uses_random_stream:
+            self.task_selector.random_stream = stream
+
+    def for_episode(self) -> 'Scheduler':
+        """ポリシーを共有し、エピソードごとの状態だけ別のスケジューラーを作る"""
+        episode = copy.copy(self)
+        episode.concentration_model = self.concentration_model.for_episode()
+        episode.break_strategy = self.break_strategy.for_episode(episode.concentration_model)
+        episode.task_selector = self.task_selector.for_episode()
+        return episode
+
     def reset(self):
         """スケジューラーの状態をリセットする"""
         self.concentration_model.reset()
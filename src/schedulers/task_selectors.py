@@ -1,13 +1,34 @@
+import copy
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from datetime import datetime
-import random
 from ..models.task import Task
+from ..environment.task_index import TaskIndex
+from ..utils.rng import DecisionStream, uniform_index
 
 
 class TaskSelector(ABC):
     """タスク選択戦略の基底クラス"""
 
+    # 判断ごとの乱数列（DecisionStream）を使う戦略か（共通乱数法・対称変量法の対象）
+    uses_random_stream = False
+    random_stream: Optional[DecisionStream] = None
+
+    def _next_uniforms(self):
+        """次の判断の一様乱数の組（乱数列が設定されていなければ、OSのエントロピーから乱数列を作る）"""
+        if self.random_stream is None:
+            self.random_stream = DecisionStream()
+        return self.random_stream.next()
+
+    def for_episode(self) -> 'TaskSelector':
+        """
+        ポリシー（設定・学習済みの値）を共有し、エピソードごとの状態だけ別のタスク選択戦略を作る
+        乱数列は設定しない状態になる（エピソードごとに set_random_stream で設定する）
+        """
+        selector = copy.copy(self)
+        selector.random_stream = None
+        return selector
+
     @abstractmethod
     def select_task(self, tasks: List[Task], current_time: datetime) -> Optional[Task]:
         """
@@ -22,6 +43,20 @@ class TaskSelector(ABC):
         """
         pass
 
+    def select_task_from_index(self, index: TaskIndex, current_time: datetime) -> Optional[Task]:
+        """
+        タスクインデックスから次に実行するタスクを選択する（長期間シミュレーション用）
+        select_task と同じタスクを返す。インデックスに対応していない戦略は全タスクのリストで select_task を呼ぶ
+
+        Args:
+            index: 全タスクのインデックス
+            current_time: 現在時刻
+
+        Returns:
+            選択されたタスク。タスクがない場合はNone
+        """
+        return self.select_task(index.tasks, current_time)
+
     def _get_ready_tasks(self, tasks: List[Task], current_time: datetime = None) -> Optional[List[Task]]:
         """
         未完了かつ依存関係を満たすタスクを取得する共通メソッド
@@ -73,6 +108,10 @@ class DeadlineTaskSelector(TaskSelector):
         sorted_tasks = sorted(ready_tasks, key=lambda task: task.deadline)
         return sorted_tasks[0]
 
+    def select_task_from_index(self, index: TaskIndex, current_time: datetime) -> Optional[Task]:
+        ready = index.get_ready(current_time)
+        return ready.earliest_deadline() if ready is not None else None
+
 
 class PriorityTaskSelector(TaskSelector):
     """重要度順タスク選択戦略"""
@@ -87,13 +126,30 @@ class PriorityTaskSelector(TaskSelector):
                              key=lambda task: (-task.priority.value, task.deadline))
         return sorted_tasks[0]
 
+    def select_task_from_index(self, index: TaskIndex, current_time: datetime) -> Optional[Task]:
+        ready = index.get_ready(current_time)
+        return ready.highest_priority() if ready is not None else None
+
 
 class RandomTaskSelector(TaskSelector):
-    """ランダムタスク選択戦略"""
+    """ランダムタスク選択戦略（判断ごとの乱数列 random_stream を使う）"""
+
+    uses_random_stream = True
+
+    def _random_index(self, n: int) -> int:
+        return uniform_index(self._next_uniforms()[0], n)
 
     def select_task(self, tasks: List[Task], current_time: datetime) -> Optional[Task]:
         ready_tasks = self._get_ready_tasks(tasks, current_time)
         if ready_tasks is None:
             return None
 
-        return random.choice(ready_tasks)
\ No newline at end of file
+        return ready_tasks[self._random_index(len(ready_tasks))]
+
+    def select_task_from_index(self, index: TaskIndex, current_time: datetime) -> Optional[Task]:
+        ready = index.get_ready(current_time)
+        if ready is None:
+            return None
+
+        # select_task と同じ乱数の使い方で、同じタスクを選ぶ
+        return ready.kth(self._random_index(len(ready)))
@@ -0,0 +1,313 @@
+"""
+強化学習スケジューラーのハイパーパラメータ探索
+複数の設定をワーカープロセスで並列に学習し、Successive Halving で弱い設定を早期に打ち切る
+"""
+
+import itertools
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ..environment.simulation import TaskSchedulingSimulation
+from ..models.concentration import ConcentrationModel
+from ..schedulers.rl_learning_scheduler import RLLearningScheduler
+from ..utils.task_loader import task_loader_from_spec, task_loader_spec
+from config import (DEFAULT_SIMULATION_CONFIG, CONCENTRATION_CONFIG,
+                    RL_CONFIG, RL_LEARNING_MODE_CONFIG)
+
+
+# 探索対象のうち、RLLearningSchedulerのコンストラクタに渡すパラメータ
+SCHEDULER_PARAMS = ('learning_rate', 'discount_factor')
+
+# ワーカープロセス内のタスクローダーと学習・評価用インデックス（initializer で作る）
+_worker_state = {}
+
+
+def sample_configurations(search_space: Dict[str, List[Any]],
+                          num_configs: int,
+                          seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    探索空間から設定を選ぶ
+
+    Args:
+        search_space: パラメータ名 -> 候補値リスト
+        num_configs: 選ぶ設定数（全組み合わせ数以上なら全組み合わせ）
+        seed: 抽出用の乱数シード
+
+    Returns:
+        設定（パラメータ名 -> 値）のリスト
+    """
+    names = sorted(search_space)
+    grid = [dict(zip(names, values))
+            for values in itertools.product(*(search_space[name] for name in names))]
+
+    if num_configs >= len(grid):
+        return grid
+
+    return random.Random(seed).sample(grid, num_configs)
+
+
+def build_rungs(min_episodes: int, max_episodes: int, reduction_factor: int) -> List[int]:
+    """
+    Successive Halving の各段階で到達する累積エピソード数を返す
+
+    例: min=500, max=20000, factor=3 -> [500, 1500, 4500, 13500, 20000]
+    """
+    if min_episodes <= 0 or max_episodes < min_episodes:
+        raise ValueError(f"エピソード数の指定が不正です: min={min_episodes}, max={max_episodes}")
+    if reduction_factor < 2:
+        raise ValueError(f"reduction_factorは2以上である必要があります: {reduction_factor}")
+
+    rungs = []
+    budget = min_episodes
+    while budget < max_episodes:
+        rungs.append(budget)
+        budget *= reduction_factor
+    rungs.append(max_episodes)
+    return rungs
+
+
+def _create_training_scheduler(params: Dict[str, Any], q_table: Dict) -> RLLearningScheduler:
+    """設定とQ-tableから学習モードのスケジューラーを作る"""
+    scheduler_kwargs = dict(RL_CONFIG)
+    scheduler_kwargs.update({name: params[name] for name in SCHEDULER_PARAMS if name in params})
+
+    scheduler = RLLearningScheduler(
+        concentration_model=ConcentrationModel(**CONCENTRATION_CONFIG),
+        learning_mode=True,
+        **scheduler_kwargs
+    )
+    scheduler.task_selector.q_table = q_table
+    return scheduler
+
+
+def _run_trial_segment(trial_id: int,
+                       params: Dict[str, Any],
+                       q_table: Dict,
+                       start_episode: int,
+                       end_episode: int,
+                       task_loader,
+                       train_indices: List[int],
+                       eval_indices: List[int]) -> Tuple[int, Dict, float]:
+    """
+    1つの設定を start_episode から end_episode まで学習し、評価用タスクセットで評価する
+    （ワーカープロセスで実行される）
+
+    Returns:
+        (trial_id, 学習後のQ-table, 評価用タスクセットでの平均スコア)
+    """
+    simulation = TaskSchedulingSimulation(**DEFAULT_SIMULATION_CONFIG)
+    scheduler = _create_training_scheduler(params, q_table)
+
+    initial_epsilon = RL_LEARNING_MODE_CONFIG['train_epsilon']
+    decay_rate = params.get('epsilon_decay_rate', RL_LEARNING_MODE_CONFIG['epsilon_decay_rate'])
+    min_epsilon = params.get('min_epsilon', RL_LEARNING_MODE_CONFIG['min_epsilon'])
+
+    # 学習（train_rl_model.py と同じエピソード処理）
+    for episode in range(start_episode, end_episode):
+        scheduler.set_epsilon(max(min_epsilon, initial_epsilon * (decay_rate ** episode)))
+
+        task_index = train_indices[episode % len(train_indices)]
+        training_tasks = task_loader.load_tasks(task_index)
+        simulation.run_simulation_with_tasks(scheduler, training_tasks)
+        scheduler.reset()
+
+    # 評価（テストモード: 探索なし・Q値更新なし）
+    scheduler.set_learning_mode(False)
+    scores = []
+    for task_index in eval_indices:
+        result = simulation.run_simulation_with_tasks(scheduler, task_loader.load_tasks(task_index))
+        scores.append(result['total_score'])
+
+    # 評価中に追加された未訪問状態（Q値0）は学習結果に含めない
+    trained_q_table = {state: q_values for state, q_values in scheduler.task_selector.q_table.items()
+                       if state in q_table or np.any(q_values)}
+
+    return trial_id, trained_q_table, float(np.mean(scores)) if scores else 0.0
+
+
+def _init_worker(loader_spec: Dict, train_indices: List[int], eval_indices: List[int]):
+    _worker_state['task_loader'] = task_loader_from_spec(loader_spec)
+    _worker_state['train_indices'] = train_indices
+    _worker_state['eval_indices'] = eval_indices
+
+
+def _run_trial_segment_in_worker(trial_id: int,
+                                 params: Dict[str, Any],
+                                 q_table: Dict,
+                                 start_episode: int,
+                                 end_episode: int) -> Tuple[int, Dict, float]:
+    """ワーカープロセスのタスクローダーで _run_trial_segment を実行する（ジョブとしてはローダーを送らない）"""
+    return _run_trial_segment(trial_id, params, q_table, start_episode, end_episode,
+                              _worker_state['task_loader'], _worker_state['train_indices'],
+                              _worker_state['eval_indices'])
+
+
+class HyperparameterSearch:
+    """Successive Halving による強化学習スケジューラーのハイパーパラメータ探索"""
+
+    def __init__(self,
+                 task_loader,
+                 search_space: Dict[str, List[Any]],
+                 num_configs: int = 27,
+                 min_episodes: int = 500,
+                 max_episodes: int = 20000,
+                 reduction_factor: int = 3,
+                 num_eval_sets: int = 100,
+                 num_workers: int = None,
+                 seed: int = 0):
+        """
+        Args:
+            task_loader: 学習用タスクローダー（末尾 num_eval_sets 個は評価専用として学習に使わない）
+            search_space: パラメータ名 -> 候補値リスト
+            num_configs: 探索する設定数
+            min_episodes: 最初の評価までの学習エピソード数
+            max_episodes: 学習エピソード数の上限
+            reduction_factor: 各段階で残す割合の逆数
+            num_eval_sets: 評価用タスクセット数
+            num_workers: ワーカープロセス数（1の場合は同一プロセスで逐次実行。2以上の場合、
+                         ワーカーはタスクローダーを task_loader_spec の設定から作り直す）
+            seed: 設定抽出用の乱数シード
+        """
+        num_datasets = task_loader.get_num_datasets()
+        if num_eval_sets <= 0 or num_eval_sets >= num_datasets:
+            raise ValueError(
+                f"num_eval_setsは1以上{num_datasets - 1}以下である必要があります: {num_eval_sets}"
+            )
+
+        self.task_loader = task_loader
+        self.configurations = sample_configurations(search_space, num_configs, seed)
+        self.rungs = build_rungs(min_episodes, max_episodes, reduction_factor)
+        self.reduction_factor = reduction_factor
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self._executor = None
+
+        # 学習データの末尾を評価用として切り出す（テスト用データセットは最終実験のために温存）
+        self.train_indices = list(range(num_datasets - num_eval_sets))
+        self.eval_indices = list(range(num_datasets - num_eval_sets, num_datasets))
+
+        self.trials = [
+            {
+                'trial_id': trial_id,
+                'params': params,
+                'q_table': {},
+                'episodes_trained': 0,
+                'score_history': [],
+                'rung': 0,
+            }
+            for trial_id, params in enumerate(self.configurations)
+        ]
+
+    def run(self, verbose: bool = True) -> List[Dict[str, Any]]:
+        """
+        探索を実行する
+
+        Returns:
+            スコア順にソートされた結果（各要素は設定・学習エピソード数・評価スコアを含む辞書）
+        """
+        if self.num_workers == 1:
+            return self._run_rungs(verbose)
+
+        # ワーカーは探索全体で1回だけ作り、タスクローダーは設定だけを渡して各ワーカーで作り直す
+        initargs = (task_loader_spec(self.task_loader), self.train_indices, self.eval_indices)
+        with ProcessPoolExecutor(max_workers=min(self.num_workers, len(self.trials)),
+                                 initializer=_init_worker, initargs=initargs) as executor:
+            self._executor = executor
+            try:
+                return self._run_rungs(verbose)
+            finally:
+                self._executor = None
+
+    def _run_rungs(self, verbose: bool) -> List[Dict[str, Any]]:
+        """Successive Halving の各段階を順に実行する"""
+        survivors = list(self.trials)
+
+        for rung_index, target_episodes in enumerate(self.rungs):
+            if verbose:
+                print(f"  段階 {rung_index + 1}/{len(self.rungs)}: "
+                      f"{len(survivors)}設定を{target_episodes}エピソードまで学習")
+
+            self._advance_trials(survivors, target_episodes)
+
+            for trial in survivors:
+                trial['rung'] = rung_index + 1
+
+            survivors.sort(key=lambda t: t['score_history'][-1], reverse=True)
+
+            if verbose:
+                best = survivors[0]
+                print(f"    最良スコア: {best['score_history'][-1]:.2f} ({best['params']})")
+
+            # 最終段階でなければ上位だけを残す
+            if rung_index < len(self.rungs) - 1:
+                num_keep = max(1, math.ceil(len(survivors) / self.reduction_factor))
+                survivors = survivors[:num_keep]
+
+        return self.get_ranking()
+
+    def _advance_trials(self, trials: List[Dict], target_episodes: int):
+        """各試行を target_episodes まで学習させて評価する"""
+        jobs = [
+            (trial['trial_id'], trial['params'], trial['q_table'],
+             trial['episodes_trained'], target_episodes)
+            for trial in trials
+        ]
+
+        if self._executor is None:
+            outputs = [_run_trial_segment(*job, self.task_loader, self.train_indices, self.eval_indices)
+                       for job in jobs]
+        else:
+            outputs = list(self._executor.map(_run_trial_segment_in_worker, *zip(*jobs)))
+
+        trials_by_id = {trial['trial_id']: trial for trial in trials}
+        for trial_id, q_table, score in outputs:
+            trial = trials_by_id[trial_id]
+            trial['q_table'] = q_table
+            trial['episodes_trained'] = target_episodes
+            trial['score_history'].append(score)
+
+    def get_ranking(self) -> List[Dict[str, Any]]:
+        """
+        到達段階 → 最終評価スコアの順で並べた結果表を返す
+        （早期に打ち切られた設定は、より少ない学習での評価なので下位に置く）
+        """
+        ranked = sorted(
+            (t for t in self.trials if t['score_history']),
+            key=lambda t: (t['rung'], t['score_history'][-1]),
+            reverse=True
+        )
+
+        return [
+            {
+                'rank': rank,
+                **trial['params'],
+                'episodes_trained': trial['episodes_trained'],
+                'rung': trial['rung'],
+                'eval_score': trial['score_history'][-1],
+                'q_table_size': len(trial['q_table']),
+            }
+            for rank, trial in enumerate(ranked, 1)
+        ]
+
+    def get_best_trial(self) -> Dict[str, Any]:
+        """最良の試行（設定とQ-tableを含む）を返す"""
+        return max(
+            (t for t in self.trials if t['score_history']),
+            key=lambda t: (t['rung'], t['score_history'][-1])
+        )
+
+    def save_best_model(self, filepath: str) -> Dict[str, Any]:
+        """
+        最良の設定で学習したQ-tableを保存する
+
+        Returns:
+            最良の試行
+        """
+        best = self.get_best_trial()
+        scheduler = _create_training_scheduler(best['params'], best['q_table'])
+        scheduler.save_model(filepath)
+        return best
@@ -0,0 +1,144 @@
+"""
+複数ペルソナの強化学習モデルを1回の学習で同時に作る
+タスクセットの選択と読み込みだけを全プロファイルで共有し、シミュレーションはプロファイルごとに順番に実行して
+それぞれのQ-tableを学習する（共有するのは読み込みの分だけで、学習時間はほぼプロファイル数に比例する）
+"""
+
+import os
+import pickle
+from typing import Dict, List
+
+from ..environment.simulation import TaskSchedulingSimulation
+from ..models.concentration import ConcentrationModel
+from ..models.personal_profile import load_personal_profile
+from ..schedulers.rl_learning_scheduler import RLLearningScheduler
+from .task_set_sampler import RoundRobinTaskSetSampler
+from ..utils.task_loader import PrefetchingTaskDataLoader
+from config import (DEFAULT_SIMULATION_CONFIG, CONCENTRATION_CONFIG,
+                    RL_CONFIG, RL_LEARNING_MODE_CONFIG)
+
+
+class MultiPersonaTrainer:
+    """プロファイルごとのQ-tableを同じエピソード列で同時に学習するトレーナー"""
+
+    def __init__(self,
+                 profile_files: Dict[str, str],
+                 task_loader,
+                 sampler=None,
+                 simulation_config: Dict = None):
+        """
+        Args:
+            profile_files: プロファイル名 -> パーソナルデータファイル
+            task_loader: 学習用タスクローダー
+            sampler: タスクセットサンプラー（Noneの場合は順番通り）
+            simulation_config: シミュレーション設定（Noneの場合はDEFAULT_SIMULATION_CONFIG）
+        """
+        if not profile_files:
+            raise ValueError("プロファイルが1つも指定されていません")
+
+        self.profile_files = dict(profile_files)
+        self.task_loader = task_loader
+        self.sampler = sampler or RoundRobinTaskSetSampler(task_loader.get_num_datasets())
+        self.simulation = TaskSchedulingSimulation(**(simulation_config or DEFAULT_SIMULATION_CONFIG))
+
+        # プロファイルごとのスケジューラー（集中力モデルと報酬関数が同じプロファイルを共有する）
+        self.profiles = {name: load_personal_profile(path) for name, path in self.profile_files.items()}
+        self.schedulers = {
+            name: RLLearningScheduler(
+                concentration_model=ConcentrationModel(**CONCENTRATION_CONFIG, personal_profile=profile),
+                learning_mode=True,
+                **RL_CONFIG
+            )
+            for name, profile in self.profiles.items()
+        }
+
+        self.episode_rewards = {name: [] for name in self.schedulers}
+
+    def train(self, num_episodes: int, verbose: bool = True) -> Dict[str, Dict]:
+        """
+        全プロファイルを同時に学習する
+
+        Args:
+            num_episodes: 学習エピソード数（各プロファイル共通）
+            verbose: 進捗を表示するか
+
+        Returns:
+            プロファイル名 -> 学習統計
+        """
+        initial_epsilon = RL_LEARNING_MODE_CONFIG['train_epsilon']
+        decay_rate = RL_LEARNING_MODE_CONFIG['epsilon_decay_rate']
+        min_epsilon = RL_LEARNING_MODE_CONFIG['min_epsilon']
+
+        for episode in range(num_episodes):
+            current_epsilon = max(min_epsilon, initial_epsilon * (decay_rate ** episode))
+
+            # タスクセットの選択と読み込みは全プロファイルで1回だけ
+            task_index = self.sampler.sample(episode)
+            training_tasks = self.task_loader.load_tasks(task_index)
+            if isinstance(self.task_loader, PrefetchingTaskDataLoader):
+                self.task_loader.prefetch(self.sampler.upcoming(episode + 1, self.task_loader.prefetch_depth))
+
+            td_errors = []
+            for name, scheduler in self.schedulers.items():
+                scheduler.set_epsilon(current_epsilon)
+
+                # シミュレーション内でタスクはコピーされるため、共有したタスクセットは変更されない
+                self.simulation.run_simulation_with_tasks(scheduler, training_tasks)
+
+                reward_history = scheduler.task_selector.reward_history
+                episode_reward = sum(reward_history[-len(training_tasks):]) if reward_history else 0
+                self.episode_rewards[name].append(episode_reward)
+                td_errors.append(scheduler.task_selector.get_episode_td_error())
+
+                scheduler.reset()
+
+            self.sampler.update(task_index, td_error=sum(td_errors) / len(td_errors))
+
+            if verbose and (episode + 1) % 100 == 0:
+                print(f"  {episode + 1}/{num_episodes}")
+
+        return self.get_training_stats()
+
+    def get_training_stats(self) -> Dict[str, Dict]:
+        """プロファイルごとの学習統計を返す"""
+        stats = {}
+        for name, scheduler in self.schedulers.items():
+            rewards = self.episode_rewards[name]
+            stats[name] = {
+                'final_average_reward': sum(rewards[-100:]) / min(100, len(rewards)) if rewards else 0,
+                'q_table_size': len(scheduler.task_selector.q_table),
+                'episode_rewards': rewards,
+            }
+        return stats
+
+    def save_bundle(self, filepath: str):
+        """
+        プロファイル名をキーとするモデルバンドルを保存する
+        （create_rl_scheduler(model_path, profile=...) で個別に読み込める）
+        """
+        bundle = {'profiles': {}}
+        for name, scheduler in self.schedulers.items():
+            selector = scheduler.task_selector
+            bundle['profiles'][name] = {
+                'q_table': selector.q_table,
+                'learning_rate': selector.learning_rate,
+                'discount_factor': selector.discount_factor,
+                'epsilon': selector.epsilon,
+                'personal_data_file': self.profile_files[name],
+            }
+
+        try:
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(filepath, 'wb') as f:
+                pickle.dump(bundle, f)
+        except (IOError, OSError) as e:
+            raise IOError(f"モデルバンドルの保存に失敗しました: {filepath}") from e
+
+
+def list_bundle_profiles(filepath: str) -> List[str]:
+    """モデルバンドルに含まれるプロファイル名を返す"""
+    with open(filepath, 'rb') as f:
+        bundle = pickle.load(f)
+    return sorted(bundle.get('profiles', {}))
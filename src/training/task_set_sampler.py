@@ -0,0 +1,228 @@
+"""
+学習用タスクセットのサンプラー
+学習があまり進まないタスクセットより、情報量の多い（難しい）タスクセットを優先して選ぶ
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..models.task import Task
+from ..utils.task_set_features import load_feature_table
+
+
+class RoundRobinTaskSetSampler:
+    """従来通りタスクセットを順番に選ぶサンプラー"""
+
+    def __init__(self, num_sets: int):
+        self.num_sets = num_sets
+
+    def sample(self, episode: int) -> int:
+        return episode % self.num_sets
+
+    def upcoming(self, episode: int, count: int) -> List[int]:
+        """episode 以降に選ばれるタスクセット（先読み用）"""
+        return [(episode + k) % self.num_sets for k in range(min(count, self.num_sets))]
+
+    def needs_baseline_score(self, index: int) -> bool:
+        return False
+
+    def update(self, index: int, td_error: float = None,
+               rl_score: float = None, baseline_score: float = None):
+        pass
+
+
+class PrioritizedTaskSetSampler:
+    """
+    タスクセットごとの統計（直近のTD誤差、ベースラインとのスコア差）に基づく優先度付きサンプラー
+
+    未訪問のタスクセットには訪問済みの最大優先度を与え、一度は選ばれやすくする。
+    difficulties を渡すとカリキュラムを有効にし、易しいタスクセットから順に解禁する。
+    """
+
+    def __init__(self,
+                 num_sets: int,
+                 alpha: float = 0.6,
+                 td_error_weight: float = 1.0,
+                 baseline_gap_weight: float = 1.0,
+                 ema_decay: float = 0.3,
+                 difficulties: Optional[np.ndarray] = None,
+                 curriculum_episodes: int = 0,
+                 curriculum_start_fraction: float = 0.2,
+                 seed: int = 0):
+        """
+        Args:
+            num_sets: タスクセット数
+            alpha: 優先度の強さ（0で一様サンプリング）
+            td_error_weight: TD誤差の重み
+            baseline_gap_weight: ベースラインとのスコア差の重み
+            ema_decay: 統計の指数移動平均で新しい値に掛ける重み
+            difficulties: タスクセットごとの難しさ（Noneの場合はカリキュラムなし）
+            curriculum_episodes: 全タスクセットが解禁されるまでのエピソード数
+            curriculum_start_fraction: 最初に解禁するタスクセットの割合
+            seed: 乱数シード
+        """
+        if num_sets <= 0:
+            raise ValueError(f"num_setsは1以上である必要があります: {num_sets}")
+
+        self.num_sets = num_sets
+        self.alpha = alpha
+        self.td_error_weight = td_error_weight
+        self.baseline_gap_weight = baseline_gap_weight
+        self.ema_decay = ema_decay
+        self.rng = np.random.default_rng(seed)
+
+        # タスクセットごとの統計（NaNは未観測）
+        self.td_errors = np.full(num_sets, np.nan)
+        self.score_gaps = np.full(num_sets, np.nan)
+        self.baseline_scores = np.full(num_sets, np.nan)
+        self.visit_counts = np.zeros(num_sets, dtype=np.int64)
+
+        # カリキュラム: 難しさの順位（易しい順）
+        self.curriculum_order = None
+        if difficulties is not None:
+            if len(difficulties) != num_sets:
+                raise ValueError("difficultiesの長さがタスクセット数と一致しません")
+            self.curriculum_order = np.argsort(difficulties, kind='stable')
+        self.curriculum_episodes = curriculum_episodes
+        self.curriculum_start_fraction = curriculum_start_fraction
+
+    def _eligible_sets(self, episode: int) -> np.ndarray:
+        """現在のエピソードで選択可能なタスクセットを返す"""
+        if self.curriculum_order is None or self.curriculum_episodes <= 0:
+            return np.arange(self.num_sets)
+
+        progress = min(1.0, episode / self.curriculum_episodes)
+        fraction = self.curriculum_start_fraction + (1.0 - self.curriculum_start_fraction) * progress
+        num_eligible = max(1, int(np.ceil(fraction * self.num_sets)))
+        return self.curriculum_order[:num_eligible]
+
+    def get_priorities(self) -> np.ndarray:
+        """各タスクセットの優先度を計算する"""
+        priorities = np.zeros(self.num_sets)
+
+        # スケールの異なる2つの統計を、それぞれ観測済みの平均で正規化して足し合わせる
+        for values, weight in ((self.td_errors, self.td_error_weight),
+                               (self.score_gaps, self.baseline_gap_weight)):
+            observed = ~np.isnan(values)
+            if weight <= 0 or not observed.any():
+                continue
+            scale = np.mean(values[observed])
+            if scale > 0:
+                priorities[observed] += weight * values[observed] / scale
+
+        # 未訪問のタスクセットは最大優先度
+        unvisited = self.visit_counts == 0
+        max_priority = priorities[~unvisited].max() if (~unvisited).any() else 1.0
+        priorities[unvisited] = max(max_priority, 1.0)
+
+        return priorities
+
+    def sample(self, episode: int) -> int:
+        """次のエピソードで使うタスクセットのインデックスを選ぶ"""
+        eligible = self._eligible_sets(episode)
+        weights = (self.get_priorities()[eligible] + 1e-6) ** self.alpha
+        return int(self.rng.choice(eligible, p=weights / weights.sum()))
+
+    def upcoming(self, episode: int, count: int) -> List[int]:
+        """
+        episode で選ばれやすいタスクセットを選択確率の高い順に返す（先読み用の予測）
+        """
+        eligible = self._eligible_sets(episode)
+        priorities = self.get_priorities()[eligible]
+        order = np.argsort(-priorities, kind='stable')[:count]
+        return [int(i) for i in eligible[order]]
+
+    def needs_baseline_score(self, index: int) -> bool:
+        """ベースラインスコアがまだ計算されていないか"""
+        return self.baseline_gap_weight > 0 and np.isnan(self.baseline_scores[index])
+
+    def update(self, index: int, td_error: float = None,
+               rl_score: float = None, baseline_score: float = None):
+        """
+        エピソード終了後にタスクセットの統計を更新する
+
+        Args:
+            index: タスクセットのインデックス
+            td_error: エピソードの平均TD誤差（絶対値）
+            rl_score: 強化学習スケジューラーのスコア
+            baseline_score: 最良ベースラインのスコア（初回のみ渡せばよい）
+        """
+        self.visit_counts[index] += 1
+
+        if baseline_score is not None:
+            self.baseline_scores[index] = baseline_score
+
+        if td_error is not None:
+            self.td_errors[index] = self._ema(self.td_errors[index], td_error)
+
+        if rl_score is not None and not np.isnan(self.baseline_scores[index]):
+            gap = max(0.0, self.baseline_scores[index] - rl_score)
+            self.score_gaps[index] = self._ema(self.score_gaps[index], gap)
+
+    def _ema(self, previous: float, value: float) -> float:
+        if np.isnan(previous):
+            return value
+        return (1 - self.ema_decay) * previous + self.ema_decay * value
+
+
+def create_task_set_sampler(task_loader, config: Dict,
+                            start_time: datetime = None,
+                            verbose: bool = True):
+    """
+    設定に従ってタスクセットサンプラーを作成する
+
+    Args:
+        task_loader: 学習用タスクローダー
+        config: RL_TRAINING_SAMPLER_CONFIG 形式の設定
+        start_time: シミュレーション開始時刻（カリキュラムの締切の厳しさ計算に使用）
+        verbose: カリキュラム準備の進捗を表示するか
+    """
+    num_sets = task_loader.get_num_datasets()
+    strategy = config.get('strategy', 'round_robin')
+
+    if strategy == 'round_robin':
+        return RoundRobinTaskSetSampler(num_sets)
+    if strategy != 'prioritized':
+        raise ValueError(f"未知のサンプリング戦略です: {strategy}")
+
+    difficulties = None
+    if config.get('curriculum', False):
+        if start_time is None:
+            raise ValueError("カリキュラムを使う場合はstart_timeが必要です")
+        # 難しさは特徴量テーブル（データセットの版ごとに1回だけ計算）から取り出す
+        features = load_feature_table(task_loader, start_time, verbose=verbose)
+        difficulties = _rank_difficulties([
+            {'num_tasks': float(num_tasks), 'deadline_tightness': float(tightness)}
+            for num_tasks, tightness in zip(features['num_tasks'], features['deadline_tightness'])
+        ])
+
+    return PrioritizedTaskSetSampler(
+        num_sets=num_sets,
+        alpha=config.get('alpha', 0.6),
+        td_error_weight=config.get('td_error_weight', 1.0),
+        baseline_gap_weight=config.get('baseline_gap_weight', 1.0),
+        ema_decay=config.get('ema_decay', 0.3),
+        difficulties=difficulties,
+        curriculum_episodes=config.get('curriculum_episodes', 0),
+        curriculum_start_fraction=config.get('curriculum_start_fraction', 0.2),
+        seed=config.get('seed', 0)
+    )
+
+
+def _rank_difficulties(metrics: List[Dict[str, float]]) -> np.ndarray:
+    """タスク数と締切の厳しさの順位を平均して、1つの難しさにまとめる"""
+    ranks = []
+    for key in ('num_tasks', 'deadline_tightness'):
+        values = np.array([m[key] for m in metrics])
+        ranks.append(np.argsort(np.argsort(values, kind='stable'), kind='stable'))
+    return np.mean(ranks, axis=0)
+
+
+def best_baseline_score(simulation, baseline_schedulers: Dict, tasks: List[Task]) -> float:
+    """ベースラインスケジューラーの中で最も高いスコアを返す"""
+    return max(
+        simulation.run_simulation_with_tasks(scheduler, tasks)['total_score']
+        for scheduler in baseline_schedulers.values()
+    )
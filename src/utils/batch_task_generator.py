@@ -0,0 +1,259 @@
+"""
+タスクセットのバッチ生成
+Task.generate_random_task と同じ分布（TASK_GENERATION_CONFIG / GENRE_CONFIG）から、
+複数のタスクセットの重要度・所要時間・締切・ジャンルをNumPyでまとめて生成する
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from ..models.task import Priority
+from .packed_dataset import TASK_RECORD_DTYPE, allocate_packed_file
+from config import TASK_GENERATION_CONFIG, GENRE_CONFIG
+
+
+# シード導出に使う分割の番号
+SPLIT_SEED_IDS = {'train': 0, 'test': 1}
+
+# 生成アルゴリズムの版（乱数の使い方を変えたら上げる）
+GENERATOR_VERSION = 1
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+def shard_seed_sequence(seed: int, split: str, shard_index: int) -> np.random.SeedSequence:
+    """(シード, 分割, シャード番号) から決定的なシード列を作る"""
+    return np.random.SeedSequence([seed, SPLIT_SEED_IDS[split], shard_index])
+
+
+def generator_config_fingerprint(generation_config: Dict = None, genre_config: Dict = None) -> str:
+    """
+    タスク生成に使う設定と生成アルゴリズムの版から決まるフィンガープリント
+    同じフィンガープリントなら、同じシードから同じタスクセットが生成される
+    """
+    config = generation_config or TASK_GENERATION_CONFIG
+    genre_config = genre_config or GENRE_CONFIG
+    payload = {
+        'version': GENERATOR_VERSION,
+        'priority_low_ratio': config['priority_low_ratio'],
+        'priority_medium_ratio': config['priority_medium_ratio'],
+        'priority_duration_ranges': {k: list(v) for k, v in config['priority_duration_ranges'].items()},
+        'deadline_min_days': config['deadline_min_days'],
+        'deadline_max_days': config['deadline_max_days'],
+        'genres': list(genre_config['genres']),
+        'genre_distribution': genre_config['genre_distribution'],
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def virtual_set_rng(seed: int, split: str, index: int) -> np.random.Generator:
+    """
+    仮想データセットの index 番目のタスクセット用の乱数生成器
+    カウンタベースのPhiloxを (index, seed, split) から作るため、前のセットを生成しなくても
+    任意のセットを直接、どの環境でも同じ値で再現できる
+    """
+    if not 0 <= seed < 2 ** 56:
+        raise ValueError(f"seedは0以上2^56未満である必要があります: {seed}")
+    key = np.array([index, (seed << 8) | SPLIT_SEED_IDS[split]], dtype=np.uint64)
+    return np.random.Generator(np.random.Philox(key=key))
+
+
+def generate_task_records(rng: np.random.Generator,
+                          num_sets: int,
+                          num_tasks: int,
+                          generation_config: Dict = None,
+                          genre_config: Dict = None) -> np.ndarray:
+    """
+    タスクセットをまとめて生成する
+
+    Args:
+        rng: 乱数生成器
+        num_sets: タスクセット数
+        num_tasks: 1セットあたりのタスク数
+        generation_config: TASK_GENERATION_CONFIG 形式の設定（Noneの場合はconfig.pyの値）
+        genre_config: GENRE_CONFIG 形式の設定（Noneの場合はconfig.pyの値）
+
+    Returns:
+        (num_sets, num_tasks) のレコード配列（TASK_RECORD_DTYPE）
+    """
+    config = generation_config or TASK_GENERATION_CONFIG
+    genre_config = genre_config or GENRE_CONFIG
+    shape = (num_sets, num_tasks)
+
+    # 重要度: 累積比率で区切る（LOW < low_ratio <= MEDIUM < low + medium <= HIGH）
+    priority_bounds = np.array([
+        config['priority_low_ratio'],
+        config['priority_low_ratio'] + config['priority_medium_ratio'],
+    ])
+    priority_index = np.searchsorted(priority_bounds, rng.random(shape), side='right')
+    priorities = np.array([Priority.LOW, Priority.MEDIUM, Priority.HIGH])
+
+    # 所要時間: 重要度ごとの範囲 [min, max] の一様整数
+    ranges = config['priority_duration_ranges']
+    min_durations = np.array([ranges[p.name][0] for p in priorities])
+    max_durations = np.array([ranges[p.name][1] for p in priorities])
+    low = min_durations[priority_index]
+    span = max_durations[priority_index] - low + 1
+    durations = low + np.floor(rng.random(shape) * span).astype(np.int64)
+
+    # 締切: 開始から [min_days, max_days] 日後の一様分布（分単位）
+    min_days = config['deadline_min_days']
+    max_days = config['deadline_max_days']
+    deadline_minutes = (min_days + rng.random(shape) * (max_days - min_days)) * _MINUTES_PER_DAY
+
+    # ジャンル: 累積分布で区切る（はみ出した場合は先頭のジャンル）
+    genres = genre_config['genres']
+    genre_cdf = np.cumsum([genre_config['genre_distribution'][g] for g in genres])
+    genre_index = np.searchsorted(genre_cdf, rng.random(shape), side='right')
+    genre_index[genre_index >= len(genres)] = 0
+    genre_codes = np.array([int(g) for g in genres])
+
+    records = np.empty(shape, dtype=TASK_RECORD_DTYPE)
+    records['id'] = np.arange(num_tasks)
+    records['duration'] = durations
+    records['priority'] = np.array([p.value for p in priorities])[priority_index]
+    records['genre'] = genre_codes[genre_index]
+    records['deadline_minutes'] = deadline_minutes
+    return records
+
+
+def generate_shard_records(seed: int, split: str, shard_index: int, shard_size: int,
+                           num_sets: int, num_tasks: int) -> np.ndarray:
+    """
+    1シャード分のタスクセットを生成する
+
+    末尾のシャードも常に shard_size 分を生成して切り詰める
+    （セット数を増やしても既存のセットが変わらないように）
+
+    Returns:
+        (num_sets, num_tasks) のレコード配列
+    """
+    rng = np.random.default_rng(shard_seed_sequence(seed, split, shard_index))
+    return generate_task_records(rng, shard_size, num_tasks)[:num_sets]
+
+
+def _shard_view(filepath: str, records_pos: int, first_set: int, num_sets: int, num_tasks: int,
+                mode: str = 'r') -> np.memmap:
+    """パック形式ファイルの1シャード分のレコード領域"""
+    return np.memmap(filepath, dtype=TASK_RECORD_DTYPE, mode=mode,
+                     offset=records_pos + first_set * num_tasks * TASK_RECORD_DTYPE.itemsize,
+                     shape=(num_sets * num_tasks,))
+
+
+def shard_sha256(records: np.ndarray) -> str:
+    """シャードのレコードのハッシュ"""
+    return hashlib.sha256(np.ascontiguousarray(records).tobytes()).hexdigest()
+
+
+def _generate_shard(filepath: str, records_pos: int, total_sets: int, num_tasks: int,
+                    seed: int, split: str, shard_index: int, shard_size: int) -> str:
+    """
+    1シャード分を生成し、確保済みのパック形式ファイルの該当位置に書き込む（ワーカープロセスで実行）
+
+    Returns:
+        書き込んだレコードのハッシュ
+    """
+    first_set = shard_index * shard_size
+    num_sets = min(shard_size, total_sets - first_set)
+
+    records = generate_shard_records(seed, split, shard_index, shard_size, num_sets, num_tasks).reshape(-1)
+
+    target = _shard_view(filepath, records_pos, first_set, num_sets, num_tasks, mode='r+')
+    target[:] = records
+    target.flush()
+    del target
+    return shard_sha256(records)
+
+
+def generate_packed_split(filepath: str,
+                          split: str,
+                          num_sets: int,
+                          num_tasks: int,
+                          start_time: datetime,
+                          seed: int = 42,
+                          shard_size: int = 10000,
+                          num_workers: int = None,
+                          verbose: bool = True,
+                          reusable_shards: Dict[int, int] = None) -> List[Dict]:
+    """
+    1つの分割をシャードに分けて並列生成し、パック形式で保存する
+    シャードごとのシードは (seed, split, シャード番号) から決まるため、
+    ワーカー数に関係なく同じデータセットになる
+
+    Args:
+        filepath: 出力ファイル（dataset/{split}.pack）
+        split: 'train' or 'test'
+        num_sets: タスクセット数
+        num_tasks: 1セットあたりのタスク数
+        start_time: 締切の基準時刻
+        seed: シード
+        shard_size: 1シャードのタスクセット数
+        num_workers: ワーカープロセス数（1の場合は同一プロセスで逐次実行）
+        verbose: 進捗を表示するか
+        reusable_shards: 既存の filepath から再利用するシャード（シャード番号 -> 既存ファイルのレコード領域の先頭位置）
+
+    Returns:
+        シャードごとの {'index', 'num_sets', 'sha256', 'reused'}
+    """
+    if split not in SPLIT_SEED_IDS:
+        raise ValueError(f"split must be 'train' or 'test', got {split}")
+    if shard_size < 1:
+        raise ValueError(f"shard_sizeは1以上である必要があります: {shard_size}")
+    reusable_shards = reusable_shards or {}
+
+    # 書き込み途中のファイルを読まれないよう、一時ファイルに書いてから置き換える
+    tmp_path = filepath + '.tmp'
+    records_pos = allocate_packed_file(tmp_path, num_sets, num_tasks, start_time)
+
+    num_shards = (num_sets + shard_size - 1) // shard_size
+    shards = [{'index': i, 'num_sets': min(shard_size, num_sets - i * shard_size),
+               'sha256': None, 'reused': i in reusable_shards}
+              for i in range(num_shards)]
+
+    # 最新のシャードは既存ファイルからコピーする
+    for shard in shards:
+        if shard['reused']:
+            first_set = shard['index'] * shard_size
+            source = _shard_view(filepath, reusable_shards[shard['index']], first_set,
+                                 shard['num_sets'], num_tasks)
+            target = _shard_view(tmp_path, records_pos, first_set, shard['num_sets'], num_tasks, mode='r+')
+            target[:] = source
+            target.flush()
+            shard['sha256'] = shard_sha256(source)
+            del source, target
+
+    jobs = [(tmp_path, records_pos, num_sets, num_tasks, seed, split, shard['index'], shard_size)
+            for shard in shards if not shard['reused']]
+    if verbose and len(jobs) < num_shards:
+        print(f"  最新のシャードを再利用: {num_shards - len(jobs)}/{num_shards}")
+
+    num_to_generate = sum(shard['num_sets'] for shard in shards if not shard['reused'])
+    num_workers = num_workers or os.cpu_count() or 1
+    done = 0
+    if num_workers == 1 or len(jobs) <= 1:
+        hashes = map(lambda job: _generate_shard(*job), jobs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=min(num_workers, len(jobs)))
+        hashes = executor.map(_generate_shard, *zip(*jobs))
+
+    try:
+        for job, sha256 in zip(jobs, hashes):
+            shard = shards[job[6]]
+            shard['sha256'] = sha256
+            done += shard['num_sets']
+            if verbose:
+                print(f"  {done}/{num_to_generate} 完了")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    os.replace(tmp_path, filepath)
+    return shards
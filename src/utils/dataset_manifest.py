@@ -0,0 +1,207 @@
+"""
+データセットのマニフェスト（dataset/manifest.json）
+どの生成設定で作ったデータセットかを記録し、シャード単位の差分再生成と読み込み時の検証に使う
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from .packed_dataset import PackedTaskDataset
+from .batch_task_generator import generate_packed_split, generator_config_fingerprint, shard_sha256
+
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# タスクセットごとの要約統計（{split}.summary.npy）
+SET_SUMMARY_DTYPE = np.dtype([
+    ('num_tasks', '<i4'),
+    ('total_score', '<i8'),                 # 全タスクのスコア（所要時間 × 重要度）の合計
+    ('low_count', '<i4'),
+    ('medium_count', '<i4'),
+    ('high_count', '<i4'),
+    ('tightest_deadline_minutes', '<f8'),   # 最も早い締切（開始からの分数）
+])
+
+
+def manifest_path(dataset_root: str) -> str:
+    return os.path.join(dataset_root, MANIFEST_FILE)
+
+
+def load_manifest(dataset_root: str) -> Optional[Dict]:
+    """マニフェストを読み込む（なければNone）"""
+    path = manifest_path(dataset_root)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(dataset_root: str, manifest: Dict):
+    """マニフェストを保存（一時ファイルに書いてから置き換える）"""
+    os.makedirs(dataset_root, exist_ok=True)
+    path = manifest_path(dataset_root)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def compute_set_summaries(records: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    パック形式のレコードとオフセットから、タスクセットごとの要約統計をまとめて計算する
+
+    Args:
+        records: 全タスクセットのレコード（連結されたもの）
+        offsets: タスクセットの境界（長さ = セット数 + 1）
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    num_sets = len(offsets) - 1
+    summaries = np.zeros(num_sets, dtype=SET_SUMMARY_DTYPE)
+    summaries['num_tasks'] = np.diff(offsets)
+
+    # 空のセットは reduceat が使えないため除いて計算する
+    nonempty = summaries['num_tasks'] > 0
+    summaries['tightest_deadline_minutes'][~nonempty] = np.inf
+    if not nonempty.any():
+        return summaries
+    starts = offsets[:-1][nonempty]
+
+    priority = np.asarray(records['priority'], dtype=np.int64)
+    scores = np.asarray(records['duration'], dtype=np.int64) * priority
+    summaries['total_score'][nonempty] = np.add.reduceat(scores, starts)
+    for value, column in ((1, 'low_count'), (2, 'medium_count'), (3, 'high_count')):
+        summaries[column][nonempty] = np.add.reduceat((priority == value).astype(np.int64), starts)
+    summaries['tightest_deadline_minutes'][nonempty] = np.minimum.reduceat(
+        np.asarray(records['deadline_minutes']), starts)
+    return summaries
+
+
+def _reusable_shards(split_entry: Optional[Dict], manifest: Optional[Dict], params: Dict,
+                     pack_path: str, num_sets: int, verify_hashes: bool) -> Dict[int, int]:
+    """既存のパック形式ファイルから再利用できるシャード（シャード番号 -> レコード領域の位置）"""
+    if manifest is None or split_entry is None or not os.path.exists(pack_path):
+        return {}
+    if any(manifest.get(key) != value for key, value in params.items()):
+        return {}
+
+    try:
+        existing = PackedTaskDataset(pack_path)
+    except ValueError:
+        return {}
+
+    reusable = {}
+    shard_size = params['shard_size']
+    num_tasks = params['num_tasks']
+    for shard in split_entry.get('shards', []):
+        first_set = shard['index'] * shard_size
+        last_set = first_set + shard['num_sets']
+        # 新しいデータセットでも同じ大きさのシャードで、既存ファイルに全て含まれるもの
+        if shard['num_sets'] != min(shard_size, num_sets - first_set) or last_set > len(existing):
+            continue
+        if verify_hashes:
+            records = existing.records[first_set * num_tasks:last_set * num_tasks]
+            if shard_sha256(records) != shard['sha256']:
+                continue
+        reusable[shard['index']] = existing.records_pos
+    return reusable
+
+
+def build_dataset_split(dataset_root: str,
+                        split: str,
+                        num_sets: int,
+                        num_tasks: int,
+                        start_time: datetime,
+                        seed: int = 42,
+                        shard_size: int = 10000,
+                        num_workers: int = None,
+                        verify_hashes: bool = True,
+                        verbose: bool = True) -> Dict:
+    """
+    分割を生成し、要約統計とマニフェストを更新する
+    生成設定・シード・シャードの大きさが前回と同じなら、最新のシャードは生成し直さない
+
+    Args:
+        dataset_root: データセットのルートディレクトリ
+        split: 'train' or 'test'
+        num_sets: タスクセット数
+        num_tasks: 1セットあたりのタスク数
+        start_time: 締切の基準時刻
+        seed: シード
+        shard_size: 1シャードのタスクセット数
+        num_workers: ワーカープロセス数
+        verify_hashes: 再利用する前に既存シャードのハッシュを確認するか
+        verbose: 進捗を表示するか
+
+    Returns:
+        マニフェストの分割のエントリ
+    """
+    params = {
+        'version': MANIFEST_VERSION,
+        'generator_fingerprint': generator_config_fingerprint(),
+        'seed': seed,
+        'num_tasks': num_tasks,
+        'shard_size': shard_size,
+        'start_time': start_time.isoformat(),
+    }
+    manifest = load_manifest(dataset_root)
+    previous_entry = manifest.get('splits', {}).get(split) if manifest else None
+
+    # 設定が変わった場合は他の分割の記録も無効になるため、マニフェストを作り直す
+    if manifest is None or any(manifest.get(key) != value for key, value in params.items()):
+        new_manifest = dict(params, splits={})
+    else:
+        new_manifest = manifest
+
+    pack_path = os.path.join(dataset_root, f"{split}.pack")
+    reusable = _reusable_shards(previous_entry, manifest, params, pack_path, num_sets, verify_hashes)
+    shards = generate_packed_split(pack_path, split, num_sets, num_tasks, start_time,
+                                   seed=seed, shard_size=shard_size, num_workers=num_workers,
+                                   verbose=verbose, reusable_shards=reusable)
+
+    dataset = PackedTaskDataset(pack_path)
+    summary_file = f"{split}.summary.npy"
+    np.save(os.path.join(dataset_root, summary_file), compute_set_summaries(dataset.records, dataset.offsets))
+
+    entry = {
+        'file': f"{split}.pack",
+        'summary_file': summary_file,
+        'num_sets': num_sets,
+        'shards': [{key: shard[key] for key in ('index', 'num_sets', 'sha256')} for shard in shards],
+    }
+    new_manifest['splits'][split] = entry
+    save_manifest(dataset_root, new_manifest)
+
+    if verbose:
+        num_reused = sum(1 for shard in shards if shard['reused'])
+        print(f"  シャード: {len(shards)}（再利用 {num_reused}、生成 {len(shards) - num_reused}）")
+    return entry
+
+
+def check_manifest(dataset_root: str, split: str, num_sets: int) -> Optional[Dict]:
+    """
+    読み込み時にマニフェストを確認する（マニフェストがなければNone）
+
+    Raises:
+        ValueError: 現在の生成設定と異なる設定で作られたデータセットの場合
+    """
+    manifest = load_manifest(dataset_root)
+    if manifest is None:
+        return None
+
+    fingerprint = generator_config_fingerprint()
+    if manifest.get('generator_fingerprint') != fingerprint:
+        raise ValueError(
+            f"データセットの生成設定が現在の設定と異なります "
+            f"(データセット: {manifest.get('generator_fingerprint')}, 現在: {fingerprint})\n"
+            f"generate_task_dataset.pyを実行してデータセットを再生成してください"
+        )
+
+    entry = manifest.get('splits', {}).get(split)
+    if entry is None or entry['num_sets'] != num_sets:
+        raise ValueError(f"データセットがマニフェストと一致しません: {dataset_root}/{split}.pack")
+    return manifest
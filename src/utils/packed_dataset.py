@@ -0,0 +1,209 @@
+"""
+タスクデータセットのパック形式
+1つの分割（train/test）を1ファイルに固定長レコードで格納し、メモリマップで読み込む
+
+ファイル構成:
+    ヘッダー（64バイト） | セットのオフセット int64[num_sets + 1] | タスクレコード[num_tasks]
+"""
+
+import json
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+import numpy as np
+
+from ..models.task import Task, Priority
+
+
+PACK_MAGIC = b'TDPACK01'
+PACK_VERSION = 1
+
+# magic, version, num_sets, num_tasks, start_time（1970-01-01からのマイクロ秒）, offsets位置, records位置
+_HEADER_FORMAT = '<8sIIqqqq'
+HEADER_SIZE = 64
+
+# タスク1個分の固定長レコード
+TASK_RECORD_DTYPE = np.dtype([
+    ('id', '<i4'),
+    ('duration', '<i4'),            # base_duration_minutes
+    ('priority', 'u1'),             # Priority.value
+    ('genre', 'u1'),                # ジャンルタグ（数字）
+    ('deadline_minutes', '<f8'),    # 開始時刻から締切までの分数
+])
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def records_from_tasks(tasks: List[Task], start_time: datetime) -> np.ndarray:
+    """Taskのリストをレコード配列に変換"""
+    records = np.empty(len(tasks), dtype=TASK_RECORD_DTYPE)
+    for i, task in enumerate(tasks):
+        records[i] = (
+            task.id,
+            task.base_duration_minutes,
+            task.priority.value,
+            int(task.genre),
+            (task.deadline - start_time) / timedelta(minutes=1),
+        )
+    return records
+
+
+def tasks_from_records(records: np.ndarray, start_time: datetime) -> List[Task]:
+    """レコード配列をTaskのリストに変換"""
+    priorities = {p.value: p for p in Priority}
+    return [
+        Task(
+            id=int(task_id),
+            name=f"Task_{int(task_id)}",
+            base_duration_minutes=int(duration),
+            priority=priorities[int(priority)],
+            deadline=start_time + timedelta(minutes=float(deadline_minutes)),
+            genre=str(int(genre))
+        )
+        for task_id, duration, priority, genre, deadline_minutes in records.tolist()
+    ]
+
+
+def write_packed_records(filepath: str, record_sets: Iterable[np.ndarray], start_time: datetime):
+    """
+    タスクセットごとのレコード配列をパック形式で書き出す
+
+    Args:
+        filepath: 出力ファイル
+        record_sets: タスクセットごとのレコード配列
+        start_time: タスク生成時の開始時刻（締切の基準）
+    """
+    record_sets = [np.asarray(records, dtype=TASK_RECORD_DTYPE) for records in record_sets]
+    offsets = np.zeros(len(record_sets) + 1, dtype='<i8')
+    offsets[1:] = np.cumsum([len(records) for records in record_sets])
+
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # 書き込み途中のファイルを読まれないよう、一時ファイルに書いてから置き換える
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_pack_header(offsets, start_time))
+        f.write(offsets.tobytes())
+        for records in record_sets:
+            f.write(records.tobytes())
+    os.replace(tmp_path, filepath)
+
+
+def allocate_packed_file(filepath: str, num_sets: int, tasks_per_set: int, start_time: datetime) -> int:
+    """
+    全タスクセットが同じタスク数のパック形式ファイルを、レコード領域を空けた状態で作成する
+    レコードは複数プロセスから np.memmap(mode='r+') で並列に書き込める
+
+    Returns:
+        レコード領域の先頭位置（バイト）
+    """
+    offsets = np.arange(num_sets + 1, dtype='<i8') * tasks_per_set
+
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(filepath, 'wb') as f:
+        f.write(_pack_header(offsets, start_time))
+        f.write(offsets.tobytes())
+        f.truncate(HEADER_SIZE + offsets.nbytes + int(offsets[-1]) * TASK_RECORD_DTYPE.itemsize)
+    return HEADER_SIZE + offsets.nbytes
+
+
+def _pack_header(offsets: np.ndarray, start_time: datetime) -> bytes:
+    """ヘッダー（HEADER_SIZEバイト）を作る"""
+    offsets_pos = HEADER_SIZE
+    records_pos = offsets_pos + offsets.nbytes
+    start_time_us = (start_time - _EPOCH) // timedelta(microseconds=1)
+
+    header = struct.pack(_HEADER_FORMAT, PACK_MAGIC, PACK_VERSION, len(offsets) - 1,
+                         int(offsets[-1]), start_time_us, offsets_pos, records_pos)
+    return header.ljust(HEADER_SIZE, b'\0')
+
+
+def write_packed_dataset(filepath: str, task_sets: Iterable[List[Task]], start_time: datetime):
+    """Taskのリストの列をパック形式で書き出す"""
+    write_packed_records(filepath, (records_from_tasks(tasks, start_time) for tasks in task_sets),
+                         start_time)
+
+
+class PackedTaskDataset:
+    """パック形式のデータセット（メモリマップで読み込み、任意のセットをインデックスで取り出す）"""
+
+    def __init__(self, filepath: str):
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"パック形式のデータセットが見つかりません: {filepath}")
+
+        with open(filepath, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+
+        if len(header) < struct.calcsize(_HEADER_FORMAT):
+            raise ValueError(f"パック形式のデータセットが壊れています: {filepath}")
+
+        magic, version, num_sets, num_tasks, start_time_us, offsets_pos, records_pos = \
+            struct.unpack_from(_HEADER_FORMAT, header)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"パック形式のデータセットではありません: {filepath}")
+
+        self.filepath = filepath
+        self.records_pos = records_pos
+        self.start_time = _EPOCH + timedelta(microseconds=start_time_us)
+        self.offsets = np.memmap(filepath, dtype='<i8', mode='r', offset=offsets_pos, shape=(num_sets + 1,))
+        self.records = np.memmap(filepath, dtype=TASK_RECORD_DTYPE, mode='r',
+                                 offset=records_pos, shape=(num_tasks,)) \
+            if num_tasks > 0 else np.zeros(0, dtype=TASK_RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_records(self, index: int) -> np.ndarray:
+        """指定セットのレコード配列（コピーなしのビュー）"""
+        if index < 0 or index >= len(self):
+            raise IndexError(f"インデックスが範囲外です: {index} (利用可能: 0-{len(self) - 1})")
+        return self.records[self.offsets[index]:self.offsets[index + 1]]
+
+    def get_tasks(self, index: int) -> List[Task]:
+        """指定セットをTaskのリストとして取り出す"""
+        return tasks_from_records(self.get_records(index), self.start_time)
+
+
+def pack_json_dataset(json_dir: str, filepath: str, start_time: datetime) -> int:
+    """
+    従来のJSON形式のデータセット（tasks_XXXX.json）をパック形式に変換する
+
+    Returns:
+        変換したタスクセット数
+    """
+    from .task_loader import dict_to_task
+
+    task_files = sorted(f for f in os.listdir(json_dir) if f.startswith('tasks_') and f.endswith('.json'))
+
+    def task_sets():
+        for filename in task_files:
+            with open(os.path.join(json_dir, filename), 'r', encoding='utf-8') as f:
+                yield [dict_to_task(td) for td in json.load(f)]
+
+    write_packed_dataset(filepath, task_sets(), start_time)
+    return len(task_files)
+
+
+def export_packed_to_json(filepath: str, json_dir: str) -> int:
+    """
+    パック形式のデータセットを従来のJSON形式（tasks_XXXX.json）に書き出す
+
+    Returns:
+        書き出したタスクセット数
+    """
+    from .task_loader import task_to_dict
+
+    dataset = PackedTaskDataset(filepath)
+    os.makedirs(json_dir, exist_ok=True)
+    for i in range(len(dataset)):
+        task_data = [task_to_dict(t) for t in dataset.get_tasks(i)]
+        with open(os.path.join(json_dir, f"tasks_{i:04d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(task_data, f, indent=2, default=str)
+    return len(dataset)
@@ -0,0 +1,102 @@
+"""
+シミュレーション用の乱数
+実験ごとの乱数は、1つのシードから SeedSequence の spawn の木で (実験回, スケジューラー, 用途) ごとに
+独立な乱数列として導出する。どの乱数列も前の実験を生成せずに直接作れるため、直列・並列・キャッシュの
+どの実行順でも同じ値になる（プロセス全体の random / np.random は使わない）。
+
+確率的なスケジューラー（ランダム選択・RLのε-greedy）には、判断ごとに決まった一様乱数を
+まとめて生成して渡す（DecisionStream）。スケジューラーを含めずに導出した乱数列を全スケジューラーに渡すと、
+k 回目の判断には同じ乱数が渡る（共通乱数法）。antithetic=True の乱数列は u の代わりに 1 - u を返す（対称変量法のペア）
+"""
+
+import zlib
+from typing import Optional
+
+import numpy as np
+
+
+# 乱数の用途（spawn key の最後の要素）
+RNG_PURPOSES = {
+    'tasks': 0,         # ランダム生成のタスクセット
+    'decisions': 1,     # スケジューラーの判断
+}
+
+
+def scheduler_key(scheduler_name: str) -> int:
+    """スケジューラー名から spawn key の要素を作る"""
+    return zlib.crc32(scheduler_name.encode('utf-8'))
+
+
+def experiment_seed_sequence(seed: int, experiment_id: int, scheduler_name: Optional[str] = None,
+                             purpose: str = 'decisions') -> np.random.SeedSequence:
+    """
+    (シード, 実験回, スケジューラー, 用途) の乱数列のシード
+
+    SeedSequence(seed).spawn(...)[experiment_id] → [scheduler_key(name)] → [用途の番号] と同じ spawn key の
+    SeedSequence を直接作る（scheduler_name が None の場合はスケジューラーの段を飛ばし、全スケジューラーで共通）
+
+    Args:
+        seed: 実験全体のシード
+        experiment_id: 実験回
+        scheduler_name: スケジューラー名（Noneの場合は全スケジューラーで共通の乱数列）
+        purpose: 用途（RNG_PURPOSES のキー）
+    """
+    key = (experiment_id,)
+    if scheduler_name is not None:
+        key += (scheduler_key(scheduler_name),)
+    return np.random.SeedSequence(seed, spawn_key=key + (RNG_PURPOSES[purpose],))
+
+
+def experiment_generator(seed: int, experiment_id: int, scheduler_name: Optional[str] = None,
+                         purpose: str = 'tasks') -> np.random.Generator:
+    """(シード, 実験回, スケジューラー, 用途) の乱数生成器"""
+    return np.random.default_rng(experiment_seed_sequence(seed, experiment_id, scheduler_name, purpose))
+
+
+class DecisionStream:
+    """
+    k 回目の判断に一様乱数の組を割り当てる乱数列（block_size 回分の判断の乱数をまとめて生成する）
+
+    1回の判断では、使う数によらず WIDTH 個の一様乱数を1組だけ消費する。
+    そのため、判断ごとに使う乱数の数がスケジューラーで違っても、k 回目の判断の乱数はそろう
+    """
+
+    # 1回の判断に割り当てる一様乱数の数（ランダム選択は1個、ε-greedyは2個使う）
+    WIDTH = 2
+
+    def __init__(self, seed_sequence: np.random.SeedSequence = None, antithetic: bool = False,
+                 block_size: int = 1024):
+        """
+        Args:
+            seed_sequence: 乱数列のシード（experiment_seed_sequence。Noneの場合はOSのエントロピーから作る）
+            antithetic: 1 - u を返すか（対称変量法のペアの片方）
+            block_size: まとめて生成する判断の数
+        """
+        self.seed_sequence = seed_sequence if seed_sequence is not None else np.random.SeedSequence()
+        self.antithetic = antithetic
+        self.block_size = block_size
+        self._rng = np.random.default_rng(self.seed_sequence)
+        self._block: Optional[np.ndarray] = None
+        self._position = block_size
+        self.num_decisions = 0
+
+    def next(self) -> np.ndarray:
+        """次の判断の一様乱数の組（長さ WIDTH、各値は [0, 1)、antithetic の場合は (0, 1]）"""
+        if self._position >= self.block_size:
+            self._block = self._rng.random((self.block_size, self.WIDTH))
+            if self.antithetic:
+                self._block = 1.0 - self._block
+            self._position = 0
+        values = self._block[self._position]
+        self._position += 1
+        self.num_decisions += 1
+        return values
+
+    def pair(self) -> 'DecisionStream':
+        """同じシードで antithetic を反転した乱数列（対称変量法のペアの相手）"""
+        return DecisionStream(self.seed_sequence, not self.antithetic, self.block_size)
+
+
+def uniform_index(u: float, n: int) -> int:
+    """一様乱数 u から 0〜n-1 の添字を選ぶ（u = 1.0 は n-1 にする）"""
+    return min(int(u * n), n - 1)
@@ -0,0 +1,229 @@
+"""
+大規模シナリオ（負荷試験用のタスクセット）の生成
+タスク数（1k〜100k）・期間（30〜365日）・重要度とジャンルの構成・締切の密度を指定して、
+パック形式のデータセットとして書き出す。シミュレーション・タスク選択・RLの状態計算が
+タスク数に対してどう伸びるかを測るために使う
+"""
+
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .batch_task_generator import generate_task_records, generator_config_fingerprint
+from .packed_dataset import TASK_RECORD_DTYPE, PackedTaskDataset, allocate_packed_file
+from ..models.task import Task, Priority
+from config import TASK_GENERATION_CONFIG, GENRE_CONFIG
+
+
+SCENARIO_START_TIME = datetime(2024, 1, 1, 9, 0)  # TaskSchedulingSimulation の開始時刻と同じ
+
+
+@dataclass(frozen=True)
+class ScenarioConfig:
+    """負荷試験シナリオの設定"""
+    name: str
+    num_tasks: int
+    simulation_days: int
+    work_hours_per_day: int = 8
+    priority_mix: Tuple[float, float, float] = (0.5, 0.3, 0.2)   # (LOW, MEDIUM, HIGH) の比率
+    genre_mix: Optional[Dict[str, float]] = None                  # ジャンル -> 比率（Noneの場合はGENRE_CONFIG）
+    # 締切の密度: 締切は [deadline_min_days, simulation_days] の先頭 1/deadline_density の区間に一様に分布する
+    # （1.0で期間全体に分散、大きいほど期間の前半に締切が集中する）
+    deadline_density: float = 1.0
+    deadline_min_days: Optional[float] = None                     # Noneの場合はTASK_GENERATION_CONFIGの値
+    priority_duration_ranges: Dict[str, Tuple[int, int]] = field(
+        default_factory=lambda: dict(TASK_GENERATION_CONFIG['priority_duration_ranges']))
+
+    def __post_init__(self):
+        if self.num_tasks < 1:
+            raise ValueError(f"num_tasksは1以上である必要があります: {self.num_tasks}")
+        if self.simulation_days < 1:
+            raise ValueError(f"simulation_daysは1以上である必要があります: {self.simulation_days}")
+        if len(self.priority_mix) != 3 or min(self.priority_mix) < 0 or not np.isclose(sum(self.priority_mix), 1.0):
+            raise ValueError(f"priority_mixは合計1の3つの比率である必要があります: {self.priority_mix}")
+        if self.genre_mix is not None and not np.isclose(sum(self.genre_mix.values()), 1.0):
+            raise ValueError(f"genre_mixの比率の合計は1である必要があります: {self.genre_mix}")
+        if self.deadline_density < 1.0:
+            raise ValueError(f"deadline_densityは1以上である必要があります: {self.deadline_density}")
+
+    @staticmethod
+    def from_dict(config: Dict) -> 'ScenarioConfig':
+        """設定の辞書（STRESS_SCENARIO_CONFIG の要素、またはメタデータのJSON）から作る"""
+        config = dict(config)
+        if 'priority_mix' in config:
+            config['priority_mix'] = tuple(config['priority_mix'])
+        if 'priority_duration_ranges' in config:
+            config['priority_duration_ranges'] = {k: tuple(v) for k, v in config['priority_duration_ranges'].items()}
+        return ScenarioConfig(**config)
+
+    def generation_configs(self) -> Tuple[Dict, Dict]:
+        """
+        generate_task_records に渡す (TASK_GENERATION_CONFIG形式, GENRE_CONFIG形式) の設定
+
+        Returns:
+            (generation_config, genre_config)
+        """
+        min_days = self.deadline_min_days
+        if min_days is None:
+            min_days = min(TASK_GENERATION_CONFIG['deadline_min_days'], self.simulation_days)
+        max_days = min_days + (self.simulation_days - min_days) / self.deadline_density
+
+        generation_config = {
+            'priority_low_ratio': self.priority_mix[0],
+            'priority_medium_ratio': self.priority_mix[1],
+            'priority_duration_ranges': dict(self.priority_duration_ranges),
+            'deadline_min_days': float(min_days),
+            'deadline_max_days': float(max_days),
+        }
+
+        if self.genre_mix is None:
+            genre_config = GENRE_CONFIG
+        else:
+            genre_config = {'genres': list(self.genre_mix), 'genre_distribution': dict(self.genre_mix)}
+        return generation_config, genre_config
+
+    def load_factor(self) -> float:
+        """期待される総作業時間 / 期間中の作業可能時間（1を超えると全タスクは終わらない）"""
+        ranges = self.priority_duration_ranges
+        expected_duration = sum(ratio * (low + high) / 2
+                                for ratio, (low, high) in zip(self.priority_mix,
+                                                              (ranges['LOW'], ranges['MEDIUM'], ranges['HIGH'])))
+        return self.num_tasks * expected_duration / (self.simulation_days * self.work_hours_per_day * 60)
+
+    def create_simulation(self, long_horizon: bool = False):
+        """このシナリオの期間・作業時間・タスク数のシミュレーション環境（long_horizon: 長期間モード）"""
+        from ..environment.simulation import TaskSchedulingSimulation
+
+        return TaskSchedulingSimulation(simulation_days=self.simulation_days,
+                                        work_hours_per_day=self.work_hours_per_day,
+                                        num_tasks=self.num_tasks,
+                                        long_horizon=long_horizon)
+
+
+def scenario_paths(output_dir: str, name: str) -> Tuple[str, str]:
+    """シナリオのパック形式ファイルとメタデータ（JSON）のパス"""
+    return os.path.join(output_dir, f"{name}.pack"), os.path.join(output_dir, f"{name}.scenario.json")
+
+
+def generate_scenario_records(scenario: ScenarioConfig, seed: int, set_index: int) -> np.ndarray:
+    """
+    シナリオの1タスクセットを生成する（(seed, シナリオ名, set_index) で決まる）
+    シナリオ名も乱数の系列に含め、同じシードで書き出した別のシナリオ同士の乱数が相関しないようにする
+
+    Returns:
+        長さ num_tasks のレコード配列
+    """
+    generation_config, genre_config = scenario.generation_configs()
+    scenario_key = zlib.crc32(scenario.name.encode('utf-8'))
+    rng = np.random.default_rng(np.random.SeedSequence([seed, scenario_key, set_index]))
+    return generate_task_records(rng, 1, scenario.num_tasks, generation_config, genre_config)[0]
+
+
+def write_scenario(scenario: ScenarioConfig, output_dir: str, num_sets: int = 1, seed: int = 0,
+                   start_time: datetime = SCENARIO_START_TIME) -> str:
+    """
+    シナリオを {output_dir}/{name}.pack に書き出し、設定を {name}.scenario.json に保存する
+    1セットずつメモリマップに書き込むため、100kタスクでもメモリ使用量は1セット分で済む
+
+    Args:
+        scenario: シナリオ設定
+        output_dir: 出力ディレクトリ
+        num_sets: タスクセット数（同じ設定で乱数だけが異なるセット）
+        seed: シード
+        start_time: 締切の基準時刻
+
+    Returns:
+        パック形式ファイルのパス
+    """
+    pack_path, metadata_path = scenario_paths(output_dir, scenario.name)
+
+    # 書き込み途中のファイルを読まれないよう、一時ファイルに書いてから置き換える
+    tmp_path = pack_path + '.tmp'
+    records_pos = allocate_packed_file(tmp_path, num_sets, scenario.num_tasks, start_time)
+    for set_index in range(num_sets):
+        target = np.memmap(tmp_path, dtype=TASK_RECORD_DTYPE, mode='r+',
+                           offset=records_pos + set_index * scenario.num_tasks * TASK_RECORD_DTYPE.itemsize,
+                           shape=(scenario.num_tasks,))
+        target[:] = generate_scenario_records(scenario, seed, set_index)
+        target.flush()
+        del target
+    os.replace(tmp_path, pack_path)
+
+    generation_config, genre_config = scenario.generation_configs()
+    metadata = {
+        'scenario': asdict(scenario),
+        'num_sets': num_sets,
+        'seed': seed,
+        'generator_fingerprint': generator_config_fingerprint(generation_config, genre_config),
+        'load_factor': scenario.load_factor(),
+        'created_at': datetime.now().isoformat(),
+    }
+    with open(metadata_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    return pack_path
+
+
+def load_scenario(output_dir: str, name: str) -> Tuple[ScenarioConfig, PackedTaskDataset]:
+    """
+    書き出したシナリオを読み込む
+
+    Returns:
+        (シナリオ設定, パック形式のデータセット)
+    """
+    pack_path, metadata_path = scenario_paths(output_dir, name)
+    if not os.path.exists(metadata_path):
+        raise FileNotFoundError(f"シナリオのメタデータが見つかりません: {metadata_path}")
+    with open(metadata_path, 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    return ScenarioConfig.from_dict(metadata['scenario']), PackedTaskDataset(pack_path)
+
+
+def generate_arrival_stream(arrivals_per_day: float,
+                            seed: int = 0,
+                            start_time: datetime = SCENARIO_START_TIME,
+                            generation_config: Dict = None,
+                            genre_config: Dict = None,
+                            chunk_size: int = 1024) -> Iterator[Tuple[datetime, Task]]:
+    """
+    タスクが連続的に到着する無限の到着ストリーム（ポアソン到着）
+    締切は到着時刻から [deadline_min_days, deadline_max_days] 日後。chunk_size 件ずつ生成するため、
+    メモリ使用量はストリームの長さに依存しない
+
+    Args:
+        arrivals_per_day: 1日あたりの平均到着数
+        seed: シード
+        start_time: 最初の到着時刻の基準
+        generation_config: TASK_GENERATION_CONFIG 形式の設定（Noneの場合はconfig.pyの値）
+        genre_config: GENRE_CONFIG 形式の設定（Noneの場合はconfig.pyの値）
+        chunk_size: 1回にまとめて生成するタスク数
+
+    Yields:
+        (到着時刻, Task)（到着時刻の順）
+    """
+    if arrivals_per_day <= 0:
+        raise ValueError(f"arrivals_per_dayは正の値である必要があります: {arrivals_per_day}")
+
+    rng = np.random.default_rng(np.random.SeedSequence([seed]))
+    priorities = {p.value: p for p in Priority}
+    arrival_minutes = 0.0
+    next_id = 0
+    while True:
+        records = generate_task_records(rng, 1, chunk_size, generation_config, genre_config)[0]
+        gaps = rng.exponential(24 * 60 / arrivals_per_day, size=chunk_size)
+        for gap, (_, duration, priority, genre, deadline_minutes) in zip(gaps.tolist(), records.tolist()):
+            arrival_minutes += gap
+            arrival_time = start_time + timedelta(minutes=arrival_minutes)
+            yield arrival_time, Task(
+                id=next_id,
+                name=f"Task_{next_id}",
+                base_duration_minutes=int(duration),
+                priority=priorities[int(priority)],
+                deadline=arrival_time + timedelta(minutes=float(deadline_minutes)),
+                genre=str(int(genre))
+            )
+            next_id += 1
@@ -3,15 +3,20 @@
 重複コードを削減し、一貫性を保つ
 """
 
-from typing import Dict
+import os
+from typing import Dict, Optional
 from ..models.concentration import ConcentrationModel
 from ..schedulers.scheduler import Scheduler
 from ..schedulers.task_selectors import DeadlineTaskSelector, PriorityTaskSelector, RandomTaskSelector
 from ..schedulers.break_strategies import ConcentrationBreakStrategy
 from ..schedulers.rl_learning_scheduler import RLLearningScheduler
+from ..schedulers.rl_policy_selector import read_model_data
 from config import CONCENTRATION_CONFIG, BREAK_STRATEGY_CONFIG, RL_CONFIG
 
 
+DEFAULT_RL_MODEL_PATH = "trained_models/rl_model_default.pkl"
+
+
 def create_baseline_schedulers() -> Dict[str, Scheduler]:
     """
     ベースラインスケジューラーを作成する
@@ -42,32 +47,81 @@ def create_baseline_schedulers() -> Dict[str, Scheduler]:
     return schedulers
 
 
-def create_rl_scheduler(model_path: str = None) -> RLLearningScheduler:
+def resolve_personal_data_file(bundle_file: Optional[str], personal_data_file: str = None,
+                               profile: str = None) -> Optional[str]:
+    """
+    強化学習スケジューラーが使うパーソナルデータファイル
+    バンドルのプロファイルを読み込む場合は、そのプロファイルの学習に使ったファイルを使う
+
+    Args:
+        bundle_file: 読み込み済みの保存データの personal_data_file（バンドルのプロファイルでなければNone）
+        personal_data_file: 指定されたパーソナルデータファイル
+        profile: プロファイル名（エラーの表示用）
+
+    Raises:
+        ValueError: personal_data_file がバンドルのプロファイルのファイルと異なる場合
+    """
+    if bundle_file is None:
+        return personal_data_file
+    if personal_data_file is None:
+        return bundle_file
+    if os.path.abspath(personal_data_file) != os.path.abspath(bundle_file):
+        raise ValueError(
+            f"プロファイル '{profile}' のパーソナルデータファイルと一致しません: "
+            f"{personal_data_file}（バンドル: {bundle_file}）"
+        )
+    return personal_data_file
+
+
+def create_rl_scheduler(model_path: str = None,
+                        profile: str = None,
+                        personal_data_file: str = None,
+                        distilled_model_path: str = None) -> RLLearningScheduler:
     """
     強化学習スケジューラーを作成する（テストモード）
 
     Args:
         model_path: 学習済みモデルのパス。Noneの場合はデフォルトモデルを使用
+        profile: 複数ペルソナのモデルバンドルから読み込むプロファイル名
+        personal_data_file: パーソナルデータファイル。Noneの場合はconfigの設定を使用
+                            （profile を指定した場合はバンドルに記録されたプロファイルのファイル）
+        distilled_model_path: 蒸留モデルのパス。指定した場合はQ-tableを読み込まず蒸留モードで動く
 
     Returns:
         強化学習スケジューラーインスタンス
+
+    Raises:
+        ValueError: personal_data_file がバンドルのプロファイルのファイルと異なる場合
     """
-    import os
+    # デフォルトパスを設定
+    if model_path is None:
+        model_path = DEFAULT_RL_MODEL_PATH
 
-    concentration = ConcentrationModel(**CONCENTRATION_CONFIG)
+    # モデルファイルは1回だけ読み込み、パーソナルデータの確認とQ-tableの設定に使う
+    # （バンドルのプロファイルは、学習に使ったパーソナルデータで集中力と報酬を計算する）
+    save_data = None
+    if distilled_model_path is None and os.path.exists(model_path):
+        save_data = read_model_data(model_path, profile)
+        personal_data_file = resolve_personal_data_file(save_data.get('personal_data_file'),
+                                                        personal_data_file, profile)
+
+    concentration = ConcentrationModel(**CONCENTRATION_CONFIG, personal_data_file=personal_data_file)
     rl_scheduler = RLLearningScheduler(
         concentration_model=concentration,
         learning_mode=False,  # テストモード
+        personal_data_file=personal_data_file,
         **RL_CONFIG
     )
 
-    # デフォルトパスを設定
-    if model_path is None:
-        model_path = "trained_models/rl_model_default.pkl"
+    # 蒸留モード（Q-tableは読み込まない）
+    if distilled_model_path is not None:
+        rl_scheduler.load_distilled_model(distilled_model_path)
+        print(f"✅ 蒸留モデルを読み込み: {distilled_model_path}")
+        return rl_scheduler
 
     # モデルが存在すれば読み込む
-    if os.path.exists(model_path):
-        rl_scheduler.load_model(model_path)
+    if save_data is not None:
+        rl_scheduler.load_model(model_path, profile=profile, save_data=save_data)
         print(f"✅ 学習済みモデルを読み込み: {model_path}")
     else:
         print(f"⚠️  学習済みモデルが見つからない: {model_path}")
@@ -76,6 +130,47 @@ def create_rl_scheduler(model_path: str = None) -> RLLearningScheduler:
     return rl_scheduler
 
 
+def default_scheduler_specs() -> Dict[str, Dict]:
+    """
+    評価に使うスケジューラーの設定（ベースライン3種 + 強化学習）
+    並列評価では、スケジューラーそのものではなくこの設定を各プロセスに渡して作り直す
+    """
+    specs = {name: {'type': 'baseline'} for name in
+             ('deadline_scheduler', 'priority_scheduler', 'random_scheduler')}
+    specs['rl_scheduler'] = {'type': 'rl'}
+    return specs
+
+
+def create_schedulers_from_specs(specs: Dict[str, Dict]) -> Dict[str, Scheduler]:
+    """
+    設定からスケジューラーを作成する
+
+    Args:
+        specs: スケジューラー名 -> 設定。設定の 'type' は
+               'baseline'（名前が create_baseline_schedulers のキー）または
+               'rl'（残りのキーを create_rl_scheduler の引数として渡す）
+
+    Returns:
+        スケジューラー名をキー、スケジューラーインスタンスを値とする辞書（specs の順）
+    """
+    schedulers = {}
+    baselines = None
+    for name, spec in specs.items():
+        spec = dict(spec)
+        scheduler_type = spec.pop('type')
+        if scheduler_type == 'baseline':
+            if baselines is None:
+                baselines = create_baseline_schedulers()
+            if name not in baselines:
+                raise ValueError(f"未知のベースラインスケジューラーです: {name}")
+            schedulers[name] = baselines[name]
+        elif scheduler_type == 'rl':
+            schedulers[name] = create_rl_scheduler(**spec)
+        else:
+            raise ValueError(f"未知のスケジューラーの種類です: {scheduler_type}")
+    return schedulers
+
+
 def get_scheduler_description(scheduler_name: str) -> str:
     """
     スケジューラーの説明を取得する
@@ -4,23 +4,52 @@
 
 import json
 import os
-from typing import List
+import threading
+from collections import OrderedDict, deque
+from typing import Iterable, List, Optional
 from datetime import datetime
+import numpy as np
 from ..models.task import Task, Priority
+from .packed_dataset import PackedTaskDataset, records_from_tasks, tasks_from_records
+from .batch_task_generator import (
+    SPLIT_SEED_IDS, generate_task_records, generator_config_fingerprint, virtual_set_rng
+)
+from .dataset_manifest import check_manifest, compute_set_summaries
 
 class TaskDataLoader:
     """タスクデータセットローダー"""
 
-    def __init__(self, dataset_type: str = 'train'):
+    def __init__(self, dataset_type: str = 'train', dataset_root: str = 'dataset'):
         """
         Args:
             dataset_type: 'train' or 'test'
+            dataset_root: データセットのルートディレクトリ
+
+        パック形式（{dataset_root}/{dataset_type}.pack）があればそれを、
+        なければ従来のJSON形式（{dataset_root}/{dataset_type}/tasks_XXXX.json）を読み込む
         """
         if dataset_type not in ['train', 'test']:
             raise ValueError(f"dataset_type must be 'train' or 'test', got {dataset_type}")
 
         self.dataset_type = dataset_type
-        self.dataset_dir = f"dataset/{dataset_type}"
+        self.dataset_root = dataset_root
+        self.dataset_dir = os.path.join(dataset_root, dataset_type)
+        self.pack_path = os.path.join(dataset_root, f"{dataset_type}.pack")
+        self.packed = None
+        self.manifest = None
+        self.task_files = []
+
+        if os.path.exists(self.pack_path):
+            self.packed = PackedTaskDataset(self.pack_path)
+            if len(self.packed) == 0:
+                raise FileNotFoundError(f"{self.pack_path}にタスクセットがありません")
+
+            # 生成設定のフィンガープリントを確認（マニフェストを読むだけ）
+            self.manifest = check_manifest(dataset_root, dataset_type, len(self.packed))
+            print(f"✅ {dataset_type}データセット読み込み: {len(self.packed)}セット（パック形式）")
+            if self.manifest is None:
+                print(f"⚠️ {dataset_root}/manifest.json がないため、生成設定を確認できません")
+            return
 
         if not os.path.exists(self.dataset_dir):
             raise FileNotFoundError(
@@ -49,11 +78,10 @@ class TaskDataLoader:
         Returns:
             Taskオブジェクトのリスト
         """
-        if index < 0 or index >= len(self.task_files):
-            raise IndexError(
-                f"インデックスが範囲外です: {index} "
-                f"(利用可能: 0-{len(self.task_files)-1})"
-            )
+        self._check_index(index)
+
+        if self.packed is not None:
+            return self.packed.get_tasks(index)
 
         filename = os.path.join(self.dataset_dir, self.task_files[index])
 
@@ -63,10 +91,375 @@ class TaskDataLoader:
         tasks = [dict_to_task(td) for td in task_data_list]
         return tasks
 
+    def load_task_records(self, index: int, start_time: datetime) -> np.ndarray:
+        """
+        指定インデックスのタスクセットを固定長レコード配列として読み込む
+        （パック形式ではファイルのビューをそのまま返すため解析が発生しない）
+
+        Args:
+            index: タスクセットのインデックス
+            start_time: 締切の基準時刻（JSON形式の変換に使用）
+        """
+        self._check_index(index)
+
+        if self.packed is not None:
+            return self.packed.get_records(index)
+        return records_from_tasks(self.load_tasks(index), start_time)
+
+    def _check_index(self, index: int):
+        if index < 0 or index >= self.get_num_datasets():
+            raise IndexError(
+                f"インデックスが範囲外です: {index} "
+                f"(利用可能: 0-{self.get_num_datasets()-1})"
+            )
+
     def get_num_datasets(self) -> int:
         """利用可能なデータセット数を返す"""
+        if self.packed is not None:
+            return len(self.packed)
         return len(self.task_files)
 
+    def load_summaries(self, start_time: datetime = datetime(2024, 1, 1, 9, 0)) -> np.ndarray:
+        """
+        タスクセットごとの要約統計（SET_SUMMARY_DTYPE）
+        マニフェストがあれば事前計算したものを読み込み、なければその場で計算する
+
+        Args:
+            start_time: 締切の基準時刻（JSON形式の場合に使用）
+        """
+        if self.manifest is not None:
+            summary_file = self.manifest['splits'][self.dataset_type]['summary_file']
+            return np.load(os.path.join(self.dataset_root, summary_file), mmap_mode='r')
+
+        if self.packed is not None:
+            return compute_set_summaries(self.packed.records, self.packed.offsets)
+
+        record_sets = [self.load_task_records(i, start_time) for i in range(self.get_num_datasets())]
+        offsets = np.concatenate([[0], np.cumsum([len(records) for records in record_sets])])
+        return compute_set_summaries(np.concatenate(record_sets), offsets)
+
+    def get_dataset_info(self) -> dict:
+        """実験結果と一緒に保存するデータセットの情報"""
+        info = {
+            'source': 'packed' if self.packed is not None else 'json',
+            'split': self.dataset_type,
+            'path': self.pack_path if self.packed is not None else self.dataset_dir,
+            'num_sets': self.get_num_datasets(),
+        }
+        if self.manifest is not None:
+            info['generator_fingerprint'] = self.manifest['generator_fingerprint']
+            info['seed'] = self.manifest['seed']
+        return info
+
+
+class VirtualTaskDataLoader:
+    """
+    ディスクを使わない仮想データセットのローダー
+    分割の i 番目のタスクセットを (seed, split, i) から決まる乱数で必要な時に生成する
+    """
+
+    def __init__(self,
+                 dataset_type: str = 'train',
+                 num_sets: int = 8000,
+                 num_tasks: int = 60,
+                 seed: int = 42,
+                 start_time: datetime = datetime(2024, 1, 1, 9, 0)):
+        """
+        Args:
+            dataset_type: 'train' or 'test'
+            num_sets: タスクセット数（生成はしないので数百万でもよい）
+            num_tasks: 1セットあたりのタスク数
+            seed: シード
+            start_time: 締切の基準時刻（シミュレーション開始時刻）
+        """
+        if dataset_type not in SPLIT_SEED_IDS:
+            raise ValueError(f"dataset_type must be 'train' or 'test', got {dataset_type}")
+        if num_sets < 1:
+            raise ValueError(f"num_setsは1以上である必要があります: {num_sets}")
+
+        self.dataset_type = dataset_type
+        self.num_sets = num_sets
+        self.num_tasks = num_tasks
+        self.seed = seed
+        self.start_time = start_time
+        self.fingerprint = generator_config_fingerprint()
+
+    def load_tasks(self, index: int) -> List[Task]:
+        """指定インデックスのタスクセットを生成する"""
+        return tasks_from_records(self.load_task_records(index), self.start_time)
+
+    def load_task_records(self, index: int, start_time: datetime = None) -> np.ndarray:
+        """指定インデックスのタスクセットを固定長レコード配列として生成する"""
+        if index < 0 or index >= self.num_sets:
+            raise IndexError(f"インデックスが範囲外です: {index} (利用可能: 0-{self.num_sets - 1})")
+        rng = virtual_set_rng(self.seed, self.dataset_type, index)
+        return generate_task_records(rng, 1, self.num_tasks)[0]
+
+    def get_num_datasets(self) -> int:
+        """利用可能なデータセット数を返す"""
+        return self.num_sets
+
+    def get_dataset_info(self) -> dict:
+        """実験結果と一緒に保存するデータセットの情報"""
+        return {
+            'source': 'virtual',
+            'split': self.dataset_type,
+            'num_sets': self.num_sets,
+            'num_tasks': self.num_tasks,
+            'seed': self.seed,
+            'generator_fingerprint': self.fingerprint,
+        }
+
+
+def create_task_loader(dataset_type: str, dataset_config: dict = None, num_tasks: int = None):
+    """
+    設定に従ってタスクローダーを作成する
+
+    Args:
+        dataset_type: 'train' or 'test'
+        dataset_config: TASK_DATASET_CONFIG 形式の設定（Noneの場合はconfig.pyの値）
+        num_tasks: 仮想データセットの1セットあたりのタスク数（Noneの場合はDEFAULT_SIMULATION_CONFIGの値）
+    """
+    from config import TASK_DATASET_CONFIG, DEFAULT_SIMULATION_CONFIG
+
+    config = dataset_config or TASK_DATASET_CONFIG
+    source = config.get('source', 'stored')
+
+    if source == 'stored':
+        return TaskDataLoader(dataset_type=dataset_type, dataset_root=config.get('dataset_root', 'dataset'))
+    if source != 'virtual':
+        raise ValueError(f"未知のデータセットの種類です: {source}")
+
+    loader = VirtualTaskDataLoader(
+        dataset_type=dataset_type,
+        num_sets=config['virtual_num_sets'][dataset_type],
+        num_tasks=num_tasks or DEFAULT_SIMULATION_CONFIG['num_tasks'],
+        seed=config.get('seed', 42)
+    )
+    print(f"✅ {dataset_type}データセット: {loader.num_sets}セット（仮想、フィンガープリント {loader.fingerprint}）")
+    return loader
+
+def task_loader_spec(loader) -> dict:
+    """
+    ローダーを別プロセスで作り直すための設定（タスクそのものは含まない）
+
+    Args:
+        loader: TaskDataLoader / VirtualTaskDataLoader（先読みローダーの場合は元のローダー）
+
+    Returns:
+        task_loader_from_spec に渡す辞書
+    """
+    loader = getattr(loader, 'loader', loader)
+    if isinstance(loader, VirtualTaskDataLoader):
+        return {
+            'source': 'virtual',
+            'dataset_type': loader.dataset_type,
+            'num_sets': loader.num_sets,
+            'num_tasks': loader.num_tasks,
+            'seed': loader.seed,
+            'start_time': loader.start_time,
+        }
+    if isinstance(loader, TaskDataLoader):
+        return {'source': 'stored', 'dataset_type': loader.dataset_type, 'dataset_root': loader.dataset_root}
+    raise ValueError(f"別プロセスで作り直せないローダーです: {type(loader).__name__}")
+
+
+def task_loader_from_spec(spec: dict):
+    """task_loader_spec の設定からローダーを作る"""
+    spec = dict(spec)
+    source = spec.pop('source')
+    if source == 'stored':
+        return TaskDataLoader(**spec)
+    if source == 'virtual':
+        return VirtualTaskDataLoader(**spec)
+    raise ValueError(f"未知のデータセットの種類です: {source}")
+
+
+class PrefetchingTaskDataLoader:
+    """
+    デコード済みタスクセットのLRUキャッシュと先読みスレッドを持つローダー
+
+    既知のアクセス順（access_order や prefetch() で渡したインデックス）に沿って
+    バックグラウンドでタスクセットを読み込み、ディスクI/Oをシミュレーションと並行させる。
+    返すリストはキャッシュと共有されるため、呼び出し側で変更しないこと
+    （run_simulation_with_tasks はタスクをコピーしてから使う）。
+    """
+
+    def __init__(self,
+                 loader,
+                 cache_size: int = 256,
+                 prefetch_depth: int = 8,
+                 access_order: Optional[Iterable[int]] = None):
+        """
+        Args:
+            loader: 実際に読み込むローダー（load_tasks と get_num_datasets を持つもの）
+            cache_size: キャッシュするタスクセット数の上限
+            prefetch_depth: まだ使われていない先読み済みタスクセット数の上限
+            access_order: 既知のアクセス順（遅延評価されるので無限イテレータでもよい）
+        """
+        if cache_size < 1:
+            raise ValueError(f"cache_sizeは1以上である必要があります: {cache_size}")
+
+        self.loader = loader
+        self.cache_size = cache_size
+        self.prefetch_depth = max(0, min(prefetch_depth, cache_size))
+
+        self._cache = OrderedDict()      # index -> タスクのリスト
+        self._unused = set()             # 先読みしたがまだ使われていないインデックス
+        self._loading = set()            # 読み込み中のインデックス
+        self._hints = deque()            # prefetch() で渡された先読み候補
+        self._access_order = iter(access_order) if access_order is not None else None
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self.hits = 0
+        self.misses = 0
+
+        self._thread = None
+        if self.prefetch_depth > 0:
+            self._thread = threading.Thread(target=self._prefetch_loop, daemon=True)
+            self._thread.start()
+
+    def load_tasks(self, index: int) -> List[Task]:
+        """
+        指定インデックスのタスクセットを返す（キャッシュになければ読み込む）
+
+        Args:
+            index: タスクセットのインデックス
+
+        Returns:
+            Taskオブジェクトのリスト
+        """
+        with self._condition:
+            # 先読み中なら完了を待つ
+            while index in self._loading:
+                self._condition.wait()
+
+            if index in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(index)
+                self._mark_used(index)
+                return self._cache[index]
+
+            self.misses += 1
+            self._loading.add(index)
+
+        try:
+            tasks = self.loader.load_tasks(index)
+        finally:
+            with self._condition:
+                self._loading.discard(index)
+                self._condition.notify_all()
+
+        with self._condition:
+            self._insert(index, tasks)
+        return tasks
+
+    def get_num_datasets(self) -> int:
+        """利用可能なデータセット数を返す"""
+        return self.loader.get_num_datasets()
+
+    def get_dataset_info(self) -> dict:
+        """実験結果と一緒に保存するデータセットの情報"""
+        return self.loader.get_dataset_info()
+
+    def prefetch(self, indices: Iterable[int]):
+        """
+        これから使うタスクセットのインデックスを先読み候補として渡す
+
+        前回渡した候補のうち未処理のものは破棄し、先読み済みで未使用のものも
+        先読み数の上限に数えない（サンプラーの予測が外れても先読みが止まらないように）
+        """
+        with self._condition:
+            self._hints.clear()
+            self._hints.extend(indices)
+            self._unused.clear()
+            self._condition.notify_all()
+
+    def get_cache_stats(self) -> dict:
+        """キャッシュのヒット数・ミス数・ヒット率"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'cached_sets': len(self._cache),
+        }
+
+    def close(self):
+        """先読みスレッドを停止する"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _mark_used(self, index: int):
+        if index in self._unused:
+            self._unused.discard(index)
+            self._condition.notify_all()
+
+    def _insert(self, index: int, tasks: List[Task], prefetched: bool = False):
+        """キャッシュに追加し、上限を超えたら最も古いものを捨てる（ロック内で呼ぶ）"""
+        self._cache[index] = tasks
+        self._cache.move_to_end(index)
+        if prefetched:
+            self._unused.add(index)
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._mark_used(evicted)
+
+    def _next_prefetch_index(self) -> Optional[int]:
+        """次に先読みするインデックス（ロック内で呼ぶ。候補がなければNone）"""
+        num_sets = self.loader.get_num_datasets()
+        while True:
+            if self._hints:
+                index = self._hints.popleft()
+            elif self._access_order is not None:
+                index = next(self._access_order, None)
+                if index is None:
+                    self._access_order = None
+                    return None
+            else:
+                return None
+
+            if 0 <= index < num_sets and index not in self._cache and index not in self._loading:
+                return index
+
+    def _prefetch_loop(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    index = None
+                    if len(self._unused) < self.prefetch_depth:
+                        index = self._next_prefetch_index()
+                    if index is not None:
+                        break
+                    self._condition.wait()
+                self._loading.add(index)
+
+            try:
+                tasks = self.loader.load_tasks(index)
+            except Exception:
+                # 先読みの失敗は無視し、load_tasks の同期読み込みでエラーを報告させる
+                tasks = None
+
+            with self._condition:
+                self._loading.discard(index)
+                if tasks is not None:
+                    self._insert(index, tasks, prefetched=True)
+                self._condition.notify_all()
+
+
 def dict_to_task(task_dict: dict) -> Task:
     """辞書からTaskオブジェクトを復元"""
     task = Task(
@@ -79,3 +472,15 @@ def dict_to_task(task_dict: dict) -> Task:
     )
     task.is_completed = task_dict['is_completed']
     return task
+
+def task_to_dict(task: Task) -> dict:
+    """TaskオブジェクトをJSON化可能な辞書に変換"""
+    return {
+        'id': task.id,
+        'name': task.name,
+        'base_duration_minutes': task.base_duration_minutes,
+        'priority': task.priority.name,
+        'deadline': task.deadline.isoformat(),
+        'genre': task.genre,
+        'is_completed': task.is_completed
+    }
@@ -0,0 +1,281 @@
+"""
+タスクセットの特徴量テーブル
+データセットの分割ごとに、タスクセット単位の特徴量（重要度の内訳、総スコア、所要時間の分位点、
+締切の広がり、ジャンルのエントロピーなど）を列形式で事前計算し、ベクトル化した条件検索や
+層化サンプリングに使う
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .packed_dataset import TASK_RECORD_DTYPE, records_from_tasks
+
+
+FEATURE_TABLE_VERSION = 1
+
+FEATURE_COLUMNS = (
+    'num_tasks',
+    'total_score',              # 全タスクのスコア（所要時間 × 重要度）の合計
+    'low_count',
+    'medium_count',
+    'high_count',
+    'high_ratio',
+    'total_duration',           # 所要時間の合計（分）
+    'duration_p25',
+    'duration_median',
+    'duration_p75',
+    'duration_max',
+    'deadline_min',             # 最も早い締切（開始からの分数）
+    'deadline_max',
+    'deadline_spread',          # 締切の最大 - 最小（分）
+    'deadline_tightness',       # 所要時間 / 締切までの時間 の平均（締切までの時間は1分以上とする）
+    'genre_entropy',            # ジャンル分布のエントロピー（ビット）
+)
+
+
+def _segment_quantiles(values: np.ndarray, set_ids: np.ndarray, offsets: np.ndarray,
+                       quantiles: Tuple[float, ...]) -> Dict[float, np.ndarray]:
+    """タスクセットごとの分位点（線形補間、np.quantileと同じ定義）をまとめて計算する"""
+    order = np.lexsort((values, set_ids))
+    sorted_values = values[order].astype(float)
+    counts = np.diff(offsets)
+    starts = offsets[:-1]
+
+    result = {}
+    for q in quantiles:
+        position = q * (counts - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        fraction = position - lower
+        result[q] = sorted_values[starts + lower] * (1 - fraction) + sorted_values[starts + upper] * fraction
+    return result
+
+
+def compute_task_set_features(records: np.ndarray, offsets: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    パック形式のレコードから全タスクセットの特徴量をまとめて計算する
+
+    Args:
+        records: 全タスクセットのレコード（連結されたもの、TASK_RECORD_DTYPE）
+        offsets: タスクセットの境界（長さ = セット数 + 1）
+
+    Returns:
+        列名 -> 値の配列（FEATURE_COLUMNS の順）
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    if np.any(counts == 0):
+        raise ValueError("タスクが1つもないタスクセットがあります")
+
+    starts = offsets[:-1]
+    set_ids = np.repeat(np.arange(len(counts)), counts)
+    duration = np.asarray(records['duration'], dtype=np.int64)
+    priority = np.asarray(records['priority'], dtype=np.int64)
+    deadline = np.asarray(records['deadline_minutes'], dtype=float)
+    genre = np.asarray(records['genre'], dtype=np.int64)
+
+    features = {'num_tasks': counts}
+    features['total_score'] = np.add.reduceat(duration * priority, starts)
+    for value, column in ((1, 'low_count'), (2, 'medium_count'), (3, 'high_count')):
+        features[column] = np.add.reduceat((priority == value).astype(np.int64), starts)
+    features['high_ratio'] = features['high_count'] / counts
+
+    features['total_duration'] = np.add.reduceat(duration, starts)
+    quantiles = _segment_quantiles(duration, set_ids, offsets, (0.25, 0.5, 0.75))
+    features['duration_p25'] = quantiles[0.25]
+    features['duration_median'] = quantiles[0.5]
+    features['duration_p75'] = quantiles[0.75]
+    features['duration_max'] = np.maximum.reduceat(duration, starts)
+
+    features['deadline_min'] = np.minimum.reduceat(deadline, starts)
+    features['deadline_max'] = np.maximum.reduceat(deadline, starts)
+    features['deadline_spread'] = features['deadline_max'] - features['deadline_min']
+    features['deadline_tightness'] = np.add.reduceat(duration / np.maximum(deadline, 1.0), starts) / counts
+
+    # ジャンルのエントロピー: (セット, ジャンル) ごとの件数から計算
+    genre_codes, genre_index = np.unique(genre, return_inverse=True)
+    genre_counts = np.bincount(set_ids * len(genre_codes) + genre_index,
+                               minlength=len(counts) * len(genre_codes)).reshape(len(counts), len(genre_codes))
+    probabilities = genre_counts / counts[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        features['genre_entropy'] = -np.sum(np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0),
+                                            axis=1)
+
+    return {column: features[column] for column in FEATURE_COLUMNS}
+
+
+class TaskSetFeatureTable:
+    """タスクセット単位の特徴量の列形式テーブル（行 = タスクセットのインデックス）"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], version_key: str = None):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("特徴量の列の長さが揃っていません")
+
+        self.columns = {name: np.asarray(values) for name, values in columns.items()}
+        self.version_key = version_key
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def row(self, index: int) -> Dict[str, float]:
+        """1つのタスクセットの特徴量"""
+        return {name: values[index].item() for name, values in self.columns.items()}
+
+    def where(self, mask: np.ndarray = None, **ranges: Tuple[Optional[float], Optional[float]]) -> np.ndarray:
+        """
+        条件に合うタスクセットのインデックスを返す
+
+        Args:
+            mask: 任意の条件（真偽値の配列、例: table['high_count'] >= 10）
+            **ranges: 列名 = (下限, 上限)（両端を含む、Noneは制限なし）
+
+        Returns:
+            インデックスの配列
+        """
+        selected = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+        for column, (low, high) in ranges.items():
+            values = self.columns[column]
+            if low is not None:
+                selected &= values >= low
+            if high is not None:
+                selected &= values <= high
+        return np.flatnonzero(selected)
+
+    def stratified_sample(self, column: str, num_strata: int, size: int, seed: int = 0,
+                          candidates: np.ndarray = None) -> np.ndarray:
+        """
+        列の分位点で層に分け、各層から同数ずつ選ぶ層化サンプリング
+
+        Args:
+            column: 層分けに使う列
+            num_strata: 層の数
+            size: 選ぶタスクセット数（層の数で割り切れない分は先頭の層から1つずつ追加）
+            seed: 乱数シード
+            candidates: 選択候補のインデックス（Noneの場合は全て）
+
+        Returns:
+            選んだインデックス（昇順）
+        """
+        candidates = np.arange(len(self)) if candidates is None else np.asarray(candidates)
+        if size > len(candidates):
+            raise ValueError(f"候補数({len(candidates)})より多くは選べません: {size}")
+
+        rng = np.random.default_rng(seed)
+        values = self.columns[column][candidates]
+        edges = np.quantile(values, np.linspace(0, 1, num_strata + 1)[1:-1])
+        strata = np.searchsorted(edges, values, side='right')
+
+        members = [candidates[strata == s] for s in range(num_strata)]
+        quotas = [size // num_strata + (1 if s < size % num_strata else 0) for s in range(num_strata)]
+
+        # 要素の少ない層で足りない分は、余裕のある層から補う
+        selected = []
+        shortfall = 0
+        for stratum, quota in zip(members, quotas):
+            take = min(quota, len(stratum))
+            shortfall += quota - take
+            selected.append(rng.choice(stratum, size=take, replace=False))
+        if shortfall:
+            remaining = np.setdiff1d(candidates, np.concatenate(selected))
+            selected.append(rng.choice(remaining, size=shortfall, replace=False))
+
+        return np.sort(np.concatenate(selected))
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """pandasのDataFrameに変換（インデックスはタスクセットのインデックス）"""
+        df = pd.DataFrame(self.columns)
+        df.index.name = 'task_index'
+        return df
+
+    def save(self, filepath: str):
+        """npz形式で保存"""
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = filepath + '.tmp.npz'
+        np.savez(tmp_path, __version_key__=np.array(self.version_key or ''), **self.columns)
+        os.replace(tmp_path, filepath)
+
+    @staticmethod
+    def load(filepath: str) -> 'TaskSetFeatureTable':
+        """npz形式から読み込み"""
+        with np.load(filepath) as data:
+            columns = {name: data[name] for name in data.files if name != '__version_key__'}
+            version_key = str(data['__version_key__']) if '__version_key__' in data.files else None
+        return TaskSetFeatureTable(columns, version_key=version_key or None)
+
+    @staticmethod
+    def from_records(records: np.ndarray, offsets: np.ndarray, version_key: str = None) -> 'TaskSetFeatureTable':
+        return TaskSetFeatureTable(compute_task_set_features(records, offsets), version_key=version_key)
+
+
+def dataset_version_key(loader) -> Optional[str]:
+    """
+    データセットの版を表すキー（マニフェストがある保存済みデータセットのみ、それ以外はNone）
+    生成設定・シード・シャードのハッシュが同じなら同じキーになる
+    """
+    manifest = getattr(loader, 'manifest', None)
+    if manifest is None:
+        return None
+    split = manifest['splits'][loader.dataset_type]
+    payload = [FEATURE_TABLE_VERSION, manifest['generator_fingerprint'], manifest['seed'],
+               loader.dataset_type] + [shard['sha256'] for shard in split['shards']]
+    return hashlib.sha256(repr(payload).encode('utf-8')).hexdigest()[:16]
+
+
+def _loader_records(loader, start_time: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """ローダーの全タスクセットのレコードとオフセット"""
+    packed = getattr(loader, 'packed', None)
+    if packed is not None:
+        return packed.records, packed.offsets
+
+    if hasattr(loader, 'load_task_records'):
+        record_sets = [loader.load_task_records(i, start_time) for i in range(loader.get_num_datasets())]
+    else:
+        record_sets = [records_from_tasks(loader.load_tasks(i), start_time)
+                       for i in range(loader.get_num_datasets())]
+    offsets = np.concatenate([[0], np.cumsum([len(records) for records in record_sets])])
+    records = np.concatenate(record_sets) if record_sets else np.zeros(0, dtype=TASK_RECORD_DTYPE)
+    return records, offsets
+
+
+def load_feature_table(loader, start_time: datetime = datetime(2024, 1, 1, 9, 0),
+                       verbose: bool = True) -> TaskSetFeatureTable:
+    """
+    ローダーの分割の特徴量テーブルを取得する
+    マニフェストのある保存済みデータセットでは {dataset_root}/{split}.features.npz に保存し、
+    データセットの版が変わるまで再利用する
+
+    Args:
+        loader: タスクローダー（TaskDataLoader / VirtualTaskDataLoader / PrefetchingTaskDataLoader）
+        start_time: 締切の基準時刻（JSON形式の場合に使用）
+        verbose: 進捗を表示するか
+    """
+    loader = getattr(loader, 'loader', loader)  # 先読みローダーは元のローダーを使う
+    version_key = dataset_version_key(loader)
+
+    cache_path = None
+    if version_key is not None:
+        cache_path = os.path.join(loader.dataset_root, f"{loader.dataset_type}.features.npz")
+        if os.path.exists(cache_path):
+            table = TaskSetFeatureTable.load(cache_path)
+            if table.version_key == version_key and len(table) == loader.get_num_datasets():
+                return table
+
+    if verbose:
+        print(f"タスクセットの特徴量を計算中... ({loader.get_num_datasets()}セット)")
+    records, offsets = _loader_records(loader, start_time)
+    table = TaskSetFeatureTable.from_records(records, offsets, version_key=version_key)
+
+    if cache_path is not None:
+        table.save(cache_path)
+    return table
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
 from src.models.task import Task, Priority
@@ -55,3 +56,26 @@ def concentration_model():
 def start_time():
     """テスト用の開始時刻"""
     return datetime(2024, 1, 1, 9, 0)
+
+
+class InMemoryTaskLoader:
+    """テスト用: 固定シードで生成したタスクセットを返すローダー（TaskDataLoaderと同じインターフェース）"""
+
+    def __init__(self, num_sets: int = 6, num_tasks: int = 8):
+        from src.environment.simulation import TaskSchedulingSimulation
+
+        simulation = TaskSchedulingSimulation(simulation_days=2, work_hours_per_day=4, num_tasks=num_tasks,
+                                              rng=np.random.default_rng(0))
+        self.task_sets = [simulation.generate_tasks() for _ in range(num_sets)]
+
+    def load_tasks(self, index: int):
+        return self.task_sets[index]
+
+    def get_num_datasets(self) -> int:
+        return len(self.task_sets)
+
+
+@pytest.fixture
+def task_loader():
+    """テスト用の小さなタスクローダー"""
+    return InMemoryTaskLoader()
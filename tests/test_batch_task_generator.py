@@ -0,0 +1,56 @@
+import numpy as np
+from datetime import datetime
+from src.models.task import Priority
+from src.utils.batch_task_generator import generate_task_records, generate_packed_split
+from src.utils.packed_dataset import PackedTaskDataset
+from config import TASK_GENERATION_CONFIG
+
+
+class TestBatchTaskGenerator:
+    """タスクセットのバッチ生成のテスト"""
+
+    def test_distribution_matches_config(self):
+        """重要度・所要時間・締切・ジャンルが設定の分布に従うことの検証"""
+        config = TASK_GENERATION_CONFIG
+        records = generate_task_records(np.random.default_rng(0), 2000, 60)
+
+        assert records.shape == (2000, 60)
+        assert np.array_equal(records['id'][0], np.arange(60))
+
+        priorities = records['priority']
+        assert abs(np.mean(priorities == Priority.LOW.value) - config['priority_low_ratio']) < 0.01
+        assert abs(np.mean(priorities == Priority.MEDIUM.value) - config['priority_medium_ratio']) < 0.01
+
+        for priority in Priority:
+            low, high = config['priority_duration_ranges'][priority.name]
+            durations = records['duration'][priorities == priority.value]
+            assert durations.min() == low and durations.max() == high
+
+        deadline_days = records['deadline_minutes'] / (24 * 60)
+        assert deadline_days.min() >= config['deadline_min_days']
+        assert deadline_days.max() < config['deadline_max_days']
+
+        assert set(np.unique(records['genre'])) == {1, 2, 3, 4}
+
+    def test_sharded_generation_is_deterministic(self, tmp_path):
+        """ワーカー数に関係なく同じデータセットが生成されることの検証"""
+        start_time = datetime(2024, 1, 1, 9, 0)
+        serial_path = str(tmp_path / "serial.pack")
+        parallel_path = str(tmp_path / "parallel.pack")
+
+        generate_packed_split(serial_path, 'train', 25, 10, start_time, seed=7,
+                              shard_size=10, num_workers=1, verbose=False)
+        generate_packed_split(parallel_path, 'train', 25, 10, start_time, seed=7,
+                              shard_size=10, num_workers=2, verbose=False)
+
+        serial = PackedTaskDataset(serial_path)
+        parallel = PackedTaskDataset(parallel_path)
+        assert len(serial) == 25
+        assert serial.start_time == start_time
+        assert np.array_equal(np.asarray(serial.records), np.asarray(parallel.records))
+
+        # 分割が違えば別のデータ
+        test_path = str(tmp_path / "test.pack")
+        generate_packed_split(test_path, 'test', 25, 10, start_time, seed=7,
+                              shard_size=10, num_workers=1, verbose=False)
+        assert not np.array_equal(np.asarray(serial.records), np.asarray(PackedTaskDataset(test_path).records))
@@ -0,0 +1,82 @@
+import random
+import numpy as np
+import pandas as pd
+from src.evaluation.evaluator import SchedulerEvaluator
+from src.evaluation.variance_reduction import measure_variance_reduction
+from src.utils.rng import DecisionStream, experiment_seed_sequence
+from src.utils.scheduler_factory import create_baseline_schedulers
+from src.utils.task_loader import VirtualTaskDataLoader
+
+
+SPECS = {'deadline_scheduler': {'type': 'baseline'}, 'random_scheduler': {'type': 'baseline'}}
+
+
+def make_evaluator(**kwargs) -> SchedulerEvaluator:
+    loader = VirtualTaskDataLoader('test', num_sets=6, num_tasks=30, seed=1)
+    return SchedulerEvaluator(num_experiments=6, simulation_days=3, task_loader=loader, **kwargs)
+
+
+class TestCommonRandomNumbers:
+    """共通乱数法・対称変量法のテスト"""
+
+    def test_decision_stream(self):
+        """乱数列がシードと判断の順番だけで決まることの検証"""
+        stream = DecisionStream(experiment_seed_sequence(0, 3))
+        values = np.array([stream.next() for _ in range(10)])
+        small_blocks = DecisionStream(experiment_seed_sequence(0, 3), block_size=3)
+        np.testing.assert_array_equal(values, [small_blocks.next() for _ in range(10)])
+
+        antithetic = DecisionStream(experiment_seed_sequence(0, 3)).pair()
+        np.testing.assert_allclose([antithetic.next() for _ in range(10)], 1 - values)
+        assert not np.array_equal(values[0], DecisionStream(experiment_seed_sequence(0, 4)).next())
+
+    def test_random_selector_uses_stream(self):
+        """共通乱数のランダム選択は、random モジュールの状態によらず同じ選択をすることの検証"""
+        loader = VirtualTaskDataLoader('test', num_sets=1, num_tasks=30, seed=1)
+        evaluator = make_evaluator(common_random_numbers=True)
+        tasks = loader.load_tasks(0)
+
+        results = []
+        for global_seed in (1, 2):
+            random.seed(global_seed)
+            scheduler = create_baseline_schedulers()['random_scheduler']
+            results.append(evaluator.run_single_experiment('random_scheduler', scheduler, 0, tasks))
+            assert scheduler.task_selector.random_stream is None
+        assert results[0]['total_score'] == results[1]['total_score']
+        assert results[0]['simulation_log'] == results[1]['simulation_log']
+
+    def test_antithetic_averages_pair(self):
+        """対称変量法の指標が、乱数 u と 1 - u の実行の平均になることの検証"""
+        loader = VirtualTaskDataLoader('test', num_sets=1, num_tasks=30, seed=1)
+        tasks = loader.load_tasks(0)
+        scheduler = create_baseline_schedulers()['random_scheduler']
+
+        single = make_evaluator(common_random_numbers=True)
+        scores = []
+        for antithetic in (False, True):
+            stream = DecisionStream(experiment_seed_sequence(0, 0), antithetic=antithetic)
+            scheduler.set_random_stream(stream)
+            scores.append(single._simulate(0, scheduler, tasks)['total_score'])
+        scheduler.set_random_stream(None)
+
+        paired = make_evaluator(common_random_numbers=True, antithetic=True)
+        result = paired.run_single_experiment('random_scheduler', scheduler, 0, tasks)
+        assert result['total_score'] == np.mean(scores)
+
+    def test_parallel_matches_serial(self):
+        serial = make_evaluator(common_random_numbers=True, antithetic=True).run_experiments(scheduler_specs=SPECS)
+        parallel = make_evaluator(common_random_numbers=True, antithetic=True,
+                                  workers=2).run_experiments(scheduler_specs=SPECS)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_variance_reduction_report(self):
+        loader = VirtualTaskDataLoader('test', num_sets=6, num_tasks=30, seed=1)
+        report = measure_variance_reduction(SPECS, num_experiments=6, simulation_days=3, task_loader=loader)
+
+        assert set(report['mode']) == {'independent', 'common_random_numbers', 'antithetic'}
+        assert (report[report['mode'] == 'independent']['efficiency'] == 1).all()
+        deterministic = report[report['target'] == 'deadline_scheduler']
+        assert (deterministic['efficiency'] == 1).all() and (deterministic['runs_per_set'] == 1).all()
+        antithetic = report[(report['mode'] == 'antithetic')].set_index('target')
+        assert antithetic.loc['random_scheduler', 'runs_per_set'] == 2
+        assert antithetic.loc['deadline_scheduler_vs_random_scheduler', 'runs_per_set'] == 3
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.evaluation.coreset import build_coreset, coreset_error, run_pilot, select_coreset, save_coreset, load_coreset
+from src.evaluation.evaluator import SchedulerEvaluator
+from src.utils.scheduler_factory import create_baseline_schedulers
+
+
+def _synthetic_pilot(num_sets=600, seed=0):
+    """難しさに応じてスコアが変わる合成の予備実行結果"""
+    rng = np.random.default_rng(seed)
+    difficulty = rng.gamma(2.0, 1.0, num_sets)
+    features = pd.DataFrame({'difficulty': difficulty, 'size': rng.normal(60, 5, num_sets)})
+    pilot = pd.DataFrame({
+        'a': 5000 - 300 * difficulty + rng.normal(0, 50, num_sets),
+        'b': 4900 - 200 * difficulty + rng.normal(0, 50, num_sets),
+        'c': 4700 - 100 * difficulty + rng.normal(0, 80, num_sets),
+    })
+    return features, pilot
+
+
+class TestCoreset:
+    """代表コアセットのテスト"""
+
+    def test_weights_and_indices(self):
+        """コアセットの重みの合計が1で、インデックスが重複しないことの検証"""
+        features, pilot = _synthetic_pilot()
+        coreset = build_coreset(features, pilot[['a', 'b']], size=40, seed=1)
+
+        assert len(coreset['indices']) == len(set(coreset['indices'])) <= 40
+        assert sum(coreset['weights']) == pytest.approx(1.0)
+
+        with pytest.raises(ValueError):
+            build_coreset(features, pilot, size=0)
+
+    def test_reproduces_full_means(self):
+        """重み付き平均が全体の平均と順位を再現することの検証（クラスタリングに使っていない列も含む）"""
+        features, pilot = _synthetic_pilot()
+        coreset = select_coreset(features, pilot, clustering_columns=['a', 'b'],
+                                 initial_size=30, max_size=300, tolerance=0.005, seed=1)
+
+        assert coreset['achieved']
+        assert coreset['ranking_preserved']
+        assert coreset['max_relative_error'] <= 0.005
+        assert coreset['size'] < len(pilot)
+
+        # 先頭から同じ数を取るより誤差が小さい
+        head = coreset_error(pilot, list(range(coreset['size'])), [1.0] * coreset['size'])
+        assert coreset['max_relative_error'] < head['max_relative_error']
+
+    def test_save_and_load(self, tmp_path):
+        """保存したコアセットが別のデータセットで使われないことの検証"""
+        features, pilot = _synthetic_pilot(num_sets=50)
+        coreset = build_coreset(features, pilot, size=5)
+        path = str(tmp_path / "coreset.json")
+        info = {'split': 'test', 'num_sets': 50, 'generator_fingerprint': 'abc', 'seed': 42}
+
+        save_coreset(coreset, path, dataset_info=info)
+        assert load_coreset(path, info)['indices'] == coreset['indices']
+        with pytest.raises(ValueError):
+            load_coreset(path, dict(info, num_sets=60))
+
+    def test_pilot_is_reproducible(self, task_loader):
+        """ランダム選択の予備実行がシードで決まることの検証"""
+        config = {'simulation_days': 2, 'work_hours_per_day': 4}
+        pilots = [run_pilot(task_loader, {'random_scheduler': create_baseline_schedulers()['random_scheduler']},
+                            config, seed=seed, verbose=False) for seed in (0, 0, 1)]
+        pd.testing.assert_frame_equal(pilots[0], pilots[1])
+        assert not pilots[0].equals(pilots[2])
+
+    def test_weighted_evaluation(self, task_loader):
+        """評価器がコアセットのタスクセットを重み付きで集計することの検証"""
+        schedulers = {'deadline_scheduler': create_baseline_schedulers()['deadline_scheduler']}
+        evaluator = SchedulerEvaluator(simulation_days=2, work_hours_per_day=4, task_loader=task_loader,
+                                       task_indices=[1, 4], weights=[0.75, 0.25])
+        results_df = evaluator.run_experiments(schedulers)
+
+        assert list(results_df['task_index']) == [1, 4]
+        scores = results_df['total_score'].to_numpy(dtype=float)
+        analysis = evaluator.analyze_results(results_df)
+        assert analysis['deadline_scheduler']['mean_score'] == pytest.approx(0.75 * scores[0] + 0.25 * scores[1])
+
+    def test_weighted_statistics_match_unweighted_definition(self):
+        """重みが全て等しい場合、重み付きの標準偏差とWelch検定が重みなしと一致することの検証"""
+        from scipy import stats
+
+        rng = np.random.default_rng(0)
+        results_df = pd.DataFrame({
+            'scheduler_name': ['a'] * 20 + ['b'] * 20,
+            'total_score': np.concatenate([rng.normal(100, 10, 20), rng.normal(90, 20, 20)]),
+        })
+        evaluator = SchedulerEvaluator()
+        unweighted = evaluator.statistical_significance_test(results_df)['a_vs_b']
+        weighted_df = results_df.assign(weight=0.05)
+        weighted = evaluator.statistical_significance_test(weighted_df)['a_vs_b']
+
+        a = results_df['total_score'][:20]
+        assert unweighted['p_value'] == pytest.approx(stats.ttest_ind(a, results_df['total_score'][20:],
+                                                                      equal_var=False).pvalue)
+        assert weighted['p_value'] == pytest.approx(unweighted['p_value'])
+        assert evaluator._mean_std(weighted_df[:20], 'total_score')[1] == pytest.approx(a.std())
+
+        # 重みが偏ると、平均の差は重み付き平均の差になる
+        skewed = results_df.assign(weight=np.tile(np.r_[np.full(10, 0.09), np.full(10, 0.01)], 2))
+        result = evaluator.statistical_significance_test(skewed)['a_vs_b']
+        means = [np.average(group['total_score'], weights=group['weight'])
+                 for _, group in skewed.groupby('scheduler_name')]
+        assert result['mean_diff'] == pytest.approx(means[0] - means[1])
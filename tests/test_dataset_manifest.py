@@ -0,0 +1,88 @@
+import json
+import numpy as np
+import pytest
+from datetime import datetime
+from src.utils import dataset_manifest
+from src.utils.dataset_manifest import build_dataset_split, load_manifest, compute_set_summaries
+from src.utils.packed_dataset import PackedTaskDataset
+from src.utils.task_loader import TaskDataLoader
+
+
+START_TIME = datetime(2024, 1, 1, 9, 0)
+
+
+class TestDatasetManifest:
+    """データセットのマニフェストのテスト"""
+
+    def test_incremental_rebuild(self, tmp_path):
+        """設定が同じなら既存のシャードを再利用し、壊れたシャードだけ作り直すことの検証"""
+        root = str(tmp_path)
+        first = build_dataset_split(root, 'train', 25, 8, START_TIME, seed=1, shard_size=10,
+                                    num_workers=1, verbose=False)
+        original = np.array(PackedTaskDataset(f"{root}/train.pack").records)
+
+        # セット数を増やしても、大きさの変わらないシャードはそのまま
+        grown = build_dataset_split(root, 'train', 35, 8, START_TIME, seed=1, shard_size=10,
+                                    num_workers=1, verbose=False)
+        assert [s['sha256'] for s in grown['shards'][:2]] == [s['sha256'] for s in first['shards'][:2]]
+        records = np.array(PackedTaskDataset(f"{root}/train.pack").records)
+        assert np.array_equal(records[:len(original)], original)
+
+        # 一から生成したものと同じ
+        fresh = build_dataset_split(str(tmp_path / "fresh"), 'train', 35, 8, START_TIME, seed=1,
+                                    shard_size=10, num_workers=1, verbose=False)
+        assert [s['sha256'] for s in fresh['shards']] == [s['sha256'] for s in grown['shards']]
+
+        # ハッシュが一致しないシャードは再利用しない
+        calls = []
+        original_generate = dataset_manifest.generate_packed_split
+
+        def spy(*args, **kwargs):
+            calls.append(sorted(kwargs['reusable_shards']))
+            return original_generate(*args, **kwargs)
+
+        manifest = load_manifest(root)
+        manifest['splits']['train']['shards'][1]['sha256'] = '0' * 64
+        with open(f"{root}/manifest.json", 'w') as f:
+            json.dump(manifest, f)
+
+        dataset_manifest.generate_packed_split = spy
+        try:
+            build_dataset_split(root, 'train', 35, 8, START_TIME, seed=1, shard_size=10,
+                                num_workers=1, verbose=False)
+            # シードが変わると全て作り直す
+            build_dataset_split(root, 'train', 35, 8, START_TIME, seed=2, shard_size=10,
+                                num_workers=1, verbose=False)
+        finally:
+            dataset_manifest.generate_packed_split = original_generate
+        assert calls == [[0, 2, 3], []]
+
+    def test_summaries(self, tmp_path):
+        """要約統計がタスクから計算した値と一致することの検証"""
+        root = str(tmp_path)
+        build_dataset_split(root, 'test', 12, 15, START_TIME, seed=3, shard_size=5,
+                            num_workers=1, verbose=False)
+        loader = TaskDataLoader('test', dataset_root=root)
+        summaries = loader.load_summaries()
+
+        for i in range(loader.get_num_datasets()):
+            tasks = loader.load_tasks(i)
+            assert summaries['total_score'][i] == sum(t.get_score() for t in tasks)
+            assert summaries['high_count'][i] == sum(1 for t in tasks if t.priority.name == 'HIGH')
+            tightest = min((t.deadline - START_TIME).total_seconds() / 60 for t in tasks)
+            assert summaries['tightest_deadline_minutes'][i] == pytest.approx(tightest)
+
+        # マニフェストがなくても同じ値を計算できる
+        dataset = PackedTaskDataset(f"{root}/test.pack")
+        assert np.array_equal(compute_set_summaries(dataset.records, dataset.offsets), np.asarray(summaries))
+
+    def test_loader_rejects_other_generation_config(self, tmp_path, monkeypatch):
+        """生成設定が現在と異なるデータセットを読み込まないことの検証"""
+        root = str(tmp_path)
+        build_dataset_split(root, 'train', 5, 4, START_TIME, seed=1, shard_size=5,
+                            num_workers=1, verbose=False)
+        assert TaskDataLoader('train', dataset_root=root).get_dataset_info()['seed'] == 1
+
+        monkeypatch.setattr(dataset_manifest, 'generator_config_fingerprint', lambda: 'changed')
+        with pytest.raises(ValueError):
+            TaskDataLoader('train', dataset_root=root)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from src.schedulers.distilled_policy import DistilledPolicy, distill_q_table
+from src.utils.scheduler_factory import create_rl_scheduler
+
+
+def make_q_table():
+    """集中力ビンが高いときは行動0、低いときは行動2が最適なQ-table"""
+    q_table = {}
+    for num_tasks_bin in range(3):
+        for concentration_bin in range(4):
+            q_values = np.zeros(7)
+            q_values[0 if concentration_bin >= 2 else 2] = 10.0 + num_tasks_bin
+            q_table[(num_tasks_bin, 0, 1, 1, concentration_bin, 0, 0, 0)] = q_values
+    # 初期化されただけの状態（蒸留対象外）
+    q_table[(9, 9, 9, 9, 9, 9, 9, 9)] = np.zeros(7)
+    return q_table
+
+
+class TestDistilledPolicy:
+    """DistilledPolicy のテスト"""
+
+    def test_distill_reproduces_greedy_policy(self):
+        """単純な方策が完全に再現されることの検証"""
+        policy, report = distill_q_table(make_q_table(), max_depth=3)
+
+        assert report['num_states'] == 12
+        assert report['fidelity'] == 1.0
+        assert report['mean_q_regret'] == 0.0
+        assert report['depth'] == 1
+        assert policy.predict((0, 0, 1, 1, 3, 0, 0, 0)) == 0
+        assert policy.predict((2, 0, 1, 1, 1, 0, 0, 0)) == 2
+        assert len(policy.to_rules()) == report['num_leaves'] == 2
+
+    def test_max_depth_limits_tree(self):
+        """最大深さが守られることの検証"""
+        rng = np.random.default_rng(0)
+        states = rng.integers(0, 5, size=(200, 8))
+        actions = rng.integers(0, 7, size=200)
+
+        policy = DistilledPolicy(max_depth=3).fit(states, actions)
+        assert policy.get_depth() <= 3
+
+        with pytest.raises(ValueError):
+            DistilledPolicy().fit(np.zeros((0, 8)), np.zeros(0, dtype=int))
+
+    def test_scheduler_runs_without_q_table(self, tmp_path, sample_tasks, start_time):
+        """蒸留モードのスケジューラーがQ-tableなしで動くことの検証"""
+        policy, _ = distill_q_table(make_q_table(), max_depth=3)
+        model_path = tmp_path / "distilled.pkl"
+        policy.save(str(model_path))
+
+        scheduler = create_rl_scheduler(distilled_model_path=str(model_path))
+        assert scheduler.task_selector.q_table == {}
+        assert scheduler.learning_mode is False
+
+        selected_task = scheduler.select_next_task(sample_tasks, start_time)
+        assert selected_task in sample_tasks
+        scheduler.work_on_task(selected_task)
+
+        # 推論してもQ-tableは作られない
+        assert scheduler.task_selector.q_table == {}
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from src.environment.simulation import TaskSchedulingSimulation
+from src.models.concentration import ConcentrationModel, ConcentrationState
+from src.schedulers.rl_learning_scheduler import RLLearningScheduler
+from src.utils.rng import DecisionStream, experiment_seed_sequence
+from src.utils.scheduler_factory import create_baseline_schedulers
+from src.utils.task_loader import VirtualTaskDataLoader
+from config import CONCENTRATION_CONFIG
+
+
+def make_rl_scheduler(task_sets) -> RLLearningScheduler:
+    """数エピソード学習してから評価モードにしたRLスケジューラー"""
+    scheduler = RLLearningScheduler(ConcentrationModel(**CONCENTRATION_CONFIG), learning_mode=True)
+    simulation = TaskSchedulingSimulation(simulation_days=3)
+    for i, tasks in enumerate(task_sets):
+        scheduler.set_random_stream(DecisionStream(np.random.SeedSequence(i)))
+        simulation.run_simulation_with_tasks(scheduler, tasks)
+    scheduler.set_random_stream(None)
+    scheduler.set_learning_mode(False)
+    scheduler.reset()
+    return scheduler
+
+
+def run_episode(scheduler, tasks, experiment_id: int) -> dict:
+    episode = scheduler.for_episode()
+    episode.set_random_stream(DecisionStream(experiment_seed_sequence(0, experiment_id)))
+    return TaskSchedulingSimulation(simulation_days=3).run_simulation_with_tasks(episode, tasks)
+
+
+class TestEpisodeState:
+    """ポリシーとエピソードごとの状態の分離のテスト"""
+
+    def test_concentration_for_episode(self, concentration_model):
+        """状態だけ別の集中力モデルになり、パラメータは共有されることの検証"""
+        episode = concentration_model.for_episode()
+        episode.apply_genre_switch_effect('1')
+        episode.work(90, 3)
+
+        assert episode.personal_profile is concentration_model.personal_profile
+        assert episode.current_level < concentration_model.current_level == concentration_model.initial_level
+        assert concentration_model.state == concentration_model.new_state()
+        assert isinstance(episode.state, ConcentrationState)
+        assert episode.state.last_genre == '1' and episode.last_priority == 3
+
+        resumed = concentration_model.for_episode(episode.state)
+        assert resumed.current_level == episode.current_level
+
+    def test_scheduler_for_episode_shares_policy(self, task_loader):
+        """エピソードのコピーがQ-tableを共有し、実行しても元のスケジューラーが変わらないことの検証"""
+        scheduler = make_rl_scheduler(task_loader.task_sets[:2])
+        q_table_size = len(scheduler.task_selector.q_table)
+
+        episode = scheduler.for_episode()
+        assert episode.task_selector.q_table is scheduler.task_selector.q_table
+        assert episode.concentration_model is not scheduler.concentration_model
+        assert episode.break_strategy.concentration_model is episode.concentration_model
+
+        run_episode(scheduler, task_loader.task_sets[2], 2)
+        assert scheduler.task_selector.state_history == []
+        assert scheduler.task_selector.random_stream is None
+        assert scheduler.concentration_model.state == scheduler.concentration_model.new_state()
+        # 評価モードの判断は Q-table を変更しない
+        assert len(scheduler.task_selector.q_table) == q_table_size
+
+    def test_concurrent_episodes_match_sequential(self):
+        """1つのスケジューラーで複数のエピソードをスレッドで同時に実行しても、順番に実行した結果と同じになることの検証"""
+        loader = VirtualTaskDataLoader('test', num_sets=8, num_tasks=30, seed=1)
+        task_sets = [loader.load_tasks(i) for i in range(8)]
+        schedulers = {'rl_scheduler': make_rl_scheduler(task_sets[:2]),
+                      'random_scheduler': create_baseline_schedulers()['random_scheduler']}
+
+        for scheduler in schedulers.values():
+            sequential = [run_episode(scheduler, tasks, i) for i, tasks in enumerate(task_sets)]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                concurrent = list(executor.map(lambda i: run_episode(scheduler, task_sets[i], i), range(8)))
+
+            for expected, actual in zip(sequential, concurrent):
+                assert actual['total_score'] == expected['total_score']
+                assert actual['simulation_log'] == expected['simulation_log']
@@ -1,5 +1,9 @@
 import pytest
+import pandas as pd
 from src.evaluation.evaluator import SchedulerEvaluator
+from src.evaluation.parallel_runner import default_chunk_size
+from src.evaluation.result_sink import JsonlLogStore, MemoryResultSink
+from src.utils.task_loader import VirtualTaskDataLoader
 
 
 class TestSchedulerEvaluator:
@@ -28,3 +32,78 @@ class TestSchedulerEvaluator:
         assert evaluator.num_experiments == 100
         assert evaluator.simulation_days == 7
         assert evaluator.work_hours_per_day == 8
+
+
+class TestParallelEvaluation:
+    """並列実行のテスト"""
+
+    SPECS = {
+        'deadline_scheduler': {'type': 'baseline'},
+        'random_scheduler': {'type': 'baseline'},
+        'rl_scheduler': {'type': 'rl', 'model_path': 'no_such_model.pkl'},
+    }
+
+    def make_evaluator(self, workers: int, seed: int = 0, chunk_size: int = None,
+                       group_by_task_set: bool = True, loader=None) -> SchedulerEvaluator:
+        loader = loader or VirtualTaskDataLoader('test', num_sets=5, num_tasks=20, seed=1)
+        return SchedulerEvaluator(num_experiments=6, simulation_days=3, task_loader=loader,
+                                  seed=seed, workers=workers, chunk_size=chunk_size,
+                                  group_by_task_set=group_by_task_set)
+
+    def test_matches_serial(self):
+        """並列実行の結果が直列実行と（順番も含めて）一致することの検証"""
+        serial = self.make_evaluator(workers=1).run_experiments(scheduler_specs=self.SPECS)
+        parallel = self.make_evaluator(workers=2, chunk_size=4).run_experiments(scheduler_specs=self.SPECS)
+
+        assert len(serial) == 18
+        assert list(parallel['scheduler_name']) == list(serial['scheduler_name'])
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_task_set_order_matches_scheduler_order(self, workers):
+        """タスクセット単位の実行順でも、スケジューラー単位の実行順と同じ結果になることの検証"""
+        by_scheduler = self.make_evaluator(workers=1, group_by_task_set=False).run_experiments(
+            scheduler_specs=self.SPECS)
+        by_task_set = self.make_evaluator(workers=workers, chunk_size=2).run_experiments(scheduler_specs=self.SPECS)
+        pd.testing.assert_frame_equal(by_scheduler, by_task_set)
+
+    def test_task_set_loaded_once(self):
+        """タスクセット単位の実行では、各タスクセットを1回だけ読み込むことの検証"""
+        loader = VirtualTaskDataLoader('test', num_sets=5, num_tasks=20, seed=1)
+        loaded = []
+        original = loader.load_tasks
+        loader.load_tasks = lambda index: loaded.append(index) or original(index)
+
+        self.make_evaluator(workers=1, loader=loader).run_experiments(scheduler_specs=self.SPECS)
+        assert loaded == [0, 1, 2, 3, 4, 0]
+
+    def test_seed_makes_runs_independent_of_order(self):
+        """シードを指定すると、他のスケジューラーの実行有無に関係なく同じ結果になることの検証"""
+        both = self.make_evaluator(workers=1).run_experiments(scheduler_specs=self.SPECS)
+        only_random = self.make_evaluator(workers=1).run_experiments(
+            scheduler_specs={'random_scheduler': {'type': 'baseline'}})
+        expected = both[both['scheduler_name'] == 'random_scheduler']['total_score']
+        assert list(only_random['total_score']) == list(expected)
+
+    def test_parallel_logs_match_serial(self, tmp_path):
+        """並列実行で書き出したログが直列実行と一致することの検証"""
+        logs = {}
+        for workers in (1, 2):
+            with JsonlLogStore(str(tmp_path / f"logs_{workers}.jsonl")) as log_store:
+                self.make_evaluator(workers=workers).run_to_sink(MemoryResultSink(), log_store,
+                                                                 scheduler_specs=self.SPECS)
+                logs[workers] = {(r['scheduler_name'], r['experiment_id']): r for r in log_store}
+        assert len(logs[1]) == 18
+        assert logs[1] == logs[2]
+
+    def test_parallel_requires_specs(self):
+        """並列実行にスケジューラーのインスタンスを渡すとエラーになることの検証"""
+        from src.utils.scheduler_factory import create_baseline_schedulers
+
+        with pytest.raises(ValueError):
+            self.make_evaluator(workers=2).run_experiments(create_baseline_schedulers())
+
+    def test_default_chunk_size(self):
+        """チャンクの大きさの検証"""
+        assert default_chunk_size(1000, 4) == 32
+        assert default_chunk_size(3, 4) == 1
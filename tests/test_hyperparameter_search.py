@@ -0,0 +1,90 @@
+import pytest
+from src.training.hyperparameter_search import (
+    HyperparameterSearch, build_rungs, sample_configurations
+)
+from src.utils.task_loader import PrefetchingTaskDataLoader, VirtualTaskDataLoader
+
+
+class TestHyperparameterSearch:
+    """HyperparameterSearch のテスト"""
+
+    def test_build_rungs(self):
+        """段階ごとのエピソード数の検証"""
+        assert build_rungs(500, 20000, 3) == [500, 1500, 4500, 13500, 20000]
+        assert build_rungs(10, 10, 2) == [10]
+
+        with pytest.raises(ValueError):
+            build_rungs(0, 10, 2)
+
+    def test_sample_configurations(self):
+        """設定抽出の検証"""
+        space = {'learning_rate': [0.1, 0.2], 'discount_factor': [0.9, 0.95, 0.99]}
+
+        # 全組み合わせ
+        assert len(sample_configurations(space, 100)) == 6
+
+        # 抽出はシードで再現できる
+        sampled = sample_configurations(space, 3, seed=1)
+        assert len(sampled) == 3
+        assert sampled == sample_configurations(space, 3, seed=1)
+
+    def test_successive_halving(self, task_loader, tmp_path):
+        """弱い設定が打ち切られ、最良モデルが保存されることの検証"""
+        search = HyperparameterSearch(
+            task_loader=task_loader,
+            search_space={'learning_rate': [0.05, 0.1, 0.2, 0.3], 'min_epsilon': [0.05]},
+            num_configs=4,
+            min_episodes=2,
+            max_episodes=4,
+            reduction_factor=2,
+            num_eval_sets=2,
+            num_workers=1
+        )
+
+        ranking = search.run(verbose=False)
+
+        assert len(ranking) == 4
+        assert [row['rank'] for row in ranking] == [1, 2, 3, 4]
+
+        # 最終段階まで残ったのは2設定だけ
+        assert sum(1 for row in ranking if row['episodes_trained'] == 4) == 2
+        assert ranking[0]['episodes_trained'] == 4
+
+        # 評価用タスクセットは学習に使われない
+        assert set(search.train_indices).isdisjoint(search.eval_indices)
+
+        model_path = tmp_path / "best_model.pkl"
+        best = search.save_best_model(str(model_path))
+        assert model_path.exists()
+        assert best['params']['learning_rate'] == ranking[0]['learning_rate']
+
+    def test_parallel_search_rebuilds_loader_in_workers(self, monkeypatch):
+        """並列探索で、先読みローダーを送らずに探索全体で1つのプロセスプールを使うことの検証"""
+        from src.training import hyperparameter_search
+
+        created = []
+
+        class CountingExecutor(hyperparameter_search.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                created.append(kwargs)
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(hyperparameter_search, 'ProcessPoolExecutor', CountingExecutor)
+        loader = PrefetchingTaskDataLoader(VirtualTaskDataLoader('train', num_sets=6, num_tasks=20, seed=1))
+        search = HyperparameterSearch(
+            task_loader=loader,
+            search_space={'learning_rate': [0.05, 0.1, 0.2, 0.3]},
+            num_configs=4,
+            min_episodes=1,
+            max_episodes=4,
+            reduction_factor=2,
+            num_eval_sets=2,
+            num_workers=2
+        )
+
+        ranking = search.run(verbose=False)
+
+        assert len(ranking) == 4
+        assert len(created) == 1
+        assert created[0]['initargs'][0]['source'] == 'virtual'
+        assert sum(1 for row in ranking if row['episodes_trained'] == 4) == 1
@@ -0,0 +1,75 @@
+import pytest
+from src.training.multi_persona_trainer import MultiPersonaTrainer, list_bundle_profiles
+from src.evaluation.result_cache import scheduler_fingerprint
+from src.utils.scheduler_factory import create_rl_scheduler
+
+
+class TestMultiPersonaTrainer:
+    """MultiPersonaTrainer のテスト"""
+
+    PROFILES = {
+        'default': 'personal_data.json',
+        'switch_short': 'personas/switch_short.json',
+    }
+
+    def test_profiles_use_own_personal_data(self, task_loader):
+        """プロファイルごとに別のパーソナルデータが使われることの検証"""
+        trainer = MultiPersonaTrainer(self.PROFILES, task_loader)
+
+        default = trainer.schedulers['default']
+        switch = trainer.schedulers['switch_short']
+        assert default.concentration_model.genre_preference_type == 'same'
+        assert switch.concentration_model.genre_preference_type == 'switch'
+        assert switch.concentration_model.decay_factor > default.concentration_model.decay_factor
+        assert switch.task_selector.personal_data_file == 'personas/switch_short.json'
+
+    def test_train_and_save_bundle(self, task_loader, tmp_path):
+        """同時学習とモデルバンドルの保存・読み込みの検証"""
+        trainer = MultiPersonaTrainer(self.PROFILES, task_loader)
+        stats = trainer.train(num_episodes=3, verbose=False)
+
+        assert set(stats) == set(self.PROFILES)
+        for profile_stats in stats.values():
+            assert len(profile_stats['episode_rewards']) == 3
+            assert profile_stats['q_table_size'] > 0
+
+        bundle_path = tmp_path / "bundle.pkl"
+        trainer.save_bundle(str(bundle_path))
+        assert list_bundle_profiles(str(bundle_path)) == sorted(self.PROFILES)
+
+        scheduler = create_rl_scheduler(str(bundle_path), profile='switch_short',
+                                        personal_data_file='personas/switch_short.json')
+        assert scheduler.task_selector.q_table.keys() == \
+            trainer.schedulers['switch_short'].task_selector.q_table.keys()
+
+        # パーソナルデータはバンドルに記録されたプロファイルのファイルを使う（異なるファイルの指定はエラー）
+        scheduler = create_rl_scheduler(str(bundle_path), profile='switch_short')
+        assert scheduler.concentration_model.genre_preference_type == 'switch'
+        assert scheduler.task_selector.personal_data_file == 'personas/switch_short.json'
+        with pytest.raises(ValueError):
+            create_rl_scheduler(str(bundle_path), profile='switch_short', personal_data_file='personal_data.json')
+
+        # プロファイル未指定ではバンドルを読み込めない
+        with pytest.raises(ValueError):
+            create_rl_scheduler(str(bundle_path))
+
+    def test_bundle_is_read_once(self, task_loader, tmp_path, monkeypatch):
+        """スケジューラーの作成とフィンガープリントの計算でバンドルを読み込み直さないことの検証"""
+        from src.schedulers import rl_policy_selector
+
+        trainer = MultiPersonaTrainer(self.PROFILES, task_loader)
+        trainer.train(num_episodes=1, verbose=False)
+        bundle_path = tmp_path / "bundle.pkl"
+        trainer.save_bundle(str(bundle_path))
+
+        loads = []
+        original_load = rl_policy_selector.pickle.load
+        monkeypatch.setattr(rl_policy_selector.pickle, 'load', lambda f: loads.append(f) or original_load(f))
+
+        create_rl_scheduler(str(bundle_path), profile='switch_short')
+        assert len(loads) == 1
+
+        spec = {'type': 'rl', 'model_path': str(bundle_path), 'profile': 'switch_short'}
+        fingerprint = scheduler_fingerprint('rl_scheduler', spec)
+        assert scheduler_fingerprint('rl_scheduler', spec) == fingerprint
+        assert len(loads) == 2
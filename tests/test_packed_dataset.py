@@ -0,0 +1,112 @@
+import json
+import pytest
+from datetime import datetime
+from src.utils.packed_dataset import (
+    PackedTaskDataset, write_packed_dataset, pack_json_dataset, export_packed_to_json
+)
+from src.utils.task_loader import TaskDataLoader, task_to_dict
+
+
+def _task_signature(task):
+    return (task.id, task.base_duration_minutes, task.priority, task.deadline, task.genre)
+
+
+class TestPackedDataset:
+    """パック形式のデータセットのテスト"""
+
+    def test_round_trip(self, tmp_path, task_loader):
+        """書き出したタスクセットがそのまま読み戻せることの検証"""
+        start_time = datetime(2024, 1, 1, 9, 0)
+        task_sets = [task_loader.load_tasks(i) for i in range(task_loader.get_num_datasets())]
+        path = str(tmp_path / "train.pack")
+
+        write_packed_dataset(path, task_sets, start_time)
+        dataset = PackedTaskDataset(path)
+
+        assert len(dataset) == len(task_sets)
+        assert dataset.start_time == start_time
+        for i, tasks in enumerate(task_sets):
+            restored = dataset.get_tasks(i)
+            assert [_task_signature(t) for t in restored] == [_task_signature(t) for t in tasks]
+            assert len(dataset.get_records(i)) == len(tasks)
+
+        with pytest.raises(IndexError):
+            dataset.get_records(len(task_sets))
+
+    def test_invalid_file(self, tmp_path):
+        """パック形式でないファイルを拒否することの検証"""
+        path = tmp_path / "broken.pack"
+        path.write_bytes(b"not a pack file" * 8)
+
+        with pytest.raises(ValueError):
+            PackedTaskDataset(str(path))
+
+    def test_loader_prefers_packed(self, tmp_path, task_loader):
+        """TaskDataLoaderがパック形式を優先し、JSON形式と同じタスクを返すことの検証"""
+        start_time = datetime(2024, 1, 1, 9, 0)
+        task_sets = [task_loader.load_tasks(i) for i in range(3)]
+
+        # JSON形式で書き出し、パック形式に変換
+        json_dir = tmp_path / "train"
+        json_dir.mkdir()
+        for i, tasks in enumerate(task_sets):
+            (json_dir / f"tasks_{i:04d}.json").write_text(
+                json.dumps([task_to_dict(t) for t in tasks], default=str))
+
+        json_loader = TaskDataLoader('train', dataset_root=str(tmp_path))
+        assert json_loader.packed is None
+
+        assert pack_json_dataset(str(json_dir), str(tmp_path / "train.pack"), start_time) == 3
+        packed_loader = TaskDataLoader('train', dataset_root=str(tmp_path))
+        assert packed_loader.packed is not None
+        assert packed_loader.get_num_datasets() == 3
+
+        for i in range(3):
+            assert ([_task_signature(t) for t in packed_loader.load_tasks(i)]
+                    == [_task_signature(t) for t in json_loader.load_tasks(i)])
+            assert (packed_loader.load_task_records(i, start_time).tolist()
+                    == json_loader.load_task_records(i, start_time).tolist())
+
+        # JSON形式への書き戻し
+        export_dir = tmp_path / "export"
+        assert export_packed_to_json(str(tmp_path / "train.pack"), str(export_dir)) == 3
+        exported = json.loads((export_dir / "tasks_0001.json").read_text())
+        assert exported[0]['deadline'] == task_sets[1][0].deadline.isoformat()
+
+
+class TestVirtualTaskDataLoader:
+    """仮想データセットのローダーのテスト"""
+
+    def test_sets_are_reproducible_and_independent(self):
+        """同じ (seed, split, index) からは同じタスクセット、分割が違えば別のタスクセットになることの検証"""
+        from src.utils.task_loader import VirtualTaskDataLoader
+
+        train = VirtualTaskDataLoader('train', num_sets=1_000_000, num_tasks=20, seed=3)
+        again = VirtualTaskDataLoader('train', num_sets=1_000_000, num_tasks=20, seed=3)
+        test = VirtualTaskDataLoader('test', num_sets=1_000_000, num_tasks=20, seed=3)
+
+        # 前のセットを生成しなくても任意のセットを直接取り出せる
+        last = train.load_task_records(999_999)
+        assert last.tolist() == again.load_task_records(999_999).tolist()
+        assert train.load_task_records(5).tolist() != test.load_task_records(5).tolist()
+        assert train.load_task_records(5).tolist() != train.load_task_records(6).tolist()
+
+        tasks = train.load_tasks(999_999)
+        assert len(tasks) == 20
+        assert [t.base_duration_minutes for t in tasks] == last['duration'].tolist()
+
+        info = train.get_dataset_info()
+        assert info['source'] == 'virtual'
+        assert info['generator_fingerprint'] == again.fingerprint
+
+        with pytest.raises(IndexError):
+            train.load_tasks(1_000_000)
+
+    def test_fingerprint_tracks_generation_config(self):
+        """生成設定が変わるとフィンガープリントが変わることの検証"""
+        from src.utils.batch_task_generator import generator_config_fingerprint
+        from config import TASK_GENERATION_CONFIG
+
+        changed = dict(TASK_GENERATION_CONFIG, deadline_max_days=6.0)
+        assert generator_config_fingerprint() == generator_config_fingerprint()
+        assert generator_config_fingerprint(changed) != generator_config_fingerprint()
@@ -0,0 +1,63 @@
+import json
+import pytest
+from src.models.concentration import ConcentrationModel
+from src.models.personal_profile import (
+    PersonalProfile, load_personal_profile, clear_profile_registry
+)
+from src.schedulers.rl_learning_scheduler import RLLearningScheduler
+from config import CONCENTRATION_CONFIG, RL_CONFIG
+
+
+class TestPersonalProfile:
+    """PersonalProfile とプロファイルレジストリのテスト"""
+
+    def test_profile_loaded_once(self, tmp_path, monkeypatch):
+        """同じファイルは1回だけ読み込まれることの検証"""
+        path = tmp_path / "persona.json"
+        path.write_text(json.dumps({
+            'concentration_sustainability': 'short',
+            'genre_preference_type': 'switch',
+            'same_genre_preference': {'same_genre_bonus': 0.05, 'switch_genre_penalty': 0.0},
+            'switch_genre_preference': {'same_genre_penalty': 0.0, 'switch_genre_bonus': 0.1},
+        }))
+
+        profile = load_personal_profile(str(path))
+        assert profile.genre_preference_type == 'switch'
+        assert profile.genre_params == {'same_genre_penalty': 0.0, 'switch_genre_bonus': 0.1}
+        assert profile.decay_factor == 1.3
+
+        # 2回目以降はファイルを開かない
+        def fail_open(*args, **kwargs):
+            raise AssertionError("プロファイルが再読み込みされた")
+        monkeypatch.setattr('builtins.open', fail_open)
+        assert load_personal_profile(str(path)) is profile
+        monkeypatch.undo()
+
+        clear_profile_registry()
+        assert load_personal_profile(str(path)) is not profile
+
+    def test_profile_is_immutable(self):
+        """プロファイルが変更できないことの検証"""
+        profile = load_personal_profile()
+
+        with pytest.raises(AttributeError):
+            profile.genre_preference_type = 'switch'
+
+        # genre_paramsはコピーなので、書き換えてもプロファイルに影響しない
+        profile.genre_params['same_genre_bonus'] = 1.0
+        assert profile.genre_params['same_genre_bonus'] != 1.0
+
+    def test_models_share_profile(self):
+        """集中力モデルと報酬関数が同じプロファイルを共有することの検証"""
+        profile = PersonalProfile.from_dict({
+            'genre_preference_type': 'switch',
+            'same_genre_preference': {},
+            'switch_genre_preference': {'same_genre_penalty': 0.0, 'switch_genre_bonus': 0.05},
+        })
+
+        concentration_model = ConcentrationModel(**CONCENTRATION_CONFIG, personal_profile=profile)
+        scheduler = RLLearningScheduler(concentration_model=concentration_model, **RL_CONFIG)
+
+        assert concentration_model.genre_preference_type == 'switch'
+        assert concentration_model.decay_factor == 1.0
+        assert scheduler.task_selector.personal_profile is profile
@@ -0,0 +1,88 @@
+import threading
+import pytest
+from src.utils.task_loader import PrefetchingTaskDataLoader
+from src.training.task_set_sampler import RoundRobinTaskSetSampler, PrioritizedTaskSetSampler
+
+
+class CountingLoader:
+    """読み込み回数を数えるローダー"""
+
+    def __init__(self, task_loader):
+        self.task_loader = task_loader
+        self.load_counts = {}
+        self.lock = threading.Lock()
+
+    def load_tasks(self, index):
+        with self.lock:
+            self.load_counts[index] = self.load_counts.get(index, 0) + 1
+        return self.task_loader.load_tasks(index)
+
+    def get_num_datasets(self):
+        return self.task_loader.get_num_datasets()
+
+
+class TestPrefetchingTaskDataLoader:
+    """PrefetchingTaskDataLoader のテスト"""
+
+    def test_cache_reuses_decoded_sets(self, task_loader):
+        """同じタスクセットは1回だけ読み込まれることの検証"""
+        counting = CountingLoader(task_loader)
+        with PrefetchingTaskDataLoader(counting, cache_size=16, prefetch_depth=0) as loader:
+            for _ in range(3):
+                for i in range(loader.get_num_datasets()):
+                    assert loader.load_tasks(i) == task_loader.load_tasks(i)
+
+            stats = loader.get_cache_stats()
+
+        assert all(count == 1 for count in counting.load_counts.values())
+        assert stats['misses'] == task_loader.get_num_datasets()
+        assert stats['hits'] == 2 * task_loader.get_num_datasets()
+
+    def test_lru_eviction(self, task_loader):
+        """キャッシュ上限を超えると最も古いタスクセットが捨てられることの検証"""
+        counting = CountingLoader(task_loader)
+        with PrefetchingTaskDataLoader(counting, cache_size=2, prefetch_depth=0) as loader:
+            loader.load_tasks(0)
+            loader.load_tasks(1)
+            loader.load_tasks(0)   # 0 が最近使われた
+            loader.load_tasks(2)   # 1 が捨てられる
+            loader.load_tasks(0)
+            loader.load_tasks(1)
+
+        assert counting.load_counts == {0: 1, 1: 2, 2: 1}
+
+    def test_prefetch_along_access_order(self, task_loader):
+        """アクセス順に沿った先読みで、全ての読み込みがキャッシュヒットになることの検証"""
+        counting = CountingLoader(task_loader)
+        order = [3, 1, 4, 0, 5, 2]
+        with PrefetchingTaskDataLoader(counting, cache_size=8, prefetch_depth=8,
+                                       access_order=order) as loader:
+            # 先読みスレッドが全て読み込むまで待つ
+            with loader._condition:
+                while len(loader._cache) < len(order):
+                    loader._condition.wait(timeout=1.0)
+
+            for i in order:
+                assert loader.load_tasks(i) == task_loader.load_tasks(i)
+            stats = loader.get_cache_stats()
+
+        assert stats['hits'] == len(order)
+        assert all(count == 1 for count in counting.load_counts.values())
+
+    def test_sampler_upcoming(self, task_loader):
+        """サンプラーが先読み候補を返すことの検証"""
+        round_robin = RoundRobinTaskSetSampler(4)
+        assert round_robin.upcoming(3, 3) == [3, 0, 1]
+
+        prioritized = PrioritizedTaskSetSampler(4, seed=0)
+        for index in range(4):
+            prioritized.update(index, td_error=float(index + 1))
+        assert prioritized.upcoming(0, 2) == [3, 2]
+
+        counting = CountingLoader(task_loader)
+        with PrefetchingTaskDataLoader(counting, cache_size=8, prefetch_depth=4) as loader:
+            loader.prefetch(round_robin.upcoming(0, 4))
+            for i in round_robin.upcoming(0, 4):
+                loader.load_tasks(i)
+
+        assert all(count == 1 for count in counting.load_counts.values())
@@ -0,0 +1,87 @@
+import pandas as pd
+from src.evaluation.evaluator import SchedulerEvaluator
+from src.evaluation.progress import ThroughputMonitor, append_history, format_duration, resource_usage
+from src.evaluation.result_sink import MemoryResultSink
+from src.evaluation.sequential import ObservingResultSink
+from src.utils.task_loader import VirtualTaskDataLoader
+
+
+SPECS = {'deadline_scheduler': {'type': 'baseline'}, 'random_scheduler': {'type': 'baseline'}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestProgress:
+    """評価の進捗・コスト計測のテスト"""
+
+    def test_monitor_reports_throughput_and_eta(self, capsys):
+        clock = FakeClock()
+        monitor = ThroughputMonitor(total_runs=10, interval=5.0, clock=clock)
+        for _ in range(4):
+            clock.now += 1.0
+            monitor.observe({'num_decisions': 50})
+        assert capsys.readouterr().out == ''
+
+        clock.now += 1.0
+        monitor.observe({'num_decisions': 50})
+        assert "5/10件 (50.0%) 1.0 エピソード/秒, 50 判断/秒, 残り約5秒" in capsys.readouterr().out
+
+        summary = monitor.summary()
+        assert summary['episodes'] == 5 and summary['decisions'] == 250
+        assert summary['wall_seconds'] == 5.0 and summary['decisions_per_second'] == 50.0
+        assert summary['cpu_seconds'] >= 0
+
+    def test_cached_rows_are_not_throughput(self, capsys):
+        """キャッシュから読んだ結果が進捗には数えられ、スループットと残り時間には含まれないことの検証"""
+        clock = FakeClock()
+        monitor = ThroughputMonitor(total_runs=10, interval=5.0, clock=clock)
+        for _ in range(4):
+            monitor.observe({'num_decisions': 500, 'from_cache': True})
+        for _ in range(2):
+            clock.now += 2.5
+            monitor.observe({'num_decisions': 50, 'from_cache': False})
+        assert "6/10件 (60.0%) 0.4 エピソード/秒, 20 判断/秒（キャッシュ 4件）, 残り約10秒" in capsys.readouterr().out
+
+        summary = monitor.summary()
+        assert summary['episodes'] == 2 and summary['decisions'] == 100 and summary['cached_runs'] == 4
+        assert summary['episodes_per_second'] == 0.4 and summary['decisions_per_second'] == 20.0
+
+    def test_resource_usage_and_duration(self):
+        usage = resource_usage()
+        assert usage['cpu_seconds'] > 0
+        assert usage['peak_rss_mb'] is None or usage['peak_rss_mb'] > 0
+        assert format_duration(3725) == "1時間2分"
+        assert format_duration(125) == "2分5秒"
+
+    def test_append_history(self, tmp_path):
+        path = str(tmp_path / 'history' / 'cost.csv')
+        append_history(path, {'timestamp': 'a', 'wall_seconds': 1.0})
+        append_history(path, {'timestamp': 'b', 'wall_seconds': 2.0})
+        append_history(path, {'timestamp': 'c', 'wall_seconds': 3.0, 'peak_rss_mb': 100.0})
+
+        history = pd.read_csv(path)
+        assert list(history['timestamp']) == ['a', 'b', 'c']
+        assert history['peak_rss_mb'].isna().sum() == 2
+
+    def test_full_split_parallel_long_horizon(self):
+        """全セットを長期間モード・並列で評価しても、通常モードの直列と同じ結果になり、判断数を数えられることの検証"""
+        loader = VirtualTaskDataLoader('test', num_sets=6, num_tasks=30, seed=1)
+        serial = SchedulerEvaluator(num_experiments=loader.get_num_datasets(), simulation_days=3,
+                                    task_loader=loader, seed=0).run_experiments(scheduler_specs=SPECS)
+
+        evaluator = SchedulerEvaluator(num_experiments=loader.get_num_datasets(), simulation_days=3,
+                                       task_loader=loader, seed=0, workers=2, long_horizon=True)
+        monitor = ThroughputMonitor(total_runs=12)
+        sink = MemoryResultSink()
+        names = evaluator.run_to_sink(ObservingResultSink(sink, monitor.observe), scheduler_specs=SPECS)
+        fast = evaluator._sort_results(sink.read(), names)
+
+        pd.testing.assert_frame_equal(serial, fast)
+        assert monitor.episodes == 12
+        assert monitor.decisions == serial['num_decisions'].sum() > 0
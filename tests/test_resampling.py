@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from src.evaluation.resampling import bootstrap_means, resampling_analysis, sign_flip_statistics
+
+
+def make_results(num_sets: int = 400, shifts=(0.0, 2.0, 0.0), seed: int = 0) -> pd.DataFrame:
+    """タスクセットごとの難しさを共有し、スケジューラーごとに平均をずらした結果"""
+    rng = np.random.default_rng(seed)
+    difficulty = rng.normal(100, 20, num_sets)
+    rows = []
+    for s, shift in enumerate(shifts):
+        scores = difficulty + shift + rng.normal(0, 5, num_sets)
+        rows += [{'scheduler_name': f"scheduler_{s}", 'experiment_id': e, 'total_score': scores[e],
+                  'completion_rate': rng.random()} for e in range(num_sets)]
+    return pd.DataFrame(rows)
+
+
+class TestResampling:
+    """ブートストラップ信頼区間と並べ替え検定のテスト"""
+
+    def test_bootstrap_matches_loop(self):
+        """回数行列による平均が、添字で復元抽出した平均と一致することの検証"""
+        values = np.random.default_rng(1).normal(size=(50, 3, 2))
+        weights = np.random.default_rng(2).uniform(0.5, 2, 50)
+
+        means = bootstrap_means(values, weights, 20, np.random.default_rng(3), chunk_size=20)
+
+        rng = np.random.default_rng(3)
+        picks = rng.integers(0, 50, size=(20, 50))
+        expected = np.stack([np.average(values[p], axis=0, weights=weights[p]) for p in picks])
+        np.testing.assert_allclose(means, expected)
+
+    def test_sign_flip_statistics(self):
+        """符号を入れ替えた平均が ±1 の行列と差の積になっていることの検証"""
+        # 単位行列の差からは符号そのものが取り出せる
+        signs = sign_flip_statistics(np.eye(30), np.ones(30), 10, np.random.default_rng(5)) * 30
+        np.testing.assert_allclose(np.abs(signs), 1)
+
+        differences = np.random.default_rng(1).normal(size=(30, 4))
+        statistics = sign_flip_statistics(differences, np.ones(30), 10, np.random.default_rng(5))
+        expected = np.stack([(sign[:, None] * differences).mean(axis=0) for sign in signs])
+        np.testing.assert_allclose(statistics, expected)
+
+    def test_chunk_size_does_not_change_results(self):
+        """チャンクの大きさによらず同じ結果になることの検証"""
+        df = make_results(num_sets=101)
+        whole = resampling_analysis(df, n_resamples=500, seed=3)
+        chunked = resampling_analysis(df, n_resamples=500, seed=3, chunk_size=7)
+        pd.testing.assert_frame_equal(whole['confidence_intervals'], chunked['confidence_intervals'])
+        pd.testing.assert_frame_equal(whole['comparisons'], chunked['comparisons'])
+
+    def test_detects_paired_difference(self):
+        """タスクセット間のばらつきが大きくても、対応のある差を検出することの検証"""
+        df = make_results()
+        result = resampling_analysis(df, n_resamples=2000, seed=0)
+        comparisons = result['comparisons'].set_index(['metric', 'comparison'])
+
+        shifted = comparisons.loc[('total_score', 'scheduler_0_vs_scheduler_1')]
+        assert shifted['significant'] and shifted['ci_low'] < -2 * 0.5 and shifted['ci_high'] < 0
+        same = comparisons.loc[('total_score', 'scheduler_0_vs_scheduler_2')]
+        assert not same['significant'] and same['ci_low'] < 0 < same['ci_high']
+
+        # 大標本では対応のあるt検定とほぼ同じp値になる
+        scores = df.pivot(index='experiment_id', columns='scheduler_name', values='total_score')
+        t_p = stats.ttest_rel(scores['scheduler_0'], scores['scheduler_2']).pvalue
+        assert same['p_value'] == pytest.approx(t_p, abs=0.05)
+
+    def test_confidence_interval_width(self):
+        """平均の信頼区間が正規近似の幅とほぼ一致することの検証"""
+        df = make_results(num_sets=1000)
+        intervals = resampling_analysis(df, n_resamples=4000, seed=0)['confidence_intervals']
+        row = intervals[(intervals['metric'] == 'total_score') & (intervals['scheduler_name'] == 'scheduler_0')].iloc[0]
+        scores = df[df['scheduler_name'] == 'scheduler_0']['total_score']
+        expected_width = 2 * 1.96 * scores.std() / np.sqrt(len(scores))
+        assert row['ci_low'] < row['mean'] < row['ci_high']
+        assert row['ci_high'] - row['ci_low'] == pytest.approx(expected_width, rel=0.1)
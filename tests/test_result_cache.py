@@ -0,0 +1,115 @@
+import pandas as pd
+import pytest
+import config
+from src.evaluation.evaluator import SchedulerEvaluator
+from src.evaluation.result_sink import JsonlLogStore, MemoryResultSink
+from src.evaluation.result_cache import ResultCache, scheduler_fingerprint, simulation_fingerprint, task_set_hash
+from src.utils.scenario_generator import SCENARIO_START_TIME
+from src.utils.task_loader import VirtualTaskDataLoader
+
+
+SPECS = {
+    'deadline_scheduler': {'type': 'baseline'},
+    'priority_scheduler': {'type': 'baseline'},
+    'random_scheduler': {'type': 'baseline'},
+}
+
+
+def make_evaluator(cache: ResultCache, seed=0, workers: int = 1, simulation_days: int = 3) -> SchedulerEvaluator:
+    loader = VirtualTaskDataLoader('test', num_sets=4, num_tasks=20, seed=1)
+    return SchedulerEvaluator(num_experiments=4, simulation_days=simulation_days, task_loader=loader,
+                              seed=seed, workers=workers, result_cache=cache)
+
+
+class TestResultCache:
+    """実験結果のキャッシュのテスト"""
+
+    def test_rerun_uses_cache(self, tmp_path):
+        """2回目の実行がキャッシュから同じ結果を返すことの検証"""
+        with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+            first = make_evaluator(cache).run_experiments(scheduler_specs=SPECS)
+            assert (cache.hits, cache.misses) == (0, 12)
+
+            second = make_evaluator(cache).run_experiments(scheduler_specs=SPECS)
+            assert (cache.hits, cache.misses) == (12, 12)
+            assert not first['from_cache'].any() and second['from_cache'].all()
+            pd.testing.assert_frame_equal(first.drop(columns='from_cache'), second.drop(columns='from_cache'))
+
+        # 開き直しても残っている
+        with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+            assert len(cache) == 12
+
+    def test_parallel_with_cache_matches_serial(self, tmp_path):
+        """一部がキャッシュにある状態の並列実行が直列実行と一致することの検証"""
+        expected = make_evaluator(None).run_experiments(scheduler_specs=SPECS)
+        with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+            make_evaluator(cache).run_experiments(scheduler_specs={'deadline_scheduler': {'type': 'baseline'}})
+            result = make_evaluator(cache, workers=2).run_experiments(scheduler_specs=SPECS)
+            assert cache.hits == 4
+        assert result['from_cache'].sum() == 4
+        pd.testing.assert_frame_equal(expected, result.drop(columns='from_cache'))
+
+    def test_cached_runs_are_marked_without_logs(self, tmp_path, capsys):
+        """キャッシュから読んだ実験はログがなく、from_cache 列と警告で分かることの検証"""
+        with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+            make_evaluator(cache).run_experiments(scheduler_specs={'deadline_scheduler': {'type': 'baseline'}})
+            sink = MemoryResultSink()
+            with JsonlLogStore(str(tmp_path / 'logs.jsonl')) as log_store:
+                make_evaluator(cache).run_to_sink(sink, log_store, scheduler_specs=SPECS)
+                assert len(log_store) == 8
+        assert "4件の実験はログに残りません" in capsys.readouterr().out
+
+        results = sink.read()
+        cached = results[results['from_cache']]
+        assert set(cached['scheduler_name']) == {'deadline_scheduler'} and len(cached) == 4
+
+    def test_without_seed_only_deterministic_schedulers(self, tmp_path):
+        """シードを指定しない場合は乱数を使わないスケジューラーだけをキャッシュすることの検証"""
+        with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+            make_evaluator(cache, seed=None).run_experiments(scheduler_specs=SPECS)
+            assert len(cache) == 8
+            make_evaluator(cache, seed=None).run_experiments(scheduler_specs=SPECS)
+            assert cache.hits == 8
+
+    def test_simulation_config_change_invalidates(self, tmp_path):
+        """シミュレーション設定が変わるとキャッシュを使わないことの検証"""
+        with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+            make_evaluator(cache).run_experiments(scheduler_specs=SPECS)
+            make_evaluator(cache, simulation_days=4).run_experiments(scheduler_specs=SPECS)
+            assert cache.hits == 0
+
+    def test_fingerprints_follow_inputs(self, tmp_path, monkeypatch):
+        """設定・モデルファイル・タスクセットが変わるとキーが変わることの検証"""
+        spec = {'type': 'baseline'}
+        before = scheduler_fingerprint('deadline_scheduler', spec)
+        monkeypatch.setitem(config.BREAK_STRATEGY_CONFIG, 'threshold', 0.9)
+        assert scheduler_fingerprint('deadline_scheduler', spec) != before
+
+        model_path = tmp_path / 'model.pkl'
+        model_path.write_bytes(b'a')
+        rl_spec = {'type': 'rl', 'model_path': str(model_path)}
+        rl_before = scheduler_fingerprint('rl_scheduler', rl_spec)
+        model_path.write_bytes(b'b')
+        assert scheduler_fingerprint('rl_scheduler', rl_spec) != rl_before
+
+        loader = VirtualTaskDataLoader('test', num_sets=2, num_tasks=10, seed=1)
+        assert task_set_hash(loader, 0, SCENARIO_START_TIME) == task_set_hash(loader, 0, SCENARIO_START_TIME)
+        assert task_set_hash(loader, 0, SCENARIO_START_TIME) != task_set_hash(loader, 1, SCENARIO_START_TIME)
+
+        simulation_before = simulation_fingerprint(7, 8, None, SCENARIO_START_TIME)
+        assert simulation_fingerprint(7, 9, None, SCENARIO_START_TIME) != simulation_before
+        monkeypatch.setitem(config.TIME_MARGIN_CONFIG, 'safety_factor', 0.5)
+        assert simulation_fingerprint(7, 8, None, SCENARIO_START_TIME) != simulation_before
+
+    def test_evaluator_code_invalidates(self, monkeypatch):
+        """指標を作る evaluator.py が変わるとコードのハッシュが変わることの検証"""
+        from src.evaluation import result_cache
+
+        monkeypatch.setattr(result_cache, '_code_hash', None)
+        before = result_cache.code_fingerprint()
+
+        original_hash = result_cache.file_hash
+        monkeypatch.setattr(result_cache, 'file_hash', lambda path: (
+            '0' * 64 if path.endswith('evaluator.py') else original_hash(path)))
+        monkeypatch.setattr(result_cache, '_code_hash', None)
+        assert result_cache.code_fingerprint() != before
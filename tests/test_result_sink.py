@@ -0,0 +1,94 @@
+import pytest
+from src.evaluation.evaluator import SchedulerEvaluator
+from src.evaluation.result_sink import (CsvResultSink, JsonlLogStore, MemoryResultSink, ResultSink,
+                                        read_result_columns, split_result)
+from src.utils.task_loader import VirtualTaskDataLoader
+
+
+def make_result(scheduler_name: str, experiment_id: int) -> dict:
+    return {
+        'scheduler_name': scheduler_name,
+        'experiment_id': experiment_id,
+        'total_score': 100 + experiment_id,
+        'completion_rate': 0.5,
+        'simulation_log': [{'time': '2024-01-01T09:00:00', 'action': 'break', 'duration': 15}],
+        'tasks': {'total': 3, 'completed': [], 'incomplete': []},
+    }
+
+
+class TestResultSink:
+    """結果の書き出し先のテスト"""
+
+    def test_split_result(self):
+        """スカラーの指標と入れ子のログに分かれることの検証"""
+        metrics, logs = split_result(make_result('a', 0))
+        assert set(metrics) == {'scheduler_name', 'experiment_id', 'total_score', 'completion_rate'}
+        assert set(logs) == {'simulation_log', 'tasks'}
+
+    def test_sink_requires_write_and_read(self):
+        """write と read を実装しない書き出し先は作れないことの検証"""
+        class WriteOnlySink(ResultSink):
+            def write(self, metrics):
+                pass
+
+        with pytest.raises(TypeError):
+            ResultSink()
+        with pytest.raises(TypeError):
+            WriteOnlySink()
+
+    def test_memory_sink_is_typed(self):
+        """メモリ上の書き出し先が型付きの列になることの検証"""
+        sink = MemoryResultSink()
+        for i in range(3):
+            sink.write(split_result(make_result('a', i))[0])
+        df = sink.read()
+        assert df['total_score'].dtype == 'int64'
+        assert df['completion_rate'].dtype == 'float64'
+        assert df['scheduler_name'].dtype == 'category'
+        assert list(sink.read(['total_score', 'missing']).columns) == ['total_score']
+
+    def test_csv_sink_reads_selected_columns(self, tmp_path):
+        """CSVの書き出し先から指定した列だけを読めることの検証"""
+        path = str(tmp_path / 'results.csv')
+        with CsvResultSink(path) as sink:
+            for i in range(3):
+                sink.write(split_result(make_result('a', i))[0])
+            with pytest.raises(ValueError):
+                sink.write({'scheduler_name': 'a', 'unexpected': 1})
+
+        df = read_result_columns(path, ['scheduler_name', 'total_score'])
+        assert list(df.columns) == ['scheduler_name', 'total_score']
+        assert list(df['total_score']) == [100, 101, 102]
+
+    def test_log_store_round_trip(self, tmp_path):
+        """ログを追記し、キーで読み出せる（開き直しても読める）ことの検証"""
+        path = str(tmp_path / 'logs.jsonl')
+        with JsonlLogStore(path) as store:
+            for i in range(3):
+                result = make_result('a', i)
+                store.append('a', i, split_result(result)[1])
+            assert store.load('a', 1)['tasks']['total'] == 3
+
+        with JsonlLogStore(path) as store:
+            assert len(store) == 3
+            assert store.load('a', 2)['experiment_id'] == 2
+            with pytest.raises(KeyError):
+                store.load('b', 0)
+
+    def test_evaluator_streams_to_csv(self, tmp_path):
+        """評価結果をCSVに書き出し、レポートが必要な列だけで作れることの検証"""
+        loader = VirtualTaskDataLoader('test', num_sets=3, num_tasks=15, seed=1)
+        evaluator = SchedulerEvaluator(num_experiments=3, simulation_days=2, task_loader=loader, seed=0)
+        specs = {'deadline_scheduler': {'type': 'baseline'}, 'priority_scheduler': {'type': 'baseline'}}
+
+        with CsvResultSink(str(tmp_path / 'results.csv')) as sink:
+            evaluator.run_to_sink(sink, scheduler_specs=specs)
+
+        expected = evaluator.run_experiments(scheduler_specs=specs)
+        analysis = evaluator.analyze_results(sink)
+        assert analysis['deadline_scheduler']['mean_score'] == pytest.approx(
+            expected[expected['scheduler_name'] == 'deadline_scheduler']['total_score'].mean())
+        assert 'simulation_log' not in sink.read().columns
+        report = evaluator.generate_report(sink)
+        assert '## 統計的有意差検定結果' in report
+        assert '## ブートストラップ信頼区間と並べ替え検定（対応あり、3セット）' in report
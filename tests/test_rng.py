@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.evaluation.evaluator import SchedulerEvaluator
+from src.evaluation.result_cache import ResultCache
+from src.models.task import Task
+from src.utils.rng import experiment_generator, experiment_seed_sequence, scheduler_key
+from src.utils.task_loader import VirtualTaskDataLoader
+
+
+SPECS = {'deadline_scheduler': {'type': 'baseline'}, 'random_scheduler': {'type': 'baseline'},
+         'rl_scheduler': {'type': 'rl'}}
+
+
+def make_evaluator(**kwargs) -> SchedulerEvaluator:
+    loader = VirtualTaskDataLoader('test', num_sets=6, num_tasks=30, seed=1)
+    return SchedulerEvaluator(num_experiments=6, simulation_days=3, task_loader=loader, seed=0, **kwargs)
+
+
+class TestExperimentRng:
+    """実験ごとの乱数列のテスト"""
+
+    def test_seed_sequence_matches_spawn_tree(self):
+        """直接作った乱数列のシードが SeedSequence.spawn の木と一致することの検証"""
+        root = np.random.SeedSequence(7)
+        spawned = root.spawn(3)[2].spawn(2)[1]
+        assert (experiment_seed_sequence(7, 2, purpose='decisions').generate_state(4)
+                == spawned.generate_state(4)).all()
+
+        key = scheduler_key('random_scheduler')
+        direct = experiment_seed_sequence(7, 2, 'random_scheduler', 'decisions')
+        assert direct.spawn_key == (2, key, 1)
+        assert not (direct.generate_state(4) == spawned.generate_state(4)).all()
+
+    def test_serial_parallel_and_cached_runs_are_identical(self, tmp_path):
+        expected = make_evaluator().run_experiments(scheduler_specs=SPECS)
+        pd.testing.assert_frame_equal(expected, make_evaluator().run_experiments(scheduler_specs=SPECS))
+        pd.testing.assert_frame_equal(expected, make_evaluator(workers=2).run_experiments(scheduler_specs=SPECS))
+        pd.testing.assert_frame_equal(
+            expected, make_evaluator(group_by_task_set=False).run_experiments(scheduler_specs=SPECS))
+
+        with ResultCache(str(tmp_path / 'cache.sqlite')) as cache:
+            make_evaluator(result_cache=cache).run_experiments(scheduler_specs=SPECS)
+            cached = make_evaluator(result_cache=cache).run_experiments(scheduler_specs=SPECS)
+            assert cache.hits == len(expected)
+        assert cached['from_cache'].all()
+        pd.testing.assert_frame_equal(expected, cached.drop(columns='from_cache'))
+
+    def test_random_tasks_are_shared_across_schedulers(self):
+        """ランダム生成のタスクセットが (シード, 実験回) で決まり、スケジューラーによらないことの検証"""
+        evaluator = SchedulerEvaluator(num_experiments=2, simulation_days=2, num_tasks=20, seed=0)
+        results = evaluator.run_experiments(scheduler_specs={'deadline_scheduler': {'type': 'baseline'},
+                                                             'priority_scheduler': {'type': 'baseline'}})
+        total_tasks = results['completed_tasks_count'] + results['incomplete_tasks_count']
+        assert (total_tasks.groupby(results['experiment_id']).nunique() == 1).all()
+        pd.testing.assert_frame_equal(results, evaluator.run_experiments(
+            scheduler_specs={'deadline_scheduler': {'type': 'baseline'}, 'priority_scheduler': {'type': 'baseline'}}))
+
+    def test_generate_random_task_uses_generator(self):
+        start = datetime(2024, 1, 1, 9, 0)
+        first = Task.generate_random_task(0, start, experiment_generator(0, 0))
+        second = Task.generate_random_task(0, start, experiment_generator(0, 0))
+        assert first == second
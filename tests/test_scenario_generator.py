@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from src.models.task import Priority
+from src.utils.scenario_generator import ScenarioConfig, generate_scenario_records, write_scenario, load_scenario
+
+
+class TestScenarioGenerator:
+    """負荷試験シナリオ生成のテスト"""
+
+    def test_write_and_load_round_trip(self, tmp_path):
+        """書き出したシナリオが設定どおりのタスク数・構成で読み込めることの検証"""
+        scenario = ScenarioConfig(name='small', num_tasks=5000, simulation_days=60,
+                                  priority_mix=(0.2, 0.3, 0.5),
+                                  genre_mix={'1': 0.7, '2': 0.1, '3': 0.1, '4': 0.1})
+        write_scenario(scenario, str(tmp_path), num_sets=2, seed=3)
+
+        loaded, dataset = load_scenario(str(tmp_path), 'small')
+        assert loaded == scenario
+        assert len(dataset) == 2
+
+        records = dataset.get_records(0)
+        assert len(records) == 5000
+        assert abs(np.mean(records['priority'] == Priority.HIGH.value) - 0.5) < 0.03
+        assert abs(np.mean(records['genre'] == 1) - 0.7) < 0.03
+        assert not np.array_equal(np.asarray(records), np.asarray(dataset.get_records(1)))
+
+        tasks = dataset.get_tasks(0)
+        simulation = loaded.create_simulation()
+        assert simulation.num_tasks == len(tasks) == 5000
+        assert simulation.start_time == dataset.start_time
+
+    def test_generation_is_deterministic(self, tmp_path):
+        """同じシードなら同じシナリオが生成されることの検証"""
+        scenario = ScenarioConfig(name='det', num_tasks=300, simulation_days=30)
+        write_scenario(scenario, str(tmp_path / 'a'), seed=1)
+        write_scenario(scenario, str(tmp_path / 'b'), seed=1)
+
+        _, first = load_scenario(str(tmp_path / 'a'), 'det')
+        _, second = load_scenario(str(tmp_path / 'b'), 'det')
+        assert np.array_equal(np.asarray(first.records), np.asarray(second.records))
+
+    def test_scenarios_use_separate_streams(self):
+        """同じシード・同じ構成でもシナリオ名が違えば別の乱数でタスクが生成されることの検証"""
+        first = ScenarioConfig(name='first', num_tasks=300, simulation_days=30)
+        second = ScenarioConfig(name='second', num_tasks=300, simulation_days=30)
+        assert not np.array_equal(generate_scenario_records(first, 1, 0), generate_scenario_records(second, 1, 0))
+        assert np.array_equal(generate_scenario_records(first, 1, 0), generate_scenario_records(first, 1, 0))
+
+    def test_deadline_density_compresses_window(self):
+        """締切の密度を上げると締切が期間の前半に集中することの検証"""
+        spread = ScenarioConfig(name='spread', num_tasks=100, simulation_days=90)
+        dense = ScenarioConfig(name='dense', num_tasks=100, simulation_days=90, deadline_density=4.0)
+
+        spread_config, _ = spread.generation_configs()
+        dense_config, _ = dense.generation_configs()
+        assert spread_config['deadline_max_days'] == 90
+        assert dense_config['deadline_min_days'] == spread_config['deadline_min_days']
+        assert dense_config['deadline_max_days'] == pytest.approx(
+            dense_config['deadline_min_days'] + (90 - dense_config['deadline_min_days']) / 4)
+
+    def test_invalid_config_raises(self):
+        """不正な設定が拒否されることの検証"""
+        with pytest.raises(ValueError):
+            ScenarioConfig(name='bad', num_tasks=0, simulation_days=30)
+        with pytest.raises(ValueError):
+            ScenarioConfig(name='bad', num_tasks=10, simulation_days=30, priority_mix=(0.5, 0.5, 0.5))
+        with pytest.raises(ValueError):
+            ScenarioConfig(name='bad', num_tasks=10, simulation_days=30, deadline_density=0.5)
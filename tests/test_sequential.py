@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+import pandas as pd
+from src.evaluation.evaluator import SchedulerEvaluator
+from src.evaluation.result_sink import MemoryResultSink
+from src.evaluation.sequential import SequentialComparison, confidence_sequence_radius
+from src.utils.task_loader import VirtualTaskDataLoader
+
+
+def feed(comparison: SequentialComparison, scores: np.ndarray, start: int = 0):
+    """shape=(タスクセット数, スケジューラー数) の指標を結果の行として加える"""
+    names = [comparison.reference] + comparison.others
+    for offset, row in enumerate(scores):
+        for name, value in zip(names, row):
+            comparison.observe({'scheduler_name': name, 'experiment_id': start + offset, 'total_score': value})
+
+
+class TestSequentialEvaluation:
+    """逐次評価のテスト"""
+
+    def test_radius_is_wider_than_fixed_sample_interval(self):
+        """信頼系列の半幅は固定標本の信頼区間より広く、タスクセット数とともに狭くなることの検証"""
+        radii = [confidence_sequence_radius(t, 1.0, 0.05, 200) for t in (50, 200, 800)]
+        assert radii[0] > radii[1] > radii[2]
+        assert radii[1] > 1.96 / np.sqrt(200)
+
+    def test_large_difference_is_decided_early(self):
+        rng = np.random.default_rng(0)
+        comparison = SequentialComparison(['rl_scheduler', 'a', 'b'], tuning_sets=100, min_sets=10)
+        difficulty = rng.normal(100, 30, (40, 1))
+        feed(comparison, difficulty + np.array([0.0, -5.0, 5.0]) + rng.normal(0, 1, (40, 3)))
+        comparison.update()
+
+        summary = comparison.summary().set_index('comparison')
+        assert summary.loc['rl_scheduler_vs_a', 'decision'] == 'better'
+        assert summary.loc['rl_scheduler_vs_b', 'decision'] == 'worse'
+        assert comparison.all_decided
+
+    def test_waits_for_complete_task_sets(self):
+        """全スケジューラーの結果がそろったタスクセットだけを使うことの検証"""
+        comparison = SequentialComparison(['rl_scheduler', 'a'])
+        comparison.observe({'scheduler_name': 'rl_scheduler', 'experiment_id': 3, 'total_score': 1.0})
+        assert comparison.num_sets == 0
+        comparison.observe({'scheduler_name': 'a', 'experiment_id': 3, 'total_score': 0.0})
+        assert comparison.num_sets == 1
+
+    def test_error_rate_under_repeated_looks(self):
+        """差がない場合、何度確認しても誤って決まる割合が有意水準程度に収まることの検証"""
+        rng = np.random.default_rng(1)
+        false_decisions = 0
+        for _ in range(100):
+            comparison = SequentialComparison(['rl_scheduler', 'a'], alpha=0.1, tuning_sets=100, min_sets=20)
+            for batch in range(20):
+                feed(comparison, rng.normal(0, 1, (20, 2)), start=batch * 20)
+                comparison.update()
+            false_decisions += comparison.decisions[0] is not None
+        assert false_decisions <= 20
+
+    def test_equivalence_margin(self):
+        rng = np.random.default_rng(2)
+        comparison = SequentialComparison(['rl_scheduler', 'a'], equivalence_margin=1.0, tuning_sets=100)
+        feed(comparison, rng.normal(0, 0.5, (200, 1)) + np.zeros((200, 2)))
+        comparison.update()
+        assert comparison.decisions == ['equivalent']
+
+    def test_run_sequential(self):
+        """逐次評価がバッチ単位で実行し、省略した実行数を返すことの検証"""
+        loader = VirtualTaskDataLoader('test', num_sets=10, num_tasks=20, seed=1)
+        evaluator = SchedulerEvaluator(num_experiments=40, simulation_days=2, task_loader=loader, seed=0)
+        specs = {'deadline_scheduler': {'type': 'baseline'}, 'priority_scheduler': {'type': 'baseline'}}
+        sink = MemoryResultSink()
+
+        result = evaluator.run_sequential(sink, scheduler_specs=specs, reference='deadline_scheduler',
+                                          batch_size=10, min_sets=10, equivalence_margin=1e9)
+
+        # 差の範囲が広いので最初の判定で「差なし」に決まる
+        assert result['num_sets'] == 10
+        assert result['saved_runs'] == 30 * 2
+        assert sink.num_rows == 10 * 2
+        assert result['comparisons']['decision'].tolist() == ['equivalent']
+
+        with pytest.raises(ValueError):
+            evaluator.run_sequential(sink, scheduler_specs=specs, reference='rl_scheduler')
+
+    def test_parallel_batches_share_one_pool(self, monkeypatch):
+        """並列の逐次評価が全バッチで1つのプロセスプールを使い、直列と同じ結果になることの検証"""
+        from src.evaluation import parallel_runner
+
+        created = []
+
+        class CountingExecutor(parallel_runner.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                created.append(self)
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(parallel_runner, 'ProcessPoolExecutor', CountingExecutor)
+        loader = VirtualTaskDataLoader('test', num_sets=6, num_tasks=20, seed=1)
+        specs = {'deadline_scheduler': {'type': 'baseline'}, 'random_scheduler': {'type': 'baseline'}}
+        results = {}
+        for workers in (1, 2):
+            evaluator = SchedulerEvaluator(num_experiments=6, simulation_days=2, task_loader=loader, seed=0,
+                                           workers=workers)
+            sink = MemoryResultSink()
+            result = evaluator.run_sequential(sink, scheduler_specs=specs, reference='deadline_scheduler',
+                                              batch_size=2, min_sets=100)
+            assert result['num_sets'] == 6
+            results[workers] = evaluator._sort_results(sink.read(), list(specs))
+
+        assert len(created) == 1
+        assert evaluator._pool is None
+        pd.testing.assert_frame_equal(results[1], results[2])
@@ -0,0 +1,156 @@
+import copy
+import itertools
+import numpy as np
+import pytest
+from datetime import timedelta
+from src.environment.simulation import TaskSchedulingSimulation
+from src.environment.task_index import TaskIndex
+from src.models.concentration import ConcentrationModel
+from src.schedulers.rl_learning_scheduler import RLLearningScheduler
+from src.utils.packed_dataset import tasks_from_records
+from src.utils.rng import DecisionStream
+from src.utils.scenario_generator import (ScenarioConfig, SCENARIO_START_TIME, generate_scenario_records,
+                                         generate_arrival_stream)
+from src.utils.scheduler_factory import create_baseline_schedulers
+from config import CONCENTRATION_CONFIG
+
+
+def scenario_tasks(num_tasks: int, simulation_days: int, deadline_density: float = 1.0, seed: int = 0):
+    scenario = ScenarioConfig(name='test', num_tasks=num_tasks, simulation_days=simulation_days,
+                              deadline_density=deadline_density)
+    return tasks_from_records(generate_scenario_records(scenario, seed, 0), SCENARIO_START_TIME)
+
+
+class TestTaskIndex:
+    """タスクインデックスのテスト"""
+
+    def test_expiry_and_completion(self, sample_tasks, start_time):
+        """締切に間に合わなくなったタスクと完了したタスクが候補から外れることの検証"""
+        index = TaskIndex(sample_tasks)
+        assert len(index.get_ready(start_time)) == 3
+
+        # 1日後: 30分のLOWタスク（締切1日後）は間に合わない
+        ready = index.get_ready(start_time + timedelta(days=1))
+        assert len(ready) == 2
+        assert sample_tasks[0] not in ready
+        assert ready.earliest_deadline() is sample_tasks[1]
+
+        sample_tasks[1].is_completed = True
+        index.mark_completed(sample_tasks[1])
+        assert index.get_ready(start_time + timedelta(days=1)).highest_priority() is sample_tasks[2]
+
+        # 全タスクが間に合わない場合は未完了タスク全体が候補になる
+        ready = index.get_ready(start_time + timedelta(days=5))
+        assert ready is index.incomplete
+        assert len(ready) == 2
+
+    def test_kth_follows_list_order(self, sample_tasks, start_time):
+        """k番目のタスクがリスト内の順になることの検証"""
+        index = TaskIndex(sample_tasks)
+        index.mark_completed(sample_tasks[1])
+        ready = index.get_ready(start_time)
+        assert [ready.kth(k) for k in range(len(ready))] == [sample_tasks[0], sample_tasks[2]]
+
+    def test_time_cannot_go_backwards(self, sample_tasks, start_time):
+        """時刻を戻すとエラーになることの検証"""
+        index = TaskIndex(sample_tasks)
+        index.get_ready(start_time + timedelta(hours=1))
+        with pytest.raises(ValueError):
+            index.get_ready(start_time)
+
+    def test_incremental_add_and_compaction(self):
+        """追加したタスクが候補に入り、完了タスクの領域が回収されることの検証"""
+        tasks = scenario_tasks(500, 30)
+        index = TaskIndex()
+        for task in tasks[:300]:
+            index.add(task)
+        for task in tasks[:250]:
+            task.is_completed = True
+            index.mark_completed(task)
+        for task in tasks[300:]:
+            index.add(task)
+
+        assert len(index) == 250
+        assert len(index.tasks) <= 2 * len(index) + 64
+        ready = index.get_ready(SCENARIO_START_TIME)
+        assert [ready.kth(k) for k in range(len(ready))] == [t for t in tasks[250:]
+                                                             if t in ready]
+        assert ready.earliest_deadline() is min(tasks[250:], key=lambda t: t.deadline)
+
+        with pytest.raises(ValueError):
+            index.add(tasks[-1])
+
+
+class TestLongHorizonSimulation:
+    """長期間モードのシミュレーションのテスト"""
+
+    @pytest.mark.parametrize('num_tasks,simulation_days,deadline_density', [
+        (60, 7, 1.0),
+        (400, 20, 4.0),     # 締切切れのタスクが多く、未完了タスク全体から選ぶ場合を含む
+    ])
+    def test_matches_list_path(self, num_tasks, simulation_days, deadline_density):
+        """長期間モードと通常モードで同じスケジュールになることの検証"""
+        tasks = scenario_tasks(num_tasks, simulation_days, deadline_density)
+        schedulers = create_baseline_schedulers()
+
+        # 全ての行動を試すよう、探索率を高くしたRLスケジューラー（Q値は更新しない）
+        rl_scheduler = RLLearningScheduler(ConcentrationModel(**CONCENTRATION_CONFIG), learning_mode=False)
+        rl_scheduler.set_epsilon(0.7)
+        schedulers['rl_scheduler'] = rl_scheduler
+
+        for name, scheduler in schedulers.items():
+            logs = []
+            for long_horizon in (False, True):
+                simulation = TaskSchedulingSimulation(simulation_days, 8, num_tasks, long_horizon=long_horizon)
+                scheduler.set_random_stream(DecisionStream(np.random.SeedSequence(1)))
+                logs.append(simulation.run_simulation_with_tasks(scheduler, tasks)['simulation_log'])
+            assert logs[0] == logs[1], name
+
+
+class TestArrivalSimulation:
+    """タスク到着ストリームのシミュレーションのテスト"""
+
+    def test_arrivals_at_start_match_long_horizon(self):
+        """全タスクが開始時刻に到着する場合、長期間モードと同じ結果になることの検証"""
+        tasks = scenario_tasks(200, 10)
+        for name, scheduler in create_baseline_schedulers().items():
+            simulation = TaskSchedulingSimulation(10, 8, 200, long_horizon=True)
+            scheduler.set_random_stream(DecisionStream(np.random.SeedSequence(1)))
+            expected = simulation.run_simulation_with_tasks(scheduler, tasks)
+            scheduler.set_random_stream(DecisionStream(np.random.SeedSequence(1)))
+            result = simulation.run_simulation_with_arrivals(
+                scheduler, [(SCENARIO_START_TIME, task) for task in copy.deepcopy(tasks)], record_log=True)
+
+            assert result['simulation_log'] == expected['simulation_log'], name
+            for key in ('total_score', 'completed_tasks_count', 'overdue_tasks_count', 'deadline_compliance_rate'):
+                assert result[key] == expected[key], (name, key)
+            assert result['arrived_tasks_count'] == 200
+
+    def test_infinite_stream_stops_at_horizon(self):
+        """無限の到着ストリームが期間の終わりで打ち切られることの検証"""
+        simulation = TaskSchedulingSimulation(30, 8)
+        scheduler = create_baseline_schedulers()['deadline_scheduler']
+        result = simulation.run_simulation_with_arrivals(scheduler, generate_arrival_stream(8, seed=0))
+
+        # 到着数は期待値（30日 × 8件）の近く、バックログは到着数より十分小さい
+        assert 180 < result['arrived_tasks_count'] < 300
+        assert result['completed_tasks_count'] + result['incomplete_tasks_count'] == result['arrived_tasks_count']
+        assert result['max_backlog'] < result['arrived_tasks_count']
+        assert result['on_time_completed_count'] <= result['completed_tasks_count']
+
+    def test_arrival_stream_is_reproducible(self):
+        """同じシードの到着ストリームが同じになり、到着時刻の順に並ぶことの検証"""
+        first = list(itertools.islice(generate_arrival_stream(20, seed=3, chunk_size=16), 50))
+        second = list(itertools.islice(generate_arrival_stream(20, seed=3, chunk_size=16), 50))
+        assert [(t, task.deadline, task.priority) for t, task in first] == \
+               [(t, task.deadline, task.priority) for t, task in second]
+        assert all(a[0] <= b[0] for a, b in zip(first, first[1:]))
+        assert all(task.deadline > t for t, task in first)
+
+    def test_out_of_order_arrivals_raise(self):
+        """到着時刻の順でないストリームがエラーになることの検証"""
+        tasks = scenario_tasks(2, 3)
+        arrivals = [(SCENARIO_START_TIME + timedelta(hours=2), tasks[0]), (SCENARIO_START_TIME, tasks[1])]
+        simulation = TaskSchedulingSimulation(3, 8)
+        with pytest.raises(ValueError):
+            simulation.run_simulation_with_arrivals(create_baseline_schedulers()['deadline_scheduler'], arrivals)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from src.utils.dataset_manifest import build_dataset_split
+from src.utils.task_loader import TaskDataLoader
+from src.utils.task_set_features import TaskSetFeatureTable, load_feature_table
+from src.utils.packed_dataset import records_from_tasks
+
+
+START_TIME = datetime(2024, 1, 1, 9, 0)
+
+
+class TestTaskSetFeatureTable:
+    """タスクセットの特徴量テーブルのテスト"""
+
+    def test_features_match_tasks(self, task_loader):
+        """ベクトル化した特徴量がタスクから直接計算した値と一致することの検証"""
+        table = load_feature_table(task_loader, START_TIME, verbose=False)
+        assert len(table) == task_loader.get_num_datasets()
+
+        for i in range(len(table)):
+            tasks = task_loader.load_tasks(i)
+            durations = [t.base_duration_minutes for t in tasks]
+            deadlines = [(t.deadline - START_TIME).total_seconds() / 60 for t in tasks]
+            row = table.row(i)
+
+            assert row['total_score'] == sum(t.get_score() for t in tasks)
+            assert row['high_count'] == sum(1 for t in tasks if t.priority.name == 'HIGH')
+            assert row['duration_median'] == pytest.approx(np.median(durations))
+            assert row['duration_p25'] == pytest.approx(np.quantile(durations, 0.25))
+            assert row['deadline_spread'] == pytest.approx(max(deadlines) - min(deadlines))
+            assert row['deadline_tightness'] == pytest.approx(
+                np.mean(np.array(durations) / np.maximum(deadlines, 1.0)))
+
+            _, counts = np.unique([t.genre for t in tasks], return_counts=True)
+            p = counts / counts.sum()
+            assert row['genre_entropy'] == pytest.approx(-np.sum(p * np.log2(p)))
+
+    def test_deadline_tightness(self, sample_tasks):
+        """締切の厳しさ（所要時間 / 締切までの時間 の平均）の検証"""
+        table = TaskSetFeatureTable.from_records(records_from_tasks(sample_tasks, START_TIME), np.array([0, 3]))
+
+        # 30分 / 1日、60分 / 2日、120分 / 3日
+        assert table.row(0)['num_tasks'] == 3
+        assert table.row(0)['deadline_tightness'] == pytest.approx((30 / 1440 + 60 / 2880 + 120 / 4320) / 3)
+
+    def test_queries_and_stratified_sample(self):
+        """条件検索と層化サンプリングの検証"""
+        values = np.arange(100)
+        table = TaskSetFeatureTable({'high_count': values % 10, 'total_score': values * 10})
+
+        assert list(table.where(high_count=(9, None), total_score=(None, 500))) == [9, 19, 29, 39, 49]
+        assert list(table.where(table['high_count'] == 0, total_score=(100, None))) == [10, 20, 30, 40, 50,
+                                                                                         60, 70, 80, 90]
+
+        sample = table.stratified_sample('total_score', num_strata=4, size=20, seed=1)
+        assert len(np.unique(sample)) == 20
+        # 各層（25件ずつ）から5件ずつ
+        assert np.array_equal(np.bincount(sample // 25), [5, 5, 5, 5])
+        assert np.array_equal(sample, table.stratified_sample('total_score', 4, 20, seed=1))
+
+    def test_cached_per_dataset_version(self, tmp_path):
+        """保存済みデータセットの特徴量が版ごとに1回だけ計算されることの検証"""
+        root = str(tmp_path)
+        build_dataset_split(root, 'train', 12, 10, START_TIME, seed=1, shard_size=6,
+                            num_workers=1, verbose=False)
+        loader = TaskDataLoader('train', dataset_root=root)
+
+        table = load_feature_table(loader, verbose=False)
+        assert (tmp_path / "train.features.npz").exists()
+
+        cached = load_feature_table(loader, verbose=False)
+        assert cached.version_key == table.version_key
+        for column in table.columns:
+            assert np.array_equal(cached[column], table[column])
+
+        # データセットが変わると作り直す
+        build_dataset_split(root, 'train', 12, 10, START_TIME, seed=2, shard_size=6,
+                            num_workers=1, verbose=False)
+        rebuilt = load_feature_table(TaskDataLoader('train', dataset_root=root), verbose=False)
+        assert rebuilt.version_key != table.version_key
+        assert not np.array_equal(rebuilt['total_score'], table['total_score'])
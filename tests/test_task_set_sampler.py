@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from src.training.task_set_sampler import PrioritizedTaskSetSampler, RoundRobinTaskSetSampler
+
+
+class TestTaskSetSampler:
+    """タスクセットサンプラーのテスト"""
+
+    def test_round_robin(self):
+        """順番通りのサンプリングの検証"""
+        sampler = RoundRobinTaskSetSampler(3)
+        assert [sampler.sample(e) for e in range(5)] == [0, 1, 2, 0, 1]
+        assert not sampler.needs_baseline_score(0)
+
+    def test_unvisited_sets_have_max_priority(self):
+        """未訪問のタスクセットが優先されることの検証"""
+        sampler = PrioritizedTaskSetSampler(3, td_error_weight=1.0, baseline_gap_weight=0.0)
+        sampler.update(0, td_error=1.0)
+        sampler.update(1, td_error=3.0)
+
+        priorities = sampler.get_priorities()
+        assert priorities[2] == priorities.max()
+        assert priorities[1] > priorities[0]
+
+    def test_informative_sets_sampled_more_often(self):
+        """TD誤差とスコア差が大きいタスクセットほど多く選ばれることの検証"""
+        sampler = PrioritizedTaskSetSampler(2, alpha=1.0, seed=0)
+
+        assert sampler.needs_baseline_score(0)
+        sampler.update(0, td_error=10.0, rl_score=500, baseline_score=1000)
+        sampler.update(1, td_error=1.0, rl_score=1000, baseline_score=1000)
+        assert not sampler.needs_baseline_score(0)
+
+        counts = np.bincount([sampler.sample(e) for e in range(500)], minlength=2)
+        assert counts[0] > counts[1] * 3
+
+    def test_curriculum_unlocks_easy_sets_first(self):
+        """カリキュラムで易しいタスクセットから解禁されることの検証"""
+        difficulties = np.array([3.0, 0.0, 2.0, 1.0])
+        sampler = PrioritizedTaskSetSampler(
+            4, difficulties=difficulties, curriculum_episodes=100, curriculum_start_fraction=0.25
+        )
+
+        assert {sampler.sample(0) for _ in range(20)} == {1}
+        assert set(sampler._eligible_sets(100)) == {0, 1, 2, 3}
+
+        with pytest.raises(ValueError):
+            PrioritizedTaskSetSampler(3, difficulties=difficulties)
@@ -0,0 +1,66 @@
+"""
+複数ペルソナの強化学習モデルを同時に事前学習するスクリプト
+プロファイルごとのQ-tableを1つのモデルバンドルにまとめて保存する
+"""
+
+import sys
+import os
+from datetime import datetime
+
+# プロジェクトルートを追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.training.multi_persona_trainer import MultiPersonaTrainer
+from src.utils.task_loader import create_task_loader, PrefetchingTaskDataLoader
+from config import MULTI_PERSONA_TRAINING_CONFIG, TASK_LOADER_CONFIG
+
+
+def main():
+    """全プロファイルの強化学習モデルを同時に学習"""
+    print("=" * 60)
+    print("複数ペルソナの強化学習モデル事前学習")
+    print("=" * 60)
+
+    config = MULTI_PERSONA_TRAINING_CONFIG
+    num_episodes = config['num_episodes']
+
+    # タスクローダーを作成（学習用、先読みスレッドとキャッシュでディスクI/Oを学習と並行させる）
+    train_loader = PrefetchingTaskDataLoader(create_task_loader('train'), **TASK_LOADER_CONFIG)
+
+    trainer = MultiPersonaTrainer(
+        profile_files=config['profiles'],
+        task_loader=train_loader
+    )
+
+    print(f"\nプロファイル:")
+    for name, path in config['profiles'].items():
+        print(f"  - {name}: {path}")
+    print(f"学習エピソード数: {num_episodes}（全プロファイル共通）")
+
+    print(f"\n事前学習を開始...")
+    stats = trainer.train(num_episodes)
+    train_loader.close()
+
+    # モデルバンドルを保存
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    bundle_path = f"trained_models/rl_model_bundle_{timestamp}.pkl"
+    trainer.save_bundle(bundle_path)
+
+    import shutil
+    shutil.copy(bundle_path, config['bundle_path'])
+
+    print(f"\n✅ 学習完了！モデルバンドルを保存: {bundle_path}")
+    print(f"（デフォルトのバンドルとしてコピー: {config['bundle_path']}）")
+
+    for name, profile_stats in stats.items():
+        print(f"\n{name}:")
+        print(f"  最終平均報酬: {profile_stats['final_average_reward']:.2f}")
+        print(f"  Q-tableサイズ: {profile_stats['q_table_size']} 状態")
+
+    print("\n特定のプロファイルを使う場合:")
+    print(f"  create_rl_scheduler('{config['bundle_path']}', profile='<プロファイル名>')"
+          f"（パーソナルデータはバンドルに記録されたファイルを使う）")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from src.environment.simulation import TaskSchedulingSimulation
 from src.schedulers.rl_learning_scheduler import RLLearningScheduler
 from src.models.concentration import ConcentrationModel
-from src.utils.task_loader import TaskDataLoader
-from config import DEFAULT_SIMULATION_CONFIG, RL_CONFIG, CONCENTRATION_CONFIG, RL_LEARNING_MODE_CONFIG
+from src.utils.task_loader import create_task_loader, PrefetchingTaskDataLoader
+from src.utils.scheduler_factory import create_baseline_schedulers
+from src.training.task_set_sampler import create_task_set_sampler, best_baseline_score
+from config import (DEFAULT_SIMULATION_CONFIG, RL_CONFIG, CONCENTRATION_CONFIG,
+                    RL_LEARNING_MODE_CONFIG, RL_TRAINING_SAMPLER_CONFIG, TASK_LOADER_CONFIG)
 
 
 def main():
@@ -23,8 +26,8 @@ def main():
     print("強化学習モデルの事前学習")
     print("=" * 60)
 
-    # タスクローダーを作成（学習用）
-    train_loader = TaskDataLoader(dataset_type='train')
+    # タスクローダーを作成（学習用、先読みスレッドとキャッシュでディスクI/Oを学習と並行させる）
+    train_loader = PrefetchingTaskDataLoader(create_task_loader('train'), **TASK_LOADER_CONFIG)
 
     # 学習エピソード数（報酬簡素化後なので増やす）
     num_episodes = 20000
@@ -32,6 +35,15 @@ def main():
     # シミュレーション環境を作成
     simulation = TaskSchedulingSimulation(**DEFAULT_SIMULATION_CONFIG)
 
+    # 学習に使うタスクセットの選び方（順番通り or 優先度付き）
+    sampler = create_task_set_sampler(train_loader, RL_TRAINING_SAMPLER_CONFIG,
+                                      start_time=simulation.start_time)
+
+    # スコア差の基準にする決定的なベースライン（ランダムは除く）
+    baseline_schedulers = {
+        name: scheduler for name, scheduler in create_baseline_schedulers().items()
+        if name != 'random_scheduler'
+    }
 
     # 強化学習スケジューラーを作成（学習モードで）
     concentration = ConcentrationModel(**CONCENTRATION_CONFIG)
@@ -46,6 +58,8 @@ def main():
     print(f"  - 割引率: {RL_CONFIG['discount_factor']}")
     print(f"  - 初期探索率: {RL_CONFIG['epsilon']}")
     print(f"  - 学習エピソード数: {num_episodes}")
+    print(f"  - タスクセットの選び方: {RL_TRAINING_SAMPLER_CONFIG['strategy']}"
+          f"{'（カリキュラムあり）' if RL_TRAINING_SAMPLER_CONFIG['curriculum'] else ''}")
 
     # 事前学習を実行
     print(f"\n事前学習を開始...")
@@ -67,12 +81,24 @@ def main():
         epsilon_history.append(current_epsilon)
 
         # 学習用データセットからタスクを読み込み
-        task_index = episode % train_loader.get_num_datasets()
+        task_index = sampler.sample(episode)
         training_tasks = train_loader.load_tasks(task_index)
+        train_loader.prefetch(sampler.upcoming(episode + 1, train_loader.prefetch_depth))
 
         # エピソード実行
         result = simulation.run_simulation_with_tasks(rl_scheduler, training_tasks)
 
+        # タスクセットの統計を更新（ベースラインスコアは初回のみ計算）
+        baseline_score = None
+        if sampler.needs_baseline_score(task_index):
+            baseline_score = best_baseline_score(simulation, baseline_schedulers, training_tasks)
+        sampler.update(
+            task_index,
+            td_error=rl_scheduler.task_selector.get_episode_td_error(),
+            rl_score=result['total_score'],
+            baseline_score=baseline_score
+        )
+
         # 報酬記録
         episode_reward = sum(rl_scheduler.task_selector.reward_history[-len(training_tasks):]) \
                          if rl_scheduler.task_selector.reward_history else 0
@@ -86,6 +112,10 @@ def main():
         # エピソード終了処理
         rl_scheduler.reset()
 
+    train_loader.close()
+    cache_stats = train_loader.get_cache_stats()
+    print(f"タスクセットのキャッシュヒット率: {cache_stats['hit_rate']:.1%}")
+
     # 学習統計を作成
     training_stats = {
         'final_average_reward': sum(total_rewards[-100:]) / min(100, len(total_rewards)),
@@ -109,7 +139,8 @@ def main():
         f.write(f"学習日時: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}\n")
         f.write(f"学習エピソード数: {num_episodes}\n")
         f.write(f"最終平均報酬: {training_stats['final_average_reward']:.2f}\n")
-        f.write(f"Q-tableサイズ: {training_stats['q_table_size']} 状態\n\n")
+        f.write(f"Q-tableサイズ: {training_stats['q_table_size']} 状態\n")
+        f.write(f"学習データセット: {train_loader.get_dataset_info()}\n\n")
 
         f.write("## エピソードごとの報酬推移\n")
         for i, reward in enumerate(training_stats['episode_rewards'], 1):
@@ -0,0 +1,76 @@
+"""
+強化学習モデルのハイパーパラメータ探索スクリプト
+複数の設定を並列に学習し、Successive Halving で弱い設定を打ち切りながら最良の設定を探す
+"""
+
+import sys
+import os
+from datetime import datetime
+
+# プロジェクトルートを追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from src.training.hyperparameter_search import HyperparameterSearch
+from src.utils.task_loader import create_task_loader
+from config import RL_HYPERPARAMETER_SEARCH_CONFIG
+
+
+def main():
+    """ハイパーパラメータ探索を実行して結果表と最良モデルを保存"""
+    print("=" * 60)
+    print("強化学習モデルのハイパーパラメータ探索")
+    print("=" * 60)
+
+    config = RL_HYPERPARAMETER_SEARCH_CONFIG
+
+    # タスクローダーを作成（学習用。末尾を評価用に切り出す）
+    train_loader = create_task_loader('train')
+
+    search = HyperparameterSearch(
+        task_loader=train_loader,
+        search_space=config['search_space'],
+        num_configs=config['num_configs'],
+        min_episodes=config['min_episodes'],
+        max_episodes=config['max_episodes'],
+        reduction_factor=config['reduction_factor'],
+        num_eval_sets=config['num_eval_sets'],
+        num_workers=config['num_workers'],
+        seed=config['seed']
+    )
+
+    print(f"\n探索設定:")
+    print(f"  - 設定数: {len(search.configurations)}")
+    print(f"  - 段階（累積エピソード数）: {search.rungs}")
+    print(f"  - 評価用タスクセット: {len(search.eval_indices)}セット")
+    print(f"  - ワーカー数: {search.num_workers}")
+
+    print(f"\n探索を開始...")
+    ranking = search.run()
+
+    # 結果を保存
+    os.makedirs("trained_models", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    ranking_df = pd.DataFrame(ranking)
+    ranking_path = f"trained_models/hyperparameter_search_{timestamp}.csv"
+    ranking_df.to_csv(ranking_path, index=False, encoding='utf-8')
+
+    model_path = f"trained_models/rl_model_tuned_{timestamp}.pkl"
+    best = search.save_best_model(model_path)
+
+    print("\n" + "=" * 60)
+    print("探索結果（上位10設定）")
+    print("=" * 60)
+    print(ranking_df.head(10).to_string(index=False))
+
+    print(f"\n✅ 探索完了！")
+    print(f"  - 結果表: {ranking_path}")
+    print(f"  - 最良モデル: {model_path}")
+    print(f"  - 最良設定: {best['params']}")
+    print("\nこのモデルを実験で使う場合は trained_models/rl_model_default.pkl にコピーしてください。")
+
+
+if __name__ == "__main__":
+    main()